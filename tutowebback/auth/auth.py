@@ -10,12 +10,13 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 from fastapi import Depends, status, HTTPException
-from config.database import get_db
+from tutowebback.config.database import get_db
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from tutowebback.config import database
 from tutowebback.models import models
 from tutowebback.schemas import schemas
+from tutowebback.services import catalogoCacheService
 
 environment = os.getenv('ENVIRONMENT', 'development')
 env_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'environments', f".env-{environment}")
@@ -45,17 +46,18 @@ def login_for_access_token(db: Session, email: str, password: str):
     # Obtener el rol del usuario
     rol = None
     if user.id_rol:
-        rol = db.query(models.Rol).filter(models.Rol.id == user.id_rol).first()
+        rol = catalogoCacheService.rol_por_id(db, user.id_rol)
 
     # Obtener las carreras del usuario
     carreras = []
+    carreras_por_id = catalogoCacheService.carreras_por_id(db)
     user_carreras = db.query(models.CarreraUsuario).filter(models.CarreraUsuario.usuario_id == user.id).all()
     for user_carrera in user_carreras:
-        carrera = db.query(models.Carrera).filter(models.Carrera.id == user_carrera.carrera_id).first()
+        carrera = carreras_por_id.get(user_carrera.carrera_id)
         if carrera:
             carreras.append({
-                "id": carrera.id,
-                "nombre": carrera.nombre
+                "id": carrera["id"],
+                "nombre": carrera["nombre"]
             })
 
     # Crear un token JWT con los datos del usuario
@@ -68,7 +70,7 @@ def login_for_access_token(db: Session, email: str, password: str):
                 "apellido": user.apellido,
                 "email": user.email,
             },
-            "user_rol": rol.nombre if rol else None,
+            "user_rol": rol["nombre"] if rol else None,
             "user_carreras": carreras
         },
         expires_delta=access_token_expires
@@ -0,0 +1,14 @@
+"""
+Benchmarks de punta a punta de la API.
+
+- semilla: carga un conjunto de datos sintético (miles de tutores, estudiantes, reservas, pagos,
+  calificaciones y notificaciones) en una base vacía, SQLite o PostgreSQL
+- escenarios: los endpoints de mayor tráfico y cómo armar cada request
+- ejecucion: corre los escenarios con clientes asíncronos concurrentes contra la app en el mismo
+  proceso (httpx.ASGITransport) o contra un servidor, midiendo latencias, throughput y sentencias SQL
+- comparacion: compara un resultado con una línea base guardada y detecta regresiones
+
+Uso (desde la raíz del repositorio):
+    python -m tutowebback.benchmarks --salida linea_base.json
+    python -m tutowebback.benchmarks --comparar linea_base.json
+"""
@@ -0,0 +1,145 @@
+"""
+Línea de comandos de los benchmarks (ver el docstring del paquete).
+
+Sin `--base` usa un SQLite temporal migrado y sembrado en cada corrida. Con `--base` (p. ej. un
+PostgreSQL local) migra y siembra solo si la base todavía no tiene los datos, así las corridas
+sucesivas, una por commit, miden sobre los mismos datos. Con `--url` las requests van a un
+servidor ya levantado sobre esa misma base; si no, a la app en este proceso.
+
+El resultado (JSON) incluye el commit, los parámetros y el resumen de cada escenario. Con
+`--comparar` se compara con una línea base y el proceso termina con código 1 si hay regresiones.
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+
+DIRECTORIO_RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _argumentos():
+    parser = argparse.ArgumentParser(prog="python -m tutowebback.benchmarks",
+                                     description="Latencias, throughput y sentencias SQL de los endpoints principales")
+    parser.add_argument("--base", help="URL de la base (por defecto un SQLite temporal)")
+    parser.add_argument("--url", help="Servidor a medir (por defecto la app en este proceso)")
+    parser.add_argument("--escala", type=float, default=1.0, help="Factor sobre el tamaño del conjunto de datos")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla del conjunto de datos")
+    parser.add_argument("--escenarios", help="Escenarios separados por coma (por defecto todos)")
+    parser.add_argument("--solicitudes", type=int, default=200, help="Requests medidas por escenario")
+    parser.add_argument("--concurrencia", type=int, default=8, help="Clientes simultáneos")
+    parser.add_argument("--calentamiento", type=int, default=20, help="Requests sin medir antes de cada escenario")
+    parser.add_argument("--usuarios", type=int, default=20, help="Tutores y estudiantes autenticados que se rotan")
+    parser.add_argument("--salida", help="Archivo donde guardar el resultado (JSON)")
+    parser.add_argument("--comparar", help="Línea base (JSON) con la que comparar el resultado")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Variación admitida de p95 y throughput")
+    return parser.parse_args()
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=DIRECTORIO_RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _medir(args, escenarios: list, base: dict) -> dict:
+    import httpx
+    from tutowebback.benchmarks.escenarios import autenticar
+    from tutowebback.benchmarks.ejecucion import ejecutar
+
+    limites = httpx.Limits(max_connections=args.concurrencia, max_keepalive_connections=args.concurrencia)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limites, timeout=60) as cliente:
+            contexto = await autenticar(cliente, base)
+            return await ejecutar(cliente, escenarios, contexto, args.solicitudes, args.concurrencia, args.calentamiento)
+
+    from tutowebback import main
+    from tutowebback.config import database
+    capacidad = database.POOL_SIZE + database.MAX_OVERFLOW
+    if args.concurrencia > capacidad:
+        # Los endpoints usan la sesión de forma sincrónica en el event loop: la request que espera
+        # una conexión libre bloquea el loop, y con él a las que tendrían que devolverla
+        print(f"Aviso: concurrencia {args.concurrencia} mayor que el pool de conexiones ({capacidad}); "
+              f"las requests que esperen conexión bloquean el event loop hasta DB_POOL_TIMEOUT")
+    app = main.app
+    async with app.router.lifespan_context(app):
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://benchmark", timeout=60) as cliente:
+            contexto = await autenticar(cliente, base)
+            return await ejecutar(cliente, escenarios, contexto, args.solicitudes, args.concurrencia, args.calentamiento)
+
+
+def _imprimir(resultado: dict):
+    print(f"\n{'escenario':<32}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'SQL':>7}{'errores':>9}")
+    for nombre, resumen in resultado["escenarios"].items():
+        latencia = resumen["latencia_ms"] or {"p50": 0, "p95": 0, "p99": 0}
+        consultas = resumen["consultas_sql"]["media"] if resumen["consultas_sql"] else "-"
+        print(f"{nombre:<32}{resumen['throughput_rps']:>9.1f}{latencia['p50']:>9.1f}{latencia['p95']:>9.1f}"
+              f"{latencia['p99']:>9.1f}{consultas:>7}{resumen['errores']:>9}")
+
+
+def main():
+    args = _argumentos()
+    with tempfile.TemporaryDirectory(prefix="tutoweb_benchmark_") as directorio:
+        url_base = args.base or f"sqlite:///{os.path.join(directorio, 'benchmark.db')}"
+        # Antes de importar la aplicación: config/database.py y config/instrumentacion.py leen el entorno al importarse
+        os.environ["SQLALCHEMY_DATABASE_URL_LOCAL"] = url_base
+        os.environ["DB_INSTRUMENTACION_HEADERS"] = "true"
+        os.environ.pop("DB_CREATE_ALL", None)
+        sys.path.append(DIRECTORIO_RAIZ)
+
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+        from tutowebback.tools.datos_prueba import migrar
+        from tutowebback.benchmarks.semilla import sembrar, sembrada
+        from tutowebback.benchmarks.escenarios import ESCENARIOS, leer_base
+        from tutowebback.benchmarks.comparacion import comparar
+
+        nombres = args.escenarios.split(",") if args.escenarios else list(ESCENARIOS)
+        desconocidos = [nombre for nombre in nombres if nombre not in ESCENARIOS]
+        if desconocidos:
+            sys.exit(f"Escenarios desconocidos: {', '.join(desconocidos)} (disponibles: {', '.join(ESCENARIOS)})")
+
+        engine = create_engine(url_base)
+        migrar(engine)
+        with Session(engine) as db:
+            if not sembrada(db):
+                print("Sembrando datos:", sembrar(db, args.escala, args.semilla))
+            base = leer_base(db, args.usuarios)
+        engine.dispose()
+
+        escenarios = asyncio.run(_medir(args, [ESCENARIOS[nombre] for nombre in nombres], base))
+
+    resultado = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "base": url_base.split(":", 1)[0] if not args.base else args.base.split("@")[-1],
+        "parametros": {
+            "escala": args.escala, "semilla": args.semilla, "solicitudes": args.solicitudes,
+            "concurrencia": args.concurrencia, "calentamiento": args.calentamiento, "usuarios": args.usuarios,
+            "servidor": args.url or "en_proceso",
+        },
+        "escenarios": escenarios,
+    }
+    _imprimir(resultado)
+    if args.salida:
+        with open(args.salida, "w") as archivo:
+            json.dump(resultado, archivo, indent=2)
+    if args.comparar:
+        with open(args.comparar) as archivo:
+            regresiones = comparar(json.load(archivo), resultado, args.tolerancia)
+        if regresiones:
+            print("\nRegresiones respecto de", args.comparar)
+            for regresion in regresiones:
+                print(" -", regresion)
+            sys.exit(1)
+        print("\nSin regresiones respecto de", args.comparar)
+
+
+if __name__ == "__main__":
+    main()
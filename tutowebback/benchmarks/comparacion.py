@@ -0,0 +1,37 @@
+"""
+Comparación de un resultado con una línea base.
+
+Por escenario es regresión:
+- p95 mayor que el de la línea base en más de `tolerancia` (fracción) y de `piso_ms` milisegundos
+  (el piso evita falsos positivos en endpoints de pocos milisegundos, dominados por el ruido)
+- throughput menor en más de `tolerancia`
+- más sentencias SQL por request (media o máximo): no dependen del ruido, cualquier aumento
+  es un cambio de comportamiento (una consulta N+1 nueva, una relación sin cargar)
+- errores en un escenario que no los tenía
+"""
+
+
+def comparar(linea_base: dict, resultado: dict, tolerancia: float = 0.2, piso_ms: float = 2.0) -> list:
+    """
+    Lista de regresiones (textos) de `resultado` respecto de `linea_base`; vacía si no hay
+    """
+    regresiones = []
+    for nombre, actual in resultado["escenarios"].items():
+        base = linea_base["escenarios"].get(nombre)
+        if base is None:
+            continue
+        if actual["errores"] and not base["errores"]:
+            regresiones.append(f"{nombre}: {actual['errores']} errores {actual['errores_por_estado']}")
+        if base["latencia_ms"] and actual["latencia_ms"]:
+            antes, ahora = base["latencia_ms"]["p95"], actual["latencia_ms"]["p95"]
+            if ahora > antes * (1 + tolerancia) and ahora - antes > piso_ms:
+                regresiones.append(f"{nombre}: p95 {antes:.1f} ms -> {ahora:.1f} ms")
+        antes, ahora = base["throughput_rps"], actual["throughput_rps"]
+        if ahora < antes * (1 - tolerancia):
+            regresiones.append(f"{nombre}: throughput {antes:.1f} -> {ahora:.1f} req/s")
+        if base["consultas_sql"] and actual["consultas_sql"]:
+            for medida in ("media", "maximo"):
+                antes, ahora = base["consultas_sql"][medida], actual["consultas_sql"][medida]
+                if ahora > antes:
+                    regresiones.append(f"{nombre}: sentencias SQL ({medida}) {antes} -> {ahora}")
+    return regresiones
@@ -0,0 +1,102 @@
+"""
+Ejecución de los escenarios con clientes asíncronos concurrentes.
+
+Cada escenario envía `solicitudes` requests desde `concurrencia` clientes (precedidas por
+`calentamiento` requests que no se miden) y resume latencias p50/p95/p99, throughput, errores
+y sentencias SQL por request. Las sentencias se leen del header X-DB-Consultas
+(config/instrumentacion.py), así que el servidor debe tener DB_INSTRUMENTACION_HEADERS=true;
+si el header no viene, `consultas_sql` queda en None.
+"""
+import os
+import sys
+import time
+import asyncio
+import statistics
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import httpx
+
+from tutowebback.benchmarks.escenarios import Escenario
+
+
+def resumir(latencias: list, consultas: list, errores: Counter, segundos: float) -> dict:
+    """
+    Resumen de un escenario: latencias en ms de las requests exitosas, throughput en requests
+    por segundo (todas) y errores por código de estado
+    """
+    resumen = {
+        "solicitudes": len(latencias) + sum(errores.values()),
+        "errores": sum(errores.values()),
+        "errores_por_estado": {str(estado): cantidad for estado, cantidad in sorted(errores.items())},
+        "throughput_rps": round((len(latencias) + sum(errores.values())) / segundos, 2) if segundos else 0.0,
+        "latencia_ms": None,
+        "consultas_sql": None,
+    }
+    if latencias:
+        milisegundos = [latencia * 1000 for latencia in latencias]
+        if len(milisegundos) > 1:
+            cortes = statistics.quantiles(milisegundos, n=100, method="inclusive")
+            p50, p95, p99 = cortes[49], cortes[94], cortes[98]
+        else:
+            p50 = p95 = p99 = milisegundos[0]
+        resumen["latencia_ms"] = {
+            "p50": round(p50, 2), "p95": round(p95, 2), "p99": round(p99, 2),
+            "media": round(statistics.fmean(milisegundos), 2), "maximo": round(max(milisegundos), 2),
+        }
+    if consultas:
+        resumen["consultas_sql"] = {"media": round(statistics.fmean(consultas), 2), "maximo": max(consultas)}
+    return resumen
+
+
+async def ejecutar_escenario(cliente: httpx.AsyncClient, escenario: Escenario, contexto: dict,
+                             solicitudes: int, concurrencia: int, calentamiento: int = 0) -> dict:
+    """
+    Corre un escenario y devuelve su resumen. Los índices de las requests son consecutivos
+    (primero las de calentamiento), así cada una es distinta aunque haya varios clientes.
+    """
+    latencias, consultas, errores = [], [], Counter()
+    siguiente = 0
+
+    async def _cliente(total: int, medir: bool):
+        nonlocal siguiente
+        while siguiente < total:
+            indice = siguiente
+            siguiente += 1
+            solicitud = escenario.solicitud(contexto, indice)
+            url = solicitud.pop("url")
+            inicio = time.perf_counter()
+            try:
+                respuesta = await cliente.request(escenario.metodo, url, **solicitud)
+            except httpx.HTTPError as e:
+                if medir:
+                    errores[type(e).__name__] += 1
+                continue
+            duracion = time.perf_counter() - inicio
+            if not medir:
+                continue
+            if respuesta.status_code >= 400:
+                errores[respuesta.status_code] += 1
+                continue
+            latencias.append(duracion)
+            if "x-db-consultas" in respuesta.headers:
+                consultas.append(int(respuesta.headers["x-db-consultas"]))
+
+    if calentamiento:
+        await asyncio.gather(*[_cliente(calentamiento, False) for _ in range(concurrencia)])
+    inicio = time.perf_counter()
+    await asyncio.gather(*[_cliente(calentamiento + solicitudes, True) for _ in range(concurrencia)])
+    return resumir(latencias, consultas, errores, time.perf_counter() - inicio)
+
+
+async def ejecutar(cliente: httpx.AsyncClient, escenarios: list, contexto: dict,
+                   solicitudes: int, concurrencia: int, calentamiento: int = 0) -> dict:
+    """
+    Corre los escenarios uno después del otro (cada uno mide su endpoint aislado)
+    """
+    resultados = {}
+    for escenario in escenarios:
+        resultados[escenario.nombre] = await ejecutar_escenario(
+            cliente, escenario, contexto, solicitudes, concurrencia, calentamiento
+        )
+    return resultados
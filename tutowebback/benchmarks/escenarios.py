@@ -0,0 +1,180 @@
+"""
+Escenarios de los benchmarks: los endpoints de mayor tráfico.
+
+Cada escenario arma la i-ésima request a partir del contexto (ids y tokens leídos de una base
+sembrada con semilla.sembrar). Los usuarios autenticados se rotan entre un grupo chico, como
+haría una población real de clientes, y /reserva/create recorre los horarios de la
+disponibilidad de cada tutor en las semanas posteriores a todas las reservas existentes, para
+que cada request cree una reserva válida.
+"""
+import os
+import sys
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from tutowebback.models import models
+from tutowebback.benchmarks.semilla import PASSWORD, EMAIL_ADMIN
+
+
+class Escenario:
+    def __init__(self, nombre: str, metodo: str, solicitud):
+        """
+        Args:
+            nombre: Nombre del escenario en el resultado
+            metodo: Método HTTP
+            solicitud: Función (contexto, i) -> dict con url y opcionalmente params, json y headers
+        """
+        self.nombre = nombre
+        self.metodo = metodo
+        self.solicitud = solicitud
+
+
+def _rotar(lista: list, i: int):
+    return lista[i % len(lista)]
+
+
+def _crear_reserva(contexto: dict, i: int) -> dict:
+    # Un servicio por tutor: dos reservas en el mismo horario nunca caen en el mismo tutor
+    servicios = contexto["servicios"]
+    vuelta, indice = divmod(i, len(servicios))
+    servicio, horarios = servicios[indice]
+    semana, horario = divmod(vuelta, len(horarios))
+    dia, inicio = horarios[horario]
+    estudiante, headers = _rotar(contexto["estudiantes"], i)
+    return {
+        "url": "/reserva/create",
+        "json": {
+            "estudiante_id": estudiante,
+            "servicio_id": servicio,
+            "fecha": (contexto["semana_libre"] + timedelta(days=7 * semana + dia - 1)).isoformat(),
+            "hora_inicio": f"{inicio:02d}:00:00",
+            "hora_fin": f"{inicio + 1:02d}:00:00",
+        },
+        "headers": headers,
+    }
+
+
+def _reservas_tutor(contexto: dict, i: int) -> dict:
+    return {"url": "/reservas/tutor/detalladas", "headers": _rotar(contexto["tutores"], i)}
+
+
+def _reservas_admin(contexto: dict, i: int) -> dict:
+    hoy = date.today()
+    return {
+        "url": "/reservas/admin/all",
+        "params": {"fecha_desde": (hoy - timedelta(days=30)).isoformat(), "fecha_hasta": hoy.isoformat()},
+        "headers": contexto["admin"],
+    }
+
+
+def _calificaciones_fechas(contexto: dict, i: int) -> dict:
+    # Panel de reseñas del admin: primeras páginas de los últimos 90 días
+    return {
+        "url": "/calificaciones/date-range",
+        "params": {"fecha_desde": (date.today() - timedelta(days=90)).isoformat(), "pagina": 1 + i % 3},
+        "headers": contexto["admin"],
+    }
+
+
+def _notificaciones(contexto: dict, i: int) -> dict:
+    return {"url": "/notificaciones", "headers": _rotar(contexto["estudiantes"], i)[1]}
+
+
+def _tutores_con_materias(contexto: dict, i: int) -> dict:
+    return {
+        "url": f"/tutores/by/carrera/{_rotar(contexto['carreras'], i)}/with-materias",
+        "headers": _rotar(contexto["estudiantes"], i)[1],
+    }
+
+
+def _login(contexto: dict, i: int) -> dict:
+    return {"url": "/login", "params": {"email": _rotar(contexto["emails"], i), "password": PASSWORD}}
+
+
+ESCENARIOS = {
+    escenario.nombre: escenario for escenario in (
+        Escenario("login", "POST", _login),
+        Escenario("reserva_create", "POST", _crear_reserva),
+        Escenario("reservas_tutor_detalladas", "GET", _reservas_tutor),
+        Escenario("reservas_admin_all", "GET", _reservas_admin),
+        Escenario("calificaciones_date_range", "GET", _calificaciones_fechas),
+        Escenario("notificaciones", "GET", _notificaciones),
+        Escenario("tutores_carrera_with_materias", "GET", _tutores_con_materias),
+    )
+}
+
+
+def leer_base(db: Session, usuarios: int = 20) -> dict:
+    """
+    Ids que usan los escenarios, leídos de una base sembrada: `usuarios` tutores y estudiantes
+    (los de más reservas, para que los listados tengan volumen), un servicio por tutor con los
+    horarios (día, hora) de su disponibilidad, las carreras y el lunes desde el que no hay reservas
+    """
+    hoy = date.today()
+    # Los estudiantes con reservas completadas sin pagar no pueden reservar (reservaService)
+    impagos = select(models.Reserva.estudiante_id).where(
+        models.Reserva.estado == "completada",
+        models.Reserva.fecha < hoy - timedelta(days=3),
+        ~select(models.Pago.id).where(
+            models.Pago.reserva_id == models.Reserva.id, models.Pago.estado == "completado"
+        ).exists(),
+    )
+
+    def _mas_reservas(columna, *condiciones) -> list:
+        return list(db.scalars(
+            select(columna).where(*condiciones).group_by(columna)
+            .order_by(func.count().desc(), columna).limit(usuarios)
+        ))
+
+    tutores = _mas_reservas(models.Reserva.tutor_id)
+    estudiantes = _mas_reservas(models.Reserva.estudiante_id, models.Reserva.estudiante_id.not_in(impagos))
+    emails = dict(db.execute(
+        select(models.Usuario.id, models.Usuario.email).where(models.Usuario.id.in_(tutores + estudiantes))
+    ).all())
+
+    horarios = {}
+    for tutor, dia, inicio, fin in db.execute(
+        select(models.Disponibilidad.tutor_id, models.Disponibilidad.dia_semana,
+               models.Disponibilidad.hora_inicio, models.Disponibilidad.hora_fin)
+        .order_by(models.Disponibilidad.tutor_id, models.Disponibilidad.dia_semana, models.Disponibilidad.hora_inicio)
+    ):
+        horarios.setdefault(tutor, []).extend((dia, hora) for hora in range(inicio.hour, fin.hour))
+    servicios = [
+        (servicio, horarios[tutor]) for tutor, servicio in db.execute(
+            select(models.ServicioTutoria.tutor_id, func.min(models.ServicioTutoria.id))
+            .where(models.ServicioTutoria.activo.is_(True))
+            .group_by(models.ServicioTutoria.tutor_id).order_by(models.ServicioTutoria.tutor_id)
+        ) if horarios.get(tutor)
+    ]
+
+    siguiente = max(db.scalar(select(func.max(models.Reserva.fecha))) or hoy, hoy) + timedelta(days=1)
+    return {
+        "tutores": [emails[tutor] for tutor in tutores],
+        "estudiantes": [(estudiante, emails[estudiante]) for estudiante in estudiantes],
+        "servicios": servicios,
+        "carreras": list(db.scalars(select(models.Carrera.id).order_by(models.Carrera.id))),
+        "semana_libre": siguiente + timedelta(days=(7 - siguiente.weekday()) % 7),
+    }
+
+
+async def autenticar(cliente: httpx.AsyncClient, base: dict) -> dict:
+    """
+    Contexto de los escenarios: los datos de leer_base con los emails reemplazados por headers
+    de autorización (un login por usuario)
+    """
+    async def _headers(email: str) -> dict:
+        respuesta = await cliente.post("/login", params={"email": email, "password": PASSWORD})
+        respuesta.raise_for_status()
+        return {"Authorization": f"Bearer {respuesta.json()['access_token']}"}
+
+    return {
+        **base,
+        "admin": await _headers(EMAIL_ADMIN),
+        "tutores": [await _headers(email) for email in base["tutores"]],
+        "estudiantes": [(estudiante, await _headers(email)) for estudiante, email in base["estudiantes"]],
+        "emails": base["tutores"] + [email for _, email in base["estudiantes"]],
+    }
@@ -0,0 +1,61 @@
+"""
+Conjunto de datos de los benchmarks: el de tools/generador_datos con los tamaños de TAMANOS
+(multiplicados por `escala`) más un usuario superAdmin para los endpoints de administración.
+Todos los usuarios tienen el password PASSWORD.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from tutowebback.models import models
+from tutowebback.tools.generador_datos import generar
+
+PASSWORD = "benchmark"
+EMAIL_ADMIN = "admin@bench.local"
+
+# Tamaños para escala 1
+TAMANOS = {
+    "usuarios": 12000,
+    "proporcion_tutores": 1 / 6,
+    "reservas": 100000,
+}
+
+
+def sembrar(db: Session, escala: float = 1.0, semilla: int = 42) -> dict:
+    """
+    Carga el conjunto de datos en una base vacía y migrada.
+
+    Args:
+        db: Sesión sobre la base
+        escala: Factor sobre TAMANOS (p. ej. 0.05 para una corrida rápida)
+        semilla: Semilla del generador
+
+    Returns:
+        dict con la cantidad de filas insertadas por tabla
+    """
+    filas = generar(
+        db, semilla,
+        usuarios=max(60, int(TAMANOS["usuarios"] * escala)),
+        proporcion_tutores=TAMANOS["proporcion_tutores"],
+        reservas=max(1000, int(TAMANOS["reservas"] * escala)),
+        password=PASSWORD,
+        dominio="bench.local",
+    )
+    # El generador usa el mismo hash para todos los usuarios
+    password_hash = db.scalar(select(models.Usuario.password_hash).limit(1))
+    db.execute(insert(models.Usuario), [{
+        "nombre": "Admin", "apellido": "Benchmark", "email": EMAIL_ADMIN, "password_hash": password_hash,
+        "id_rol": db.scalar(select(models.Rol.id).where(models.Rol.nombre == "superAdmin")),
+    }])
+    db.commit()
+    return filas
+
+
+def sembrada(db: Session) -> bool:
+    """
+    True si la base ya tiene el conjunto de datos de los benchmarks
+    """
+    return db.scalar(select(models.Usuario.id).where(models.Usuario.email == EMAIL_ADMIN)) is not None
@@ -9,7 +9,49 @@ env_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'environment
 load_dotenv(env_file)
 SQLALCHEMY_DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL_LOCAL")
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Pool de conexiones de cada proceso. Con varios workers (gunicorn.conf.py) cada uno tiene su pool:
+# el máximo de conexiones abiertas es WEB_CONCURRENCY × (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Segundos tras los que se reemplaza una conexión (-1: nunca); útil si el servidor corta las inactivas
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+# Conexiones que admite la base para toda la aplicación (0: sin límite). Si se define, el pool de
+# cada worker se achica para que la suma entre los WEB_CONCURRENCY workers no lo supere
+DB_CONEXIONES_MAXIMAS = int(os.getenv("DB_CONEXIONES_MAXIMAS", "0"))
+
+
+def dimensionar_pool(workers: int = None, conexiones_maximas: int = DB_CONEXIONES_MAXIMAS) -> tuple:
+    """
+    (pool_size, max_overflow) de cada proceso. Sin límite de conexiones son DB_POOL_SIZE y
+    DB_MAX_OVERFLOW; con límite se reparten entre los workers manteniendo la proporción entre
+    conexiones fijas y de desborde (al menos una fija por worker).
+    """
+    if not conexiones_maximas:
+        return DB_POOL_SIZE, DB_MAX_OVERFLOW
+    workers = workers or int(os.getenv("WEB_CONCURRENCY", "1"))
+    por_worker = max(1, conexiones_maximas // workers)
+    if DB_POOL_SIZE + DB_MAX_OVERFLOW <= por_worker:
+        return DB_POOL_SIZE, DB_MAX_OVERFLOW
+    pool_size = max(1, por_worker * DB_POOL_SIZE // (DB_POOL_SIZE + DB_MAX_OVERFLOW))
+    return pool_size, max(0, por_worker - pool_size)
+
+
+POOL_SIZE, MAX_OVERFLOW = dimensionar_pool()
+
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    # SQLite (desarrollo y herramientas) usa el pool por defecto del dialecto
+    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+else:
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -20,4 +62,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
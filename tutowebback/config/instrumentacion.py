@@ -0,0 +1,234 @@
+"""
+Instrumentación de las consultas SQL por request.
+
+Los eventos `before/after_cursor_execute` de SQLAlchemy (registrados sobre la clase Engine, así
+cubren cualquier engine del proceso) miden cada sentencia y la suman a las estadísticas del
+request en curso, que el middleware deja en una ContextVar. Las dependencias y endpoints
+síncronos corren en el threadpool con una copia del contexto, que apunta al mismo objeto.
+
+Por cada request se registra:
+- cantidad de sentencias y tiempo total en la base, en histogramas por método y plantilla de
+  ruta (config/metricas.py) y en un log estructurado (JSON) del logger "tutoweb.sql"
+- las sentencias que superan DB_CONSULTA_LENTA_MS, con la ruta que las originó
+- en desarrollo (o con DB_INSTRUMENTACION_HEADERS=true), los headers X-DB-Consultas y
+  X-DB-Tiempo-ms en la respuesta
+
+Presupuesto de consultas: una ruta declara su máximo con
+`dependencies=[Depends(instrumentacion.presupuesto_consultas(n))]`; las demás usan
+DB_PRESUPUESTO_CONSULTAS (0 = sin límite). Excederlo deja un warning y suma al contador
+`tutoweb_db_presupuesto_excedido_total`; con DB_PRESUPUESTO_ESTRICTO=true (pruebas) el request
+además responde 500, así una carga diferida por fila hace fallar la prueba que la ejecuta.
+Las sentencias que corren después de enviar los headers (respuestas en streaming) se cuentan
+en los logs y métricas, pero no en los headers ni en el modo estricto.
+"""
+import os
+import sys
+import time
+import logging
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.config import database  # noqa: F401 (carga las variables de environments/.env-*)
+from tutowebback.config import metricas
+from tutowebback.config.respuestas import a_json
+
+DB_CONSULTA_LENTA_MS = float(os.getenv("DB_CONSULTA_LENTA_MS", "200"))
+DB_PRESUPUESTO_CONSULTAS = int(os.getenv("DB_PRESUPUESTO_CONSULTAS", "0"))
+DB_PRESUPUESTO_ESTRICTO = os.getenv("DB_PRESUPUESTO_ESTRICTO", "false").lower() == "true"
+DB_INSTRUMENTACION_HEADERS = os.getenv(
+    "DB_INSTRUMENTACION_HEADERS", str(database.environment == "development")
+).lower() == "true"
+# Largo máximo de la sentencia en el log de consultas lentas
+_LARGO_SENTENCIA = 1000
+
+logger = logging.getLogger("tutoweb.sql")
+
+CONSULTAS_POR_REQUEST = metricas.registro.histograma(
+    "tutoweb_db_consultas_por_request", "Sentencias SQL ejecutadas por request",
+    (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89), ("metodo", "ruta"),
+)
+TIEMPO_DB_POR_REQUEST = metricas.registro.histograma(
+    "tutoweb_db_tiempo_por_request_segundos", "Tiempo total en la base de datos por request",
+    (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5), ("metodo", "ruta"),
+)
+CONSULTAS_LENTAS = metricas.registro.contador(
+    "tutoweb_db_consultas_lentas_total", "Sentencias SQL que superaron DB_CONSULTA_LENTA_MS", ("ruta",),
+)
+PRESUPUESTO_EXCEDIDO = metricas.registro.contador(
+    "tutoweb_db_presupuesto_excedido_total", "Requests que superaron su presupuesto de consultas",
+    ("metodo", "ruta"),
+)
+
+# Sin ruta: sentencias fuera de un request (tareas en segundo plano, scripts)
+SIN_RUTA = "sin_ruta"
+
+
+class ConsultasRequest:
+    """
+    Estadísticas de las sentencias SQL de un request
+    """
+    __slots__ = ("scope", "cantidad", "tiempo", "lentas", "presupuesto")
+
+    def __init__(self, scope: dict, presupuesto: int = DB_PRESUPUESTO_CONSULTAS):
+        self.scope = scope
+        self.cantidad = 0
+        self.tiempo = 0.0
+        self.lentas = 0
+        self.presupuesto = presupuesto
+
+    @property
+    def metodo(self) -> str:
+        return self.scope.get("method", "")
+
+    @property
+    def ruta(self) -> str:
+        # El router de FastAPI deja la ruta resuelta en el scope: se usa su plantilla
+        # ("/reserva/{id}") y no la URL, para acotar las series de métricas
+        ruta = self.scope.get("route")
+        return getattr(ruta, "path", None) or SIN_RUTA
+
+    def excedido(self) -> bool:
+        return bool(self.presupuesto) and self.cantidad > self.presupuesto
+
+
+_consultas_actuales: ContextVar = ContextVar("consultas_request", default=None)
+
+
+def consultas_actuales():
+    """
+    Estadísticas del request en curso, o None fuera de un request
+    """
+    return _consultas_actuales.get()
+
+
+def presupuesto_consultas(maximo: int):
+    """
+    Dependencia que fija el máximo de sentencias SQL del request, p. ej.
+    `@router.get(..., dependencies=[Depends(instrumentacion.presupuesto_consultas(5))])`
+    """
+    async def _fijar_presupuesto():
+        consultas = _consultas_actuales.get()
+        if consultas is not None:
+            consultas.presupuesto = maximo
+
+    return _fijar_presupuesto
+
+
+def _antes_de_ejecutar(conn, cursor, sentencia, parametros, contexto, executemany):
+    contexto._tutoweb_inicio = time.perf_counter()
+
+
+def _despues_de_ejecutar(conn, cursor, sentencia, parametros, contexto, executemany):
+    inicio = getattr(contexto, "_tutoweb_inicio", None)
+    if inicio is None:
+        return
+    duracion = time.perf_counter() - inicio
+
+    consultas = _consultas_actuales.get()
+    if consultas is not None:
+        consultas.cantidad += 1
+        consultas.tiempo += duracion
+
+    if duracion * 1000 >= DB_CONSULTA_LENTA_MS:
+        ruta = consultas.ruta if consultas is not None else SIN_RUTA
+        if consultas is not None:
+            consultas.lentas += 1
+        CONSULTAS_LENTAS.inc(ruta=ruta)
+        logger.warning(a_json({
+            "evento": "consulta_lenta",
+            "metodo": consultas.metodo if consultas is not None else None,
+            "ruta": ruta,
+            "duracion_ms": round(duracion * 1000, 2),
+            "sentencia": sentencia[:_LARGO_SENTENCIA],
+        }).decode())
+
+
+def instalar():
+    """
+    Registra los eventos de medición sobre todos los engines (llamarla más de una vez no duplica)
+    """
+    if not event.contains(Engine, "before_cursor_execute", _antes_de_ejecutar):
+        event.listen(Engine, "before_cursor_execute", _antes_de_ejecutar)
+        event.listen(Engine, "after_cursor_execute", _despues_de_ejecutar)
+
+
+class InstrumentacionConsultasMiddleware:
+    """
+    Middleware ASGI que abre las estadísticas de consultas de cada request HTTP y las registra
+    al terminar. Es ASGI puro (no BaseHTTPMiddleware) para no agregar una tarea por request.
+    """
+
+    def __init__(self, app, headers: bool = DB_INSTRUMENTACION_HEADERS, estricto: bool = DB_PRESUPUESTO_ESTRICTO):
+        self.app = app
+        self.headers = headers
+        self.estricto = estricto
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        consultas = ConsultasRequest(scope)
+        respuesta = {"status": 500, "rechazada": False}
+
+        async def _enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                respuesta["status"] = mensaje["status"]
+                if self.estricto and consultas.excedido():
+                    respuesta["rechazada"] = True
+                    await self._rechazar(consultas, send)
+                    return
+                if self.headers:
+                    mensaje["headers"] = list(mensaje.get("headers", [])) + [
+                        (b"x-db-consultas", str(consultas.cantidad).encode()),
+                        (b"x-db-tiempo-ms", f"{consultas.tiempo * 1000:.2f}".encode()),
+                    ]
+            elif respuesta["rechazada"]:
+                # Se descarta el cuerpo de la respuesta original
+                return
+            await send(mensaje)
+
+        token = _consultas_actuales.set(consultas)
+        try:
+            await self.app(scope, receive, _enviar)
+        finally:
+            _consultas_actuales.reset(token)
+            self._registrar(consultas, respuesta["status"])
+
+    @staticmethod
+    async def _rechazar(consultas: ConsultasRequest, send):
+        cuerpo = a_json({
+            "detail": f"Presupuesto de consultas excedido en {consultas.metodo} {consultas.ruta}: "
+                      f"{consultas.cantidad} sentencias, máximo {consultas.presupuesto}"
+        })
+        await send({
+            "type": "http.response.start",
+            "status": 500,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(cuerpo)).encode())],
+        })
+        await send({"type": "http.response.body", "body": cuerpo})
+
+    @staticmethod
+    def _registrar(consultas: ConsultasRequest, status: int):
+        metodo, ruta = consultas.metodo, consultas.ruta
+        CONSULTAS_POR_REQUEST.observar(consultas.cantidad, metodo=metodo, ruta=ruta)
+        TIEMPO_DB_POR_REQUEST.observar(consultas.tiempo, metodo=metodo, ruta=ruta)
+
+        registro = {
+            "evento": "request_db",
+            "metodo": metodo,
+            "ruta": ruta,
+            "status": status,
+            "consultas": consultas.cantidad,
+            "tiempo_db_ms": round(consultas.tiempo * 1000, 2),
+            "consultas_lentas": consultas.lentas,
+        }
+        if consultas.excedido():
+            PRESUPUESTO_EXCEDIDO.inc(metodo=metodo, ruta=ruta)
+            registro["presupuesto"] = consultas.presupuesto
+            logger.warning(a_json({**registro, "evento": "presupuesto_consultas_excedido"}).decode())
+        else:
+            logger.info(a_json(registro).decode())
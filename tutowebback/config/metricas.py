@@ -0,0 +1,363 @@
+"""
+Métricas en memoria con el formato de exposición de texto de Prometheus.
+
+Registro mínimo (contadores, histogramas con buckets fijos e indicadores) sin dependencias
+externas: cada proceso acumula sus propias series y `registro.exponer()` las devuelve en el
+formato que lee Prometheus. Las etiquetas se declaran al crear la métrica y se pasan por nombre
+al registrar un valor; usar solo etiquetas de cardinalidad acotada (método, plantilla de ruta),
+nunca ids ni rutas con parámetros ya reemplazados.
+
+Con varios workers (gunicorn) cada uno tiene su registro: Multiproceso los vuelca a un
+directorio compartido y expone la suma, para que los contadores no dependan de qué worker
+atiende el scrape.
+"""
+import os
+import copy
+import json
+import glob
+import bisect
+import threading
+import contextlib
+from abc import ABC, abstractmethod
+
+try:
+    import fcntl
+except ImportError:  # Windows: gunicorn no corre ahí, Multiproceso no se usa
+    fcntl = None
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatear(numero) -> str:
+    if numero == float("inf"):
+        return "+Inf"
+    if isinstance(numero, float) and numero.is_integer():
+        return str(int(numero))
+    return repr(numero) if isinstance(numero, float) else str(numero)
+
+
+class _Metrica(ABC):
+    tipo = None
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: tuple = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def _clave(self, etiquetas: dict) -> tuple:
+        if set(etiquetas) != set(self.etiquetas):
+            raise ValueError(f"{self.nombre}: se esperaban las etiquetas {self.etiquetas}, no {tuple(etiquetas)}")
+        return tuple(str(etiquetas[nombre]) for nombre in self.etiquetas)
+
+    def _selector(self, clave: tuple, extra: tuple = ()) -> str:
+        pares = list(zip(self.etiquetas, clave)) + list(extra)
+        if not pares:
+            return ""
+        return "{" + ",".join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in pares) + "}"
+
+    @abstractmethod
+    def _muestras(self):
+        """
+        Líneas de las series de la métrica (se llama con el lock tomado)
+        """
+
+    def _definicion(self) -> dict:
+        return {"tipo": self.tipo, "ayuda": self.ayuda, "etiquetas": list(self.etiquetas)}
+
+    def volcar(self) -> dict:
+        """
+        Definición y series de la métrica serializables en JSON
+        """
+        with self._lock:
+            series = [[list(clave), copy.deepcopy(valor)] for clave, valor in self._series.items()]
+        return {**self._definicion(), "series": series}
+
+    def combinar(self, series: list):
+        """
+        Suma a esta métrica las series de un volcado (ver volcar)
+        """
+        with self._lock:
+            for clave, valor in series:
+                clave = tuple(clave)
+                self._series[clave] = self._sumar(self._series.get(clave), valor)
+
+    def _sumar(self, actual, valor):
+        return valor if actual is None else actual + valor
+
+    def exponer(self) -> list:
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}"]
+        with self._lock:
+            lineas.extend(self._muestras())
+        return lineas
+
+    def limpiar(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def inc(self, valor: float = 1, **etiquetas):
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._series[clave] = self._series.get(clave, 0) + valor
+
+    def valor(self, **etiquetas) -> float:
+        with self._lock:
+            return self._series.get(self._clave(etiquetas), 0)
+
+    def _muestras(self):
+        return [f"{self.nombre}{self._selector(clave)} {_formatear(valor)}" for clave, valor in sorted(self._series.items())]
+
+
+class Indicador(_Metrica):
+    """
+    Valor que sube y baja (gauge). `fijar` lo reemplaza; `inc`/`dec` lo modifican.
+    `agregacion` indica cómo se combinan los valores de varios procesos: "suma" (requests en
+    curso, hilos ocupados) o "maximo" (retrasos, donde sumar no tiene sentido).
+    """
+    tipo = "gauge"
+    AGREGACIONES = ("suma", "maximo")
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: tuple = (), agregacion: str = "suma"):
+        if agregacion not in self.AGREGACIONES:
+            raise ValueError(f"{nombre}: agregación inválida {agregacion!r}")
+        super().__init__(nombre, ayuda, etiquetas)
+        self.agregacion = agregacion
+
+    def fijar(self, valor: float, **etiquetas):
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._series[clave] = valor
+
+    def inc(self, valor: float = 1, **etiquetas):
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._series[clave] = self._series.get(clave, 0) + valor
+
+    def dec(self, valor: float = 1, **etiquetas):
+        self.inc(-valor, **etiquetas)
+
+    def _definicion(self) -> dict:
+        return {**super()._definicion(), "agregacion": self.agregacion}
+
+    def _sumar(self, actual, valor):
+        if actual is None:
+            return valor
+        return max(actual, valor) if self.agregacion == "maximo" else actual + valor
+
+    def valor(self, **etiquetas) -> float:
+        with self._lock:
+            return self._series.get(self._clave(etiquetas), 0)
+
+    def _muestras(self):
+        return [f"{self.nombre}{self._selector(clave)} {_formatear(valor)}" for clave, valor in sorted(self._series.items())]
+
+
+class Histograma(_Metrica):
+    """
+    Histograma con límites de bucket fijos. Cada serie guarda la cantidad por bucket (no
+    acumulada), la suma y el total; la forma acumulada de Prometheus se arma al exponer.
+    """
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, buckets: tuple, etiquetas: tuple = ()):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.buckets = tuple(sorted(buckets))
+
+    def observar(self, valor: float, **etiquetas):
+        clave = self._clave(etiquetas)
+        # bisect_left: un valor igual al límite cuenta en ese bucket (le = "menor o igual")
+        indice = bisect.bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                serie = self._series[clave] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            serie[0][indice] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def _definicion(self) -> dict:
+        return {**super()._definicion(), "buckets": list(self.buckets)}
+
+    def _sumar(self, actual, valor):
+        if actual is None:
+            return [list(valor[0]), valor[1], valor[2]]
+        return [[a + b for a, b in zip(actual[0], valor[0])], actual[1] + valor[1], actual[2] + valor[2]]
+
+    def resumen(self, **etiquetas):
+        """
+        (cantidad, suma) de la serie con esas etiquetas
+        """
+        with self._lock:
+            serie = self._series.get(self._clave(etiquetas))
+            return (serie[2], serie[1]) if serie else (0, 0.0)
+
+    def _muestras(self):
+        lineas = []
+        for clave, (cantidades, suma, total) in sorted(self._series.items()):
+            acumulado = 0
+            for limite, cantidad in zip(self.buckets + (float("inf"),), cantidades):
+                acumulado += cantidad
+                lineas.append(f"{self.nombre}_bucket{self._selector(clave, (('le', _formatear(float(limite))),))} {acumulado}")
+            lineas.append(f"{self.nombre}_sum{self._selector(clave)} {_formatear(suma)}")
+            lineas.append(f"{self.nombre}_count{self._selector(clave)} {total}")
+        return lineas
+
+
+class Registro:
+    """
+    Conjunto de métricas de un proceso. Pedir dos veces una métrica con el mismo nombre
+    devuelve la misma instancia, así los módulos pueden declararla al importarse.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metricas = {}
+
+    def _obtener(self, clase, nombre: str, *args, **kwargs):
+        with self._lock:
+            metrica = self._metricas.get(nombre)
+            if metrica is None:
+                metrica = self._metricas[nombre] = clase(nombre, *args, **kwargs)
+            elif not isinstance(metrica, clase):
+                raise ValueError(f"La métrica {nombre} ya está registrada como {metrica.tipo}")
+            return metrica
+
+    def contador(self, nombre: str, ayuda: str, etiquetas: tuple = ()) -> Contador:
+        return self._obtener(Contador, nombre, ayuda, etiquetas)
+
+    def indicador(self, nombre: str, ayuda: str, etiquetas: tuple = (), agregacion: str = "suma") -> Indicador:
+        return self._obtener(Indicador, nombre, ayuda, etiquetas, agregacion)
+
+    def histograma(self, nombre: str, ayuda: str, buckets: tuple, etiquetas: tuple = ()) -> Histograma:
+        return self._obtener(Histograma, nombre, ayuda, buckets, etiquetas)
+
+    def exponer(self) -> str:
+        """
+        Todas las métricas en el formato de texto de Prometheus (version 0.0.4)
+        """
+        with self._lock:
+            metricas = sorted(self._metricas.values(), key=lambda metrica: metrica.nombre)
+        lineas = []
+        for metrica in metricas:
+            lineas.extend(metrica.exponer())
+        return "\n".join(lineas) + "\n"
+
+    def volcar(self) -> dict:
+        """
+        Todas las métricas (definición y series) serializables en JSON, por nombre
+        """
+        with self._lock:
+            metricas = list(self._metricas.values())
+        return {metrica.nombre: metrica.volcar() for metrica in metricas}
+
+    def combinar(self, volcado: dict, indicadores: bool = True):
+        """
+        Suma a este registro las métricas de un volcado, creando las que falten. Con
+        indicadores=False se omiten los gauges (valores de procesos que ya no existen)
+        """
+        for nombre, datos in volcado.items():
+            tipo, ayuda, etiquetas = datos["tipo"], datos["ayuda"], tuple(datos["etiquetas"])
+            if tipo == Contador.tipo:
+                metrica = self.contador(nombre, ayuda, etiquetas)
+            elif tipo == Histograma.tipo:
+                metrica = self.histograma(nombre, ayuda, tuple(datos["buckets"]), etiquetas)
+            elif indicadores:
+                metrica = self.indicador(nombre, ayuda, etiquetas, datos["agregacion"])
+            else:
+                continue
+            metrica.combinar(datos["series"])
+
+    def limpiar(self):
+        """
+        Vacía los valores de todas las métricas (las declaraciones se conservan)
+        """
+        with self._lock:
+            metricas = list(self._metricas.values())
+        for metrica in metricas:
+            metrica.limpiar()
+
+
+class Multiproceso:
+    """
+    Métricas de todos los workers de un maestro de gunicorn, en `directorio`:
+    - cada worker vuelca su registro en <pid>.json (periódicamente y antes de responder /metrics)
+    - al terminar un worker, el maestro (hook child_exit) suma sus contadores e histogramas a
+      acumulado.json y borra su archivo; sus indicadores se descartan
+    - `combinado` suma el acumulado y los archivos de los workers vivos
+
+    Así los contadores expuestos no retroceden aunque cada scrape lo atienda otro worker o los
+    workers se reciclen. Los indicadores se combinan según su `agregacion`, con el valor del
+    último volcado de cada worker (hasta METRICAS_VOLCADO_INTERVALO de atraso).
+    """
+    ACUMULADO = "acumulado.json"
+
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+
+    @contextlib.contextmanager
+    def _bloqueo(self, exclusivo: bool):
+        # Evita leer a la vez que child_exit mueve un worker al acumulado (se contaría dos veces)
+        os.makedirs(self.directorio, exist_ok=True)
+        with open(os.path.join(self.directorio, ".bloqueo"), "a") as archivo:
+            fcntl.flock(archivo, fcntl.LOCK_EX if exclusivo else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(archivo, fcntl.LOCK_UN)
+
+    def _escribir(self, nombre: str, volcado: dict):
+        ruta = os.path.join(self.directorio, nombre)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "w") as archivo:
+            json.dump(volcado, archivo)
+        os.replace(temporal, ruta)
+
+    def _leer(self, ruta: str) -> dict:
+        try:
+            with open(ruta) as archivo:
+                return json.load(archivo)
+        except FileNotFoundError:
+            return {}
+
+    def volcar(self, registro: Registro):
+        """
+        Escribe el registro de este proceso (reemplazo atómico del archivo anterior)
+        """
+        os.makedirs(self.directorio, exist_ok=True)
+        self._escribir(f"{os.getpid()}.json", registro.volcar())
+
+    def recolectar(self, pid: int):
+        """
+        Suma los contadores e histogramas del worker `pid`, que terminó, al acumulado
+        """
+        ruta = os.path.join(self.directorio, f"{pid}.json")
+        with self._bloqueo(exclusivo=True):
+            volcado = self._leer(ruta)
+            if not volcado:
+                return
+            acumulado = Registro()
+            acumulado.combinar(self._leer(os.path.join(self.directorio, self.ACUMULADO)), indicadores=False)
+            acumulado.combinar(volcado, indicadores=False)
+            self._escribir(self.ACUMULADO, acumulado.volcar())
+            os.remove(ruta)
+
+    def combinado(self, registro: Registro) -> Registro:
+        """
+        Vuelca `registro` (el de este proceso) y devuelve la suma de todos los procesos
+        """
+        self.volcar(registro)
+        combinado = Registro()
+        with self._bloqueo(exclusivo=False):
+            for ruta in sorted(glob.glob(os.path.join(self.directorio, "*.json"))):
+                combinado.combinar(self._leer(ruta))
+        return combinado
+
+
+registro = Registro()
@@ -0,0 +1,205 @@
+"""
+Perfilado de requests bajo demanda: árbol de llamadas (cProfile) y asignaciones de memoria
+(tracemalloc) de un request, guardados en PERFILADO_DIRECTORIO.
+
+Se activa con PERFILADO_HABILITADO=true y se perfila un request cuando:
+- trae el header `X-Perfilar: <PERFILADO_TOKEN>` (en desarrollo, sin token, alcanza con `X-Perfilar: 1`)
+- o sale sorteado con probabilidad PERFILADO_MUESTREO (0 = nunca)
+
+La respuesta de un request perfilado lleva el header X-Perfil con el nombre del perfil. Por
+cada uno se guardan tres archivos:
+- <nombre>.prof: estadísticas de cProfile (pstats; se abren con snakeviz o `python -m pstats`)
+- <nombre>.txt: las funciones con más tiempo acumulado y las líneas que más memoria asignaron
+- <nombre>.json: método, ruta, status, duración, sentencias SQL y fecha (lo que lista GET /admin/perfiles)
+
+Se perfila un request a la vez (cProfile mide un único hilo y no admite perfiles anidados): si
+llega otro mientras tanto, se atiende sin perfilar. cProfile mide el hilo del event loop, donde
+corren los endpoints `async def` y su acceso a la base; el código que corre en el threadpool
+(dependencias síncronas como get_db) no aparece. Si otros requests avanzan mientras el perfilado
+espera, su trabajo también queda en el perfil: para un árbol limpio conviene perfilar en una
+instancia sin tráfico. tracemalloc se enciende solo durante el request y multiplica su costo en
+memoria y CPU; PERFILADO_MEMORIA=false lo desactiva.
+"""
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import hmac
+import pstats
+import random
+import logging
+import cProfile
+import tracemalloc
+from io import StringIO
+from datetime import datetime
+
+import anyio.to_thread
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.config import database
+from tutowebback.config.instrumentacion import SIN_RUTA, consultas_actuales
+
+PERFILADO_HABILITADO = os.getenv("PERFILADO_HABILITADO", "false").lower() == "true"
+PERFILADO_TOKEN = os.getenv("PERFILADO_TOKEN")
+PERFILADO_MUESTREO = float(os.getenv("PERFILADO_MUESTREO", "0"))
+PERFILADO_MEMORIA = os.getenv("PERFILADO_MEMORIA", "true").lower() == "true"
+PERFILADO_DIRECTORIO = os.getenv(
+    "PERFILADO_DIRECTORIO", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "perfiles")
+)
+# Perfiles que se conservan; al guardar uno nuevo se borran los más viejos
+PERFILADO_MAXIMO = int(os.getenv("PERFILADO_MAXIMO", "100"))
+
+# Funciones y líneas de asignación que se escriben en el resumen de texto
+_FUNCIONES_RESUMEN = 60
+_LINEAS_MEMORIA = 30
+_NOMBRE_VALIDO = re.compile(r"^[\w.-]+\.(prof|txt|json)$")
+
+logger = logging.getLogger("tutoweb.perfilado")
+
+
+def _header_valido(valor: str) -> bool:
+    if PERFILADO_TOKEN:
+        return hmac.compare_digest(valor.encode(), PERFILADO_TOKEN.encode())
+    return database.environment == "development"
+
+
+def _nombre(metodo: str, ruta: str) -> str:
+    ruta = re.sub(r"[^\w]+", "_", ruta).strip("_") or "raiz"
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{metodo}-{ruta[:60]}-{uuid.uuid4().hex[:6]}"
+
+
+class PerfiladoMiddleware:
+    """
+    Middleware ASGI que perfila los requests elegidos (ver el docstring del módulo). Va después
+    de InstrumentacionConsultasMiddleware para registrar las sentencias SQL del request.
+    """
+
+    def __init__(self, app, habilitado: bool = PERFILADO_HABILITADO, muestreo: float = PERFILADO_MUESTREO,
+                 memoria: bool = PERFILADO_MEMORIA, directorio: str = PERFILADO_DIRECTORIO):
+        self.app = app
+        self.habilitado = habilitado
+        self.muestreo = muestreo
+        self.memoria = memoria
+        self.directorio = directorio
+        self._en_curso = False
+
+    def _elegir(self, scope) -> bool:
+        if self._en_curso:
+            return False
+        for clave, valor in scope["headers"]:
+            if clave == b"x-perfilar":
+                return _header_valido(valor.decode("latin-1"))
+        return self.muestreo > 0 and random.random() < self.muestreo
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.habilitado or not self._elegir(scope):
+            await self.app(scope, receive, send)
+            return
+
+        perfil = {"nombre": None, "status": 500}
+
+        async def _enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                # La ruta ya está resuelta: el nombre del perfil la incluye
+                perfil["status"] = mensaje["status"]
+                perfil["nombre"] = _nombre(scope["method"], getattr(scope.get("route"), "path", None) or SIN_RUTA)
+                mensaje["headers"] = list(mensaje.get("headers", [])) + [(b"x-perfil", perfil["nombre"].encode())]
+            await send(mensaje)
+
+        self._en_curso = True
+        trazando = self.memoria and not tracemalloc.is_tracing()
+        if trazando:
+            tracemalloc.start(10)
+        antes = tracemalloc.take_snapshot() if self.memoria else None
+        perfilador = cProfile.Profile()
+        inicio = time.perf_counter()
+        perfilador.enable()
+        try:
+            await self.app(scope, receive, _enviar)
+        finally:
+            perfilador.disable()
+            duracion = time.perf_counter() - inicio
+            despues = tracemalloc.take_snapshot() if self.memoria else None
+            if trazando:
+                tracemalloc.stop()
+            self._en_curso = False
+            consultas = consultas_actuales()
+            datos = {
+                "nombre": perfil["nombre"] or _nombre(scope["method"], SIN_RUTA),
+                "metodo": scope["method"],
+                "ruta": getattr(scope.get("route"), "path", None) or SIN_RUTA,
+                "path": scope["path"],
+                "status": perfil["status"],
+                "duracion_ms": round(duracion * 1000, 2),
+                "consultas": consultas.cantidad if consultas else None,
+                "tiempo_db_ms": round(consultas.tiempo * 1000, 2) if consultas else None,
+                "fecha": datetime.now().isoformat(timespec="seconds"),
+            }
+            try:
+                await anyio.to_thread.run_sync(guardar, self.directorio, datos, perfilador, antes, despues)
+            except OSError as e:
+                logger.error(f"No se pudo guardar el perfil {datos['nombre']}: {e}")
+
+
+def guardar(directorio: str, datos: dict, perfilador: cProfile.Profile, antes=None, despues=None):
+    """
+    Escribe los archivos del perfil y borra los más viejos si se supera PERFILADO_MAXIMO
+    """
+    os.makedirs(directorio, exist_ok=True)
+    base = os.path.join(directorio, datos["nombre"])
+    perfilador.dump_stats(f"{base}.prof")
+
+    resumen = StringIO()
+    resumen.write(f"{datos['metodo']} {datos['path']} ({datos['ruta']}) -> {datos['status']} "
+                  f"en {datos['duracion_ms']} ms, {datos['consultas']} sentencias SQL ({datos['tiempo_db_ms']} ms)\n\n")
+    pstats.Stats(perfilador, stream=resumen).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_FUNCIONES_RESUMEN)
+    if antes is not None and despues is not None:
+        filtros = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap>")]
+        diferencias = despues.filter_traces(filtros).compare_to(antes.filter_traces(filtros), "lineno")
+        asignado = sum(diferencia.size_diff for diferencia in diferencias if diferencia.size_diff > 0)
+        datos["memoria_asignada_kb"] = round(asignado / 1024, 1)
+        resumen.write(f"\nMemoria asignada durante el request y no liberada: {datos['memoria_asignada_kb']} KiB\n")
+        for diferencia in diferencias[:_LINEAS_MEMORIA]:
+            resumen.write(f"{diferencia}\n")
+    with open(f"{base}.txt", "w") as archivo:
+        archivo.write(resumen.getvalue())
+    with open(f"{base}.json", "w") as archivo:
+        json.dump(datos, archivo)
+
+    sobrantes = sorted(nombre for nombre in os.listdir(directorio) if nombre.endswith(".json"))[:-PERFILADO_MAXIMO]
+    for nombre in sobrantes:
+        for extension in (".json", ".prof", ".txt"):
+            try:
+                os.remove(os.path.join(directorio, nombre[:-len(".json")] + extension))
+            except FileNotFoundError:
+                pass
+
+
+def listar(directorio: str = PERFILADO_DIRECTORIO) -> list:
+    """
+    Metadatos de los perfiles guardados, del más nuevo al más viejo
+    """
+    if not os.path.isdir(directorio):
+        return []
+    perfiles = []
+    for nombre in sorted(os.listdir(directorio), reverse=True):
+        if not nombre.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directorio, nombre)) as archivo:
+                perfiles.append(json.load(archivo))
+        except (OSError, ValueError):
+            continue
+    return perfiles
+
+
+def ruta_archivo(nombre: str, directorio: str = PERFILADO_DIRECTORIO):
+    """
+    Ruta de un archivo de perfil (.prof, .txt o .json), o None si el nombre no es válido o no existe
+    """
+    if not _NOMBRE_VALIDO.match(nombre):
+        return None
+    ruta = os.path.join(directorio, nombre)
+    return ruta if os.path.isfile(ruta) else None
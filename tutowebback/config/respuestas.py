@@ -0,0 +1,29 @@
+"""
+Respuestas JSON serializadas con orjson.
+
+`RespuestaJSON` es la clase de respuesta por defecto de la aplicación. Los listados grandes
+además la devuelven directamente desde el controlador: FastAPI no pasa por `jsonable_encoder`
+las respuestas ya construidas, y orjson serializa date/time/datetime sin conversión previa.
+"""
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _por_defecto(valor):
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo no serializable a JSON: {type(valor).__name__}")
+
+
+def a_json(contenido) -> bytes:
+    """
+    Serializa `contenido` a JSON (UTF-8, sin espacios), igual que JSONResponse pero con orjson
+    """
+    return orjson.dumps(contenido, default=_por_defecto, option=orjson.OPT_NON_STR_KEYS)
+
+
+class RespuestaJSON(JSONResponse):
+    def render(self, content) -> bytes:
+        return a_json(content)
@@ -0,0 +1,175 @@
+"""
+Métricas de latencia y throughput de la API.
+
+- InstrumentacionHttpMiddleware: duración de cada request en un histograma con buckets fijos,
+  requests por método, plantilla de ruta y status, excepciones no manejadas y requests en curso
+- retraso del event loop, muestreado por una tarea periódica (tareasService)
+- ocupación y cola del threadpool de AnyIO, donde corren las dependencias y endpoints síncronos
+  (p. ej. get_db); se leen al momento de exponer las métricas
+
+Todo se registra en `metricas.registro`, junto con las métricas de SQL de config/instrumentacion.py,
+y se expone en GET /metrics (urls/urlsMetricas.py) en el formato de texto de Prometheus. Con
+METRICAS_MULTIPROCESO_DIR (lo define gunicorn.conf.py) cada worker vuelca sus series ahí y
+/metrics expone la suma de todos (ver metricas.Multiproceso).
+"""
+import os
+import sys
+import hmac
+import time
+import asyncio
+
+import anyio.to_thread
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.config import metricas, database
+from tutowebback.config.instrumentacion import SIN_RUTA
+from tutowebback.services import tareasService
+
+# Segundos entre muestras del retraso del event loop
+EVENT_LOOP_MUESTREO = float(os.getenv("EVENT_LOOP_MUESTREO", "0.5"))
+# GET /metrics exige "Authorization: Bearer <METRICAS_TOKEN>". Sin token solo responde en
+# desarrollo: fuera de él queda cerrado hasta que se configure
+METRICAS_TOKEN = os.getenv("METRICAS_TOKEN")
+METRICAS_MULTIPROCESO_DIR = os.getenv("METRICAS_MULTIPROCESO_DIR")
+# Segundos entre volcados de las métricas de cada worker al directorio compartido
+METRICAS_VOLCADO_INTERVALO = float(os.getenv("METRICAS_VOLCADO_INTERVALO", "5"))
+
+multiproceso = metricas.Multiproceso(METRICAS_MULTIPROCESO_DIR) if METRICAS_MULTIPROCESO_DIR else None
+
+REQUESTS = metricas.registro.contador(
+    "tutoweb_http_requests_total", "Requests HTTP atendidos", ("metodo", "ruta", "status"),
+)
+DURACION = metricas.registro.histograma(
+    "tutoweb_http_request_duracion_segundos", "Duración de los requests HTTP hasta el último byte de la respuesta",
+    (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10), ("metodo", "ruta"),
+)
+EXCEPCIONES = metricas.registro.contador(
+    "tutoweb_http_excepciones_total", "Requests que terminaron con una excepción no manejada", ("metodo", "ruta"),
+)
+EN_CURSO = metricas.registro.indicador(
+    "tutoweb_http_requests_en_curso", "Requests HTTP en curso",
+)
+RETRASO_EVENT_LOOP = metricas.registro.indicador(
+    "tutoweb_event_loop_retraso_segundos", "Último retraso medido del event loop", agregacion="maximo",
+)
+RETRASO_EVENT_LOOP_MUESTRAS = metricas.registro.histograma(
+    "tutoweb_event_loop_retraso_muestras_segundos", "Retraso del event loop en cada muestra",
+    (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+THREADPOOL_OCUPADOS = metricas.registro.indicador(
+    "tutoweb_threadpool_hilos_ocupados", "Hilos del threadpool ejecutando código síncrono",
+)
+THREADPOOL_CAPACIDAD = metricas.registro.indicador(
+    "tutoweb_threadpool_capacidad", "Máximo de hilos simultáneos del threadpool",
+)
+THREADPOOL_EN_ESPERA = metricas.registro.indicador(
+    "tutoweb_threadpool_tareas_en_espera", "Llamadas esperando un hilo libre del threadpool",
+)
+
+
+class InstrumentacionHttpMiddleware:
+    """
+    Middleware ASGI que mide cada request HTTP. Va primero en la lista de middlewares para
+    incluir el tiempo de los demás. La ruta se toma del scope al terminar, cuando el router ya
+    la resolvió.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"codigo": 500}
+
+        async def _enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                status["codigo"] = mensaje["status"]
+            await send(mensaje)
+
+        inicio = time.perf_counter()
+        EN_CURSO.inc()
+        try:
+            await self.app(scope, receive, _enviar)
+        except Exception:
+            EXCEPCIONES.inc(metodo=scope["method"], ruta=_ruta(scope))
+            raise
+        finally:
+            EN_CURSO.dec()
+            metodo, ruta = scope["method"], _ruta(scope)
+            DURACION.observar(time.perf_counter() - inicio, metodo=metodo, ruta=ruta)
+            REQUESTS.inc(metodo=metodo, ruta=ruta, status=status["codigo"])
+
+
+def _ruta(scope: dict) -> str:
+    return getattr(scope.get("route"), "path", None) or SIN_RUTA
+
+
+_ultima_muestra = None
+
+
+async def medir_retraso_event_loop():
+    """
+    Retraso del event loop: crece cuando algo lo bloquea (código síncrono en un endpoint async,
+    serialización larga). Se toma el mayor entre lo que se atrasó esta ejecución respecto del
+    intervalo programado (bloqueos durante la espera) y lo que tarda el loop en volver a esta
+    corrutina después de cederle el control (callbacks encolados ahora).
+    """
+    global _ultima_muestra
+    loop = asyncio.get_running_loop()
+    inicio = loop.time()
+    retraso = 0.0
+    if _ultima_muestra is not None:
+        retraso = max(0.0, inicio - _ultima_muestra - EVENT_LOOP_MUESTREO)
+    await asyncio.sleep(0)
+    _ultima_muestra = loop.time()
+    retraso = max(retraso, _ultima_muestra - inicio)
+    RETRASO_EVENT_LOOP.fijar(retraso)
+    RETRASO_EVENT_LOOP_MUESTRAS.observar(retraso)
+
+
+tarea_event_loop = tareasService.registrar_tarea(
+    "retraso_event_loop", EVENT_LOOP_MUESTREO, medir_retraso_event_loop, ejecutar_al_detener=False
+)
+
+
+def actualizar_threadpool():
+    """
+    Lee el estado del limitador del threadpool de AnyIO (debe llamarse desde el event loop)
+    """
+    estadisticas = anyio.to_thread.current_default_thread_limiter().statistics()
+    THREADPOOL_OCUPADOS.fijar(estadisticas.borrowed_tokens)
+    THREADPOOL_CAPACIDAD.fijar(estadisticas.total_tokens)
+    THREADPOOL_EN_ESPERA.fijar(estadisticas.tasks_waiting)
+
+
+def exponer() -> str:
+    """
+    Todas las métricas en el formato de texto de Prometheus: las del proceso o, con varios
+    workers, la suma de todos. Lee y escribe archivos: llamarla desde el threadpool
+    """
+    if multiproceso is None:
+        return metricas.registro.exponer()
+    return multiproceso.combinado(metricas.registro).exponer()
+
+
+async def volcar_metricas():
+    actualizar_threadpool()
+    await anyio.to_thread.run_sync(multiproceso.volcar, metricas.registro)
+
+
+tarea_volcado = None
+if multiproceso is not None:
+    # Corre en cada worker; el último volcado al apagar deja sus contadores para child_exit
+    tarea_volcado = tareasService.registrar_tarea("metricas_volcado", METRICAS_VOLCADO_INTERVALO, volcar_metricas)
+
+
+def autorizado(authorization: str = None) -> bool:
+    """
+    Indica si el header Authorization permite leer las métricas
+    """
+    if not METRICAS_TOKEN:
+        return database.environment == "development"
+    return hmac.compare_digest(authorization or "", f"Bearer {METRICAS_TOKEN}")
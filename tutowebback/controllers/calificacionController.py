@@ -7,6 +7,7 @@ import logging
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.schemas import schemas
 from tutowebback.config import database
+from tutowebback.config.respuestas import RespuestaJSON
 from tutowebback.services import calificacionService
 from tutowebback.auth import auth
 
@@ -155,20 +156,26 @@ async def get_calificaciones_by_date_range(
     fecha_hasta: str = None, 
     usuario_id: int = None,
     db: Session = Depends(database.get_db),
-    current_user: schemas.Usuario = Depends(auth.get_current_user)
+    current_user: schemas.Usuario = Depends(auth.get_current_user),
+    pagina: int = 1,
+    por_pagina: int = calificacionService.CALIFICACIONES_POR_PAGINA
 ):
     try:
         # Toda la lógica está en el service
-        calificaciones_response = calificacionService.CalificacionService().get_calificaciones_by_date_range_formatted(
-            db, fecha_desde, fecha_hasta, usuario_id
+        calificaciones_response, total = calificacionService.CalificacionService().get_calificaciones_by_date_range_formatted(
+            db, fecha_desde, fecha_hasta, usuario_id, pagina, por_pagina
         )
 
-        return {
+        # Listado grande: se serializa directo con orjson, sin pasar por jsonable_encoder
+        return RespuestaJSON({
             "success": True,
             "data": calificaciones_response,
-            "message": f"Se encontraron {len(calificaciones_response)} calificaciones",
-            "total": len(calificaciones_response)
-        }
+            "message": f"Se encontraron {total} calificaciones",
+            "total": total,
+            "pagina": pagina,
+            "por_pagina": por_pagina,
+            "paginas": -(-total // por_pagina)
+        })
         
     except HTTPException as he:
         logging.error(f"HTTP error retrieving calificaciones by date range: {he.detail}")
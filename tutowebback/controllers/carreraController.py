@@ -9,7 +9,7 @@ from starlette import status
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.schemas import schemas
 from tutowebback.config import database
-from tutowebback.services import carreraService
+from tutowebback.services import carreraService, catalogoCacheService
 
 async def create_carrera(carrera: schemas.CarreraCreate, db: Session = Depends(database.get_db), current_user: schemas.Usuario = None):
     try:
@@ -43,15 +43,17 @@ async def get_carrera(id: int, db: Session, current_user: schemas.Usuario = None
         logging.error(f"Error retrieving carrera: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
-async def get_all_carreras(db: Session):
+async def get_all_carreras(db: Session, if_none_match: str = None):
     try:
-        db_carreras = carreraService.CarreraService().get_all_carreras(db)
-        carrera_responses = [carrera.to_dict_carrera() for carrera in db_carreras]
-        return {
+        carrera_responses, etag = catalogoCacheService.obtener(
+            "carreras", "all",
+            lambda: [carrera.to_dict_carrera() for carrera in carreraService.CarreraService().get_all_carreras(db)]
+        )
+        return catalogoCacheService.respuesta_condicional({
             "success": True,
             "data": carrera_responses,
             "message": "Get carreras successfully"
-        }
+        }, etag, if_none_match, publica=True)
     except HTTPException as he:
         logging.error(f"HTTP error retrieving carreras: {he.detail}")
         raise he
@@ -0,0 +1,59 @@
+import os
+import sys
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.schemas import schemas
+from tutowebback.services.dispositivoService import DispositivoService
+
+dispositivo_service = DispositivoService()
+
+
+async def registrar_dispositivo(dispositivo: schemas.DispositivoUsuarioRegistro, db: Session, current_user: schemas.Usuario):
+    try:
+        db_dispositivo = dispositivo_service.registrar_dispositivo(db, current_user["id"], dispositivo)
+        return {
+            "success": True,
+            "data": db_dispositivo.to_dict_dispositivo_usuario(),
+            "message": "Dispositivo registered successfully"
+        }
+    except HTTPException as he:
+        logging.error(f"HTTP error registering dispositivo: {he.detail}")
+        raise he
+    except Exception as e:
+        logging.error(f"Error registering dispositivo: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+async def get_dispositivos(db: Session, current_user: schemas.Usuario):
+    try:
+        dispositivos = dispositivo_service.get_dispositivos_by_usuario(db, current_user["id"])
+        return {
+            "success": True,
+            "data": [dispositivo.to_dict_dispositivo_usuario() for dispositivo in dispositivos],
+            "message": "Get dispositivos successfully"
+        }
+    except HTTPException as he:
+        logging.error(f"HTTP error retrieving dispositivos: {he.detail}")
+        raise he
+    except Exception as e:
+        logging.error(f"Error retrieving dispositivos: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+async def delete_dispositivo(token_dispositivo: str, db: Session, current_user: schemas.Usuario):
+    try:
+        dispositivo_service.delete_dispositivo(db, current_user["id"], token_dispositivo)
+        return {
+            "success": True,
+            "data": None,
+            "message": "Dispositivo deleted successfully"
+        }
+    except HTTPException as he:
+        logging.error(f"HTTP error deleting dispositivo: {he.detail}")
+        raise he
+    except Exception as e:
+        logging.error(f"Error deleting dispositivo: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
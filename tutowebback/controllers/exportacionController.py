@@ -0,0 +1,24 @@
+import os
+import sys
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.schemas import schemas
+from tutowebback.services import exportacionService
+
+
+async def exportar(conjunto: str, formato: str, fecha_desde: str, fecha_hasta: str, current_user: schemas.Usuario):
+    try:
+        contenido, media_type, archivo = exportacionService.exportar(conjunto, formato, fecha_desde, fecha_hasta)
+
+        # El generador es sincrónico: Starlette lo recorre en el threadpool, fuera del event loop
+        return StreamingResponse(contenido, media_type=media_type,
+                                 headers={"Content-Disposition": f'attachment; filename="{archivo}"'})
+    except HTTPException as he:
+        logging.error(f"HTTP error exporting {conjunto}: {he.detail}")
+        raise he
+    except Exception as e:
+        logging.error(f"Error exporting {conjunto}: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
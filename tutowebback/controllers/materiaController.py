@@ -1,15 +1,16 @@
 import os
 import sys
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, UploadFile
 from sqlalchemy.orm import Session
 import logging
 
 from starlette import status
+from starlette.concurrency import run_in_threadpool
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.schemas import schemas
 from tutowebback.config import database
-from tutowebback.services import materiaService
+from tutowebback.services import materiaService, catalogoCacheService, importacionCatalogoService
 
 async def create_materia(materia: schemas.MateriaCreate, db: Session = Depends(database.get_db), current_user: schemas.Usuario = None):
     try:
@@ -43,15 +44,17 @@ async def get_materia(id: int, db: Session, current_user: schemas.Usuario = None
         logging.error(f"Error retrieving materia: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
-async def get_all_materias(db: Session, current_user: schemas.Usuario = None):
+async def get_all_materias(db: Session, current_user: schemas.Usuario = None, if_none_match: str = None):
     try:
-        db_materias = materiaService.MateriaService().get_all_materias(db)
-        materia_responses = [materia.to_dict_materia() for materia in db_materias]
-        return {
+        materia_responses, etag = catalogoCacheService.obtener(
+            "materias", "all",
+            lambda: [materia.to_dict_materia() for materia in materiaService.MateriaService().get_all_materias(db)]
+        )
+        return catalogoCacheService.respuesta_condicional({
             "success": True,
             "data": materia_responses,
             "message": "Get materias successfully"
-        }
+        }, etag, if_none_match)
     except HTTPException as he:
         logging.error(f"HTTP error retrieving materias: {he.detail}")
         raise he
@@ -59,15 +62,19 @@ async def get_all_materias(db: Session, current_user: schemas.Usuario = None):
         logging.error(f"Error retrieving materias: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
-async def get_materias_by_carrera(carrera_id: int, db: Session, current_user: schemas.Usuario = None):
+async def get_materias_by_carrera(carrera_id: int, db: Session, current_user: schemas.Usuario = None,
+                                  if_none_match: str = None):
     try:
-        db_materias = materiaService.MateriaService().get_materias_by_carrera(db, carrera_id)
-        materia_responses = [materia.to_dict_materia() for materia in db_materias]
-        return {
+        materia_responses, etag = catalogoCacheService.obtener(
+            "materias", f"carrera:{carrera_id}",
+            lambda: [materia.to_dict_materia()
+                     for materia in materiaService.MateriaService().get_materias_by_carrera(db, carrera_id)]
+        )
+        return catalogoCacheService.respuesta_condicional({
             "success": True,
             "data": materia_responses,
             "message": "Get materias by carrera successfully"
-        }
+        }, etag, if_none_match)
     except HTTPException as he:
         logging.error(f"HTTP error retrieving materias by carrera: {he.detail}")
         raise he
@@ -103,4 +110,27 @@ async def delete_materia(id: int, db: Session = Depends(database.get_db), curren
         raise he
     except Exception as e:
         logging.error(f"Error deleting materia: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+async def importar_catalogo(archivo: UploadFile, dry_run: bool, db: Session, current_user: schemas.Usuario = None):
+    try:
+        contenido = await importacionCatalogoService.leer_subida(archivo)
+        # Corre en el threadpool: validar, comparar con la base y escribir un archivo grande no
+        # debe bloquear el event loop
+        reporte = await run_in_threadpool(
+            importacionCatalogoService.importar, db, contenido, archivo.filename or "", dry_run
+        )
+        if not reporte["exitoso"]:
+            # Archivo inválido: el detalle es el reporte con los errores por fila
+            logging.error(f"Invalid catalogo file: {reporte['total_errores']} errors")
+            raise HTTPException(status_code=400, detail=reporte)
+        return {
+            "success": True,
+            "data": reporte,
+            "message": "Catalogo import checked successfully" if dry_run else "Catalogo imported successfully"
+        }
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logging.error(f"Error importing catalogo: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -1,6 +1,7 @@
 import os
 import sys
 from fastapi import Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import logging
 from datetime import datetime, date
@@ -8,7 +9,8 @@ from datetime import datetime, date
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.schemas import schemas
 from tutowebback.config import database
-from tutowebback.services import notificacionService
+from tutowebback.config.respuestas import RespuestaJSON
+from tutowebback.services import notificacionService, retencionService
 from tutowebback.models import models
 
 
@@ -74,12 +76,13 @@ async def get_all_notificaciones(db: Session, current_user: schemas.Usuario, fec
             raise HTTPException(status_code=403, detail="No tienes permisos para ver todas las notificaciones")
         
         notificaciones = notificacionService.obtener_todas_las_notificaciones(db, fecha_desde, fecha_hasta)
-        
-        return {
+
+        # Listado grande: se serializa directo con orjson, sin pasar por jsonable_encoder
+        return RespuestaJSON({
             "success": True,
             "data": notificaciones,
             "message": "Get all notificaciones successfully"
-        }
+        })
     except HTTPException as he:
         logging.error(f"HTTP error retrieving all notificaciones: {he.detail}")
         raise he
@@ -135,4 +138,35 @@ async def delete_notificacion(notificacion_id: int, db: Session, current_user: s
         raise he
     except Exception as e:
         logging.error(f"Error deleting notificacion: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+async def ejecutar_retencion(current_user: schemas.Usuario, leidas_dias: int = None,
+                             archivo_dias: int = None, destino: str = None):
+    """
+    Ejecuta manualmente las políticas de retención de notificaciones (solo para admins)
+    """
+    try:
+        if current_user["user_rol"] not in ["superAdmin", "admin"]:
+            raise HTTPException(status_code=403, detail="No tienes permisos para ejecutar la retención de notificaciones")
+
+        if destino is not None and destino not in retencionService.DESTINOS_VALIDOS:
+            raise HTTPException(status_code=400,
+                                detail=f"Destino inválido. Debe ser uno de: {', '.join(retencionService.DESTINOS_VALIDOS)}")
+
+        # Corre en el threadpool: puede procesar muchos lotes y no debe bloquear el event loop
+        resultado = await run_in_threadpool(
+            retencionService.ejecutar_retencion, leidas_dias, archivo_dias, destino
+        )
+
+        return {
+            "success": True,
+            "data": resultado,
+            "message": "Retención de notificaciones ejecutada successfully"
+        }
+    except HTTPException as he:
+        logging.error(f"HTTP error executing retencion: {he.detail}")
+        raise he
+    except Exception as e:
+        logging.error(f"Error executing retencion: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
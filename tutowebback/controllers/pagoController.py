@@ -10,7 +10,7 @@ import re
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.schemas import schemas
 from tutowebback.config import database
-from tutowebback.services import pagoService, notificacionService, mercadoPagoService
+from tutowebback.services import pagoService, notificacionOutboxService, mercadoPagoService
 from tutowebback.models import models
 
 
@@ -168,28 +168,27 @@ async def webhook_mercadopago(payment_data: dict, db: Session, background_tasks:
         return {"success": False, "message": f"Error en webhook: {str(e)}"}
 
 
-# Función para enviar notificaciones en segundo plano
+# Función para encolar notificaciones de pago en segundo plano
 def notificar_pago(db: Session, pago_id: int, reserva_id: int, metodo_pago: str, es_confirmacion: bool):
     try:
-        # Obtener la reserva
-        reserva = db.query(models.Reserva).filter(models.Reserva.id == reserva_id).first()
-        if not reserva:
-            logging.error(f"Reserva {reserva_id} no encontrada para notificación de pago")
+        # Obtener la reserva con su servicio y materia en una sola consulta
+        fila = db.query(models.Reserva, models.ServicioTutoria, models.Materia).join(
+            models.ServicioTutoria, models.ServicioTutoria.id == models.Reserva.servicio_id
+        ).outerjoin(
+            models.Materia, models.Materia.id == models.ServicioTutoria.materia_id
+        ).filter(models.Reserva.id == reserva_id).first()
+
+        if not fila:
+            logging.error(f"Reserva {reserva_id} o su servicio no encontrados para notificación de pago")
             return
 
-        # Obtener el servicio y materia
-        servicio = db.query(models.ServicioTutoria).filter(models.ServicioTutoria.id == reserva.servicio_id).first()
-        if not servicio:
-            logging.error(f"Servicio para reserva {reserva_id} no encontrado")
-            return
-
-        materia = db.query(models.Materia).filter(models.Materia.id == servicio.materia_id).first()
+        reserva, servicio, materia = fila
         materia_nombre = materia.nombre if materia else "materia"
 
         # Determinar destinatarios y mensajes según sea confirmación o inicio de pago
         if es_confirmacion:
             # Notificar al estudiante
-            notificacionService.crear_notificacion(
+            notificacionOutboxService.encolar_notificacion(
                 db=db,
                 usuario_id=reserva.estudiante_id,
                 titulo="Pago confirmado",
@@ -199,7 +198,7 @@ def notificar_pago(db: Session, pago_id: int, reserva_id: int, metodo_pago: str,
             )
 
             # Notificar al tutor
-            notificacionService.crear_notificacion(
+            notificacionOutboxService.encolar_notificacion(
                 db=db,
                 usuario_id=servicio.tutor_id,
                 titulo="Pago recibido",
@@ -212,7 +211,7 @@ def notificar_pago(db: Session, pago_id: int, reserva_id: int, metodo_pago: str,
             metodo_texto = "efectivo" if metodo_pago == "efectivo" else "Mercado Pago"
 
             # Notificar al tutor
-            notificacionService.crear_notificacion(
+            notificacionOutboxService.encolar_notificacion(
                 db=db,
                 usuario_id=servicio.tutor_id,
                 titulo="Pago iniciado",
@@ -220,7 +219,11 @@ def notificar_pago(db: Session, pago_id: int, reserva_id: int, metodo_pago: str,
                 tipo="pago",
                 reserva_id=reserva.id
             )
+
+        # Un único commit para todas las notificaciones encoladas
+        db.commit()
     except Exception as e:
+        db.rollback()
         logging.error(f"Error enviando notificación de pago: {e}")
 
 async def payment_callback(
@@ -0,0 +1,95 @@
+import os
+import sys
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.schemas import schemas
+from tutowebback.config.respuestas import RespuestaJSON
+from tutowebback.services import reporteService, resumenService
+
+
+async def get_reporte_tutor(tutor_id: int, desde: str, hasta: str, db: Session, current_user: schemas.Usuario):
+    try:
+        # Un tutor solo puede ver su propio reporte
+        if tutor_id != current_user["id"] and current_user["user_rol"] not in ["superAdmin", "admin"]:
+            raise HTTPException(status_code=403, detail="Solo puedes ver tu propio reporte")
+
+        reporte = reporteService.generar_reporte(db, tutor_id, desde, hasta)
+
+        return RespuestaJSON({
+            "success": True,
+            "data": reporte,
+            "message": "Get reporte successfully"
+        })
+    except HTTPException as he:
+        logging.error(f"HTTP error retrieving reporte: {he.detail}")
+        raise he
+    except Exception as e:
+        logging.error(f"Error retrieving reporte: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+async def get_reporte_global(desde: str, hasta: str, db: Session, current_user: schemas.Usuario):
+    try:
+        reporte = reporteService.generar_reporte(db, None, desde, hasta)
+
+        return RespuestaJSON({
+            "success": True,
+            "data": reporte,
+            "message": "Get reporte successfully"
+        })
+    except HTTPException as he:
+        logging.error(f"HTTP error retrieving reporte global: {he.detail}")
+        raise he
+    except Exception as e:
+        logging.error(f"Error retrieving reporte global: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+async def get_dashboard(fecha_desde: str, fecha_hasta: str, agrupar: str, db: Session, current_user: schemas.Usuario):
+    try:
+        dashboard = resumenService.obtener_dashboard(db, fecha_desde, fecha_hasta, agrupar)
+
+        return RespuestaJSON({
+            "success": True,
+            "data": dashboard,
+            "message": "Get dashboard successfully"
+        })
+    except HTTPException as he:
+        logging.error(f"HTTP error retrieving dashboard: {he.detail}")
+        raise he
+    except Exception as e:
+        logging.error(f"Error retrieving dashboard: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+async def actualizar_resumenes(desde: str, current_user: schemas.Usuario):
+    """
+    Actualiza manualmente los resúmenes diarios (solo para admins)
+    """
+    try:
+        desde_obj = None
+        if desde:
+            try:
+                desde_obj = datetime.strptime(desde, '%Y-%m-%d').date()
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Formato de desde incorrecto. Use YYYY-MM-DD")
+
+        # Corre en el threadpool: recalcular un rango largo puede llevar varios tramos
+        resultado = await run_in_threadpool(resumenService.actualizar_resumenes, desde_obj)
+
+        return {
+            "success": True,
+            "data": resultado,
+            "message": "Resúmenes actualizados successfully"
+        }
+    except HTTPException as he:
+        logging.error(f"HTTP error updating resumenes: {he.detail}")
+        raise he
+    except Exception as e:
+        logging.error(f"Error updating resumenes: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
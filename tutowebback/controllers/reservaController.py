@@ -9,6 +9,7 @@ from datetime import datetime, date
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.schemas import schemas
 from tutowebback.config import database
+from tutowebback.config.respuestas import RespuestaJSON
 from tutowebback.services import reservaService
 from tutowebback.auth import auth
 
@@ -168,12 +169,13 @@ async def get_all_reservas(
             fecha_desde=fecha_desde_dt,
             fecha_hasta=fecha_hasta_dt
         )
-        
-        return {
+
+        # Listado grande: se serializa directo con orjson, sin pasar por jsonable_encoder
+        return RespuestaJSON({
             "success": True,
             "data": reserva_responses,
             "message": "Get all reservas successfully"
-        }
+        })
     except HTTPException as he:
         logging.error(f"HTTP error retrieving all reservas: {he.detail}")
         raise he
@@ -292,6 +294,36 @@ async def edit_reserva(id: int, reserva: schemas.ReservaUpdate, db: Session, cur
 
 
 
+async def bulk_transition_reservas(body: schemas.ReservasBulkTransitionRequest, db: Session,
+                                   current_user: schemas.Usuario):
+    try:
+        is_admin = current_user["user_rol"] in ["superAdmin", "admin"]
+
+        resultados = reservaService.ReservaService().bulk_transition(
+            db,
+            body.transiciones,
+            current_user["id"],
+            is_admin
+        )
+        exitosas = sum(1 for resultado in resultados if resultado["success"])
+
+        return {
+            "success": True,
+            "data": {
+                "resultados": resultados,
+                "exitosas": exitosas,
+                "fallidas": len(resultados) - exitosas
+            },
+            "message": "Bulk transition processed"
+        }
+    except HTTPException as he:
+        logging.error(f"HTTP error in bulk transition: {he.detail}")
+        raise he
+    except Exception as e:
+        logging.error(f"Error in bulk transition: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
 async def delete_reserva(id: int, db: Session, current_user: schemas.Usuario):
     try:
         # Obtener la reserva
@@ -7,7 +7,7 @@ import logging
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.schemas import schemas
 from tutowebback.config import database
-from tutowebback.services import roleService
+from tutowebback.services import roleService, catalogoCacheService
 from tutowebback.auth.auth import get_current_user
 
 async def create_rol(rol: schemas.RolCreate, db: Session = Depends(database.get_db), current_user: schemas.Usuario=None):
@@ -26,15 +26,17 @@ async def create_rol(rol: schemas.RolCreate, db: Session = Depends(database.get_
         logging.error(f"Error creating role: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
-async def get_all_roles(db: Session = Depends(database.get_db),  current_user: schemas.Usuario=None):
+async def get_all_roles(db: Session = Depends(database.get_db),  current_user: schemas.Usuario=None,
+                        if_none_match: str = None):
     try:
-        db_rol = roleService.RoleService().get_all_roles(db)
-        rol_response = [rol.to_dict_rol() for rol in db_rol]
-        return {
+        rol_response, etag = catalogoCacheService.obtener(
+            "roles", "all", lambda: [rol.to_dict_rol() for rol in roleService.RoleService().get_all_roles(db)]
+        )
+        return catalogoCacheService.respuesta_condicional({
             "success": True,
             "data": rol_response,
             "message": "Roles retrieved successfully"
-        }
+        }, etag, if_none_match)
     except HTTPException as he:
         logging.error(f"HTTP error retrieving role: {he.detail}")
         raise he
@@ -90,15 +92,17 @@ async def delete_role(id: int, db: Session = Depends(database.get_db),  current_
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
-async def get_all_roles_by_register(db):
+async def get_all_roles_by_register(db, if_none_match: str = None):
     try:
-        db_rol = roleService.RoleService().get_all_roles_by_register(db)
-        rol_response = [rol.to_dict_rol() for rol in db_rol]
-        return {
+        rol_response, etag = catalogoCacheService.obtener(
+            "roles", "register",
+            lambda: [rol.to_dict_rol() for rol in roleService.RoleService().get_all_roles_by_register(db)]
+        )
+        return catalogoCacheService.respuesta_condicional({
             "success": True,
             "data": rol_response,
             "message": "Roles retrieved successfully"
-        }
+        }, etag, if_none_match, publica=True)
     except HTTPException as he:
         logging.error(f"HTTP error retrieving role: {he.detail}")
         raise he
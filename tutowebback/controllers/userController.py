@@ -9,10 +9,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.schemas import schemas
 from tutowebback.config import database
 from tutowebback.services import usersService
-from tutowebback.services.imageService import ImageService
-
-# Inicializar el servicio de imágenes
-image_service = ImageService()
+from tutowebback.services.imageService import obtener_image_service
 
 
 async def create_usuario(usuario: schemas.UsuarioCreate, db: Session = Depends(database.get_db),
@@ -28,7 +25,7 @@ async def create_usuario(usuario: schemas.UsuarioCreate, db: Session = Depends(d
         # Si hay imagen, guardarla temporalmente
         if profile_image:
             # Guardar imagen temporalmente
-            temp_path = await image_service.save_profile_image(
+            temp_path = await obtener_image_service().save_profile_image(
                 emailUser=usuario.email,
                 file=profile_image
             )
@@ -77,9 +74,9 @@ async def create_usuario(usuario: schemas.UsuarioCreate, db: Session = Depends(d
         # Rollback at controller level
         db.rollback()
 
-        # Si hubo un error pero ya se guardó la imagen, eliminarla
+        # Si hubo un error pero ya se guardó la imagen, eliminarla (salvo que otro usuario la use)
         if temp_path:
-            image_service.delete_profile_image(temp_path)
+            obtener_image_service().delete_profile_image(temp_path, db)
 
         logging.error(f"Error creating usuario: {str(e)}")
 
@@ -154,6 +151,7 @@ async def edit_usuario(emailParam: str,id:int, usuario: schemas.UsuarioUpdate, d
     se completen correctamente o se revierta todo.
     """
     new_image_path = None
+    old_image_path = None
 
     try:
         # Obtener usuario actual para tener info de imagen antigua
@@ -164,7 +162,7 @@ async def edit_usuario(emailParam: str,id:int, usuario: schemas.UsuarioUpdate, d
         # Si hay nueva imagen, procesarla
         if profile_image:
             # Guardar nueva imagen
-            new_image_path = await image_service.save_profile_image(
+            new_image_path = await obtener_image_service().save_profile_image(
                 emailUser=emailParam,
                 file=profile_image
             )
@@ -179,9 +177,10 @@ async def edit_usuario(emailParam: str,id:int, usuario: schemas.UsuarioUpdate, d
         # Commit a nivel de controlador
         db.commit()
 
-        # Eliminar imagen anterior si existe y se subió una nueva exitosamente
-        if old_image_path and new_image_path:
-            image_service.delete_profile_image(old_image_path)
+        # Eliminar imagen anterior si existe, se subió una nueva exitosamente y no es la misma
+        # (las imágenes se deduplican por contenido) ni la usa otro usuario
+        if old_image_path and new_image_path and old_image_path != new_image_path:
+            obtener_image_service().delete_profile_image(old_image_path, db)
 
         # Preparar respuesta
         usuario_response = db_usuario.to_dict_usuario()
@@ -197,8 +196,8 @@ async def edit_usuario(emailParam: str,id:int, usuario: schemas.UsuarioUpdate, d
         db.rollback()
 
         # Si hubo un error pero ya se guardó la imagen nueva, eliminarla
-        if new_image_path:
-            image_service.delete_profile_image(new_image_path)
+        if new_image_path and new_image_path != old_image_path:
+            obtener_image_service().delete_profile_image(new_image_path, db)
 
         # Re-raise HTTPExceptions as-is
         if isinstance(e, HTTPException):
@@ -218,7 +217,7 @@ async def delete_usuario(id: int, db: Session = Depends(database.get_db), curren
 
         # Si el usuario tenía imagen, intentar eliminarla
         if db_usuario.foto_perfil:
-            image_service.delete_profile_image(db_usuario.foto_perfil)
+            obtener_image_service().delete_profile_image(db_usuario.foto_perfil, db, excluir_usuario_id=id)
 
         # Eliminar usuario (baja lógica en tu caso)
         usuario_service.delete_usuario(db, id)
@@ -0,0 +1,116 @@
+"""
+Perfil de producción: gunicorn como administrador de procesos con workers de uvicorn.
+
+Uso (desde la raíz del repositorio):
+    gunicorn -c tutowebback/gunicorn.conf.py
+
+- Workers: WEB_CONCURRENCY, o 2 × CPUs disponibles + 1 (respetando la afinidad y la cuota de
+  CPU del contenedor), con tope GUNICORN_WORKERS_MAXIMO.
+- preload_app: la aplicación se importa una vez en el proceso maestro y los workers la heredan
+  al hacer fork, compartiendo esa memoria copy-on-write. Importar main no abre conexiones
+  (el trabajo de arranque está en el lifespan, que corre en cada worker); igual, post_fork
+  descarta el pool heredado para que ningún worker use conexiones del maestro.
+- Pool de conexiones por worker: WEB_CONCURRENCY se exporta antes de importar la aplicación
+  y config/database.py reparte DB_CONEXIONES_MAXIMAS entre los workers (ver dimensionar_pool).
+- Recarga sin cortar requests: `kill -HUP <pid del maestro>` levanta workers nuevos y apaga los
+  viejos después de terminar sus requests (graceful_timeout). Con preload_app los workers nuevos
+  heredan el código ya cargado en el maestro: para desplegar código nuevo usar
+  `kill -USR2` (maestro nuevo) seguido de `kill -WINCH` y `kill -QUIT` al maestro viejo,
+  o GUNICORN_PRELOAD=false para que HUP también recargue el código.
+- Tareas en segundo plano: las exclusivas (resúmenes diarios, barrido de reservas, retención)
+  corren en un solo worker, el que toma el bloqueo TAREAS_BLOQUEO; si ese worker se recicla,
+  otro toma el bloqueo en su próxima ejecución. El outbox corre en todos (toma sus filas con
+  FOR UPDATE SKIP LOCKED) y las mediciones del proceso (event loop, volcado de métricas) también.
+- Métricas: cada worker vuelca las suyas en METRICAS_MULTIPROCESO_DIR y GET /metrics, lo atienda
+  el worker que lo atienda, expone la suma de todos; child_exit pasa los contadores de un worker
+  que terminó al acumulado, así no retroceden entre scrapes.
+- Ambos archivos van en un directorio temporal propio de cada maestro (un maestro nuevo por
+  USR2 empieza de cero), que se borra al salir.
+"""
+import os
+import sys
+import math
+import shutil
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def cpus_disponibles() -> int:
+    """
+    CPUs que puede usar este proceso: afinidad (cpuset) y cuota de cgroup v2, si las hay
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = multiprocessing.cpu_count()
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as archivo:
+            cuota, periodo = archivo.read().split()
+        if cuota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(cuota) / int(periodo))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def calcular_workers() -> int:
+    maximo = int(os.getenv("GUNICORN_WORKERS_MAXIMO", "12"))
+    return max(1, min(2 * cpus_disponibles() + 1, maximo))
+
+
+workers = int(os.getenv("WEB_CONCURRENCY", "0")) or calcular_workers()
+# config/database.py dimensiona el pool de cada worker con este valor
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Estado compartido por los workers de este maestro; se exporta antes de importar la aplicación
+directorio_procesos = os.path.join(tempfile.gettempdir(), f"tutoweb-{os.getpid()}")
+os.makedirs(directorio_procesos, exist_ok=True)
+os.environ["TAREAS_BLOQUEO"] = os.path.join(directorio_procesos, "tareas.lock")
+os.environ["METRICAS_MULTIPROCESO_DIR"] = os.path.join(directorio_procesos, "metricas")
+
+wsgi_app = "main:app"
+chdir = os.path.dirname(os.path.abspath(__file__))
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:7000")
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Un worker que no responde en `timeout` segundos se reinicia; al recargar o apagar, cada worker
+# tiene `graceful_timeout` segundos para terminar sus requests
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Reciclar workers cada tantos requests (con jitter para que no reinicien todos juntos)
+# acota el crecimiento de memoria por fragmentación
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "500"))
+
+# GUNICORN_ACCESSLOG vacío desactiva el log de accesos
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-") or None
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
+
+
+def when_ready(server):
+    from tutowebback.config import database
+    server.log.info(
+        f"{workers} workers ({cpus_disponibles()} CPUs), pool por worker: "
+        f"{database.POOL_SIZE} + {database.MAX_OVERFLOW} de desborde"
+    )
+
+
+def post_fork(server, worker):
+    # Las conexiones abiertas antes del fork no se pueden compartir entre procesos:
+    # close=False las abandona sin cerrarlas (siguen siendo del maestro)
+    from tutowebback.config import database
+    database.engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    # Corre en el maestro cuando termina un worker (reciclado, timeout o apagado)
+    from tutowebback.config import metricas
+    metricas.Multiproceso(os.environ["METRICAS_MULTIPROCESO_DIR"]).recolectar(worker.pid)
+
+
+def on_exit(server):
+    shutil.rmtree(directorio_procesos, ignore_errors=True)
@@ -1,7 +1,7 @@
 import os
 import sys
-
-from services.mercadoPagoService import MercadoPagoService
+import logging
+from contextlib import asynccontextmanager
 
 # Add the project root directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -9,41 +9,112 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware import Middleware
-from fastapi.staticfiles import StaticFiles
-from models import models
-from config import database
-from urls import urlsUser, urlsCarrera, urlsRole, urlsMaterias, urlsMateriasCarreraUsuario, \
-    urlsDisponibilidad, urlsReserva, urlsServicioTutoria,urlsNotificacion,urlsPago,urlsCalificacion
+from tutowebback.models import models
+from tutowebback.config import database
+from tutowebback.urls import urlsUser, urlsCarrera, urlsRole, urlsMaterias, urlsMateriasCarreraUsuario, \
+    urlsDisponibilidad, urlsReserva, urlsServicioTutoria, urlsNotificacion, urlsPago, urlsCalificacion, \
+    urlsDispositivo, urlsMetricas, urlsPerfiles, urlsReporte, urlsExportacion
+from tutowebback.config.respuestas import RespuestaJSON
+from tutowebback.config import instrumentacion, telemetria, perfilado
+from tutowebback.services import tareasService, notificacionOutboxService, pushService, retencionService, imageService, \
+    reservaCicloVidaService, resumenService
 
-# Crear directorios para imágenes si no existen
-os.makedirs("uploads/profile_images", exist_ok=True)
+# El esquema se administra con migraciones (cd tutowebback && alembic upgrade head).
+# DB_CREATE_ALL=true crea las tablas faltantes al iniciar, útil para bases descartables de desarrollo.
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "false").lower() == "true"
+# DB_VERIFICAR_ESQUEMA=true impide el arranque si la base no está en la última migración
+DB_VERIFICAR_ESQUEMA = os.getenv("DB_VERIFICAR_ESQUEMA", "false").lower() == "true"
 
-models.Base.metadata.create_all(bind=database.engine)
+DIRECTORIO_UPLOADS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads")
 
-middleware = [
-    Middleware(CORSMiddleware,   allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+ROUTERS = [
+    urlsUser.router, urlsNotificacion.router, urlsServicioTutoria.router, urlsReserva.router,
+    urlsDisponibilidad.router, urlsPago.router, urlsMateriasCarreraUsuario.router, urlsCarrera.router,
+    urlsRole.router, urlsMaterias.router, urlsCalificacion.router, urlsDispositivo.router, urlsMetricas.router,
+    urlsPerfiles.router, urlsReporte.router, urlsExportacion.router,
 ]
-app = FastAPI(
-    title="TUTOWEB API",
-    description="API para la gestión de perfiles, autenticacion, clases, reservas, pagos del sistema TutoWeb",
-    middleware=middleware
-)
-app.mount("/uploads", StaticFiles(directory="tutowebback/uploads"), name="uploads")
-
-# Incluir todas las rutas definidas
-app.include_router(urlsUser.router)
-app.include_router(urlsNotificacion.router)
-app.include_router(urlsServicioTutoria.router)
-app.include_router(urlsReserva.router)
-app.include_router(urlsDisponibilidad.router)
-app.include_router(urlsPago.router)
-app.include_router(urlsMateriasCarreraUsuario.router)
-app.include_router(urlsCarrera.router)
-app.include_router(urlsRole.router)
-app.include_router(urlsMaterias.router)
-app.include_router(urlsCalificacion.router)
 
 
+def verificar_esquema():
+    """
+    Compara la revisión de Alembic de la base con la última del repositorio
+    """
+    # Alembic se importa solo si se pide la verificación, para no sumarlo al arranque
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    config = Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini"))
+    ultima = ScriptDirectory.from_config(config).get_current_head()
+    with database.engine.connect() as conexion:
+        actual = MigrationContext.configure(conexion).get_current_revision()
+    if actual != ultima:
+        raise RuntimeError(
+            f"La base está en la migración {actual} y la última es {ultima}: ejecutar 'alembic upgrade head'"
+        )
+    logging.info(f"Esquema de la base al día (migración {actual})")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Crear directorios para imágenes si no existen
+    os.makedirs(os.path.join(DIRECTORIO_UPLOADS, "profile_images"), exist_ok=True)
+    # Crea el almacenamiento de imágenes: una configuración inválida impide el arranque
+    imageService.obtener_image_service()
+    if app.state.crear_tablas:
+        models.Base.metadata.create_all(bind=database.engine)
+    if app.state.verificar_esquema:
+        verificar_esquema()
+
+    # Tareas en segundo plano (outbox de notificaciones, etc.)
+    tareasService.iniciar_tareas()
+    try:
+        yield
+    finally:
+        await tareasService.detener_tareas()
+        imageService.cerrar_procesos()
+
+
+def crear_app(crear_tablas: bool = DB_CREATE_ALL, verificar_esquema: bool = DB_VERIFICAR_ESQUEMA) -> FastAPI:
+    """
+    Arma la aplicación sin tocar la base ni el disco: el trabajo de arranque (directorios,
+    esquema, tareas en segundo plano) queda en el lifespan
+    """
+    # Conteo y tiempo de las consultas SQL de cada request (ver config/instrumentacion.py)
+    instrumentacion.instalar()
+
+    middleware = [
+        # Latencia, throughput y requests en curso; va primero para medir también a los demás middlewares
+        Middleware(telemetria.InstrumentacionHttpMiddleware),
+        Middleware(instrumentacion.InstrumentacionConsultasMiddleware),
+        # Perfiles bajo demanda (PERFILADO_HABILITADO); sin efecto si está deshabilitado
+        Middleware(perfilado.PerfiladoMiddleware),
+        Middleware(CORSMiddleware,   allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"],
+                   expose_headers=["X-DB-Consultas", "X-DB-Tiempo-ms", "X-Perfil"])
+    ]
+    app = FastAPI(
+        title="TUTOWEB API",
+        description="API para la gestión de perfiles, autenticacion, clases, reservas, pagos del sistema TutoWeb",
+        middleware=middleware,
+        default_response_class=RespuestaJSON,
+        lifespan=lifespan
+    )
+    app.state.crear_tablas = crear_tablas
+    app.state.verificar_esquema = verificar_esquema
+
+    # check_dir=False: el directorio lo crea el lifespan
+    app.mount("/uploads", imageService.ImagenesStaticFiles(directory=DIRECTORIO_UPLOADS, check_dir=False), name="uploads")
+
+    # Incluir todas las rutas definidas
+    for router in ROUTERS:
+        app.include_router(router)
+    return app
+
+
+app = crear_app()
+
+
+# Desarrollo: un proceso con recarga automática. En producción: gunicorn -c tutowebback/gunicorn.conf.py
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=7000, reload=True)
\ No newline at end of file
+    uvicorn.run("main:app", host="0.0.0.0", port=7000, reload=True)
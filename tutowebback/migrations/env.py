@@ -0,0 +1,59 @@
+import os
+import sys
+from logging.config import fileConfig
+
+from alembic import context
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from tutowebback.config import database
+from tutowebback.models import models
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = models.Base.metadata
+
+
+def run_migrations_offline():
+    """
+    Genera el SQL de las migraciones sin conectarse a la base (alembic upgrade --sql)
+    """
+    context.configure(
+        url=database.SQLALCHEMY_DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _configurar_y_migrar(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    # Permite migrar una conexión ya abierta (por ejemplo desde tools/planes_consulta.py)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configurar_y_migrar(connection)
+        return
+
+    with database.engine.connect() as connection:
+        _configurar_y_migrar(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
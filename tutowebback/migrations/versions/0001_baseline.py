@@ -0,0 +1,199 @@
+"""baseline
+
+Esquema tal como lo creaba `create_all` antes de incorporar las migraciones.
+Las bases existentes se marcan con `alembic stamp 0001` en lugar de aplicarla.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 11:29:46.788232
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('carreras',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nombre', sa.String(length=100), nullable=False),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('facultad', sa.String(length=100), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('roles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nombre', sa.String(length=255), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('materias',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nombre', sa.String(length=100), nullable=False),
+    sa.Column('carrera_id', sa.Integer(), nullable=False),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('año_plan', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['carrera_id'], ['carreras.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('usuarios',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nombre', sa.String(length=100), nullable=False),
+    sa.Column('apellido', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('password_hash', sa.String(length=200), nullable=False),
+    sa.Column('fecha_registro', sa.DateTime(), nullable=True),
+    sa.Column('activo', sa.Boolean(), nullable=True),
+    sa.Column('puntuacion_promedio', sa.Numeric(precision=3, scale=2), nullable=True),
+    sa.Column('cantidad_reseñas', sa.Integer(), nullable=True),
+    sa.Column('foto_perfil', sa.String(length=255), nullable=True),
+    sa.Column('id_rol', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['id_rol'], ['roles.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_table('carrera_usuario',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('carrera_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['carrera_id'], ['carreras.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('disponibilidad',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tutor_id', sa.Integer(), nullable=False),
+    sa.Column('dia_semana', sa.Integer(), nullable=True),
+    sa.Column('hora_inicio', sa.Time(), nullable=False),
+    sa.Column('hora_fin', sa.Time(), nullable=False),
+    sa.CheckConstraint('dia_semana BETWEEN 1 AND 7'),
+    sa.CheckConstraint('hora_inicio < hora_fin'),
+    sa.ForeignKeyConstraint(['tutor_id'], ['usuarios.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('dispositivos_usuario',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('token_dispositivo', sa.String(length=255), nullable=False),
+    sa.Column('plataforma', sa.String(length=20), nullable=True),
+    sa.Column('ultimo_acceso', sa.DateTime(), nullable=True),
+    sa.CheckConstraint("plataforma IN ('web', 'android', 'ios')"),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('usuario_id', 'token_dispositivo', name='UQ_usuario_token')
+    )
+    op.create_table('materias_x_carrera_x_usuario',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('estado', sa.Boolean(), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('materia_id', sa.Integer(), nullable=False),
+    sa.Column('carrera_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['carrera_id'], ['carreras.id'], ),
+    sa.ForeignKeyConstraint(['materia_id'], ['materias.id'], ),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('usuario_id', 'materia_id', 'carrera_id', name='UQ_usuario_materia_carrera')
+    )
+    op.create_table('servicios_tutoria',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tutor_id', sa.Integer(), nullable=False),
+    sa.Column('materia_id', sa.Integer(), nullable=False),
+    sa.Column('precio', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('modalidad', sa.String(length=50), nullable=True),
+    sa.Column('activo', sa.Boolean(), nullable=True),
+    sa.CheckConstraint("modalidad IN ('presencial', 'virtual', 'ambas')"),
+    sa.ForeignKeyConstraint(['materia_id'], ['materias.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tutor_id'], ['usuarios.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tutor_id', 'materia_id', name='UQ_tutor_materia')
+    )
+    op.create_table('reservas',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('estudiante_id', sa.Integer(), nullable=False),
+    sa.Column('servicio_id', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('hora_inicio', sa.Time(), nullable=False),
+    sa.Column('hora_fin', sa.Time(), nullable=False),
+    sa.Column('estado', sa.String(length=20), nullable=True),
+    sa.Column('notas', sa.Text(), nullable=True),
+    sa.Column('fecha_creacion', sa.DateTime(), nullable=True),
+    sa.Column('sala_virtual', sa.String(length=255), nullable=True),
+    sa.CheckConstraint("estado IN ('pendiente', 'confirmada', 'completada', 'cancelada')"),
+    sa.CheckConstraint('hora_inicio < hora_fin'),
+    sa.ForeignKeyConstraint(['estudiante_id'], ['usuarios.id'], ),
+    sa.ForeignKeyConstraint(['servicio_id'], ['servicios_tutoria.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('calificaciones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('reserva_id', sa.Integer(), nullable=False),
+    sa.Column('calificador_id', sa.Integer(), nullable=False),
+    sa.Column('calificado_id', sa.Integer(), nullable=False),
+    sa.Column('puntuacion', sa.Integer(), nullable=True),
+    sa.Column('comentario', sa.Text(), nullable=True),
+    sa.Column('fecha', sa.DateTime(), nullable=True),
+    sa.CheckConstraint('puntuacion BETWEEN 1 AND 5'),
+    sa.ForeignKeyConstraint(['calificado_id'], ['usuarios.id'], ),
+    sa.ForeignKeyConstraint(['calificador_id'], ['usuarios.id'], ),
+    sa.ForeignKeyConstraint(['reserva_id'], ['reservas.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('notificaciones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('titulo', sa.String(length=100), nullable=False),
+    sa.Column('mensaje', sa.Text(), nullable=False),
+    sa.Column('tipo', sa.String(length=50), nullable=True),
+    sa.Column('leida', sa.Boolean(), nullable=True),
+    sa.Column('fecha_creacion', sa.DateTime(), nullable=True),
+    sa.Column('fecha_programada', sa.DateTime(), nullable=True),
+    sa.Column('reserva_id', sa.Integer(), nullable=True),
+    sa.CheckConstraint("tipo IN ('reserva', 'pago', 'recordatorio', 'sistema')"),
+    sa.ForeignKeyConstraint(['reserva_id'], ['reservas.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('pagos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('reserva_id', sa.Integer(), nullable=False),
+    sa.Column('monto', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('metodo_pago', sa.String(length=50), nullable=True),
+    sa.Column('estado', sa.String(length=50), nullable=True),
+    sa.Column('referencia_externa', sa.String(length=100), nullable=True),
+    sa.Column('fecha_pago', sa.DateTime(), nullable=True),
+    sa.Column('fecha_creacion', sa.DateTime(), nullable=True),
+    sa.CheckConstraint("estado IN ('pendiente', 'completado', 'cancelado', 'reembolsado')"),
+    sa.CheckConstraint("metodo_pago IN ('mercado_pago', 'efectivo')"),
+    sa.ForeignKeyConstraint(['reserva_id'], ['reservas.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('reserva_actions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('reserva_id', sa.Integer(), nullable=False),
+    sa.Column('tutor_opened', sa.Boolean(), nullable=True),
+    sa.Column('estudiante_opened', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['reserva_id'], ['reservas.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('reserva_actions')
+    op.drop_table('pagos')
+    op.drop_table('notificaciones')
+    op.drop_table('calificaciones')
+    op.drop_table('reservas')
+    op.drop_table('servicios_tutoria')
+    op.drop_table('materias_x_carrera_x_usuario')
+    op.drop_table('dispositivos_usuario')
+    op.drop_table('disponibilidad')
+    op.drop_table('carrera_usuario')
+    op.drop_table('usuarios')
+    op.drop_table('materias')
+    op.drop_table('roles')
+    op.drop_table('carreras')
@@ -0,0 +1,74 @@
+"""outbox, archivo de notificaciones e índices de barrido
+
+Tablas e índices agregados junto con el outbox de notificaciones, la retención y el
+barrido de reservas vencidas. Las bases donde `create_all` ya los creó quedan igual.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 11:42:10.114503
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def _tabla_existe(tabla):
+    return sa.inspect(op.get_bind()).has_table(tabla)
+
+
+def _indice_existe(tabla, indice):
+    return any(i["name"] == indice for i in sa.inspect(op.get_bind()).get_indexes(tabla))
+
+
+def _crear_indice(indice, tabla, columnas, **kwargs):
+    if not _indice_existe(tabla, indice):
+        op.create_index(indice, tabla, columnas, **kwargs)
+
+
+def upgrade():
+    if not _tabla_existe('notificaciones_outbox'):
+        op.create_table('notificaciones_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('titulo', sa.String(length=100), nullable=False),
+        sa.Column('mensaje', sa.Text(), nullable=False),
+        sa.Column('tipo', sa.String(length=50), nullable=True),
+        sa.Column('fecha_creacion', sa.DateTime(), nullable=True),
+        sa.Column('fecha_programada', sa.DateTime(), nullable=True),
+        sa.Column('reserva_id', sa.Integer(), nullable=True),
+        sa.Column('intentos', sa.Integer(), nullable=True),
+        sa.CheckConstraint("tipo IN ('reserva', 'pago', 'recordatorio', 'sistema')"),
+        sa.ForeignKeyConstraint(['reserva_id'], ['reservas.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not _tabla_existe('notificaciones_archivo'):
+        op.create_table('notificaciones_archivo',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('fecha_creacion', sa.DateTime(), nullable=True),
+        sa.Column('fecha_archivado', sa.DateTime(), nullable=True),
+        sa.Column('contenido', sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+    _crear_indice(op.f('ix_notificaciones_archivo_usuario_id'), 'notificaciones_archivo', ['usuario_id'])
+    _crear_indice(op.f('ix_notificaciones_archivo_fecha_creacion'), 'notificaciones_archivo', ['fecha_creacion'])
+    _crear_indice('ix_notificaciones_usuario_fecha', 'notificaciones', ['usuario_id', 'fecha_creacion'])
+    _crear_indice('ix_notificaciones_fecha', 'notificaciones', ['fecha_creacion'])
+    _crear_indice('ix_reservas_estado_fecha', 'reservas', ['estado', 'fecha'])
+
+
+def downgrade():
+    op.drop_index('ix_reservas_estado_fecha', table_name='reservas')
+    op.drop_index('ix_notificaciones_fecha', table_name='notificaciones')
+    op.drop_index('ix_notificaciones_usuario_fecha', table_name='notificaciones')
+    op.drop_index(op.f('ix_notificaciones_archivo_fecha_creacion'), table_name='notificaciones_archivo')
+    op.drop_index(op.f('ix_notificaciones_archivo_usuario_id'), table_name='notificaciones_archivo')
+    op.drop_table('notificaciones_archivo')
+    op.drop_table('notificaciones_outbox')
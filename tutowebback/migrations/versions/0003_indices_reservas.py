@@ -0,0 +1,47 @@
+"""índices de reservas para los predicados frecuentes
+
+- ix_reservas_servicio_fecha_activas: índice parcial (solo pendientes y confirmadas) para
+  los chequeos de solapamiento al crear/editar reservas y la disponibilidad del tutor.
+- ix_reservas_estudiante_estado_fecha: vistas del estudiante y próxima reserva confirmada.
+- ix_reservas_servicio_fecha: vistas del tutor.
+
+Las consultas deben filtrar con `Reserva.activa()` para que el planificador use el índice parcial.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 12:05:31.402877
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+PREDICADO_ACTIVAS = "estado IN ('pendiente', 'confirmada')"
+
+
+def _indice_existe(tabla, indice):
+    return any(i["name"] == indice for i in sa.inspect(op.get_bind()).get_indexes(tabla))
+
+
+def upgrade():
+    if not _indice_existe('reservas', 'ix_reservas_servicio_fecha_activas'):
+        op.create_index('ix_reservas_servicio_fecha_activas', 'reservas', ['servicio_id', 'fecha', 'hora_inicio'],
+                        postgresql_where=sa.text(PREDICADO_ACTIVAS),
+                        sqlite_where=sa.text(PREDICADO_ACTIVAS),
+                        mssql_where=sa.text(PREDICADO_ACTIVAS))
+    if not _indice_existe('reservas', 'ix_reservas_estudiante_estado_fecha'):
+        op.create_index('ix_reservas_estudiante_estado_fecha', 'reservas',
+                        ['estudiante_id', 'estado', 'fecha', 'hora_inicio'])
+    if not _indice_existe('reservas', 'ix_reservas_servicio_fecha'):
+        op.create_index('ix_reservas_servicio_fecha', 'reservas', ['servicio_id', 'fecha'])
+
+
+def downgrade():
+    op.drop_index('ix_reservas_servicio_fecha', table_name='reservas')
+    op.drop_index('ix_reservas_estudiante_estado_fecha', table_name='reservas')
+    op.drop_index('ix_reservas_servicio_fecha_activas', table_name='reservas')
@@ -0,0 +1,56 @@
+"""índices para claves foráneas y columnas de búsqueda
+
+Ni SQL Server ni PostgreSQL indexan las claves foráneas: cada filtro o join por ellas (y cada
+borrado en cascada desde la tabla referenciada) recorría la tabla completa. Se agregan los
+índices que reporta `python -m tutowebback.tools.auditoria_indices`.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 11:36:35.755275
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+# (índice, tabla, columnas)
+INDICES = [
+    ('ix_calificaciones_calificado_id', 'calificaciones', ['calificado_id']),
+    ('ix_calificaciones_calificador_id', 'calificaciones', ['calificador_id']),
+    ('ix_calificaciones_reserva_id', 'calificaciones', ['reserva_id']),
+    ('ix_carrera_usuario_carrera_id', 'carrera_usuario', ['carrera_id']),
+    ('ix_carrera_usuario_usuario_id', 'carrera_usuario', ['usuario_id']),
+    ('ix_disponibilidad_tutor_dia', 'disponibilidad', ['tutor_id', 'dia_semana']),
+    ('ix_dispositivos_usuario_token_dispositivo', 'dispositivos_usuario', ['token_dispositivo']),
+    ('ix_materias_carrera_id', 'materias', ['carrera_id']),
+    ('ix_materias_x_carrera_x_usuario_carrera_id', 'materias_x_carrera_x_usuario', ['carrera_id']),
+    ('ix_materias_x_carrera_x_usuario_materia_id', 'materias_x_carrera_x_usuario', ['materia_id']),
+    ('ix_notificaciones_reserva_id', 'notificaciones', ['reserva_id']),
+    ('ix_notificaciones_outbox_reserva_id', 'notificaciones_outbox', ['reserva_id']),
+    ('ix_notificaciones_outbox_usuario_id', 'notificaciones_outbox', ['usuario_id']),
+    ('ix_pagos_reserva_id', 'pagos', ['reserva_id']),
+    ('ix_reserva_actions_reserva_id', 'reserva_actions', ['reserva_id']),
+    ('ix_servicios_tutoria_materia_id', 'servicios_tutoria', ['materia_id']),
+    ('ix_usuarios_foto_perfil', 'usuarios', ['foto_perfil']),
+    ('ix_usuarios_id_rol', 'usuarios', ['id_rol']),
+]
+
+
+def _indice_existe(tabla, indice):
+    return any(i["name"] == indice for i in sa.inspect(op.get_bind()).get_indexes(tabla))
+
+
+def upgrade():
+    for indice, tabla, columnas in INDICES:
+        if not _indice_existe(tabla, indice):
+            op.create_index(indice, tabla, columnas)
+
+
+def downgrade():
+    for indice, tabla, _ in reversed(INDICES):
+        op.drop_index(indice, table_name=tabla)
@@ -0,0 +1,76 @@
+"""tutor_id desnormalizado en reservas
+
+Copia servicios_tutoria.tutor_id en reservas para que las consultas del tutor filtren por un
+único predicado indexado en lugar de `servicio_id IN (servicios del tutor)`. El índice parcial
+de solapamiento pasa a ser por tutor (todas sus materias) en lugar de por servicio.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 12:31:08.220914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+PREDICADO_ACTIVAS = "estado IN ('pendiente', 'confirmada')"
+
+# SQLite recrea la tabla en batch_alter_table y omite los CHECK sin nombre reflejados
+CHECKS_RESERVAS = (
+    sa.CheckConstraint("estado IN ('pendiente', 'confirmada', 'completada', 'cancelada')"),
+    sa.CheckConstraint("hora_inicio < hora_fin"),
+)
+
+
+def _columna_existe(tabla, columna):
+    return any(c["name"] == columna for c in sa.inspect(op.get_bind()).get_columns(tabla))
+
+
+def _indice_existe(tabla, indice):
+    return any(i["name"] == indice for i in sa.inspect(op.get_bind()).get_indexes(tabla))
+
+
+def upgrade():
+    if _indice_existe('reservas', 'ix_reservas_servicio_fecha_activas'):
+        op.drop_index('ix_reservas_servicio_fecha_activas', table_name='reservas')
+
+    if not _columna_existe('reservas', 'tutor_id'):
+        op.add_column('reservas', sa.Column('tutor_id', sa.Integer(), nullable=True))
+
+    op.execute(
+        "UPDATE reservas SET tutor_id = ("
+        "SELECT servicios_tutoria.tutor_id FROM servicios_tutoria "
+        "WHERE servicios_tutoria.id = reservas.servicio_id"
+        ") WHERE tutor_id IS NULL"
+    )
+
+    fks = sa.inspect(op.get_bind()).get_foreign_keys('reservas')
+    with op.batch_alter_table('reservas', table_args=CHECKS_RESERVAS) as batch_op:
+        batch_op.alter_column('tutor_id', existing_type=sa.Integer(), nullable=False)
+        if not any(fk["constrained_columns"] == ['tutor_id'] for fk in fks):
+            batch_op.create_foreign_key('fk_reservas_tutor_id_usuarios', 'usuarios', ['tutor_id'], ['id'])
+
+    if not _indice_existe('reservas', 'ix_reservas_tutor_fecha'):
+        op.create_index('ix_reservas_tutor_fecha', 'reservas', ['tutor_id', 'fecha'])
+    if not _indice_existe('reservas', 'ix_reservas_tutor_fecha_activas'):
+        op.create_index('ix_reservas_tutor_fecha_activas', 'reservas', ['tutor_id', 'fecha', 'hora_inicio'],
+                        postgresql_where=sa.text(PREDICADO_ACTIVAS),
+                        sqlite_where=sa.text(PREDICADO_ACTIVAS),
+                        mssql_where=sa.text(PREDICADO_ACTIVAS))
+
+
+def downgrade():
+    op.drop_index('ix_reservas_tutor_fecha_activas', table_name='reservas')
+    op.drop_index('ix_reservas_tutor_fecha', table_name='reservas')
+    with op.batch_alter_table('reservas', table_args=CHECKS_RESERVAS) as batch_op:
+        batch_op.drop_constraint('fk_reservas_tutor_id_usuarios', type_='foreignkey')
+        batch_op.drop_column('tutor_id')
+    op.create_index('ix_reservas_servicio_fecha_activas', 'reservas', ['servicio_id', 'fecha', 'hora_inicio'],
+                    postgresql_where=sa.text(PREDICADO_ACTIVAS),
+                    sqlite_where=sa.text(PREDICADO_ACTIVAS),
+                    mssql_where=sa.text(PREDICADO_ACTIVAS))
@@ -0,0 +1,32 @@
+"""índice de calificaciones por fecha
+
+El listado de calificaciones por rango de fechas (/calificaciones/date-range) filtra por
+calificaciones.fecha y ordena por ella para paginar; sin índice recorría la tabla completa
+y ordenaba todas las filas antes de devolver la primera página.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 12:41:52.104377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def _indice_existe(tabla, indice):
+    return any(i["name"] == indice for i in sa.inspect(op.get_bind()).get_indexes(tabla))
+
+
+def upgrade():
+    if not _indice_existe('calificaciones', 'ix_calificaciones_fecha'):
+        op.create_index('ix_calificaciones_fecha', 'calificaciones', ['fecha'])
+
+
+def downgrade():
+    op.drop_index('ix_calificaciones_fecha', table_name='calificaciones')
@@ -0,0 +1,97 @@
+"""resúmenes diarios de los dashboards
+
+Tablas con los agregados por día de reservas, pagos, notificaciones y calificaciones que
+mantiene services/resumenService.py, y la marca de agua de cada resumen. Se llenan en la
+primera ejecución de la tarea (o con `python -m tutowebback.tools.resumenes`).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 13:27:05.318842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def _tabla_existe(tabla):
+    return sa.inspect(op.get_bind()).has_table(tabla)
+
+
+def upgrade():
+    if not _tabla_existe('resumen_diario_reservas'):
+        op.create_table('resumen_diario_reservas',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('estado', sa.String(length=20), nullable=True),
+        sa.Column('cantidad', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_resumen_diario_reservas_dia'), 'resumen_diario_reservas', ['dia'])
+    if not _tabla_existe('resumen_diario_reservas_materia'):
+        op.create_table('resumen_diario_reservas_materia',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('materia_id', sa.Integer(), nullable=True),
+        sa.Column('carrera_id', sa.Integer(), nullable=True),
+        sa.Column('estado', sa.String(length=20), nullable=True),
+        sa.Column('cantidad', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_resumen_diario_reservas_materia_dia'), 'resumen_diario_reservas_materia', ['dia'])
+    if not _tabla_existe('resumen_diario_pagos'):
+        op.create_table('resumen_diario_pagos',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('metodo_pago', sa.String(length=50), nullable=True),
+        sa.Column('estado', sa.String(length=50), nullable=True),
+        sa.Column('cantidad', sa.Integer(), nullable=False),
+        sa.Column('monto', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_resumen_diario_pagos_dia'), 'resumen_diario_pagos', ['dia'])
+    if not _tabla_existe('resumen_diario_notificaciones'):
+        op.create_table('resumen_diario_notificaciones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('tipo', sa.String(length=50), nullable=True),
+        sa.Column('leida', sa.Boolean(), nullable=True),
+        sa.Column('cantidad', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_resumen_diario_notificaciones_dia'), 'resumen_diario_notificaciones', ['dia'])
+    if not _tabla_existe('resumen_diario_calificaciones'):
+        op.create_table('resumen_diario_calificaciones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('puntuacion', sa.Integer(), nullable=True),
+        sa.Column('cantidad', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_resumen_diario_calificaciones_dia'), 'resumen_diario_calificaciones', ['dia'])
+    if not _tabla_existe('resumen_estado'):
+        op.create_table('resumen_estado',
+        sa.Column('nombre', sa.String(length=50), nullable=False),
+        sa.Column('procesado_hasta', sa.Date(), nullable=True),
+        sa.Column('fecha_actualizacion', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('nombre')
+        )
+
+
+def downgrade():
+    op.drop_table('resumen_estado')
+    op.drop_index(op.f('ix_resumen_diario_calificaciones_dia'), table_name='resumen_diario_calificaciones')
+    op.drop_table('resumen_diario_calificaciones')
+    op.drop_index(op.f('ix_resumen_diario_notificaciones_dia'), table_name='resumen_diario_notificaciones')
+    op.drop_table('resumen_diario_notificaciones')
+    op.drop_index(op.f('ix_resumen_diario_pagos_dia'), table_name='resumen_diario_pagos')
+    op.drop_table('resumen_diario_pagos')
+    op.drop_index(op.f('ix_resumen_diario_reservas_materia_dia'), table_name='resumen_diario_reservas_materia')
+    op.drop_table('resumen_diario_reservas_materia')
+    op.drop_index(op.f('ix_resumen_diario_reservas_dia'), table_name='resumen_diario_reservas')
+    op.drop_table('resumen_diario_reservas')
@@ -0,0 +1,33 @@
+"""reintentos con espera en el outbox de notificaciones
+
+Una fila del outbox que falla se reintentaba en cada vaciado (cada pocos segundos), de modo
+que un error transitorio agotaba todos los intentos casi de inmediato. proximo_intento guarda
+desde cuándo se puede volver a tomar, con espera exponencial entre intentos.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 16:05:37.530218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def _columna_existe(tabla, columna):
+    return any(c["name"] == columna for c in sa.inspect(op.get_bind()).get_columns(tabla))
+
+
+def upgrade():
+    if not _columna_existe('notificaciones_outbox', 'proximo_intento'):
+        op.add_column('notificaciones_outbox', sa.Column('proximo_intento', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('notificaciones_outbox') as batch_op:
+        batch_op.drop_column('proximo_intento')
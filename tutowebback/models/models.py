@@ -1,11 +1,27 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Float, DateTime, Text, Date, Time, CheckConstraint, \
-    UniqueConstraint, Numeric
+    UniqueConstraint, Numeric, Index, LargeBinary, bindparam, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, selectinload
 from datetime import datetime, date, time
+import json
+import zlib
 
 Base = declarative_base()
 
+# Estados en los que una reserva ocupa el horario del tutor
+ESTADOS_RESERVA_ACTIVOS = ("pendiente", "confirmada")
+_PREDICADO_RESERVA_ACTIVA = "estado IN ('pendiente', 'confirmada')"
+
+
+def miniatura_foto_perfil(foto_perfil):
+    """
+    Ruta de la miniatura WebP generada junto a la foto de perfil
+    (las fotos previas al pipeline de variantes no tienen miniatura)
+    """
+    if not foto_perfil or not foto_perfil.endswith(".webp") or foto_perfil.endswith("_original.webp"):
+        return foto_perfil
+    return foto_perfil[:-len(".webp")] + "_thumb.webp"
+
 
 class Rol(Base):
     __tablename__ = 'roles'
@@ -49,8 +65,8 @@ class MateriasXCarreraXUsuario(Base):
     id = Column(Integer, primary_key=True)
     estado = Column(Boolean, nullable=False)
     usuario_id = Column(Integer, ForeignKey('usuarios.id'), nullable=False)
-    materia_id = Column(Integer, ForeignKey('materias.id'), nullable=False)
-    carrera_id = Column(Integer, ForeignKey('carreras.id'), nullable=False)
+    materia_id = Column(Integer, ForeignKey('materias.id'), nullable=False, index=True)
+    carrera_id = Column(Integer, ForeignKey('carreras.id'), nullable=False, index=True)
     # Relationships
     usuario = relationship("Usuario", backref="materias")
     materia = relationship("Materia", backref="usuarios")
@@ -82,9 +98,9 @@ class Usuario(Base):
     activo = Column(Boolean, default=True)
     puntuacion_promedio = Column(Numeric(3, 2), default=0)
     cantidad_reseñas = Column(Integer, default=0)
-    foto_perfil = Column(String(255), nullable=True)
+    foto_perfil = Column(String(255), nullable=True, index=True)
     # Campo para relación con rol (manteniéndolo como ya lo generamos)
-    id_rol = Column(Integer, ForeignKey('roles.id'), nullable=True)
+    id_rol = Column(Integer, ForeignKey('roles.id'), nullable=True, index=True)
 
     # Relationships
     rol = relationship("Rol", back_populates="usuarios")
@@ -99,6 +115,20 @@ class Usuario(Base):
     notificaciones = relationship("Notificacion", back_populates="usuario")
     dispositivos = relationship("DispositivoUsuario", back_populates="usuario")
 
+    @classmethod
+    def opciones_resumen(cls, desde=None):
+        """
+        Carga anticipada que necesita `to_dict_usuario` (rol y carreras con su nombre). Sin ella
+        cada usuario serializado dispara 1 + 2N cargas diferidas; toda consulta cuyos usuarios
+        terminen en `to_dict_usuario` debe incluirla. `desde` encadena las opciones a la relación
+        por la que se llega al usuario, p. ej. `joinedload(ServicioTutoria.tutor)`.
+        """
+        opciones = (
+            selectinload(cls.rol),
+            selectinload(cls.carreras).selectinload(CarreraUsuario.carrera),
+        )
+        return (desde.options(*opciones),) if desde is not None else opciones
+
     def to_dict_usuario(self):
         return {
             "id": self.id,
@@ -109,6 +139,7 @@ class Usuario(Base):
             "puntuacion_promedio": float(self.puntuacion_promedio) if self.puntuacion_promedio else 0,
             "cantidad_reseñas": self.cantidad_reseñas,
             "foto_perfil": self.foto_perfil,
+            "foto_perfil_thumb": miniatura_foto_perfil(self.foto_perfil),
             "rol": {
                 "id": self.rol.id,
                 "nombre": self.rol.nombre
@@ -127,8 +158,8 @@ class CarreraUsuario(Base):
     __tablename__ = 'carrera_usuario'
 
     id = Column(Integer, primary_key=True)
-    usuario_id = Column(Integer, ForeignKey('usuarios.id', ondelete='CASCADE'), nullable=False)
-    carrera_id = Column(Integer, ForeignKey('carreras.id', ondelete='CASCADE'), nullable=False)
+    usuario_id = Column(Integer, ForeignKey('usuarios.id', ondelete='CASCADE'), nullable=False, index=True)
+    carrera_id = Column(Integer, ForeignKey('carreras.id', ondelete='CASCADE'), nullable=False, index=True)
 
     # Relationships
     usuario = relationship("Usuario", back_populates="carreras")
@@ -147,7 +178,7 @@ class Materia(Base):
 
     id = Column(Integer, primary_key=True)
     nombre = Column(String(100), nullable=False)
-    carrera_id = Column(Integer, ForeignKey('carreras.id', ondelete='CASCADE'), nullable=False)
+    carrera_id = Column(Integer, ForeignKey('carreras.id', ondelete='CASCADE'), nullable=False, index=True)
     descripcion = Column(Text, nullable=True)
     año_plan = Column(Integer, nullable=True)
 
@@ -170,7 +201,7 @@ class ServicioTutoria(Base):
 
     id = Column(Integer, primary_key=True)
     tutor_id = Column(Integer, ForeignKey('usuarios.id', ondelete='CASCADE'), nullable=False)
-    materia_id = Column(Integer, ForeignKey('materias.id', ondelete='CASCADE'), nullable=False)
+    materia_id = Column(Integer, ForeignKey('materias.id', ondelete='CASCADE'), nullable=False, index=True)
     precio = Column(Numeric(10, 2), nullable=False)
     descripcion = Column(Text, nullable=True)
     modalidad = Column(String(50))
@@ -214,6 +245,8 @@ class Disponibilidad(Base):
     __table_args__ = (
         CheckConstraint("dia_semana BETWEEN 1 AND 7"),
         CheckConstraint("hora_inicio < hora_fin"),
+        # Disponibilidad del tutor por día (también cubre la clave foránea tutor_id)
+        Index('ix_disponibilidad_tutor_dia', 'tutor_id', 'dia_semana'),
     )
 
     # Relationships
@@ -235,6 +268,8 @@ class Reserva(Base):
     id = Column(Integer, primary_key=True)
     estudiante_id = Column(Integer, ForeignKey('usuarios.id'), nullable=False)
     servicio_id = Column(Integer, ForeignKey('servicios_tutoria.id'), nullable=False)
+    # Copia de servicio.tutor_id (el tutor de un servicio no cambia) para filtrar sin pasar por servicios_tutoria
+    tutor_id = Column(Integer, ForeignKey('usuarios.id'), nullable=False)
     fecha = Column(Date, nullable=False)
     hora_inicio = Column(Time, nullable=False)
     hora_fin = Column(Time, nullable=False)
@@ -246,8 +281,32 @@ class Reserva(Base):
     __table_args__ = (
         CheckConstraint("estado IN ('pendiente', 'confirmada', 'completada', 'cancelada')"),
         CheckConstraint("hora_inicio < hora_fin"),
+        Index('ix_reservas_estado_fecha', 'estado', 'fecha'),
+        # Índice parcial para los chequeos de solapamiento del tutor (solo reservas activas)
+        Index('ix_reservas_tutor_fecha_activas', 'tutor_id', 'fecha', 'hora_inicio',
+              postgresql_where=text(_PREDICADO_RESERVA_ACTIVA),
+              sqlite_where=text(_PREDICADO_RESERVA_ACTIVA),
+              mssql_where=text(_PREDICADO_RESERVA_ACTIVA)),
+        # Vistas del estudiante y próxima reserva confirmada
+        Index('ix_reservas_estudiante_estado_fecha', 'estudiante_id', 'estado', 'fecha', 'hora_inicio'),
+        # Vistas del tutor
+        Index('ix_reservas_tutor_fecha', 'tutor_id', 'fecha'),
+        # Reservas de un servicio (también cubre la clave foránea servicio_id)
+        Index('ix_reservas_servicio_fecha', 'servicio_id', 'fecha'),
     )
 
+    @classmethod
+    def activa(cls):
+        """
+        Filtro de reservas que ocupan horario (pendientes o confirmadas).
+        Los estados se renderizan como literales: con parámetros el planificador no puede
+        probar que la consulta cumple el WHERE del índice parcial (ix_reservas_tutor_fecha_activas)
+        y no lo usa.
+        """
+        return cls.estado.in_(
+            bindparam("estados_activos", list(ESTADOS_RESERVA_ACTIVOS), expanding=True, literal_execute=True)
+        )
+
     # Relationships
     estudiante = relationship("Usuario", foreign_keys=[estudiante_id], back_populates="reservas_estudiante")
     servicio = relationship("ServicioTutoria", back_populates="reservas")
@@ -261,6 +320,7 @@ class Reserva(Base):
             "id": self.id,
             "estudiante_id": self.estudiante_id,
             "servicio_id": self.servicio_id,
+            "tutor_id": self.tutor_id,
             "fecha": self.fecha.isoformat() if self.fecha else None,
             "hora_inicio": self.hora_inicio.isoformat() if self.hora_inicio else None,
             "hora_fin": self.hora_fin.isoformat() if self.hora_fin else None,
@@ -273,7 +333,7 @@ class ReservaActions(Base):
     __tablename__ = 'reserva_actions'
 
     id = Column(Integer, primary_key=True)
-    reserva_id = Column(Integer, ForeignKey('reservas.id', ondelete='CASCADE'), nullable=False)
+    reserva_id = Column(Integer, ForeignKey('reservas.id', ondelete='CASCADE'), nullable=False, index=True)
     tutor_opened = Column(Boolean, default=False)
     estudiante_opened = Column(Boolean, default=False)
 
@@ -292,7 +352,7 @@ class Pago(Base):
     __tablename__ = 'pagos'
 
     id = Column(Integer, primary_key=True)
-    reserva_id = Column(Integer, ForeignKey('reservas.id', ondelete='CASCADE'), nullable=False)
+    reserva_id = Column(Integer, ForeignKey('reservas.id', ondelete='CASCADE'), nullable=False, index=True)
     monto = Column(Numeric(10, 2), nullable=False)
     metodo_pago = Column(String(50))
     estado = Column(String(50))
@@ -326,16 +386,18 @@ class Calificacion(Base):
     __tablename__ = 'calificaciones'
 
     id = Column(Integer, primary_key=True)
-    reserva_id = Column(Integer, ForeignKey('reservas.id', ondelete='CASCADE'), nullable=False)
-    calificador_id = Column(Integer, ForeignKey('usuarios.id'), nullable=False)
-    calificado_id = Column(Integer, ForeignKey('usuarios.id'), nullable=False)
+    reserva_id = Column(Integer, ForeignKey('reservas.id', ondelete='CASCADE'), nullable=False, index=True)
+    calificador_id = Column(Integer, ForeignKey('usuarios.id'), nullable=False, index=True)
+    calificado_id = Column(Integer, ForeignKey('usuarios.id'), nullable=False, index=True)
     puntuacion = Column(Integer)
     comentario = Column(Text, nullable=True)
     fecha = Column(DateTime, default=datetime.utcnow)
 
-    # Check constraints
+    # Check constraints and indexes
     __table_args__ = (
         CheckConstraint("puntuacion BETWEEN 1 AND 5"),
+        # Listado por rango de fechas del admin: filtra y ordena por fecha
+        Index('ix_calificaciones_fecha', 'fecha'),
     )
 
     # Relationships
@@ -366,11 +428,13 @@ class Notificacion(Base):
     leida = Column(Boolean, default=False)
     fecha_creacion = Column(DateTime, default=datetime.utcnow)
     fecha_programada = Column(DateTime, nullable=True)
-    reserva_id = Column(Integer, ForeignKey('reservas.id', ondelete='SET NULL'), nullable=True)
+    reserva_id = Column(Integer, ForeignKey('reservas.id', ondelete='SET NULL'), nullable=True, index=True)
 
-    # Check constraints
+    # Check constraints and indexes
     __table_args__ = (
         CheckConstraint("tipo IN ('reserva', 'pago', 'recordatorio', 'sistema')"),
+        Index('ix_notificaciones_usuario_fecha', 'usuario_id', 'fecha_creacion'),
+        Index('ix_notificaciones_fecha', 'fecha_creacion'),
     )
 
     # Relationships
@@ -396,7 +460,7 @@ class DispositivoUsuario(Base):
 
     id = Column(Integer, primary_key=True)
     usuario_id = Column(Integer, ForeignKey('usuarios.id', ondelete='CASCADE'), nullable=False)
-    token_dispositivo = Column(String(255), nullable=False)
+    token_dispositivo = Column(String(255), nullable=False, index=True)
     plataforma = Column(String(20))
     ultimo_acceso = Column(DateTime, default=datetime.utcnow)
 
@@ -416,4 +480,124 @@ class DispositivoUsuario(Base):
             "token_dispositivo": self.token_dispositivo,
             "plataforma": self.plataforma,
             "ultimo_acceso": self.ultimo_acceso.isoformat() if self.ultimo_acceso else None
-        }
\ No newline at end of file
+        }
+
+class NotificacionOutbox(Base):
+    __tablename__ = 'notificaciones_outbox'
+
+    id = Column(Integer, primary_key=True)
+    usuario_id = Column(Integer, ForeignKey('usuarios.id', ondelete='CASCADE'), nullable=False, index=True)
+    titulo = Column(String(100), nullable=False)
+    mensaje = Column(Text, nullable=False)
+    tipo = Column(String(50))
+    fecha_creacion = Column(DateTime, default=datetime.utcnow)
+    fecha_programada = Column(DateTime, nullable=True)
+    reserva_id = Column(Integer, ForeignKey('reservas.id', ondelete='SET NULL'), nullable=True, index=True)
+    intentos = Column(Integer, default=0)
+    # Después de un intento fallido, la fila no se vuelve a tomar hasta esta fecha
+    proximo_intento = Column(DateTime, nullable=True)
+
+    # Check constraints
+    __table_args__ = (
+        CheckConstraint("tipo IN ('reserva', 'pago', 'recordatorio', 'sistema')"),
+    )
+
+    def to_dict_notificacion_outbox(self):
+        return {
+            "id": self.id,
+            "usuario_id": self.usuario_id,
+            "titulo": self.titulo,
+            "mensaje": self.mensaje,
+            "tipo": self.tipo,
+            "fecha_creacion": self.fecha_creacion.isoformat() if self.fecha_creacion else None,
+            "fecha_programada": self.fecha_programada.isoformat() if self.fecha_programada else None,
+            "reserva_id": self.reserva_id,
+            "intentos": self.intentos,
+            "proximo_intento": self.proximo_intento.isoformat() if self.proximo_intento else None
+        }
+
+
+class NotificacionArchivada(Base):
+    __tablename__ = 'notificaciones_archivo'
+
+    # Conserva el id original; sin claves foráneas para no atar el archivo al ciclo de vida de usuarios y reservas
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    usuario_id = Column(Integer, nullable=False, index=True)
+    fecha_creacion = Column(DateTime, index=True)
+    fecha_archivado = Column(DateTime, default=datetime.utcnow)
+    contenido = Column(LargeBinary, nullable=False)  # JSON de la notificación comprimido con zlib
+
+    def to_dict_notificacion_archivada(self):
+        return {
+            **json.loads(zlib.decompress(self.contenido).decode("utf-8")),
+            "fecha_archivado": self.fecha_archivado.isoformat() if self.fecha_archivado else None
+        }
+
+
+# Resúmenes diarios de los dashboards de administración (ver services/resumenService.py).
+# Sin claves foráneas: son datos derivados que se recalculan por día.
+class ResumenDiarioReservas(Base):
+    __tablename__ = 'resumen_diario_reservas'
+
+    id = Column(Integer, primary_key=True)
+    dia = Column(Date, nullable=False, index=True)
+    estado = Column(String(20))
+    cantidad = Column(Integer, nullable=False)
+
+
+class ResumenDiarioReservasMateria(Base):
+    __tablename__ = 'resumen_diario_reservas_materia'
+
+    # Tiene muchas más filas que resumen_diario_reservas: solo la leen los rankings por materia y carrera
+    id = Column(Integer, primary_key=True)
+    dia = Column(Date, nullable=False, index=True)
+    materia_id = Column(Integer)
+    carrera_id = Column(Integer)
+    estado = Column(String(20))
+    cantidad = Column(Integer, nullable=False)
+
+
+class ResumenDiarioPagos(Base):
+    __tablename__ = 'resumen_diario_pagos'
+
+    id = Column(Integer, primary_key=True)
+    dia = Column(Date, nullable=False, index=True)
+    metodo_pago = Column(String(50))
+    estado = Column(String(50))
+    cantidad = Column(Integer, nullable=False)
+    monto = Column(Numeric(14, 2), nullable=False)
+
+
+class ResumenDiarioNotificaciones(Base):
+    __tablename__ = 'resumen_diario_notificaciones'
+
+    id = Column(Integer, primary_key=True)
+    dia = Column(Date, nullable=False, index=True)
+    tipo = Column(String(50))
+    leida = Column(Boolean)
+    cantidad = Column(Integer, nullable=False)
+
+
+class ResumenDiarioCalificaciones(Base):
+    __tablename__ = 'resumen_diario_calificaciones'
+
+    id = Column(Integer, primary_key=True)
+    dia = Column(Date, nullable=False, index=True)
+    puntuacion = Column(Integer)
+    cantidad = Column(Integer, nullable=False)
+
+
+class ResumenEstado(Base):
+    __tablename__ = 'resumen_estado'
+
+    # Marca de agua de cada resumen: los días anteriores a procesado_hasta ya están calculados
+    nombre = Column(String(50), primary_key=True)
+    procesado_hasta = Column(Date, nullable=True)
+    fecha_actualizacion = Column(DateTime, nullable=True)
+
+    def to_dict_resumen_estado(self):
+        return {
+            "nombre": self.nombre,
+            "procesado_hasta": self.procesado_hasta.isoformat() if self.procesado_hasta else None,
+            "fecha_actualizacion": self.fecha_actualizacion.isoformat() if self.fecha_actualizacion else None
+        }
@@ -120,6 +120,7 @@ class MateriaBase(BaseModel):
     nombre: str
     carrera_id: int
     descripcion: Optional[str] = None
+    año_plan: Optional[int] = Field(None, ge=1, le=10)
 
 class MateriaCreate(MateriaBase):
     pass
@@ -128,6 +129,7 @@ class MateriaUpdate(BaseModel):
     nombre: Optional[str] = None
     carrera_id: Optional[int] = None
     descripcion: Optional[str] = None
+    año_plan: Optional[int] = Field(None, ge=1, le=10)
 
 class Materia(MateriaBase):
     id: int
@@ -136,6 +138,20 @@ class Materia(MateriaBase):
     class Config:
         from_attributes = True
 
+# Esquemas para la importación masiva del catálogo (carreras y materias de un plan de estudios)
+class CarreraImportacion(BaseModel):
+    nombre: str = Field(..., min_length=1, max_length=100)
+    descripcion: Optional[str] = None
+    facultad: Optional[str] = Field(None, max_length=100)
+
+class MateriaImportacion(BaseModel):
+    nombre: str = Field(..., min_length=1, max_length=100)
+    # La carrera se indica por nombre (puede venir en la misma importación) o por id
+    carrera: Optional[str] = None
+    carrera_id: Optional[int] = None
+    descripcion: Optional[str] = None
+    año_plan: Optional[int] = Field(None, ge=1, le=10)
+
 # Esquemas para ServicioTutoria
 class ServicioTutoriaBase(BaseModel):
     tutor_id: int
@@ -254,6 +270,13 @@ class ReservaUpdate(BaseModel):
             raise ValueError('hora_fin must be after hora_inicio')
         return v
 
+class ReservaTransicion(BaseModel):
+    reserva_id: int
+    estado: str = Field(..., pattern="^(pendiente|confirmada|completada|cancelada)$")
+
+class ReservasBulkTransitionRequest(BaseModel):
+    transiciones: List[ReservaTransicion] = Field(..., min_length=1, max_length=500)
+
 class Reserva(ReservaBase):
     id: int
     fecha_creacion: datetime
@@ -397,6 +420,10 @@ class DispositivoUsuarioBase(BaseModel):
 class DispositivoUsuarioCreate(DispositivoUsuarioBase):
     pass
 
+class DispositivoUsuarioRegistro(BaseModel):
+    token_dispositivo: str = Field(..., min_length=1, max_length=255)
+    plataforma: str = Field(..., pattern="^(web|android|ios)$")
+
 class DispositivoUsuarioUpdate(BaseModel):
     token_dispositivo: Optional[str] = None
     plataforma: Optional[str] = None
@@ -0,0 +1,156 @@
+import os
+import shutil
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+IMAGENES_ALMACENAMIENTO = os.getenv("IMAGENES_ALMACENAMIENTO", "local")
+IMAGENES_S3_BUCKET = os.getenv("IMAGENES_S3_BUCKET", "tutoweb-imagenes")
+IMAGENES_S3_ENDPOINT = os.getenv("IMAGENES_S3_ENDPOINT")  # MinIO u otro servicio compatible
+IMAGENES_URL_PUBLICA = os.getenv("IMAGENES_URL_PUBLICA")  # CDN o URL pública del bucket
+
+CACHE_CONTROL_INMUTABLE = "public, max-age=31536000, immutable"
+
+# Códigos de error de S3 que significan que el objeto no existe (head_object devuelve 404 sin cuerpo)
+CODIGOS_NO_ENCONTRADO = ("404", "NoSuchKey", "NotFound")
+
+
+class AlmacenamientoImagenes(ABC):
+    """
+    Interfaz de almacenamiento de imágenes. Las claves son rutas relativas
+    (por ejemplo `profile_images/ab/<hash>.webp`).
+    """
+
+    @abstractmethod
+    def existe(self, clave: str) -> bool:
+        pass
+
+    @abstractmethod
+    def guardar(self, clave: str, ruta_local: str, content_type: str):
+        """
+        Sube el archivo local a la clave indicada. El archivo local puede ser movido o eliminado.
+        """
+
+    @abstractmethod
+    def listar(self, prefijo: str) -> list:
+        pass
+
+    @abstractmethod
+    def eliminar(self, clave: str):
+        pass
+
+    @abstractmethod
+    def url(self, clave: str) -> str:
+        pass
+
+    @abstractmethod
+    def clave_desde_url(self, url: str):
+        """
+        Clave correspondiente a una URL devuelta por `url`, o None si no pertenece a este almacenamiento
+        """
+
+
+class AlmacenamientoLocal(AlmacenamientoImagenes):
+    """
+    Guarda las imágenes en el directorio de uploads servido por la propia API
+    """
+
+    def __init__(self, base_dir: Path, url_base: str = "/uploads"):
+        self.base_dir = Path(base_dir)
+        self.url_base = url_base.rstrip("/")
+
+    def _ruta(self, clave: str) -> Path:
+        return self.base_dir / clave
+
+    def existe(self, clave):
+        return self._ruta(clave).is_file()
+
+    def guardar(self, clave, ruta_local, content_type):
+        destino = self._ruta(clave)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(ruta_local, destino)
+
+    def listar(self, prefijo):
+        ruta = self._ruta(prefijo)
+        if not ruta.parent.is_dir():
+            return []
+        return [
+            str(archivo.relative_to(self.base_dir).as_posix())
+            for archivo in ruta.parent.iterdir()
+            if archivo.name.startswith(ruta.name)
+        ]
+
+    def eliminar(self, clave):
+        ruta = self._ruta(clave)
+        if ruta.exists():
+            os.remove(ruta)
+
+    def url(self, clave):
+        return f"{self.url_base}/{clave}"
+
+    def clave_desde_url(self, url):
+        if url.startswith(self.url_base + "/"):
+            return url[len(self.url_base) + 1:]
+        return None
+
+
+class AlmacenamientoS3(AlmacenamientoImagenes):
+    """
+    Guarda las imágenes en un bucket compatible con S3. `cliente` debe exponer la interfaz
+    de boto3 (head_object, upload_file, list_objects_v2, delete_object y exceptions.ClientError).
+    Las imágenes se sirven desde IMAGENES_URL_PUBLICA, sin pasar por la API.
+    """
+
+    def __init__(self, cliente, bucket: str, url_publica: str):
+        self.cliente = cliente
+        self.bucket = bucket
+        self.url_publica = url_publica.rstrip("/")
+
+    def existe(self, clave):
+        try:
+            self.cliente.head_object(Bucket=self.bucket, Key=clave)
+            return True
+        except self.cliente.exceptions.ClientError as e:
+            # Solo "no existe" es False; permisos, red o bucket inexistente se propagan
+            if e.response.get("Error", {}).get("Code") in CODIGOS_NO_ENCONTRADO:
+                return False
+            raise
+
+    def guardar(self, clave, ruta_local, content_type):
+        self.cliente.upload_file(
+            ruta_local, self.bucket, clave,
+            ExtraArgs={"ContentType": content_type, "CacheControl": CACHE_CONTROL_INMUTABLE}
+        )
+        os.remove(ruta_local)
+
+    def listar(self, prefijo):
+        respuesta = self.cliente.list_objects_v2(Bucket=self.bucket, Prefix=prefijo)
+        return [objeto["Key"] for objeto in respuesta.get("Contents", [])]
+
+    def eliminar(self, clave):
+        self.cliente.delete_object(Bucket=self.bucket, Key=clave)
+
+    def url(self, clave):
+        return f"{self.url_publica}/{clave}"
+
+    def clave_desde_url(self, url: str):
+        if url.startswith(self.url_publica + "/"):
+            return url[len(self.url_publica) + 1:]
+        return None
+
+
+def crear_almacenamiento(base_dir: Path) -> AlmacenamientoImagenes:
+    """
+    Crea el backend de almacenamiento según IMAGENES_ALMACENAMIENTO (local o s3). Una
+    configuración inválida falla al iniciar en lugar de guardar las imágenes en otro lado.
+    """
+    if IMAGENES_ALMACENAMIENTO not in ("local", "s3"):
+        raise RuntimeError(f"IMAGENES_ALMACENAMIENTO inválido: {IMAGENES_ALMACENAMIENTO}. Use local o s3")
+    if IMAGENES_ALMACENAMIENTO == "s3":
+        try:
+            import boto3
+        except ImportError:
+            raise RuntimeError("IMAGENES_ALMACENAMIENTO=s3 requiere boto3, que no está instalado")
+        cliente = boto3.client("s3", endpoint_url=IMAGENES_S3_ENDPOINT)
+        url_publica = IMAGENES_URL_PUBLICA or f"{IMAGENES_S3_ENDPOINT or 'https://s3.amazonaws.com'}/{IMAGENES_S3_BUCKET}"
+        return AlmacenamientoS3(cliente, IMAGENES_S3_BUCKET, url_publica)
+    return AlmacenamientoLocal(base_dir)
@@ -1,6 +1,7 @@
 import os
 import sys
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session, joinedload, aliased
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 import logging
@@ -9,8 +10,11 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.models import models
 from tutowebback.schemas import schemas
-from tutowebback.services import notificacionService
+from tutowebback.services import notificacionOutboxService
 
+# Paginación del listado de calificaciones por rango de fechas (panel de reseñas del admin)
+CALIFICACIONES_POR_PAGINA = int(os.getenv("CALIFICACIONES_POR_PAGINA", "100"))
+CALIFICACIONES_POR_PAGINA_MAXIMO = 1000
 
 class CalificacionService:
     def create_calificacion(self, db: Session, calificacion: schemas.CalificacionCreate, calificador_id: int):
@@ -64,40 +68,30 @@ class CalificacionService:
             )
 
             db.add(db_calificacion)
+
+            # Encolar notificación al tutor en la misma transacción
+            servicio = db.query(models.ServicioTutoria).options(
+                joinedload(models.ServicioTutoria.materia)
+            ).filter(
+                models.ServicioTutoria.id == reserva.servicio_id
+            ).first()
+            materia_nombre = servicio.materia.nombre if servicio and servicio.materia else "una materia"
+
+            notificacionOutboxService.encolar_notificacion(
+                db=db,
+                usuario_id=calificacion.calificado_id,
+                titulo="Nueva calificación recibida",
+                mensaje=f"Has recibido una calificación de {calificacion.puntuacion} estrellas para tu tutoría de {materia_nombre}",
+                tipo="sistema",
+                reserva_id=reserva.id
+            )
+
             db.commit()
             db.refresh(db_calificacion)
 
             # Actualizar la puntuación promedio del tutor
             self._update_tutor_rating(db, calificacion.calificado_id)
 
-            # Enviar notificación al tutor
-            try:
-                # Obtener información de la materia para la notificación
-                servicio = db.query(models.ServicioTutoria).filter(
-                    models.ServicioTutoria.id == reserva.servicio_id
-                ).first()
-                
-                materia_nombre = "una materia"
-                if servicio:
-                    materia = db.query(models.Materia).filter(
-                        models.Materia.id == servicio.materia_id
-                    ).first()
-                    if materia:
-                        materia_nombre = materia.nombre
-
-                # Crear notificación para el tutor
-                notificacionService.crear_notificacion(
-                    db=db,
-                    usuario_id=calificacion.calificado_id,
-                    titulo="Nueva calificación recibida",
-                    mensaje=f"Has recibido una calificación de {calificacion.puntuacion} estrellas para tu tutoría de {materia_nombre}",
-                    tipo="sistema",
-                    reserva_id=reserva.id
-                )
-            except Exception as e:
-                # No interrumpir el flujo si falla la notificación
-                logging.error(f"Error creando notificación: {e}")
-
             return db_calificacion
 
         except IntegrityError:
@@ -150,7 +144,7 @@ class CalificacionService:
         Obtiene todas las calificaciones recibidas por un tutor
         """
         return db.query(models.Calificacion).options(
-            joinedload(models.Calificacion.calificador),
+            *models.Usuario.opciones_resumen(joinedload(models.Calificacion.calificador)),
             joinedload(models.Calificacion.reserva)
         ).filter(
             models.Calificacion.calificado_id == tutor_id
@@ -161,7 +155,7 @@ class CalificacionService:
         Obtiene todas las calificaciones realizadas por un estudiante
         """
         return db.query(models.Calificacion).options(
-            joinedload(models.Calificacion.calificado),
+            *models.Usuario.opciones_resumen(joinedload(models.Calificacion.calificado)),
             joinedload(models.Calificacion.reserva)
         ).filter(
             models.Calificacion.calificador_id == estudiante_id
@@ -200,6 +194,37 @@ class CalificacionService:
             logging.error(f"Error getting calificaciones for estudiante reservas: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
  
+    def _filtros_date_range(self, fecha_desde: datetime.date = None, fecha_hasta: datetime.date = None,
+                            usuario_id: int = None):
+        """
+        Condiciones del listado por rango de fechas: solo reservas completadas, últimos 60 días
+        si no se indica fecha_desde, y opcionalmente un usuario (calificador o calificado)
+        """
+        from datetime import datetime, timedelta, time
+
+        filtros = [models.Reserva.estado == "completada"]
+
+        # Aplicar filtro de fechas si se proporcionan
+        if fecha_desde:
+            filtros.append(models.Calificacion.fecha >= fecha_desde)
+        else:
+            # Por defecto, últimos 60 días
+            fecha_desde_default = datetime.utcnow() - timedelta(days=60)
+            filtros.append(models.Calificacion.fecha >= fecha_desde_default)
+
+        if fecha_hasta:
+            # Incluir todo el día hasta las 23:59:59
+            fecha_hasta_end = datetime.combine(fecha_hasta, time(23, 59, 59))
+            filtros.append(models.Calificacion.fecha <= fecha_hasta_end)
+
+        # Filtro opcional por usuario (puede ser calificador o calificado)
+        if usuario_id:
+            filtros.append(
+                (models.Calificacion.calificador_id == usuario_id) |
+                (models.Calificacion.calificado_id == usuario_id)
+            )
+        return filtros
+
     def get_calificaciones_by_date_range(
         self,
         db: Session,
@@ -212,8 +237,6 @@ class CalificacionService:
         Solo incluye calificaciones de reservas completadas.
         """
         try:
-            from datetime import datetime, timedelta, time
-
             # Consulta base con joins para obtener toda la información necesaria
             query = db.query(models.Calificacion).options(
                 joinedload(models.Calificacion.calificador),
@@ -223,29 +246,9 @@ class CalificacionService:
             ).join(
                 models.Reserva, models.Calificacion.reserva_id == models.Reserva.id
             ).filter(
-                models.Reserva.estado == "completada"
+                *self._filtros_date_range(fecha_desde, fecha_hasta, usuario_id)
             )
 
-            # Aplicar filtro de fechas si se proporcionan
-            if fecha_desde:
-                query = query.filter(models.Calificacion.fecha >= fecha_desde)
-            else:
-                # Por defecto, últimos 60 días
-                fecha_desde_default = datetime.utcnow() - timedelta(days=60)
-                query = query.filter(models.Calificacion.fecha >= fecha_desde_default)
-
-            if fecha_hasta:
-                # Incluir todo el día hasta las 23:59:59
-                fecha_hasta_end = datetime.combine(fecha_hasta, time(23, 59, 59))
-                query = query.filter(models.Calificacion.fecha <= fecha_hasta_end)
-
-            # Filtro opcional por usuario (puede ser calificador o calificado)
-            if usuario_id:
-                query = query.filter(
-                    (models.Calificacion.calificador_id == usuario_id) |
-                    (models.Calificacion.calificado_id == usuario_id)
-                )
-
             # Ordenar por fecha descendente (más recientes primero)
             calificaciones = query.order_by(models.Calificacion.fecha.desc()).all()
 
@@ -259,11 +262,16 @@ class CalificacionService:
         db: Session,
         fecha_desde_str: str = None,
         fecha_hasta_str: str = None,
-        usuario_id: int = None
+        usuario_id: int = None,
+        pagina: int = 1,
+        por_pagina: int = None
     ):
         """
-        Obtiene calificaciones filtradas y formateadas para la respuesta.
-        Maneja conversión de fechas y validaciones.
+        Obtiene calificaciones filtradas y formateadas para la respuesta, de a `por_pagina`
+        (todas si es None). Maneja conversión de fechas y validaciones.
+
+        Returns:
+            (calificaciones de la página, total de calificaciones que cumplen el filtro)
         """
         try:
             from datetime import datetime
@@ -288,53 +296,92 @@ class CalificacionService:
             if fecha_desde_obj and fecha_hasta_obj and fecha_desde_obj > fecha_hasta_obj:
                 raise HTTPException(status_code=400, detail="La fecha_desde debe ser anterior a fecha_hasta")
 
-            # Obtener calificaciones usando el método base
-            db_calificaciones = self.get_calificaciones_by_date_range(db, fecha_desde_obj, fecha_hasta_obj, usuario_id)
+            # Mismo filtro que el método base, leído como tuplas con sus joins (sin objetos ORM)
+            calificador = aliased(models.Usuario)
+            calificado = aliased(models.Usuario)
+            filtros = self._filtros_date_range(fecha_desde_obj, fecha_hasta_obj, usuario_id)
+            consulta = (
+                select(
+                    models.Calificacion.id, models.Calificacion.puntuacion, models.Calificacion.comentario,
+                    models.Calificacion.fecha, models.Calificacion.reserva_id,
+                    calificador.id, calificador.nombre, calificador.apellido, calificador.email,
+                    calificado.id, calificado.nombre, calificado.apellido, calificado.email,
+                    calificado.puntuacion_promedio, calificado.cantidad_reseñas,
+                    models.Reserva.fecha, models.Reserva.hora_inicio, models.Reserva.hora_fin,
+                    models.Materia.id, models.Materia.nombre, models.Materia.carrera_id
+                )
+                .join(models.Reserva, models.Calificacion.reserva_id == models.Reserva.id)
+                .outerjoin(calificador, models.Calificacion.calificador_id == calificador.id)
+                .outerjoin(calificado, models.Calificacion.calificado_id == calificado.id)
+                .outerjoin(models.ServicioTutoria, models.Reserva.servicio_id == models.ServicioTutoria.id)
+                .outerjoin(models.Materia, models.ServicioTutoria.materia_id == models.Materia.id)
+                .where(*filtros)
+                # El id desempata calificaciones con la misma fecha: el orden entre páginas es estable
+                .order_by(models.Calificacion.fecha.desc(), models.Calificacion.id.desc())
+            )
+            if por_pagina:
+                consulta = consulta.offset((pagina - 1) * por_pagina).limit(por_pagina)
+            filas = db.execute(consulta).all()
+
+            if not por_pagina or (len(filas) < por_pagina and (filas or pagina == 1)):
+                # Última página: el total se deduce sin contar
+                total = (pagina - 1) * (por_pagina or 0) + len(filas)
+            else:
+                # Conteo aparte, solo con el join que necesitan los filtros: COUNT(*) OVER () en la
+                # consulta de la página obligaba a resolver todos los joins de todas las filas
+                total = db.scalar(
+                    select(func.count()).select_from(models.Calificacion)
+                    .join(models.Reserva, models.Calificacion.reserva_id == models.Reserva.id)
+                    .where(*filtros)
+                )
 
             # Formatear respuesta con información detallada
             calificaciones_response = []
-            for calificacion in db_calificaciones:
-                calificacion_dict = {
-                    "id": calificacion.id,
-                    "puntuacion": calificacion.puntuacion,
-                    "comentario": calificacion.comentario,
-                    "fecha": calificacion.fecha.isoformat() if calificacion.fecha else None,
-                    "reserva_id": calificacion.reserva_id,
+            for (id_, puntuacion, comentario, fecha, reserva_id,
+                 calificador_id, calificador_nombre, calificador_apellido, calificador_email,
+                 calificado_id, calificado_nombre, calificado_apellido, calificado_email,
+                 calificado_promedio, calificado_resenas,
+                 reserva_fecha, reserva_hora_inicio, reserva_hora_fin,
+                 materia_id, materia_nombre, materia_carrera_id) in filas:
+                calificaciones_response.append({
+                    "id": id_,
+                    "puntuacion": puntuacion,
+                    "comentario": comentario,
+                    "fecha": fecha,
+                    "reserva_id": reserva_id,
 
                     # Información del calificador (estudiante)
                     "calificador": {
-                        "id": calificacion.calificador.id,
-                        "nombre": calificacion.calificador.nombre,
-                        "apellido": calificacion.calificador.apellido,
-                        "email": calificacion.calificador.email
-                    } if calificacion.calificador else None,
+                        "id": calificador_id,
+                        "nombre": calificador_nombre,
+                        "apellido": calificador_apellido,
+                        "email": calificador_email
+                    } if calificador_id is not None else None,
 
                     # Información del calificado (tutor)
                     "calificado": {
-                        "id": calificacion.calificado.id,
-                        "nombre": calificacion.calificado.nombre,
-                        "apellido": calificacion.calificado.apellido,
-                        "email": calificacion.calificado.email,
-                        "puntuacion_promedio": float(calificacion.calificado.puntuacion_promedio) if calificacion.calificado.puntuacion_promedio else 0,
-                        "cantidad_reseñas": calificacion.calificado.cantidad_reseñas
-                    } if calificacion.calificado else None,
+                        "id": calificado_id,
+                        "nombre": calificado_nombre,
+                        "apellido": calificado_apellido,
+                        "email": calificado_email,
+                        "puntuacion_promedio": float(calificado_promedio) if calificado_promedio else 0,
+                        "cantidad_reseñas": calificado_resenas
+                    } if calificado_id is not None else None,
 
                     # Información de la reserva y materia
                     "reserva": {
-                        "fecha": calificacion.reserva.fecha.isoformat() if calificacion.reserva and calificacion.reserva.fecha else None,
-                        "hora_inicio": calificacion.reserva.hora_inicio.isoformat() if calificacion.reserva and calificacion.reserva.hora_inicio else None,
-                        "hora_fin": calificacion.reserva.hora_fin.isoformat() if calificacion.reserva and calificacion.reserva.hora_fin else None,
+                        "fecha": reserva_fecha,
+                        "hora_inicio": reserva_hora_inicio,
+                        "hora_fin": reserva_hora_fin,
                         "materia": {
-                            "id": calificacion.reserva.servicio.materia.id,
-                            "nombre": calificacion.reserva.servicio.materia.nombre,
-                            "carrera_id": calificacion.reserva.servicio.materia.carrera_id
-                        } if (calificacion.reserva and calificacion.reserva.servicio and calificacion.reserva.servicio.materia) else None
-                    } if calificacion.reserva else None
-                }
-
-                calificaciones_response.append(calificacion_dict)
-
-            return calificaciones_response
+                            "id": materia_id,
+                            "nombre": materia_nombre,
+                            "carrera_id": materia_carrera_id
+                        } if materia_id is not None else None
+                    }
+                })
+
+            return calificaciones_response, total
 
         except Exception as e:
             logging.error(f"Error getting formatted calificaciones by date range: {e}")
@@ -8,6 +8,7 @@ import logging
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.models import models
 from tutowebback.schemas import schemas
+from tutowebback.services import catalogoCacheService
 
 
 class CarreraService:
@@ -28,6 +29,7 @@ class CarreraService:
 
             db.add(db_carrera)
             db.commit()
+            catalogoCacheService.invalidar("carreras", "materias")
             db.refresh(db_carrera)
             return db_carrera
         except IntegrityError:
@@ -71,6 +73,7 @@ class CarreraService:
                 db_carrera.facultad = carrera.facultad
 
             db.commit()
+            catalogoCacheService.invalidar("carreras", "materias")
             db.refresh(db_carrera)
             return db_carrera
         except IntegrityError:
@@ -110,6 +113,7 @@ class CarreraService:
 
             db.delete(db_carrera)
             db.commit()
+            catalogoCacheService.invalidar("carreras", "materias")
             return True
         except Exception as e:
             db.rollback()
@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+import logging
+
+from fastapi import Response
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.models import models
+from tutowebback.config.respuestas import RespuestaJSON
+
+# Segundos que una entrada sigue válida sin invalidación explícita. Acota cuánto tarda un
+# proceso en ver los cambios hechos desde otro worker (la invalidación es local al proceso)
+CATALOGO_CACHE_TTL = int(os.getenv("CATALOGO_CACHE_TTL", "600"))
+
+CATALOGOS = ("carreras", "materias", "roles")
+
+
+class CatalogoCache:
+    """
+    Caché en memoria para los datos de referencia (carreras, materias, roles), que casi nunca
+    cambian y se leen en cada pantalla. Guarda siempre el resultado ya serializado (dicts), nunca
+    objetos ORM ligados a una sesión.
+
+    Cada catálogo tiene un número de versión que se incrementa al invalidarlo; una carga que
+    empezó antes de la invalidación no se guarda, para no volver a cachear datos viejos.
+    """
+
+    def __init__(self, ttl: float = CATALOGO_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._versiones = {catalogo: 0 for catalogo in CATALOGOS}
+        # (catalogo, clave) -> (version, expira, valor, etag)
+        self._entradas = {}
+
+    def _vigente(self, catalogo: str, clave):
+        entrada = self._entradas.get((catalogo, clave))
+        if entrada is None:
+            return None
+        version, expira, _, _ = entrada
+        if version != self._versiones[catalogo] or expira <= time.monotonic():
+            return None
+        return entrada
+
+    def obtener(self, catalogo: str, clave, cargar):
+        """
+        Devuelve (valor, etag) de la entrada `clave` del catálogo, llamando a `cargar()` si no
+        está en caché o venció. `cargar` debe devolver datos serializables a JSON.
+        """
+        with self._lock:
+            entrada = self._vigente(catalogo, clave)
+            if entrada is not None:
+                return entrada[2], entrada[3]
+            version = self._versiones[catalogo]
+
+        # La carga se hace fuera del lock para no serializar las consultas a la base
+        valor = cargar()
+        etag = calcular_etag(valor)
+
+        with self._lock:
+            if self._versiones[catalogo] == version:
+                self._entradas[(catalogo, clave)] = (version, time.monotonic() + self.ttl, valor, etag)
+        return valor, etag
+
+    def invalidar(self, *catalogos: str):
+        """
+        Descarta todas las entradas de los catálogos indicados
+        """
+        with self._lock:
+            for catalogo in catalogos:
+                self._versiones[catalogo] += 1
+                for llave in [llave for llave in self._entradas if llave[0] == catalogo]:
+                    del self._entradas[llave]
+        logging.debug(f"Caché de catálogos invalidada: {', '.join(catalogos)}")
+
+    def version(self, catalogo: str) -> int:
+        with self._lock:
+            return self._versiones[catalogo]
+
+    def limpiar(self):
+        """
+        Descarta todas las entradas de todos los catálogos
+        """
+        self.invalidar(*CATALOGOS)
+
+
+def calcular_etag(valor) -> str:
+    """
+    ETag débil derivado del contenido: dos procesos con los mismos datos generan el mismo ETag
+    """
+    contenido = json.dumps(valor, sort_keys=True, default=str, ensure_ascii=False)
+    return f'W/"{hashlib.sha1(contenido.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def respuesta_condicional(contenido: dict, etag: str, if_none_match: str = None, publica: bool = False):
+    """
+    Responde 304 sin cuerpo si el cliente ya tiene la versión `etag`; si no, el contenido con su ETag.
+    Cache-Control: no-cache obliga al cliente a revalidar en cada uso, lo que mantiene las
+    respuestas al día aunque el catálogo cambie.
+    """
+    cache_control = f"{'public' if publica else 'private'}, no-cache"
+    if if_none_match:
+        etiquetas = [etiqueta.strip() for etiqueta in if_none_match.split(",")]
+        if "*" in etiquetas or etag in etiquetas or etag[2:] in etiquetas:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return RespuestaJSON(content=contenido, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+catalogo_cache = CatalogoCache()
+
+
+def obtener(catalogo: str, clave, cargar):
+    return catalogo_cache.obtener(catalogo, clave, cargar)
+
+
+def invalidar(*catalogos: str):
+    catalogo_cache.invalidar(*catalogos)
+
+
+def roles_por_nombre(db: Session) -> dict:
+    """
+    Roles indexados por nombre ({nombre: rol serializado})
+    """
+    roles, _ = obtener("roles", "por_nombre",
+                       lambda: {rol.nombre: rol.to_dict_rol() for rol in db.query(models.Rol).all()})
+    return roles
+
+
+def rol_por_id(db: Session, rol_id: int):
+    """
+    Rol serializado con id `rol_id`, o None si no existe
+    """
+    return next((rol for rol in roles_por_nombre(db).values() if rol["id"] == rol_id), None)
+
+
+def carreras_por_id(db: Session) -> dict:
+    """
+    Carreras indexadas por id ({id: carrera serializada})
+    """
+    carreras, _ = obtener("carreras", "por_id",
+                          lambda: {carrera.id: carrera.to_dict_carrera() for carrera in db.query(models.Carrera).all()})
+    return carreras
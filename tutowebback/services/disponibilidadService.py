@@ -83,21 +83,11 @@ class DisponibilidadService:
             if not disponibilidades:
                 return []
 
-            # 4. Obtener servicios del tutor (para buscar reservas)
-            servicios = db.query(models.ServicioTutoria).filter(
-                models.ServicioTutoria.tutor_id == tutor_id,
-                models.ServicioTutoria.activo == True
-            ).all()
-
-            if not servicios:
-                return disponibilidades  # Si no hay servicios, no puede haber reservas
-
-            # 5. Obtener todas las reservas para ese tutor en esa fecha
-            servicio_ids = [servicio.id for servicio in servicios]
+            # 4. Obtener todas las reservas activas del tutor en esa fecha
             reservas = db.query(models.Reserva).filter(
-                models.Reserva.servicio_id.in_(servicio_ids),
+                models.Reserva.tutor_id == tutor_id,
                 models.Reserva.fecha == fecha,
-                models.Reserva.estado.in_(["pendiente", "confirmada"])
+                models.Reserva.activa()
             ).all()
             disponibilidades_disponibles = []
 
@@ -0,0 +1,85 @@
+import os
+import sys
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
+from fastapi import HTTPException
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.models import models
+from tutowebback.schemas import schemas
+
+
+class DispositivoService:
+
+    def _upsert(self, db: Session, valores: dict):
+        dialecto = db.get_bind().dialect.name
+        if dialecto in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialecto == "postgresql" else sqlite.insert
+            stmt = insert(models.DispositivoUsuario).values(**valores)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["usuario_id", "token_dispositivo"],
+                set_={"plataforma": stmt.excluded.plataforma, "ultimo_acceso": stmt.excluded.ultimo_acceso}
+            )
+            db.execute(stmt)
+            return
+
+        # Sin ON CONFLICT (MSSQL): UPDATE y, si no existía, INSERT; una carrera se resuelve por UQ_usuario_token
+        filtro = (
+            models.DispositivoUsuario.usuario_id == valores["usuario_id"],
+            models.DispositivoUsuario.token_dispositivo == valores["token_dispositivo"]
+        )
+        cambios = {"plataforma": valores["plataforma"], "ultimo_acceso": valores["ultimo_acceso"]}
+        if db.query(models.DispositivoUsuario).filter(*filtro).update(cambios, synchronize_session=False):
+            return
+        try:
+            with db.begin_nested():
+                db.add(models.DispositivoUsuario(**valores))
+        except IntegrityError:
+            db.query(models.DispositivoUsuario).filter(*filtro).update(cambios, synchronize_session=False)
+
+    def registrar_dispositivo(self, db: Session, usuario_id: int, dispositivo: schemas.DispositivoUsuarioRegistro):
+        try:
+            # Un token pertenece a un solo usuario: si otro inició sesión antes en el mismo dispositivo se desvincula
+            db.query(models.DispositivoUsuario).filter(
+                models.DispositivoUsuario.token_dispositivo == dispositivo.token_dispositivo,
+                models.DispositivoUsuario.usuario_id != usuario_id
+            ).delete(synchronize_session=False)
+
+            self._upsert(db, {
+                "usuario_id": usuario_id,
+                "token_dispositivo": dispositivo.token_dispositivo,
+                "plataforma": dispositivo.plataforma,
+                "ultimo_acceso": datetime.utcnow()
+            })
+            db.commit()
+
+            return db.query(models.DispositivoUsuario).filter(
+                models.DispositivoUsuario.usuario_id == usuario_id,
+                models.DispositivoUsuario.token_dispositivo == dispositivo.token_dispositivo
+            ).first()
+        except HTTPException:
+            db.rollback()
+            raise
+        except Exception as e:
+            db.rollback()
+            logging.error(f"Error registering dispositivo: {e}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    def get_dispositivos_by_usuario(self, db: Session, usuario_id: int):
+        return db.query(models.DispositivoUsuario).filter(
+            models.DispositivoUsuario.usuario_id == usuario_id
+        ).order_by(models.DispositivoUsuario.ultimo_acceso.desc()).all()
+
+    def delete_dispositivo(self, db: Session, usuario_id: int, token_dispositivo: str):
+        eliminados = db.query(models.DispositivoUsuario).filter(
+            models.DispositivoUsuario.usuario_id == usuario_id,
+            models.DispositivoUsuario.token_dispositivo == token_dispositivo
+        ).delete(synchronize_session=False)
+        if not eliminados:
+            raise HTTPException(status_code=404, detail="Dispositivo not found")
+        db.commit()
+        return eliminados
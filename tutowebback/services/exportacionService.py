@@ -0,0 +1,308 @@
+"""
+Exportación de reservas, pagos y calificaciones en CSV o Parquet.
+
+La exportación se escribe mientras se lee: una única consulta por columnas (sin objetos ORM)
+se recorre en lotes de EXPORTACION_LOTE filas con `yield_per` (cursor del lado del servidor
+en PostgreSQL) y cada lote se codifica y se envía antes de leer el siguiente. La memoria queda
+acotada por el tamaño del lote, sin importar el rango de fechas: no hay un límite de filas.
+
+El rango de fechas se aplica a la fecha de la reserva, a la fecha de creación del pago y a la
+fecha de la calificación.
+
+- CSV: UTF-8, con encabezado; fechas y horas en ISO 8601. Los textos que empiezan con =, +, -,
+  @, tabulación o retorno de carro llevan un apóstrofo adelante, para que una planilla no los
+  interprete como fórmulas (comentarios y datos cargados por usuarios)
+- Parquet: un row group por lote, con el esquema de tipos de cada conjunto. Requiere pyarrow
+  (opcional; sin él solo se ofrece CSV)
+
+El generador abre su propia sesión: la del request (get_db) se cierra antes de que empiece a
+enviarse el cuerpo de la respuesta. Esa sesión retiene una conexión del pool (y en PostgreSQL el
+cursor del servidor) hasta que el cliente termina de descargar, así que una descarga lenta la
+ocupa todo ese tiempo: por eso cada proceso admite hasta EXPORTACION_CONCURRENCIA exportaciones
+simultáneas y responde 429 a las demás, para que no agoten el pool de los requests comunes.
+"""
+import io
+import os
+import csv
+import sys
+import weakref
+import logging
+import threading
+from datetime import date, datetime
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow es opcional: sin él solo se exporta CSV
+    pyarrow = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.config import database
+from tutowebback.models import models
+
+EXPORTACION_LOTE = int(os.getenv("EXPORTACION_LOTE", "10000"))
+# Exportaciones simultáneas por proceso (cada una retiene una conexión del pool)
+EXPORTACION_CONCURRENCIA = max(1, int(os.getenv("EXPORTACION_CONCURRENCIA", "2")))
+
+FORMATOS = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+# Primer carácter con el que una planilla interpreta una celda como fórmula
+_INICIO_FORMULA = ("=", "+", "-", "@", "\t", "\r")
+
+_cupos = threading.BoundedSemaphore(EXPORTACION_CONCURRENCIA)
+
+
+class Conjunto:
+    def __init__(self, nombre: str, columnas: list, desde_tabla, fecha):
+        """
+        Args:
+            nombre: Nombre del conjunto en la URL y en el archivo
+            columnas: Lista de (nombre, expresión, tipo); tipo: entero, texto, fecha, hora, fecha_hora o decimal
+            desde_tabla: Función que recibe el SELECT de las columnas y agrega FROM y joins
+            fecha: Función que devuelve la columna por la que se filtra el rango
+        """
+        self.nombre = nombre
+        self.columnas = columnas
+        self.desde_tabla = desde_tabla
+        self.fecha = fecha
+
+    def consulta(self, desde: date = None, hasta: date = None):
+        fecha = self.fecha()
+        consulta = self.desde_tabla(select(*[expresion.label(nombre) for nombre, expresion, _ in self.columnas]))
+        if desde:
+            consulta = consulta.where(fecha >= desde)
+        if hasta:
+            # Las columnas DateTime incluyen todo el día hasta
+            consulta = consulta.where(fecha <= (hasta if fecha.type.python_type is date
+                                                else datetime.combine(hasta, datetime.max.time())))
+        return consulta.order_by(self.columnas[0][1])
+
+
+def _reservas(consulta):
+    return (
+        consulta.select_from(models.Reserva)
+        .join(models.ServicioTutoria, models.Reserva.servicio_id == models.ServicioTutoria.id)
+        .join(models.Materia, models.ServicioTutoria.materia_id == models.Materia.id)
+    )
+
+
+def _pagos(consulta):
+    return consulta.select_from(models.Pago).join(models.Reserva, models.Pago.reserva_id == models.Reserva.id)
+
+
+def _calificaciones(consulta):
+    return consulta.select_from(models.Calificacion)
+
+
+CONJUNTOS = {
+    conjunto.nombre: conjunto for conjunto in (
+        Conjunto("reservas", [
+            ("id", models.Reserva.id, "entero"),
+            ("fecha", models.Reserva.fecha, "fecha"),
+            ("hora_inicio", models.Reserva.hora_inicio, "hora"),
+            ("hora_fin", models.Reserva.hora_fin, "hora"),
+            ("estado", models.Reserva.estado, "texto"),
+            ("estudiante_id", models.Reserva.estudiante_id, "entero"),
+            ("tutor_id", models.Reserva.tutor_id, "entero"),
+            ("servicio_id", models.Reserva.servicio_id, "entero"),
+            ("materia_id", models.ServicioTutoria.materia_id, "entero"),
+            ("materia", models.Materia.nombre, "texto"),
+            ("carrera_id", models.Materia.carrera_id, "entero"),
+            ("modalidad", models.ServicioTutoria.modalidad, "texto"),
+            ("precio", models.ServicioTutoria.precio, "decimal"),
+            ("fecha_creacion", models.Reserva.fecha_creacion, "fecha_hora"),
+        ], _reservas, lambda: models.Reserva.fecha),
+        Conjunto("pagos", [
+            ("id", models.Pago.id, "entero"),
+            ("reserva_id", models.Pago.reserva_id, "entero"),
+            ("monto", models.Pago.monto, "decimal"),
+            ("metodo_pago", models.Pago.metodo_pago, "texto"),
+            ("estado", models.Pago.estado, "texto"),
+            ("referencia_externa", models.Pago.referencia_externa, "texto"),
+            ("fecha_pago", models.Pago.fecha_pago, "fecha_hora"),
+            ("fecha_creacion", models.Pago.fecha_creacion, "fecha_hora"),
+            ("fecha_reserva", models.Reserva.fecha, "fecha"),
+            ("estudiante_id", models.Reserva.estudiante_id, "entero"),
+            ("tutor_id", models.Reserva.tutor_id, "entero"),
+        ], _pagos, lambda: models.Pago.fecha_creacion),
+        Conjunto("calificaciones", [
+            ("id", models.Calificacion.id, "entero"),
+            ("reserva_id", models.Calificacion.reserva_id, "entero"),
+            ("calificador_id", models.Calificacion.calificador_id, "entero"),
+            ("calificado_id", models.Calificacion.calificado_id, "entero"),
+            ("puntuacion", models.Calificacion.puntuacion, "entero"),
+            ("comentario", models.Calificacion.comentario, "texto"),
+            ("fecha", models.Calificacion.fecha, "fecha_hora"),
+        ], _calificaciones, lambda: models.Calificacion.fecha),
+    )
+}
+
+
+def _tipos_parquet() -> dict:
+    return {
+        "entero": pyarrow.int64(),
+        "texto": pyarrow.string(),
+        "fecha": pyarrow.date32(),
+        "hora": pyarrow.time64("us"),
+        "fecha_hora": pyarrow.timestamp("us"),
+        "decimal": pyarrow.decimal128(14, 2),
+    }
+
+
+def _valor_csv(valor):
+    if valor is None:
+        return ""
+    if hasattr(valor, "isoformat"):
+        return valor.isoformat()
+    if isinstance(valor, str) and valor.startswith(_INICIO_FORMULA):
+        return "'" + valor
+    return valor
+
+
+def _lotes(conjunto: Conjunto, desde: date, hasta: date, lote: int, sesion=None):
+    """
+    Filas del conjunto en listas de hasta `lote` tuplas. Abre (y cierra) su propia sesión salvo
+    que se pase una.
+    """
+    db = sesion or database.SessionLocal()
+    try:
+        resultado = db.execute(conjunto.consulta(desde, hasta).execution_options(yield_per=lote))
+        for filas in resultado.partitions():
+            yield filas
+    finally:
+        if sesion is None:
+            db.close()
+
+
+def escribir_csv(conjunto: Conjunto, desde: date = None, hasta: date = None, lote: int = None, sesion=None):
+    """
+    Genera el CSV del conjunto en bloques de bytes, uno por lote de filas
+    """
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, lineterminator="\n")
+    escritor.writerow([nombre for nombre, _, _ in conjunto.columnas])
+    for filas in _lotes(conjunto, desde, hasta, lote or EXPORTACION_LOTE, sesion):
+        escritor.writerows([_valor_csv(valor) for valor in fila] for fila in filas)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _Salida(io.RawIOBase):
+    """
+    Archivo de solo escritura que acumula lo escrito hasta que se retira: ParquetWriter escribe
+    en él y el generador envía los bytes de cada row group
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._partes = []
+        self._posicion = 0
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        self._posicion += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self._posicion
+
+    def retirar(self) -> bytes:
+        datos = b"".join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+def escribir_parquet(conjunto: Conjunto, desde: date = None, hasta: date = None, lote: int = None, sesion=None):
+    """
+    Genera el Parquet del conjunto en bloques de bytes: un row group por lote de filas y, al
+    final, el pie con los metadatos
+    """
+    tipos = _tipos_parquet()
+    esquema = pyarrow.schema([(nombre, tipos[tipo]) for nombre, _, tipo in conjunto.columnas])
+    salida = _Salida()
+    escritor = pyarrow.parquet.ParquetWriter(salida, esquema, compression="snappy")
+    try:
+        for filas in _lotes(conjunto, desde, hasta, lote or EXPORTACION_LOTE, sesion):
+            columnas = list(zip(*filas))
+            escritor.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(valores, type=campo.type) for valores, campo in zip(columnas, esquema)], schema=esquema
+            ))
+            yield salida.retirar()
+    finally:
+        escritor.close()
+    yield salida.retirar()
+
+
+class _Cupo:
+    """
+    Lugar tomado en _cupos por una exportación; liberar() es idempotente
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._liberado = False
+
+    def liberar(self):
+        with self._lock:
+            if self._liberado:
+                return
+            self._liberado = True
+        _cupos.release()
+
+
+def _con_cupo(contenido):
+    """
+    Envuelve el generador de la exportación para liberar su cupo al terminar, fallar o cortarse
+    """
+    cupo = _Cupo()
+
+    def _generar():
+        try:
+            yield from contenido
+        finally:
+            cupo.liberar()
+
+    generador = _generar()
+    # Si la descarga se corta antes de la primera lectura, el finally nunca corre: el cupo se
+    # libera cuando el generador se descarta
+    weakref.finalize(generador, cupo.liberar)
+    return generador
+
+
+def exportar(nombre: str, formato: str = "csv", fecha_desde: str = None, fecha_hasta: str = None):
+    """
+    Valida los parámetros y devuelve (generador de bytes, media type, nombre de archivo)
+
+    Args:
+        nombre: Conjunto a exportar (reservas, pagos o calificaciones)
+        formato: "csv" o "parquet"
+        fecha_desde: Fecha desde en formato YYYY-MM-DD (opcional)
+        fecha_hasta: Fecha hasta en formato YYYY-MM-DD, inclusive (opcional)
+    """
+    conjunto = CONJUNTOS.get(nombre)
+    if conjunto is None:
+        raise HTTPException(status_code=404, detail=f"Exportación desconocida. Debe ser una de: {', '.join(CONJUNTOS)}")
+    if formato not in FORMATOS:
+        raise HTTPException(status_code=400, detail=f"Formato inválido. Debe ser uno de: {', '.join(FORMATOS)}")
+    if formato == "parquet" and pyarrow is None:
+        raise HTTPException(status_code=400, detail="El formato parquet requiere pyarrow, que no está instalado")
+    try:
+        desde = datetime.strptime(fecha_desde, '%Y-%m-%d').date() if fecha_desde else None
+        hasta = datetime.strptime(fecha_hasta, '%Y-%m-%d').date() if fecha_hasta else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Formato de fecha incorrecto. Use YYYY-MM-DD")
+
+    if not _cupos.acquire(blocking=False):
+        raise HTTPException(status_code=429, detail="Hay demasiadas exportaciones en curso. Intente más tarde")
+    escribir = escribir_parquet if formato == "parquet" else escribir_csv
+    archivo = f"{nombre}_{fecha_desde or 'inicio'}_{fecha_hasta or 'hoy'}.{formato}"
+    logging.info(f"Exportando {nombre} ({formato}) desde {fecha_desde} hasta {fecha_hasta}")
+    return _con_cupo(escribir(conjunto, desde, hasta)), FORMATOS[formato], archivo
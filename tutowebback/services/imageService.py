@@ -1,75 +1,266 @@
 import os
-import shutil
+import re
+import sys
+import uuid
+import asyncio
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from fastapi import UploadFile, HTTPException
-from datetime import datetime
+from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
 import logging
 from pathlib import Path
 
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow es opcional: sin él se guarda solo el original
+    Image = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.models import models
+from tutowebback.services.almacenamientoService import crear_almacenamiento, CACHE_CONTROL_INMUTABLE
+
+IMAGENES_TAMANO_MAXIMO = int(os.getenv("IMAGENES_TAMANO_MAXIMO", str(5 * 1024 * 1024)))
+IMAGENES_CHUNK = int(os.getenv("IMAGENES_CHUNK", str(64 * 1024)))
+IMAGENES_PROCESOS = int(os.getenv("IMAGENES_PROCESOS", "2"))
+IMAGENES_LADO_MAXIMO = int(os.getenv("IMAGENES_LADO_MAXIMO", "1024"))
+IMAGENES_LADO_THUMB = int(os.getenv("IMAGENES_LADO_THUMB", "160"))
+IMAGENES_CALIDAD_WEBP = int(os.getenv("IMAGENES_CALIDAD_WEBP", "80"))
+
+# Firmas (magic bytes) de los formatos aceptados
+FIRMAS = [
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+]
+
+CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+# Archivos direccionados por contenido: <sha256>[_thumb|_original].<ext>
+NOMBRE_POR_HASH = re.compile(r"^(?P<hash>[0-9a-f]{64})(?:_thumb|_original)?\.[a-z]+$")
+
+_procesos = None
+_servicio = None
+
+
+def _detectar_extension(cabecera: bytes):
+    for firma, extension in FIRMAS:
+        if cabecera.startswith(firma):
+            return extension
+    if cabecera[:4] == b"RIFF" and cabecera[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+def _generar_variantes(ruta_original: str, ruta_base: str, lado_maximo: int, lado_thumb: int, calidad: int):
+    """
+    Genera la variante WebP redimensionada y la miniatura cuadrada.
+    Corre en un proceso aparte (trabajo de CPU).
+    """
+    with Image.open(ruta_original) as imagen:
+        imagen = ImageOps.exif_transpose(imagen)
+        imagen = imagen.convert("RGBA" if "A" in imagen.getbands() else "RGB")
+
+        principal = imagen.copy()
+        principal.thumbnail((lado_maximo, lado_maximo))
+        principal.save(f"{ruta_base}.webp", "WEBP", quality=calidad, method=4)
+
+        miniatura = ImageOps.fit(imagen, (lado_thumb, lado_thumb))
+        miniatura.save(f"{ruta_base}_thumb.webp", "WEBP", quality=calidad, method=4)
+
+
+def _pool_procesos():
+    global _procesos
+    if _procesos is None:
+        _procesos = ProcessPoolExecutor(max_workers=IMAGENES_PROCESOS)
+    return _procesos
+
+
+def obtener_image_service():
+    """
+    ImageService compartido, creado en el primer uso (al importar el módulo no se toca el disco
+    ni se configura el almacenamiento). El lifespan lo crea al iniciar, para que una
+    configuración de almacenamiento inválida falle en el arranque.
+    """
+    global _servicio
+    if _servicio is None:
+        _servicio = ImageService()
+    return _servicio
+
+
+def cerrar_procesos():
+    """
+    Libera el pool de procesos de imágenes (al apagar la aplicación)
+    """
+    global _procesos
+    if _procesos is not None:
+        _procesos.shutdown(wait=False, cancel_futures=True)
+        _procesos = None
+
+
+class ImagenesStaticFiles(StaticFiles):
+    """
+    StaticFiles para /uploads: los archivos direccionados por contenido nunca cambian,
+    así que se sirven con caché inmutable de un año y el hash como ETag
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        request_headers = Headers(scope=scope)
+
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        coincidencia = NOMBRE_POR_HASH.match(os.path.basename(full_path))
+        if coincidencia:
+            nombre = os.path.splitext(os.path.basename(full_path))[0]
+            response.headers["etag"] = f'"{nombre}"'
+            response.headers["cache-control"] = CACHE_CONTROL_INMUTABLE
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
 
 class ImageService:
     """
-    Servicio para gestionar el guardado y eliminación de imágenes de perfil
+    Servicio para gestionar el guardado y eliminación de imágenes de perfil.
+
+    Las imágenes se direccionan por el SHA-256 del archivo subido: `profile_images/ab/<hash>`.
+    Por cada imagen se guardan el original (`<hash>_original.<ext>`), una variante WebP
+    redimensionada (`<hash>.webp`, la que se guarda en la BD) y una miniatura (`<hash>_thumb.webp`).
+    Subir dos veces la misma imagen reutiliza los archivos existentes.
     """
 
-    def __init__(self):
-        
+    def __init__(self, almacenamiento=None):
+
         project_root = Path(__file__).resolve().parent.parent  # Solo 2 .parent
+        # Los directorios los crea el lifespan de la aplicación (main.py), no el constructor
         self.base_dir = project_root / "uploads"
         self.profile_dir = self.base_dir / "profile_images"
 
-        # Crear directorios si no existen
-        self.base_dir.mkdir(exist_ok=True)
-        self.profile_dir.mkdir(exist_ok=True)
+        self.almacenamiento = almacenamiento or crear_almacenamiento(self.base_dir)
+
+    def _guardar_por_chunks(self, origen, directorio_temporal: str):
+        """
+        Copia el upload a un archivo temporal en bloques, calculando el SHA-256, cortando al
+        superar el tamaño máximo y validando el formato por su firma. Se ejecuta en el threadpool.
+
+        Returns:
+            Tupla (ruta temporal, hash hexadecimal, extensión)
+        """
+        origen.seek(0)
+        cabecera = origen.read(IMAGENES_CHUNK)
+        extension = _detectar_extension(cabecera)
+        if extension is None:
+            raise HTTPException(
+                status_code=400,
+                detail="Formato de archivo no permitido. Use: jpg, jpeg, png, gif o webp"
+            )
+
+        ruta_temporal = os.path.join(directorio_temporal, f"{uuid.uuid4().hex}{extension}")
+        digest = hashlib.sha256()
+        total = 0
+        with open(ruta_temporal, "wb") as destino:
+            chunk = cabecera
+            while chunk:
+                total += len(chunk)
+                if total > IMAGENES_TAMANO_MAXIMO:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"La imagen supera el tamaño máximo de {IMAGENES_TAMANO_MAXIMO // 1024} KB"
+                    )
+                digest.update(chunk)
+                destino.write(chunk)
+                chunk = origen.read(IMAGENES_CHUNK)
+        return ruta_temporal, digest.hexdigest(), extension
+
+    def _subir(self, archivos):
+        for clave, ruta_local, content_type in archivos:
+            self.almacenamiento.guardar(clave, ruta_local, content_type)
 
     async def save_profile_image(self, emailUser: str, file: UploadFile) -> str:
         """
         Guarda la imagen de perfil y devuelve la ruta para guardar en la BD
 
         Args:
-            user_id: ID del usuario
+            emailUser: Email del usuario
             file: Archivo de imagen
 
         Returns:
-            str: Ruta relativa para guardar en la BD
+            str: URL de la imagen para guardar en la BD
         """
         if not file or not file.filename:
             return None
 
+        # Rechazar temprano si el cliente informó un tamaño mayor al permitido
+        if file.size is not None and file.size > IMAGENES_TAMANO_MAXIMO:
+            raise HTTPException(
+                status_code=413,
+                detail=f"La imagen supera el tamaño máximo de {IMAGENES_TAMANO_MAXIMO // 1024} KB"
+            )
+
         try:
-            # Validar extensión
-            file_extension = os.path.splitext(file.filename)[1].lower()
-            valid_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
-
-            if file_extension not in valid_extensions:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Formato de archivo no permitido. Use: jpg, jpeg, png, gif o webp"
+            with tempfile.TemporaryDirectory(prefix="tutoweb_img_") as directorio_temporal:
+                ruta_temporal, hash_imagen, extension = await run_in_threadpool(
+                    self._guardar_por_chunks, file.file, directorio_temporal
                 )
+                clave_base = f"profile_images/{hash_imagen[:2]}/{hash_imagen}"
 
-            # Crear nombre único: perfil_[ID]_[TIMESTAMP].[ext]
-            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-            filename = f"perfil_{emailUser}_{timestamp}{file_extension}"
+                if Image is None:
+                    clave = f"{clave_base}_original{extension}"
+                    if not await run_in_threadpool(self.almacenamiento.existe, clave):
+                        await run_in_threadpool(self._subir, [(clave, ruta_temporal, CONTENT_TYPES[extension])])
+                    return self.almacenamiento.url(clave)
 
-            # Ruta completa
-            file_path = self.profile_dir / filename
+                clave = f"{clave_base}.webp"
+                # Deduplicación: la misma imagen ya fue procesada y subida
+                if await run_in_threadpool(self.almacenamiento.existe, clave):
+                    return self.almacenamiento.url(clave)
 
-            # Guardar archivo
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+                ruta_base = os.path.join(directorio_temporal, hash_imagen)
+                try:
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(
+                        _pool_procesos(), _generar_variantes, ruta_temporal, ruta_base,
+                        IMAGENES_LADO_MAXIMO, IMAGENES_LADO_THUMB, IMAGENES_CALIDAD_WEBP
+                    )
+                except Exception as e:
+                    # El original pasó la validación de firma; si no se puede decodificar se rechaza
+                    logging.error(f"Error generando variantes de imagen: {str(e)}")
+                    raise HTTPException(status_code=400, detail="No se pudo procesar la imagen")
 
-            # Devolver ruta relativa
-            return f"/uploads/profile_images/{filename}"
+                # La variante principal se sube última: su existencia marca la imagen como completa
+                await run_in_threadpool(self._subir, [
+                    (f"{clave_base}_original{extension}", ruta_temporal, CONTENT_TYPES[extension]),
+                    (f"{clave_base}_thumb.webp", f"{ruta_base}_thumb.webp", "image/webp"),
+                    (clave, f"{ruta_base}.webp", "image/webp"),
+                ])
+                return self.almacenamiento.url(clave)
 
+        except HTTPException:
+            raise
         except Exception as e:
             logging.error(f"Error al guardar imagen: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Error al procesar imagen: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
 
-    def delete_profile_image(self, image_path: str) -> bool:
+    def delete_profile_image(self, image_path: str, db=None, excluir_usuario_id: int = None) -> bool:
         """
-        Elimina una imagen de perfil del sistema de archivos
+        Elimina una imagen de perfil y sus variantes del almacenamiento.
+        Como las imágenes se deduplican, si se pasa `db` solo se elimina cuando ningún
+        otro usuario la referencia.
 
         Args:
-            image_path: Ruta relativa de la imagen
+            image_path: URL de la imagen guardada en la BD
+            db: Sesión de base de datos para verificar referencias (opcional)
+            excluir_usuario_id: Usuario que deja de referenciar la imagen (opcional)
 
         Returns:
             bool: True si se eliminó, False si no
@@ -78,20 +269,30 @@ class ImageService:
             return False
 
         try:
-            # Eliminar el slash inicial si existe
-            if image_path.startswith('/'):
-                image_path = image_path[1:]
+            if db is not None:
+                referencias = db.query(models.Usuario.id).filter(models.Usuario.foto_perfil == image_path)
+                if excluir_usuario_id is not None:
+                    referencias = referencias.filter(models.Usuario.id != excluir_usuario_id)
+                if referencias.first() is not None:
+                    return False
 
-            # Ruta absoluta
-            file_path = Path(os.path.join(os.getcwd(), image_path))
+            clave = self.almacenamiento.clave_desde_url(image_path)
+            if clave is None:
+                return False
 
-            # Verificar y eliminar
-            if file_path.exists():
-                os.remove(file_path)
-                return True
+            base, _ = os.path.splitext(clave)
+            if base.endswith("_original"):
+                base = base[:-len("_original")]
+            nombre_base = os.path.basename(base)
 
-            return False
+            eliminado = False
+            for clave_archivo in self.almacenamiento.listar(base):
+                nombre = os.path.basename(clave_archivo)
+                if nombre.startswith((f"{nombre_base}.", f"{nombre_base}_thumb.", f"{nombre_base}_original.")):
+                    self.almacenamiento.eliminar(clave_archivo)
+                    eliminado = True
+            return eliminado
 
         except Exception as e:
             logging.error(f"Error al eliminar imagen: {str(e)}")
-            return False
\ No newline at end of file
+            return False
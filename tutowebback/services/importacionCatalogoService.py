@@ -0,0 +1,373 @@
+"""
+Importación masiva del catálogo: carreras y materias con su año del plan de estudios.
+
+El archivo puede ser:
+- CSV (separado por coma o punto y coma, UTF-8 con o sin BOM), una fila por materia, con las
+  columnas: carrera (obligatoria), facultad, descripcion_carrera, materia, año_plan (o
+  anio_plan) y descripcion. Una fila sin materia solo declara la carrera.
+- JSON: {"carreras": [CarreraImportacion], "materias": [MateriaImportacion]}; cada materia
+  indica su carrera por nombre (`carrera`, que puede venir en el mismo archivo) o por
+  `carrera_id`.
+
+La importación es un upsert por nombre: las carreras se identifican por nombre y las materias
+por (carrera, nombre), sin distinguir mayúsculas ni espacios repetidos. Los campos que no
+vienen (o vienen vacíos) no se modifican.
+
+Todo se valida en memoria antes de escribir: se cargan los nombres existentes en dos
+consultas (sin una consulta por fila) y, si hay algún error, no se escribe nada. Después se
+escribe en lotes de IMPORTACION_LOTE filas, con un commit por lote, para no mantener una
+transacción abierta durante todo el archivo. Si la base falla a mitad de camino quedan los
+lotes ya confirmados; como la importación es idempotente, basta con volver a importar el
+mismo archivo.
+
+El resultado es un reporte de diferencias: qué se crea, qué cambia (campo, antes y después)
+y cuántas filas ya estaban al día. Con dry_run se calcula el reporte sin escribir.
+"""
+import io
+import os
+import csv
+import sys
+import json
+import logging
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import select, insert, update
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.models import models
+from tutowebback.schemas import schemas
+from tutowebback.services import catalogoCacheService
+
+IMPORTACION_LOTE = int(os.getenv("IMPORTACION_LOTE", "1000"))
+IMPORTACION_TAMANO_MAXIMO = int(os.getenv("IMPORTACION_TAMANO_MAXIMO", str(5 * 1024 * 1024)))
+# Bytes que se leen por vez de un archivo subido
+IMPORTACION_BLOQUE = 64 * 1024
+# Errores que se detallan en el reporte (el total se informa siempre)
+IMPORTACION_ERRORES_MAXIMO = 100
+
+COLUMNAS_CSV = {"carrera", "facultad", "descripcion_carrera", "materia", "año_plan", "anio_plan", "descripcion"}
+CAMPOS_CARRERA = ("descripcion", "facultad")
+CAMPOS_MATERIA = ("descripcion", "año_plan")
+
+
+def _archivo_grande() -> HTTPException:
+    return HTTPException(status_code=413, detail=f"El archivo supera {IMPORTACION_TAMANO_MAXIMO} bytes")
+
+
+async def leer_subida(archivo) -> bytes:
+    """
+    Contenido de un archivo subido (UploadFile), leído en bloques: corta con 413 apenas supera
+    IMPORTACION_TAMANO_MAXIMO, sin cargar el resto en memoria
+    """
+    if archivo.size is not None and archivo.size > IMPORTACION_TAMANO_MAXIMO:
+        raise _archivo_grande()
+    partes, tamano = [], 0
+    while True:
+        bloque = await archivo.read(IMPORTACION_BLOQUE)
+        if not bloque:
+            break
+        tamano += len(bloque)
+        if tamano > IMPORTACION_TAMANO_MAXIMO:
+            raise _archivo_grande()
+        partes.append(bloque)
+    return b"".join(partes)
+
+
+def _clave(nombre: str) -> str:
+    return " ".join(nombre.split()).casefold()
+
+
+def _mensaje(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(parte) for parte in detalle['loc'])}: {detalle['msg']}" for detalle in error.errors()
+    )
+
+
+def leer_csv(texto: str) -> tuple:
+    """
+    ([(fila, CarreraImportacion)], [(fila, MateriaImportacion)], errores) de un CSV. La fila es
+    el número de línea del archivo.
+    """
+    try:
+        dialecto = csv.Sniffer().sniff(texto.split("\n", 1)[0], delimiters=",;")
+    except csv.Error:
+        dialecto = csv.excel
+    lector = csv.DictReader(io.StringIO(texto), dialect=dialecto)
+    columnas = {(columna or "").strip().casefold() for columna in lector.fieldnames or []}
+    if "carrera" not in columnas:
+        return [], [], [{"fila": 1, "error": "Falta la columna carrera"}]
+    desconocidas = columnas - COLUMNAS_CSV
+    if desconocidas:
+        return [], [], [{"fila": 1, "error": f"Columnas desconocidas: {', '.join(sorted(desconocidas))}"}]
+
+    carreras, materias, errores = [], [], []
+    for registro in lector:
+        fila = lector.line_num
+        valores = {
+            (columna or "").strip().casefold(): (valor or "").strip() or None
+            for columna, valor in registro.items() if not isinstance(valor, list)
+        }
+        if not any(valores.values()):
+            continue
+        try:
+            carreras.append((fila, schemas.CarreraImportacion(
+                nombre=valores.get("carrera") or "",
+                facultad=valores.get("facultad"),
+                descripcion=valores.get("descripcion_carrera"),
+            )))
+            if valores.get("materia"):
+                materias.append((fila, schemas.MateriaImportacion(
+                    nombre=valores["materia"],
+                    carrera=valores.get("carrera"),
+                    descripcion=valores.get("descripcion"),
+                    año_plan=valores.get("año_plan") or valores.get("anio_plan"),
+                )))
+            elif valores.get("año_plan") or valores.get("anio_plan") or valores.get("descripcion"):
+                errores.append({"fila": fila, "error": "Falta el nombre de la materia"})
+        except ValidationError as e:
+            errores.append({"fila": fila, "error": _mensaje(e)})
+    return carreras, materias, errores
+
+
+def leer_json(texto: str) -> tuple:
+    """
+    Igual que leer_csv para un JSON; la fila es la posición en su lista (p. ej. materias[3])
+    """
+    try:
+        datos = json.loads(texto)
+    except ValueError as e:
+        return [], [], [{"fila": None, "error": f"JSON inválido: {e}"}]
+    if not isinstance(datos, dict):
+        return [], [], [{"fila": None, "error": "Se esperaba un objeto con las listas carreras y materias"}]
+
+    carreras, materias, errores = [], [], []
+    for lista, modelo, destino in (
+        ("carreras", schemas.CarreraImportacion, carreras),
+        ("materias", schemas.MateriaImportacion, materias),
+    ):
+        elementos = datos.get(lista) or []
+        if not isinstance(elementos, list):
+            errores.append({"fila": lista, "error": "Debe ser una lista"})
+            continue
+        for i, elemento in enumerate(elementos):
+            try:
+                destino.append((f"{lista}[{i}]", modelo.model_validate(elemento)))
+            except ValidationError as e:
+                errores.append({"fila": f"{lista}[{i}]", "error": _mensaje(e)})
+    return carreras, materias, errores
+
+
+def _cambios(actual: dict, nuevo, campos: tuple) -> dict:
+    """
+    {campo: {"antes", "despues"}} de los campos que vienen en la importación y difieren
+    """
+    cambios = {}
+    for campo in campos:
+        valor = getattr(nuevo, campo)
+        if valor is not None and valor != actual[campo]:
+            cambios[campo] = {"antes": actual[campo], "despues": valor}
+    return cambios
+
+
+def planificar(db: Session, carreras: list, materias: list) -> dict:
+    """
+    Compara el archivo con la base y arma el plan: altas y modificaciones de carreras y
+    materias, con los errores de referencia y de duplicados. No escribe.
+    """
+    errores = []
+    existentes = {}
+    carrera_por_id = {}
+    for id, nombre, descripcion, facultad in db.execute(
+        select(models.Carrera.id, models.Carrera.nombre, models.Carrera.descripcion, models.Carrera.facultad)
+        .order_by(models.Carrera.id)
+    ):
+        carrera = {"id": id, "nombre": nombre, "descripcion": descripcion, "facultad": facultad}
+        existentes.setdefault(_clave(nombre), carrera)
+        carrera_por_id[id] = carrera
+    materias_existentes = {}
+    for id, nombre, carrera_id, descripcion, año_plan in db.execute(
+        select(models.Materia.id, models.Materia.nombre, models.Materia.carrera_id,
+               models.Materia.descripcion, models.Materia.año_plan)
+        .order_by(models.Materia.id)
+    ):
+        materias_existentes.setdefault(
+            (carrera_id, _clave(nombre)), {"id": id, "nombre": nombre, "descripcion": descripcion, "año_plan": año_plan}
+        )
+
+    # Carreras: la misma carrera puede repetirse (en el CSV, una vez por materia) siempre que
+    # los datos no se contradigan
+    declaradas = {}
+    for fila, carrera in carreras:
+        clave = _clave(carrera.nombre)
+        anterior = declaradas.get(clave)
+        if anterior is None:
+            declaradas[clave] = (fila, carrera)
+            continue
+        for campo in CAMPOS_CARRERA:
+            valor, previo = getattr(carrera, campo), getattr(anterior[1], campo)
+            if valor is not None and previo is not None and valor != previo:
+                errores.append({"fila": fila, "error": f"La carrera '{carrera.nombre}' tiene otro valor de {campo} en la fila {anterior[0]}"})
+            elif valor is not None:
+                setattr(anterior[1], campo, valor)
+
+    plan = {"carreras": {"crear": [], "actualizar": [], "sin_cambios": 0},
+            "materias": {"crear": [], "actualizar": [], "sin_cambios": 0}}
+    for clave, (fila, carrera) in declaradas.items():
+        actual = existentes.get(clave)
+        if actual is None:
+            plan["carreras"]["crear"].append({
+                "nombre": " ".join(carrera.nombre.split()), "descripcion": carrera.descripcion,
+                **({"facultad": carrera.facultad} if carrera.facultad is not None else {}),
+            })
+            continue
+        cambios = _cambios(actual, carrera, CAMPOS_CARRERA)
+        if cambios:
+            plan["carreras"]["actualizar"].append({"id": actual["id"], "nombre": actual["nombre"], "cambios": cambios})
+        else:
+            plan["carreras"]["sin_cambios"] += 1
+
+    # Materias: la carrera se resuelve a su id si ya existe, o a su clave si se crea en esta
+    # misma importación
+    vistas = {}
+    for fila, materia in materias:
+        if materia.carrera_id is not None:
+            carrera = carrera_por_id.get(materia.carrera_id)
+            if carrera is None:
+                errores.append({"fila": fila, "error": f"Carrera {materia.carrera_id} no encontrada"})
+                continue
+            if materia.carrera and _clave(materia.carrera) != _clave(carrera["nombre"]):
+                errores.append({"fila": fila, "error": f"carrera_id {materia.carrera_id} no corresponde a '{materia.carrera}'"})
+                continue
+        elif materia.carrera:
+            clave_carrera = _clave(materia.carrera)
+            carrera = existentes.get(clave_carrera)
+            if carrera is None and clave_carrera not in declaradas:
+                errores.append({"fila": fila, "error": f"Carrera '{materia.carrera}' no encontrada"})
+                continue
+        else:
+            errores.append({"fila": fila, "error": "Indique carrera o carrera_id"})
+            continue
+
+        clave = (carrera["id"] if carrera else clave_carrera, _clave(materia.nombre))
+        if clave in vistas:
+            errores.append({"fila": fila, "error": f"Materia '{materia.nombre}' repetida (fila {vistas[clave]})"})
+            continue
+        vistas[clave] = fila
+
+        actual = materias_existentes.get(clave)
+        if actual is None:
+            plan["materias"]["crear"].append({
+                "nombre": " ".join(materia.nombre.split()),
+                "carrera_id": carrera["id"] if carrera else None,
+                "carrera": carrera["nombre"] if carrera else " ".join(declaradas[clave_carrera][1].nombre.split()),
+                "descripcion": materia.descripcion, "año_plan": materia.año_plan,
+            })
+            continue
+        cambios = _cambios(actual, materia, CAMPOS_MATERIA)
+        if cambios:
+            plan["materias"]["actualizar"].append({"id": actual["id"], "nombre": actual["nombre"], "cambios": cambios})
+        else:
+            plan["materias"]["sin_cambios"] += 1
+
+    plan["errores"] = errores
+    return plan
+
+
+def _lotes(filas: list, lote: int):
+    for inicio in range(0, len(filas), lote):
+        yield filas[inicio:inicio + lote]
+
+
+def _modificaciones(filas: list) -> list:
+    # Parámetros del UPDATE por clave primaria: id y los valores nuevos de los campos que cambian
+    return [{"id": fila["id"], **{campo: cambio["despues"] for campo, cambio in fila["cambios"].items()}} for fila in filas]
+
+
+def _ejecutar(db: Session, plan: dict, lote: int):
+    """
+    Escribe el plan en lotes, con un commit por lote: altas de carreras (y lectura de sus ids),
+    modificaciones de carreras, altas de materias y modificaciones de materias
+    """
+    carrera_ids = {}
+    for filas in _lotes(plan["carreras"]["crear"], lote):
+        db.execute(insert(models.Carrera), filas)
+        db.commit()
+        nombres = [fila["nombre"] for fila in filas]
+        for id, nombre in db.execute(
+            select(models.Carrera.id, models.Carrera.nombre)
+            .where(models.Carrera.nombre.in_(nombres)).order_by(models.Carrera.id)
+        ):
+            carrera_ids.setdefault(_clave(nombre), id)
+
+    for filas in _lotes(plan["carreras"]["actualizar"], lote):
+        db.execute(update(models.Carrera), _modificaciones(filas))
+        db.commit()
+    for filas in _lotes(plan["materias"]["crear"], lote):
+        db.execute(insert(models.Materia), [
+            {"nombre": fila["nombre"], "carrera_id": fila["carrera_id"] or carrera_ids[_clave(fila["carrera"])],
+             "descripcion": fila["descripcion"], "año_plan": fila["año_plan"]}
+            for fila in filas
+        ])
+        db.commit()
+    for filas in _lotes(plan["materias"]["actualizar"], lote):
+        db.execute(update(models.Materia), _modificaciones(filas))
+        db.commit()
+
+
+def importar(db: Session, contenido: bytes, nombre_archivo: str = "", dry_run: bool = False, lote: int = None) -> dict:
+    """
+    Importa un archivo CSV o JSON del catálogo y devuelve el reporte de diferencias.
+    Si hay errores no se escribe nada y el reporte los detalla (exitoso = False).
+
+    Args:
+        contenido: Bytes del archivo
+        nombre_archivo: Nombre del archivo; con extensión .json se lee como JSON, si no como CSV
+        dry_run: Solo calcular el reporte
+        lote: Filas por transacción (por defecto IMPORTACION_LOTE)
+    """
+    if len(contenido) > IMPORTACION_TAMANO_MAXIMO:
+        raise _archivo_grande()
+    try:
+        texto = contenido.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="El archivo debe estar codificado en UTF-8")
+
+    es_json = nombre_archivo.lower().endswith(".json") or texto.lstrip().startswith("{")
+    carreras, materias, errores = (leer_json if es_json else leer_csv)(texto)
+    plan = planificar(db, carreras, materias)
+    errores += plan["errores"]
+    exitoso = not errores
+    if exitoso and not dry_run:
+        try:
+            _ejecutar(db, plan, lote or IMPORTACION_LOTE)
+        except Exception as e:
+            db.rollback()
+            logging.error(f"Error importing catalogo: {e}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+        finally:
+            catalogoCacheService.invalidar("carreras", "materias")
+
+    reporte = {
+        "exitoso": exitoso,
+        "dry_run": dry_run,
+        "escrito": exitoso and not dry_run,
+        "errores": errores[:IMPORTACION_ERRORES_MAXIMO],
+        "total_errores": len(errores),
+    }
+    for tipo in ("carreras", "materias"):
+        reporte[tipo] = {
+            "creadas": len(plan[tipo]["crear"]),
+            "actualizadas": len(plan[tipo]["actualizar"]),
+            "sin_cambios": plan[tipo]["sin_cambios"],
+            "detalle_creadas": plan[tipo]["crear"],
+            "detalle_actualizadas": plan[tipo]["actualizar"],
+        }
+    logging.info(
+        f"Importación de catálogo ({'dry run' if dry_run else 'escritura'}): "
+        f"{reporte['carreras']['creadas']} carreras y {reporte['materias']['creadas']} materias nuevas, "
+        f"{reporte['carreras']['actualizadas']} y {reporte['materias']['actualizadas']} modificadas, "
+        f"{len(errores)} errores"
+    )
+    return reporte
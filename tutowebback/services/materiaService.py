@@ -8,6 +8,7 @@ import logging
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.models import models
 from tutowebback.schemas import schemas
+from tutowebback.services import catalogoCacheService
 
 
 class MateriaService:
@@ -38,6 +39,7 @@ class MateriaService:
 
             db.add(db_materia)
             db.commit()
+            catalogoCacheService.invalidar("materias")
             db.refresh(db_materia)
             return db_materia
         except IntegrityError:
@@ -96,8 +98,11 @@ class MateriaService:
                 db_materia.carrera_id = materia.carrera_id
             if materia.descripcion is not None:
                 db_materia.descripcion = materia.descripcion
+            if materia.año_plan is not None:
+                db_materia.año_plan = materia.año_plan
 
             db.commit()
+            catalogoCacheService.invalidar("materias")
             db.refresh(db_materia)
             return db_materia
         except IntegrityError:
@@ -127,6 +132,7 @@ class MateriaService:
 
             db.delete(db_materia)
             db.commit()
+            catalogoCacheService.invalidar("materias")
             return True
         except Exception as e:
             db.rollback()
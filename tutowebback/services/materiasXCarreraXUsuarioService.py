@@ -118,7 +118,7 @@ class MateriasXCarreraXUsuarioService:
 
         return db.query(models.MateriasXCarreraXUsuario).options(
             joinedload(models.MateriasXCarreraXUsuario.materia),
-            joinedload(models.MateriasXCarreraXUsuario.usuario)
+            *models.Usuario.opciones_resumen(joinedload(models.MateriasXCarreraXUsuario.usuario))
         ).filter(
             models.MateriasXCarreraXUsuario.materia_id == materia_id,
             models.MateriasXCarreraXUsuario.carrera_id == carrera_id
@@ -1,11 +1,8 @@
 import os
-import mercadopago
 import logging
-from fastapi import HTTPException, FastAPI
+from fastapi import HTTPException
 from dotenv import load_dotenv
 
-app = FastAPI()
-
 # Cargar variables de entorno
 environment = os.getenv('ENVIRONMENT', 'development')
 env_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'environments', f".env-{environment}")
@@ -24,6 +21,8 @@ class MercadoPagoService:
             "TEST-7fd540ed-5002-4b29-832b-c3a3ff6f83ad"
         )
 
+        # El SDK (y requests) se importa al crear el primer servicio y no al arrancar la aplicación
+        import mercadopago
         self.sdk = mercadopago.SDK(self.access_token)
 
     def crear_preferencia(self, titulo, precio, cantidad, reserva_id, pago_id, notas=None):
@@ -107,21 +106,3 @@ class MercadoPagoService:
         """
         return self.public_key
 
-
-# Endpoint para probar la creación de preferencia (solo para pruebas)
-@app.get("/test-payment")
-def test_payment():
-    mp_service = MercadoPagoService()
-    preferencia = mp_service.crear_preferencia(
-        titulo="Tutoría de prueba",
-        precio=100,
-        cantidad=1,
-        reserva_id=1,
-        pago_id=1,
-        notas="Prueba de integración"
-    )
-
-    return {
-        "checkout_url": preferencia["init_point"],
-        "sandbox_init_point": preferencia["sandbox_init_point"]
-    }
\ No newline at end of file
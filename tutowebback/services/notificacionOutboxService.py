@@ -0,0 +1,212 @@
+import os
+import sys
+import asyncio
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+import logging
+from datetime import datetime, timedelta
+from starlette.concurrency import run_in_threadpool
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.config import database
+from tutowebback.models import models
+from tutowebback.services import tareasService
+
+OUTBOX_INTERVALO = float(os.getenv("NOTIFICACIONES_OUTBOX_INTERVALO", "2"))
+OUTBOX_LOTE = int(os.getenv("NOTIFICACIONES_OUTBOX_LOTE", "500"))
+OUTBOX_MAX_INTENTOS = int(os.getenv("NOTIFICACIONES_OUTBOX_MAX_INTENTOS", "5"))
+# Espera antes del primer reintento de una fila fallida; se duplica en cada intento
+OUTBOX_BACKOFF_BASE = float(os.getenv("NOTIFICACIONES_OUTBOX_BACKOFF_BASE", "10"))
+
+TIPOS_VALIDOS = ["reserva", "pago", "recordatorio", "sistema"]
+
+# Corrutinas que reciben las notificaciones materializadas en cada ejecución del worker
+_suscriptores = []
+
+
+def encolar_notificacion(db: Session, usuario_id: int, titulo: str, mensaje: str,
+                         tipo: str = "sistema", fecha_programada: datetime = None,
+                         reserva_id: int = None):
+    """
+    Encola una notificación en el outbox dentro de la transacción actual.
+    No hace commit: la notificación se confirma junto con la escritura de negocio
+    y el worker del outbox la materializa en `notificaciones` de forma asíncrona.
+
+    Args:
+        db: Sesión de base de datos
+        usuario_id: ID del usuario que recibirá la notificación
+        titulo: Título de la notificación
+        mensaje: Contenido de la notificación
+        tipo: Tipo de notificación (reserva, pago, recordatorio, sistema)
+        fecha_programada: Fecha y hora programada para mostrar la notificación (opcional)
+        reserva_id: ID de la reserva relacionada (opcional)
+
+    Returns:
+        Registro del outbox agregado a la sesión
+    """
+    if tipo not in TIPOS_VALIDOS:
+        raise HTTPException(status_code=400,
+                            detail=f"Tipo de notificación inválido. Debe ser uno de: {', '.join(TIPOS_VALIDOS)}")
+
+    pendiente = models.NotificacionOutbox(
+        usuario_id=usuario_id,
+        titulo=titulo,
+        mensaje=mensaje,
+        tipo=tipo,
+        fecha_creacion=datetime.utcnow(),
+        fecha_programada=fecha_programada,
+        reserva_id=reserva_id,
+        intentos=0
+    )
+    db.add(pendiente)
+    return pendiente
+
+
+def _a_notificacion(pendiente: models.NotificacionOutbox):
+    return {
+        "usuario_id": pendiente.usuario_id,
+        "titulo": pendiente.titulo,
+        "mensaje": pendiente.mensaje,
+        "tipo": pendiente.tipo,
+        "leida": False,
+        "fecha_creacion": pendiente.fecha_creacion,
+        "fecha_programada": pendiente.fecha_programada,
+        "reserva_id": pendiente.reserva_id
+    }
+
+
+def _vencida():
+    return or_(models.NotificacionOutbox.proximo_intento.is_(None),
+               models.NotificacionOutbox.proximo_intento <= datetime.utcnow())
+
+
+def _tomar(db: Session, pendiente_id: int):
+    """
+    Vuelve a bloquear una fila del lote tras el rollback (que liberó los bloqueos). None si ya
+    no está, si otro worker la tiene tomada o si otro worker la postergó mientras tanto
+    """
+    return db.query(models.NotificacionOutbox).filter(
+        models.NotificacionOutbox.id == pendiente_id, _vencida()
+    ).with_for_update(skip_locked=True).first()
+
+
+def _procesar_lote(db: Session, limite: int):
+    """
+    Mueve un lote del outbox a `notificaciones` con un único INSERT multi-fila y un DELETE.
+    Si el lote falla se reintenta fila por fila para aislar los registros inválidos; cada fila
+    que falla espera OUTBOX_BACKOFF_BASE * 2^(intentos - 1) segundos antes de volver a tomarse.
+
+    Returns:
+        Tupla (notificaciones creadas, cantidad de filas leídas del outbox)
+    """
+    pendientes = db.query(models.NotificacionOutbox).filter(_vencida()).order_by(
+        models.NotificacionOutbox.id.asc()
+    ).limit(limite).with_for_update(skip_locked=True).all()
+
+    if not pendientes:
+        return [], 0
+
+    filas = [_a_notificacion(pendiente) for pendiente in pendientes]
+    ids = [pendiente.id for pendiente in pendientes]
+
+    try:
+        db.execute(insert(models.Notificacion), filas)
+        db.query(models.NotificacionOutbox).filter(
+            models.NotificacionOutbox.id.in_(ids)
+        ).delete(synchronize_session=False)
+        db.commit()
+        return filas, len(pendientes)
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Error procesando lote del outbox de notificaciones, reintentando por fila: {e}")
+
+    creadas = []
+    for pendiente_id in ids:
+        pendiente = _tomar(db, pendiente_id)
+        if not pendiente:
+            continue
+        fila = _a_notificacion(pendiente)
+        try:
+            db.execute(insert(models.Notificacion), [fila])
+            db.delete(pendiente)
+            db.commit()
+            creadas.append(fila)
+        except Exception as e:
+            db.rollback()
+            pendiente = _tomar(db, pendiente_id)
+            if not pendiente:
+                continue
+            pendiente.intentos = (pendiente.intentos or 0) + 1
+            if pendiente.intentos >= OUTBOX_MAX_INTENTOS:
+                logging.error(f"Descartando notificación {pendiente_id} del outbox tras {pendiente.intentos} intentos: {e}")
+                db.delete(pendiente)
+            else:
+                pendiente.proximo_intento = datetime.utcnow() + timedelta(
+                    seconds=OUTBOX_BACKOFF_BASE * 2 ** (pendiente.intentos - 1)
+                )
+            db.commit()
+
+    return creadas, len(ids)
+
+
+def procesar_outbox(limite: int = None):
+    """
+    Vacía el outbox en lotes hasta que no queden pendientes
+
+    Args:
+        limite: Tamaño de lote (por defecto NOTIFICACIONES_OUTBOX_LOTE)
+
+    Returns:
+        Lista de notificaciones materializadas (como diccionarios)
+    """
+    limite = limite or OUTBOX_LOTE
+    db = database.SessionLocal()
+    creadas = []
+    try:
+        while True:
+            lote, leidas = _procesar_lote(db, limite)
+            creadas.extend(lote)
+            if leidas < limite:
+                break
+        return creadas
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Error procesando outbox de notificaciones: {e}")
+        return creadas
+    finally:
+        db.close()
+
+
+def suscribir(suscriptor):
+    """
+    Registra una corrutina que recibe la lista de notificaciones creadas en cada vaciado del outbox
+    (por ejemplo, la entrega push)
+    """
+    _suscriptores.append(suscriptor)
+
+
+# Entregas a suscriptores en curso; se guarda la referencia para que el task no se recolecte
+_entregas = set()
+
+
+def _fin_entrega(entrega: asyncio.Task):
+    _entregas.discard(entrega)
+    if not entrega.cancelled() and entrega.exception() is not None:
+        logging.error(f"Error notificando suscriptor del outbox: {entrega.exception()}")
+
+
+async def _vaciar_outbox():
+    creadas = await run_in_threadpool(procesar_outbox)
+    if not creadas:
+        return creadas
+    # Cada suscriptor corre en su propio task: los reintentos y esperas de un proveedor push no
+    # frenan el vaciado del outbox (las notificaciones ya quedaron guardadas)
+    for suscriptor in _suscriptores:
+        entrega = asyncio.create_task(suscriptor(creadas))
+        _entregas.add(entrega)
+        entrega.add_done_callback(_fin_entrega)
+    return creadas
+
+
+tarea_outbox = tareasService.registrar_tarea("notificaciones_outbox", OUTBOX_INTERVALO, _vaciar_outbox)
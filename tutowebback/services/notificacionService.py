@@ -1,5 +1,6 @@
 import os
 import sys
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
@@ -9,6 +10,7 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.models import models
 from tutowebback.schemas import schemas
+from tutowebback.services import serializacionService
 
 
 def crear_notificacion(db: Session, usuario_id: int, titulo: str, mensaje: str,
@@ -191,17 +193,13 @@ def obtener_todas_las_notificaciones(db: Session, fecha_desde: str = None, fecha
         Lista de notificaciones con información del usuario
     """
     try:
-        # Construir la consulta base con información del usuario
-        query = db.query(models.Notificacion).join(
-            models.Usuario, 
-            models.Notificacion.usuario_id == models.Usuario.id
-        )
+        filtros = []
         
         # Aplicar filtros de fecha si se proporcionan
         if fecha_desde:
             try:
                 fecha_desde_obj = datetime.strptime(fecha_desde, '%Y-%m-%d').date()
-                query = query.filter(models.Notificacion.fecha_creacion >= fecha_desde_obj)
+                filtros.append(models.Notificacion.fecha_creacion >= fecha_desde_obj)
             except ValueError:
                 raise HTTPException(status_code=400, detail="Formato de fecha_desde incorrecto. Use YYYY-MM-DD")
         
@@ -210,32 +208,35 @@ def obtener_todas_las_notificaciones(db: Session, fecha_desde: str = None, fecha
                 fecha_hasta_obj = datetime.strptime(fecha_hasta, '%Y-%m-%d').date()
                 # Incluir todo el día hasta
                 fecha_hasta_obj = datetime.combine(fecha_hasta_obj, datetime.max.time())
-                query = query.filter(models.Notificacion.fecha_creacion <= fecha_hasta_obj)
+                filtros.append(models.Notificacion.fecha_creacion <= fecha_hasta_obj)
             except ValueError:
                 raise HTTPException(status_code=400, detail="Formato de fecha_hasta incorrecto. Use YYYY-MM-DD")
         
-        # Obtener las notificaciones ordenadas por fecha (más recientes primero)
-        notificaciones = query.order_by(models.Notificacion.fecha_creacion.desc()).all()
+        # Notificaciones (más recientes primero) con su reserva, leídas como tuplas
+        filas = db.execute(
+            select(*serializacionService.NOTIFICACION.columnas, *serializacionService.RESERVA.columnas)
+            .outerjoin(models.Reserva, models.Notificacion.reserva_id == models.Reserva.id)
+            .where(*filtros)
+            .order_by(models.Notificacion.fecha_creacion.desc())
+        ).all()
+        usuarios = serializacionService.usuarios_por_id(
+            db, select(models.Notificacion.usuario_id).where(*filtros)
+        )
         
         # Convertir a formato de respuesta con información del usuario
+        inicio_reserva = len(serializacionService.NOTIFICACION)
         notificaciones_response = []
-        for notif in notificaciones:
-            notif_dict = notif.to_dict_notificacion()
-            
-            # Agregar información del usuario
-            if hasattr(notif, 'usuario') and notif.usuario:
-                notif_dict["usuario"] = notif.usuario.to_dict_usuario()
-            else:
-                # Fallback: obtener usuario manualmente si no está cargado
-                usuario = db.query(models.Usuario).filter(models.Usuario.id == notif.usuario_id).first()
-                if usuario:
-                    notif_dict["usuario"] = usuario.to_dict_usuario()
+        for fila in filas:
+            notif_dict = serializacionService.NOTIFICACION.a_dict(fila)
+            usuario = usuarios.get(notif_dict["usuario_id"])
+            if usuario is None:
+                # Igual que el join con usuarios: se omiten las notificaciones sin usuario
+                continue
+            notif_dict["usuario"] = usuario
             
             # Agregar información de la reserva si existe
-            if notif.reserva_id:
-                reserva = db.query(models.Reserva).filter(models.Reserva.id == notif.reserva_id).first()
-                if reserva:
-                    notif_dict["reserva"] = reserva.to_dict_reserva()
+            if fila[inicio_reserva] is not None:
+                notif_dict["reserva"] = serializacionService.RESERVA.a_dict(fila, inicio_reserva)
             
             notificaciones_response.append(notif_dict)
         
@@ -295,31 +295,10 @@ class PagoService:
         Obtiene todos los pagos asociados a las reservas de un tutor
         """
         try:
-            # Primero obtenemos los servicios del tutor
-            servicios = db.query(models.ServicioTutoria).filter(
-                models.ServicioTutoria.tutor_id == tutor_id
-            ).all()
-            
-            if not servicios:
-                return {}
-                
-            # Obtenemos los IDs de los servicios
-            servicio_ids = [servicio.id for servicio in servicios]
-            
-            # Obtenemos todas las reservas para esos servicios
-            reservas = db.query(models.Reserva).filter(
-                models.Reserva.servicio_id.in_(servicio_ids)
-            ).all()
-            
-            if not reservas:
-                return {}
-                
-            # Obtenemos los IDs de las reservas
-            reserva_ids = [reserva.id for reserva in reservas]
-            
-            # Ahora obtenemos todos los pagos asociados a esas reservas
-            pagos = db.query(models.Pago).filter(
-                models.Pago.reserva_id.in_(reserva_ids)
+            pagos = db.query(models.Pago).join(
+                models.Reserva, models.Pago.reserva_id == models.Reserva.id
+            ).filter(
+                models.Reserva.tutor_id == tutor_id
             ).all()
             
             # Organizamos los pagos por reserva_id para fácil acceso
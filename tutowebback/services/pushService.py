@@ -0,0 +1,260 @@
+import os
+import sys
+import asyncio
+import logging
+import random
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime
+
+from starlette.concurrency import run_in_threadpool
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.config import database
+from tutowebback.models import models
+from tutowebback.services import notificacionOutboxService
+
+# Proveedores de push, por nombre y separados por coma (ver FABRICAS y registrar_fabrica); sin
+# configurar, el push queda deshabilitado. "fake" no sale a la red: solo para pruebas y staging
+PUSH_PROVEEDOR = os.getenv("PUSH_PROVEEDOR", "")
+PUSH_CONCURRENCIA = int(os.getenv("PUSH_CONCURRENCIA", "8"))
+PUSH_REINTENTOS = int(os.getenv("PUSH_REINTENTOS", "3"))
+PUSH_BACKOFF_BASE = float(os.getenv("PUSH_BACKOFF_BASE", "0.5"))
+
+# Resultados posibles por token
+ENVIADO = "enviado"
+TOKEN_INVALIDO = "token_invalido"
+REINTENTAR = "reintentar"
+
+
+class PushProvider(ABC):
+    """
+    Interfaz de un proveedor de notificaciones push (FCM, APNs, Web Push, ...).
+    Cada proveedor atiende un conjunto de plataformas y envía un mensaje a varios tokens por llamada.
+    """
+    nombre = "base"
+    plataformas = ()
+    max_lote = 500
+
+    @abstractmethod
+    async def enviar(self, tokens: list, titulo: str, mensaje: str, datos: dict = None) -> dict:
+        """
+        Envía un mensaje a un lote de tokens
+
+        Returns:
+            Diccionario token -> ENVIADO | TOKEN_INVALIDO | REINTENTAR
+        """
+
+
+class FakePushProvider(PushProvider):
+    """
+    Proveedor local que no sale a la red, para herramientas y pruebas: registra los últimos
+    `max_enviados` envíos en memoria. Permite simular tokens muertos y fallas transitorias.
+    """
+    nombre = "fake"
+    plataformas = ("web", "android", "ios")
+
+    def __init__(self, max_lote: int = 500, tokens_invalidos=None, fallas_transitorias: int = 0,
+                 max_enviados: int = 1000):
+        self.max_lote = max_lote
+        self.tokens_invalidos = set(tokens_invalidos or [])
+        self.fallas_transitorias = fallas_transitorias
+        self.enviados = deque(maxlen=max_enviados)
+
+    async def enviar(self, tokens, titulo, mensaje, datos=None):
+        if self.fallas_transitorias > 0:
+            self.fallas_transitorias -= 1
+            return {token: REINTENTAR for token in tokens}
+
+        resultado = {}
+        for token in tokens:
+            if token in self.tokens_invalidos:
+                resultado[token] = TOKEN_INVALIDO
+            else:
+                resultado[token] = ENVIADO
+                self.enviados.append({"token": token, "titulo": titulo, "mensaje": mensaje, "datos": datos})
+        return resultado
+
+
+class EntregaPushService:
+    def __init__(self, proveedores=None, concurrencia: int = PUSH_CONCURRENCIA,
+                 reintentos: int = PUSH_REINTENTOS, backoff_base: float = PUSH_BACKOFF_BASE):
+        self.proveedores = {}
+        for proveedor in proveedores or []:
+            self.registrar_proveedor(proveedor)
+        self.concurrencia = concurrencia
+        self.reintentos = reintentos
+        self.backoff_base = backoff_base
+        # Compartido entre entregas: cada vaciado del outbox entrega en su propio task y
+        # pueden superponerse
+        self._semaforo = None
+
+    def registrar_proveedor(self, proveedor: PushProvider):
+        for plataforma in proveedor.plataformas:
+            self.proveedores[plataforma] = proveedor
+
+    def _cargar_dispositivos(self, usuario_ids):
+        db = database.SessionLocal()
+        try:
+            return [
+                (dispositivo.usuario_id, dispositivo.token_dispositivo, dispositivo.plataforma)
+                for dispositivo in db.query(models.DispositivoUsuario).filter(
+                    models.DispositivoUsuario.usuario_id.in_(usuario_ids)
+                ).all()
+            ]
+        finally:
+            db.close()
+
+    def _podar_tokens(self, tokens):
+        db = database.SessionLocal()
+        try:
+            eliminados = db.query(models.DispositivoUsuario).filter(
+                models.DispositivoUsuario.token_dispositivo.in_(tokens)
+            ).delete(synchronize_session=False)
+            db.commit()
+            return eliminados
+        except Exception as e:
+            db.rollback()
+            logging.error(f"Error eliminando tokens de dispositivo inválidos: {e}")
+            return 0
+        finally:
+            db.close()
+
+    async def _enviar_con_reintentos(self, semaforo, proveedor, tokens, notificacion, tokens_muertos):
+        pendientes = list(tokens)
+        enviados = 0
+        datos = {"tipo": notificacion.get("tipo"), "reserva_id": notificacion.get("reserva_id")}
+
+        for intento in range(self.reintentos + 1):
+            async with semaforo:
+                try:
+                    resultado = await proveedor.enviar(pendientes, notificacion["titulo"], notificacion["mensaje"], datos)
+                except Exception as e:
+                    logging.error(f"Error enviando push con {proveedor.nombre}: {e}")
+                    resultado = {token: REINTENTAR for token in pendientes}
+
+            enviados += sum(1 for estado in resultado.values() if estado == ENVIADO)
+            tokens_muertos.update(token for token, estado in resultado.items() if estado == TOKEN_INVALIDO)
+            pendientes = [token for token in pendientes if resultado.get(token, REINTENTAR) == REINTENTAR]
+
+            if not pendientes or intento == self.reintentos:
+                break
+
+            # Backoff exponencial con jitter
+            espera = self.backoff_base * (2 ** intento)
+            await asyncio.sleep(espera + random.uniform(0, espera))
+
+        if pendientes:
+            logging.warning(f"No se pudo entregar push a {len(pendientes)} dispositivos con {proveedor.nombre}")
+        return enviados
+
+    async def entregar(self, notificaciones: list) -> dict:
+        """
+        Envía las notificaciones recién creadas a los dispositivos registrados de cada usuario.
+        Las notificaciones programadas a futuro se omiten.
+
+        Args:
+            notificaciones: Lista de diccionarios con usuario_id, titulo, mensaje, tipo y reserva_id
+
+        Returns:
+            Resumen con cantidad de envíos exitosos y tokens eliminados
+        """
+        ahora = datetime.utcnow()
+        notificaciones = [
+            notificacion for notificacion in notificaciones
+            if not notificacion.get("fecha_programada") or notificacion["fecha_programada"] <= ahora
+        ]
+        if not notificaciones or not self.proveedores:
+            return {"enviados": 0, "tokens_eliminados": 0}
+
+        usuario_ids = {notificacion["usuario_id"] for notificacion in notificaciones}
+        dispositivos = await run_in_threadpool(self._cargar_dispositivos, usuario_ids)
+
+        # Agrupar tokens por usuario y proveedor
+        tokens_por_usuario = {}
+        for usuario_id, token, plataforma in dispositivos:
+            proveedor = self.proveedores.get(plataforma)
+            if proveedor is None:
+                continue
+            tokens_por_usuario.setdefault(usuario_id, {}).setdefault(proveedor, []).append(token)
+
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.concurrencia)
+        semaforo = self._semaforo
+        tokens_muertos = set()
+        envios = []
+        for notificacion in notificaciones:
+            for proveedor, tokens in tokens_por_usuario.get(notificacion["usuario_id"], {}).items():
+                for inicio in range(0, len(tokens), proveedor.max_lote):
+                    envios.append(self._enviar_con_reintentos(
+                        semaforo, proveedor, tokens[inicio:inicio + proveedor.max_lote], notificacion, tokens_muertos
+                    ))
+
+        enviados = sum(await asyncio.gather(*envios))
+
+        eliminados = 0
+        if tokens_muertos:
+            eliminados = await run_in_threadpool(self._podar_tokens, list(tokens_muertos))
+
+        return {"enviados": enviados, "tokens_eliminados": eliminados}
+
+
+# Registro de proveedores: nombre en PUSH_PROVEEDOR -> función sin argumentos que crea el
+# PushProvider. Un proveedor real (FCM, APNs, ...) se agrega con registrar_fabrica
+FABRICAS = {"fake": FakePushProvider}
+
+
+def _configurados() -> list:
+    return [nombre.strip() for nombre in PUSH_PROVEEDOR.split(",") if nombre.strip()]
+
+
+def _crear_proveedores():
+    return [FABRICAS[nombre]() for nombre in _configurados() if nombre in FABRICAS]
+
+
+def registrar_fabrica(nombre: str, fabrica):
+    """
+    Agrega un proveedor al registro (por ejemplo, desde el módulo que implementa FCM). Si
+    PUSH_PROVEEDOR lo nombra, se crea y empieza a usarse en la próxima entrega.
+
+    Args:
+        nombre: Nombre del proveedor en PUSH_PROVEEDOR
+        fabrica: Función sin argumentos que devuelve el PushProvider
+    """
+    FABRICAS[nombre] = fabrica
+    if nombre in _configurados():
+        entrega_push.registrar_proveedor(fabrica())
+
+
+entrega_push = EntregaPushService(_crear_proveedores())
+_aviso_configuracion = False
+
+
+def _avisar_configuracion():
+    # Una sola vez y en la primera entrega: a esa altura ya se registraron las fábricas externas
+    global _aviso_configuracion
+    if _aviso_configuracion:
+        return
+    _aviso_configuracion = True
+    desconocidos = [nombre for nombre in _configurados() if nombre not in FABRICAS]
+    if desconocidos:
+        logging.warning(f"Proveedores push desconocidos en PUSH_PROVEEDOR: {', '.join(desconocidos)} "
+                        f"(disponibles: {', '.join(sorted(FABRICAS))})")
+    if not entrega_push.proveedores:
+        motivo = "sin proveedores válidos en PUSH_PROVEEDOR" if PUSH_PROVEEDOR.strip() else "PUSH_PROVEEDOR sin configurar"
+        logging.warning(f"Push deshabilitado ({motivo}): las notificaciones no se envían a dispositivos")
+
+
+async def entregar_notificaciones(notificaciones: list):
+    _avisar_configuracion()
+    if not entrega_push.proveedores:
+        return
+    try:
+        resumen = await entrega_push.entregar(notificaciones)
+        if resumen["enviados"] or resumen["tokens_eliminados"]:
+            logging.info(f"Push entregados: {resumen['enviados']}, tokens eliminados: {resumen['tokens_eliminados']}")
+    except Exception as e:
+        logging.error(f"Error entregando notificaciones push: {e}")
+
+
+notificacionOutboxService.suscribir(entregar_notificaciones)
@@ -0,0 +1,249 @@
+"""
+Reportes de actividad e ingresos por tutor y por materia.
+
+Las métricas salen de tres consultas agregadas (GROUP BY año, mes y materia de la reserva),
+en lugar de que el cliente reconstruya los totales descargando todo el historial:
+- sesiones por estado: reservas ⨝ servicios_tutoria
+- ingresos: pagos completados ⨝ reservas ⨝ servicios_tutoria (cada pago cuenta en el mes de su reserva)
+- calificaciones: suma y cantidad de puntuaciones ⨝ reservas ⨝ servicios_tutoria
+
+Caché por período: el resultado de cada mes (por tutor, o global) se guarda en memoria por
+separado. Un mes cerrado casi no cambia y se conserva REPORTES_CACHE_TTL segundos (un pago o
+una calificación tardíos aparecen al vencer); el mes en curso se recalcula cada
+REPORTES_CACHE_TTL_MES_ACTUAL segundos. Así un reporte de doce meses, con la caché caliente,
+solo vuelve a consultar el mes actual. La caché es local a cada proceso.
+"""
+import os
+import sys
+import time
+import threading
+import logging
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import select, func, extract
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.models import models
+
+REPORTES_CACHE_TTL = int(os.getenv("REPORTES_CACHE_TTL", "21600"))
+REPORTES_CACHE_TTL_MES_ACTUAL = int(os.getenv("REPORTES_CACHE_TTL_MES_ACTUAL", "60"))
+# Entradas (mes × tutor) que se conservan; al superarlo se descartan las menos usadas
+REPORTES_CACHE_MAXIMO = int(os.getenv("REPORTES_CACHE_MAXIMO", "20000"))
+# Meses del reporte si no se indica el período, y máximo que se puede pedir
+REPORTES_MESES = 12
+REPORTES_MESES_MAXIMO = 36
+
+GLOBAL = "global"
+
+
+class ReporteCache:
+    """
+    Celdas de cada mes por alcance (id de tutor o GLOBAL): {materia_id: celda}, donde la celda
+    tiene los conteos crudos (sesiones por estado, ingresos, puntuaciones) que se suman entre
+    meses y materias. Los promedios y tasas se calculan al armar el reporte.
+    """
+
+    def __init__(self, ttl: float = REPORTES_CACHE_TTL, ttl_mes_actual: float = REPORTES_CACHE_TTL_MES_ACTUAL,
+                 maximo: int = REPORTES_CACHE_MAXIMO):
+        self.ttl = ttl
+        self.ttl_mes_actual = ttl_mes_actual
+        self.maximo = maximo
+        self._lock = threading.Lock()
+        # (alcance, (año, mes)) -> (expira, celdas)
+        self._entradas = OrderedDict()
+
+    def obtener(self, alcance, meses: list, cargar, mes_actual: tuple) -> dict:
+        """
+        {(año, mes): celdas} de los `meses` pedidos. Los que no están en caché (o vencieron) se
+        piden juntos a `cargar(meses_faltantes)`, que devuelve {(año, mes): celdas}.
+        """
+        ahora = time.monotonic()
+        resultado, faltantes = {}, []
+        with self._lock:
+            for mes in meses:
+                entrada = self._entradas.get((alcance, mes))
+                if entrada is not None and entrada[0] > ahora:
+                    self._entradas.move_to_end((alcance, mes))
+                    resultado[mes] = entrada[1]
+                else:
+                    faltantes.append(mes)
+
+        if faltantes:
+            # La carga se hace fuera del lock para no serializar las consultas a la base
+            cargados = cargar(faltantes)
+            with self._lock:
+                for mes in faltantes:
+                    celdas = cargados.get(mes, {})
+                    ttl = self.ttl_mes_actual if mes >= mes_actual else self.ttl
+                    self._entradas[(alcance, mes)] = (time.monotonic() + ttl, celdas)
+                    self._entradas.move_to_end((alcance, mes))
+                    resultado[mes] = celdas
+                while len(self._entradas) > self.maximo:
+                    self._entradas.popitem(last=False)
+        return resultado
+
+    def invalidar(self, alcance=None):
+        """
+        Descarta las entradas de un alcance (un tutor o GLOBAL), o todas
+        """
+        with self._lock:
+            if alcance is None:
+                self._entradas.clear()
+                return
+            for llave in [llave for llave in self._entradas if llave[0] == alcance]:
+                del self._entradas[llave]
+
+
+reporte_cache = ReporteCache()
+
+
+def _celda_vacia(nombre: str) -> dict:
+    return {"materia": nombre, "estados": {}, "ingresos": Decimal(0), "pagos": 0, "puntuacion_suma": 0, "calificaciones": 0}
+
+
+def cargar_meses(db: Session, tutor_id: int, meses: list) -> dict:
+    """
+    Celdas por mes y materia de los `meses` indicados: tres consultas agregadas sobre el rango
+    que los contiene (los meses de más en el rango se descartan)
+    """
+    primero, ultimo = min(meses), max(meses)
+    desde = date(primero[0], primero[1], 1)
+    hasta = date(ultimo[0] + ultimo[1] // 12, ultimo[1] % 12 + 1, 1)
+    año, mes = extract("year", models.Reserva.fecha), extract("month", models.Reserva.fecha)
+    filtros = [models.Reserva.fecha >= desde, models.Reserva.fecha < hasta]
+    if tutor_id is not None:
+        filtros.append(models.Reserva.tutor_id == tutor_id)
+
+    def _agrupado(*columnas):
+        return (
+            select(año, mes, models.Materia.id, models.Materia.nombre, *columnas)
+            .select_from(models.Reserva)
+            .join(models.ServicioTutoria, models.Reserva.servicio_id == models.ServicioTutoria.id)
+            .join(models.Materia, models.ServicioTutoria.materia_id == models.Materia.id)
+            .where(*filtros)
+            .group_by(año, mes, models.Materia.id, models.Materia.nombre)
+        )
+
+    celdas = {}
+
+    def _celda(fila):
+        periodo = (int(fila[0]), int(fila[1]))
+        materias = celdas.setdefault(periodo, {})
+        return materias.setdefault(fila[2], _celda_vacia(fila[3]))
+
+    for fila in db.execute(_agrupado(models.Reserva.estado, func.count()).group_by(models.Reserva.estado)):
+        _celda(fila)["estados"][fila[4]] = fila[5]
+    for fila in db.execute(
+        _agrupado(func.sum(models.Pago.monto), func.count(models.Pago.id))
+        .join(models.Pago, models.Pago.reserva_id == models.Reserva.id)
+        .where(models.Pago.estado == "completado")
+    ):
+        celda = _celda(fila)
+        celda["ingresos"] = Decimal(fila[4] or 0)
+        celda["pagos"] = fila[5]
+    for fila in db.execute(
+        _agrupado(func.sum(models.Calificacion.puntuacion), func.count(models.Calificacion.id))
+        .join(models.Calificacion, models.Calificacion.reserva_id == models.Reserva.id)
+    ):
+        celda = _celda(fila)
+        celda["puntuacion_suma"] = int(fila[4] or 0)
+        celda["calificaciones"] = fila[5]
+    return {periodo: materias for periodo, materias in celdas.items() if periodo in set(meses)}
+
+
+def _metricas(celdas: list) -> dict:
+    """
+    Suma las celdas y calcula las tasas: completadas y canceladas sobre el total de sesiones
+    del período, y promedio de las calificaciones
+    """
+    estados, ingresos, pagos, suma, calificaciones = {}, Decimal(0), 0, 0, 0
+    for celda in celdas:
+        for estado, cantidad in celda["estados"].items():
+            estados[estado] = estados.get(estado, 0) + cantidad
+        ingresos += celda["ingresos"]
+        pagos += celda["pagos"]
+        suma += celda["puntuacion_suma"]
+        calificaciones += celda["calificaciones"]
+    sesiones = sum(estados.values())
+    return {
+        "sesiones": sesiones,
+        "sesiones_por_estado": estados,
+        "ingresos": float(round(ingresos, 2)),
+        "pagos": pagos,
+        "tasa_completadas": round(estados.get("completada", 0) / sesiones, 4) if sesiones else None,
+        "tasa_cancelacion": round(estados.get("cancelada", 0) / sesiones, 4) if sesiones else None,
+        "calificacion_promedio": round(suma / calificaciones, 2) if calificaciones else None,
+        "calificaciones": calificaciones,
+    }
+
+
+def _periodo(texto: str, nombre: str) -> tuple:
+    try:
+        año, mes = (int(parte) for parte in texto.split("-"))
+        if not 1 <= mes <= 12:
+            raise ValueError
+        return año, mes
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Formato de {nombre} incorrecto. Use YYYY-MM")
+
+
+def _meses(desde: tuple, hasta: tuple) -> list:
+    meses, actual = [], desde
+    while actual <= hasta:
+        meses.append(actual)
+        actual = (actual[0] + actual[1] // 12, actual[1] % 12 + 1)
+    return meses
+
+
+def generar_reporte(db: Session, tutor_id: int = None, desde: str = None, hasta: str = None) -> dict:
+    """
+    Reporte de un tutor (o de toda la plataforma si tutor_id es None) entre los meses `desde` y
+    `hasta` (YYYY-MM, inclusive; por defecto los últimos REPORTES_MESES meses): totales, serie
+    mensual y desglose por materia.
+    """
+    hoy = date.today()
+    mes_actual = (hoy.year, hoy.month)
+    hasta_mes = _periodo(hasta, "hasta") if hasta else mes_actual
+    if desde:
+        desde_mes = _periodo(desde, "desde")
+    else:
+        indice = hasta_mes[0] * 12 + hasta_mes[1] - REPORTES_MESES
+        desde_mes = (indice // 12, indice % 12 + 1)
+    if desde_mes > hasta_mes:
+        raise HTTPException(status_code=400, detail="El mes desde debe ser anterior a hasta")
+    meses = _meses(desde_mes, hasta_mes)
+    if len(meses) > REPORTES_MESES_MAXIMO:
+        raise HTTPException(status_code=400, detail=f"El período no puede superar {REPORTES_MESES_MAXIMO} meses")
+    try:
+        celdas_por_mes = reporte_cache.obtener(
+            tutor_id if tutor_id is not None else GLOBAL, meses,
+            lambda faltantes: cargar_meses(db, tutor_id, faltantes), mes_actual,
+        )
+    except Exception as e:
+        logging.error(f"Error generating reporte for tutor {tutor_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    por_materia = {}
+    for materias in celdas_por_mes.values():
+        for materia_id, celda in materias.items():
+            por_materia.setdefault(materia_id, []).append(celda)
+
+    return {
+        "tutor_id": tutor_id,
+        "desde": f"{desde_mes[0]}-{desde_mes[1]:02d}",
+        "hasta": f"{hasta_mes[0]}-{hasta_mes[1]:02d}",
+        "totales": _metricas([celda for materias in celdas_por_mes.values() for celda in materias.values()]),
+        "meses": [
+            {"periodo": f"{año}-{mes:02d}", **_metricas(list(celdas_por_mes[(año, mes)].values()))}
+            for año, mes in meses
+        ],
+        "materias": sorted(
+            ({"materia_id": materia_id, "nombre": celdas[0]["materia"], **_metricas(celdas)}
+             for materia_id, celdas in por_materia.items()),
+            key=lambda materia: (-materia["sesiones"], materia["materia_id"]),
+        ),
+    }
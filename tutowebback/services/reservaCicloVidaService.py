@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import logging
+from datetime import datetime
+
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.config import database
+from tutowebback.models import models
+from tutowebback.services import tareasService
+
+RESERVAS_BARRIDO_INTERVALO = float(os.getenv("RESERVAS_BARRIDO_INTERVALO", "300"))
+RESERVAS_BARRIDO_LOTE = int(os.getenv("RESERVAS_BARRIDO_LOTE", "500"))
+
+
+def _barrer(db: Session, estado_origen: str, estado_destino: str, columna_hora, ahora: datetime, lote: int):
+    """
+    Pasa de estado_origen a estado_destino, en lotes, las reservas cuya fecha y hora
+    (columna_hora) ya pasaron. La selección usa el índice (estado, fecha) y cada lote
+    es un UPDATE por clave primaria con su propio commit.
+
+    Returns:
+        Cantidad de reservas actualizadas
+    """
+    vencidas = (
+        models.Reserva.estado == estado_origen,
+        or_(
+            models.Reserva.fecha < ahora.date(),
+            and_(models.Reserva.fecha == ahora.date(), columna_hora <= ahora.time())
+        )
+    )
+    total = 0
+    while True:
+        ids = [
+            fila.id for fila in db.query(models.Reserva.id).filter(*vencidas)
+            .order_by(models.Reserva.id.asc()).limit(lote).all()
+        ]
+        if not ids:
+            return total
+        # Se repite la condición de estado por si la reserva cambió entre la lectura y el UPDATE
+        total += db.query(models.Reserva).filter(
+            models.Reserva.id.in_(ids),
+            models.Reserva.estado == estado_origen
+        ).update({"estado": estado_destino}, synchronize_session=False)
+        db.commit()
+        if len(ids) < lote:
+            return total
+
+
+def barrer_reservas(lote: int = None):
+    """
+    Cierra el ciclo de vida de las reservas vencidas:
+    - confirmadas cuya hora de fin ya pasó -> completada
+    - pendientes cuya hora de inicio ya pasó (nunca fueron confirmadas) -> cancelada
+
+    Returns:
+        Diccionario con la cantidad de reservas completadas y canceladas
+    """
+    lote = lote or RESERVAS_BARRIDO_LOTE
+    # Las fechas y horas de las reservas se manejan en hora local (igual que en ReservaService)
+    ahora = datetime.now()
+    inicio = time.perf_counter()
+    resultado = {"completadas": 0, "canceladas": 0}
+    db = database.SessionLocal()
+    try:
+        resultado["completadas"] = _barrer(db, "confirmada", "completada", models.Reserva.hora_fin, ahora, lote)
+        resultado["canceladas"] = _barrer(db, "pendiente", "cancelada", models.Reserva.hora_inicio, ahora, lote)
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Error barriendo reservas vencidas: {e}")
+    finally:
+        db.close()
+
+    if resultado["completadas"] or resultado["canceladas"]:
+        logging.info(f"Barrido de reservas: {resultado} en {time.perf_counter() - inicio:.3f}s")
+    return resultado
+
+
+tarea_barrido = tareasService.registrar_tarea(
+    "reservas_barrido", RESERVAS_BARRIDO_INTERVALO, barrer_reservas, ejecutar_al_detener=False, exclusiva=True
+)
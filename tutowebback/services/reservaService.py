@@ -1,6 +1,6 @@
 import os
 import sys
-from sqlalchemy import true
+from sqlalchemy import true, select, case, union
 from sqlalchemy.orm import Session, joinedload, aliased
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
@@ -10,7 +10,7 @@ from datetime import datetime, date, time, timedelta
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.models import models
 from tutowebback.schemas import schemas
-from tutowebback.services import notificacionService
+from tutowebback.services import notificacionOutboxService, serializacionService
 
 
 
@@ -85,11 +85,11 @@ class ReservaService:
                     detail="El tutor no tiene disponibilidad para el día y horario seleccionados"
                 )
 
-            # Verificar que no exista ya una reserva para ese tutor, en esa fecha y con horario solapado
+            # Verificar que el tutor no tenga ya una reserva (de cualquier materia) en esa fecha con horario solapado
             reserva_existente = db.query(models.Reserva).filter(
-                models.Reserva.servicio_id == reserva.servicio_id,
+                models.Reserva.tutor_id == servicio.tutor_id,
                 models.Reserva.fecha == reserva.fecha,
-                models.Reserva.estado.in_(["pendiente", "confirmada"]),
+                models.Reserva.activa(),
                 ((models.Reserva.hora_inicio <= reserva.hora_inicio) &
                  (models.Reserva.hora_fin > reserva.hora_inicio)) |
                 ((models.Reserva.hora_inicio < reserva.hora_fin) &
@@ -101,13 +101,14 @@ class ReservaService:
             if reserva_existente:
                 raise HTTPException(
                     status_code=400,
-                    detail="Ya existe una reserva para este servicio en la fecha y horario seleccionados"
+                    detail="El tutor ya tiene una reserva en la fecha y horario seleccionados"
                 )
 
             # Crear la reserva
             db_reserva = models.Reserva(
                 estudiante_id=reserva.estudiante_id,
                 servicio_id=reserva.servicio_id,
+                tutor_id=servicio.tutor_id,
                 fecha=reserva.fecha,
                 hora_inicio=reserva.hora_inicio,
                 hora_fin=reserva.hora_fin,
@@ -116,33 +117,22 @@ class ReservaService:
             )
 
             db.add(db_reserva)
+            db.flush()  # Para obtener el ID antes de encolar la notificación
+
+            # Encolar notificación al tutor en la misma transacción
+            materia_nombre = servicio.materia.nombre if servicio.materia else "una materia"
+            notificacionOutboxService.encolar_notificacion(
+                db=db,
+                usuario_id=servicio.tutor_id,
+                titulo="Nueva reserva de tutoría",
+                mensaje=f"Tienes una nueva reserva para {materia_nombre} el {reserva.fecha} a las {reserva.hora_inicio}",
+                tipo="reserva",
+                reserva_id=db_reserva.id
+            )
+
             db.commit()
             db.refresh(db_reserva)
 
-            # Enviar notificación al tutor
-            try:
-                # Obtener información de la materia para la notificación
-                materia_info = db.query(models.Materia).join(
-                    models.ServicioTutoria, models.ServicioTutoria.materia_id == models.Materia.id
-                ).filter(
-                    models.ServicioTutoria.id == reserva.servicio_id
-                ).first()
-
-                materia_nombre = materia_info.nombre if materia_info else "una materia"
-
-                # Crear notificación para el tutor
-                notificacionService.crear_notificacion(
-                    db=db,
-                    usuario_id=servicio.tutor_id,
-                    titulo="Nueva reserva de tutoría",
-                    mensaje=f"Tienes una nueva reserva para {materia_nombre} el {reserva.fecha} a las {reserva.hora_inicio}",
-                    tipo="reserva",
-                    reserva_id=db_reserva.id
-                )
-            except Exception as e:
-                # No interrumpir el flujo si falla la notificación
-                logging.error(f"Error creando notificación: {e}")
-
             return db_reserva
 
         except IntegrityError:
@@ -170,33 +160,10 @@ class ReservaService:
         """
         Obtiene una reserva con detalles completos (servicio, materia, tutor, estudiante)
         """
-        db_reserva = db.query(models.Reserva).filter(models.Reserva.id == id).first()
-        if db_reserva is None:
+        reservas = self._reservas_detalladas(db, [models.Reserva.id == id])
+        if not reservas:
             raise HTTPException(status_code=404, detail="Reserva not found")
-
-        reserva_dict = db_reserva.to_dict_reserva()
-
-        servicio = db.query(models.ServicioTutoria).filter(
-            models.ServicioTutoria.id == db_reserva.servicio_id
-        ).options(
-            joinedload(models.ServicioTutoria.materia),
-            joinedload(models.ServicioTutoria.tutor)
-        ).first()
-
-        if servicio:
-            reserva_dict["servicio"] = servicio.to_dict_servicio_tutoria()
-            if hasattr(servicio, 'tutor') and servicio.tutor:
-                reserva_dict["tutor"] = servicio.tutor.to_dict_usuario()
-            if hasattr(servicio, 'materia') and servicio.materia:
-                reserva_dict["materia"] = servicio.materia.to_dict_materia()
-
-        estudiante = db.query(models.Usuario).filter(
-            models.Usuario.id == db_reserva.estudiante_id
-        ).first()
-        if estudiante:
-            reserva_dict["estudiante"] = estudiante.to_dict_usuario()
-        
-        return reserva_dict
+        return reservas[0]
 
     def get_reservas_by_estudiante(self, db: Session, estudiante_id: int):
         """
@@ -215,55 +182,19 @@ class ReservaService:
         """
         Obtiene todas las reservas de un estudiante con detalles completos y filtrado por fechas si se proveen.
         """
-        query = db.query(models.Reserva).filter(models.Reserva.estudiante_id == estudiante_id)
+        filtros = [models.Reserva.estudiante_id == estudiante_id]
         if fecha_desde:
-            query = query.filter(models.Reserva.fecha >= fecha_desde)
+            filtros.append(models.Reserva.fecha >= fecha_desde)
         if fecha_hasta:
-            query = query.filter(models.Reserva.fecha <= fecha_hasta)
-
-        db_reservas = query.all()
-        reserva_responses = []
+            filtros.append(models.Reserva.fecha <= fecha_hasta)
 
-        for reserva in db_reservas:
-            reserva_dict = reserva.to_dict_reserva()
-
-            servicio = db.query(models.ServicioTutoria).filter(
-                models.ServicioTutoria.id == reserva.servicio_id
-            ).options(
-                joinedload(models.ServicioTutoria.materia),
-                joinedload(models.ServicioTutoria.tutor)
-            ).first()
-
-            if servicio:
-                reserva_dict["servicio"] = servicio.to_dict_servicio_tutoria()
-                if hasattr(servicio, 'tutor') and servicio.tutor:
-                    reserva_dict["tutor"] = servicio.tutor.to_dict_usuario()
-                if hasattr(servicio, 'materia') and servicio.materia:
-                    reserva_dict["materia"] = servicio.materia.to_dict_materia()
-
-            reserva_responses.append(reserva_dict)
-
-        return reserva_responses
+        return self._reservas_detalladas(db, filtros, con_estudiante=False)
 
     def get_reservas_by_tutor(self, db: Session, tutor_id: int):
         """
         Obtiene todas las reservas que corresponden a un tutor
         """
-        # Obtener los servicios de tutoría del tutor
-        servicios = db.query(models.ServicioTutoria).filter(
-            models.ServicioTutoria.tutor_id == tutor_id
-        ).all()
-
-        if not servicios:
-            return []
-
-        # Obtener los IDs de los servicios
-        servicio_ids = [servicio.id for servicio in servicios]
-
-        # Obtener las reservas para esos servicios
-        return db.query(models.Reserva).filter(
-            models.Reserva.servicio_id.in_(servicio_ids)
-        ).all()
+        return db.query(models.Reserva).filter(models.Reserva.tutor_id == tutor_id).all()
 
 
     def get_reservas_by_tutor_detalladas(
@@ -277,67 +208,23 @@ class ReservaService:
         Obtiene todas las reservas de un tutor con detalles completos y filtrado por fechas si se proveen.
         Incluye información del estudiante.
         """
-        # Obtener los servicios del tutor
-        servicios = db.query(models.ServicioTutoria).filter(models.ServicioTutoria.tutor_id == tutor_id).all()
-        servicio_ids = [servicio.id for servicio in servicios]
-
-        query = db.query(models.Reserva).filter(models.Reserva.servicio_id.in_(servicio_ids))
+        filtros = [models.Reserva.tutor_id == tutor_id]
         if fecha_desde:
-            query = query.filter(models.Reserva.fecha >= fecha_desde)
+            filtros.append(models.Reserva.fecha >= fecha_desde)
         if fecha_hasta:
-            query = query.filter(models.Reserva.fecha <= fecha_hasta)
-
-        db_reservas = query.all()
-        reserva_responses = []
+            filtros.append(models.Reserva.fecha <= fecha_hasta)
 
-        for reserva in db_reservas:
-            reserva_dict = reserva.to_dict_reserva()
+        return self._reservas_detalladas(db, filtros)
 
-            servicio = db.query(models.ServicioTutoria).filter(
-                models.ServicioTutoria.id == reserva.servicio_id
-            ).options(
-                joinedload(models.ServicioTutoria.materia),
-                joinedload(models.ServicioTutoria.tutor)
-            ).first()
-
-            if servicio:
-                reserva_dict["servicio"] = servicio.to_dict_servicio_tutoria()
-                if hasattr(servicio, 'tutor') and servicio.tutor:
-                    reserva_dict["tutor"] = servicio.tutor.to_dict_usuario()
-                if hasattr(servicio, 'materia') and servicio.materia:
-                    reserva_dict["materia"] = servicio.materia.to_dict_materia()
-
-            # Incluir información del estudiante
-            estudiante = db.query(models.Usuario).filter(
-                models.Usuario.id == reserva.estudiante_id
-            ).first()
-            if estudiante:
-                reserva_dict["estudiante"] = estudiante.to_dict_usuario()
-
-            reserva_responses.append(reserva_dict)
-
-        return reserva_responses
     def check_reservas_by_fecha_tutor(self, db: Session, tutor_id: int, fecha: date):
         """
         Obtiene reservas de un tutor para una fecha específica
         """
-        # Obtener servicios del tutor
-        servicios = db.query(models.ServicioTutoria).filter(
-            models.ServicioTutoria.tutor_id == tutor_id,
-            models.ServicioTutoria.activo == True
-        ).all()
-
-        if not servicios:
-            return []
-
-        # Obtener IDs de servicios
-        servicio_ids = [servicio.id for servicio in servicios]
-
-        # Obtener todas las reservas para los servicios del tutor en la fecha dada
+        # Todas las reservas activas ocupan el horario del tutor, aunque el servicio se haya desactivado
         reservas = db.query(models.Reserva).filter(
-            models.Reserva.servicio_id.in_(servicio_ids),
+            models.Reserva.tutor_id == tutor_id,
             models.Reserva.fecha == fecha,
-            models.Reserva.estado.in_(["pendiente", "confirmada"])
+            models.Reserva.activa()
         ).all()
 
         return reservas
@@ -401,20 +288,21 @@ class ReservaService:
                 if reserva_update.sala_virtual and reserva_update.sala_virtual != db_reserva.sala_virtual:
                     db_reserva.sala_virtual = reserva_update.sala_virtual
 
-            # Guardar cambios
-            db.commit()
-            db.refresh(db_reserva)
-
-            # Gestionar notificaciones según los cambios realizados
+            # Encolar notificaciones según los cambios realizados, en la misma transacción
             self._send_update_notifications(
                 db,
                 db_reserva,
                 reserva_update,
                 is_estudiante,
                 is_tutor,
-                old_estado
+                old_estado,
+                servicio
             )
 
+            # Guardar cambios
+            db.commit()
+            db.refresh(db_reserva)
+
             return db_reserva
 
         except IntegrityError:
@@ -424,6 +312,86 @@ class ReservaService:
             db.rollback()
             logging.error(f"Error updating reserva: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    def bulk_transition(self, db: Session, transiciones: list, current_user_id: int, is_admin: bool = False):
+        """
+        Cambia el estado de varias reservas en una sola transacción.
+        Carga todas las reservas con su servicio y materia en una consulta, valida permisos por ítem,
+        aplica un UPDATE por estado destino y encola todas las notificaciones juntas.
+
+        Returns:
+            Lista con el resultado de cada transición (en el mismo orden recibido)
+        """
+        ids = [transicion.reserva_id for transicion in transiciones]
+        reservas = {
+            reserva.id: reserva
+            for reserva in db.query(models.Reserva).options(
+                joinedload(models.Reserva.servicio).joinedload(models.ServicioTutoria.materia)
+            ).filter(models.Reserva.id.in_(ids)).all()
+        }
+
+        resultados = []
+        aceptadas = []
+        vistos = set()
+        for transicion in transiciones:
+            resultado = {"reserva_id": transicion.reserva_id, "estado": transicion.estado}
+            resultados.append(resultado)
+
+            reserva = reservas.get(transicion.reserva_id)
+            if transicion.reserva_id in vistos:
+                resultado.update(success=False, status_code=400, detail="Reserva duplicada en la solicitud")
+                continue
+            vistos.add(transicion.reserva_id)
+            if reserva is None or reserva.servicio is None:
+                resultado.update(success=False, status_code=404, detail="Reserva not found")
+                continue
+
+            update = schemas.ReservaUpdate(estado=transicion.estado)
+            is_estudiante = reserva.estudiante_id == current_user_id
+            is_tutor = reserva.servicio.tutor_id == current_user_id
+            try:
+                self._apply_reserva_permissions(reserva, update, is_estudiante, is_tutor, is_admin)
+            except HTTPException as he:
+                resultado.update(success=False, status_code=he.status_code, detail=he.detail)
+                continue
+
+            resultado.update(success=True, status_code=200, detail=None)
+            if reserva.estado != transicion.estado:
+                aceptadas.append((reserva, update, is_estudiante, is_tutor, reserva.estado, resultado))
+
+        if not aceptadas:
+            return resultados
+
+        try:
+            # Un UPDATE por estado destino
+            por_estado = {}
+            for reserva, update, *_ in aceptadas:
+                por_estado.setdefault(update.estado, []).append(reserva.id)
+            for estado, reserva_ids in por_estado.items():
+                db.query(models.Reserva).filter(
+                    models.Reserva.id.in_(reserva_ids)
+                ).update({"estado": estado}, synchronize_session="evaluate")
+
+            for reserva, update, is_estudiante, is_tutor, old_estado, _ in aceptadas:
+                servicio = reserva.servicio
+                # Generar salas virtuales para las reservas confirmadas (se escriben en el mismo flush)
+                if (update.estado == "confirmada" and servicio.modalidad in ["virtual", "ambas"]
+                        and not reserva.sala_virtual):
+                    self._generar_sala_jitsi(reserva, servicio)
+
+                self._send_update_notifications(
+                    db, reserva, update, is_estudiante, is_tutor, old_estado, servicio
+                )
+
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logging.error(f"Error applying bulk transition: {e}")
+            for *_, resultado in aceptadas:
+                resultado.update(success=False, status_code=500, detail="Internal Server Error")
+
+        return resultados
+
     def _apply_reserva_permissions(self, reserva, update, is_estudiante, is_tutor, is_admin):
         """
         Aplica las restricciones de permisos según el tipo de usuario
@@ -505,12 +473,12 @@ class ReservaService:
                 detail="El tutor no tiene disponibilidad para el día y horario seleccionados"
             )
 
-        # Verificar conflictos con otras reservas
+        # Verificar conflictos con otras reservas del tutor
         reserva_existente = db.query(models.Reserva).filter(
-            models.Reserva.servicio_id == reserva.servicio_id,
+            models.Reserva.tutor_id == tutor_id,
             models.Reserva.fecha == nueva_fecha,
             models.Reserva.id != reserva.id,  # Excluir la reserva actual
-            models.Reserva.estado.in_(["pendiente", "confirmada"]),
+            models.Reserva.activa(),
             # Verificar superposición de horarios
             ((models.Reserva.hora_inicio <= nueva_hora_inicio) &
              (models.Reserva.hora_fin > nueva_hora_inicio)) |
@@ -523,7 +491,7 @@ class ReservaService:
         if reserva_existente:
             raise HTTPException(
                 status_code=400,
-                detail="Ya existe una reserva para este servicio en la fecha y horario seleccionados"
+                detail="El tutor ya tiene una reserva en la fecha y horario seleccionados"
             )
 
     def _update_reserva_fields(self, reserva, update):
@@ -541,18 +509,12 @@ class ReservaService:
         if update.estado is not None:
             reserva.estado = update.estado
 
-    def _send_update_notifications(self, db, reserva, update, is_estudiante, is_tutor, old_estado):
+    def _send_update_notifications(self, db, reserva, update, is_estudiante, is_tutor, old_estado, servicio):
         """
-        Envía notificaciones según el tipo de cambio en la reserva
+        Encola notificaciones según el tipo de cambio en la reserva.
+        No hace commit: se confirman junto con la actualización de la reserva.
         """
         try:
-            # Obtener servicio y materia para las notificaciones
-            servicio = db.query(models.ServicioTutoria).filter(
-                models.ServicioTutoria.id == reserva.servicio_id
-            ).options(
-                joinedload(models.ServicioTutoria.materia)
-            ).first()
-
             if not servicio or not hasattr(servicio, 'materia') or not servicio.materia:
                 materia_nombre = "una materia"
             else:
@@ -568,7 +530,7 @@ class ReservaService:
 
             # Si se canceló la reserva y es un estudiante, notificar al tutor
             if is_estudiante and update.estado == "cancelada":
-                notificacionService.crear_notificacion(
+                notificacionOutboxService.encolar_notificacion(
                     db=db,
                     usuario_id=servicio.tutor_id,
                     titulo="Reserva cancelada",
@@ -592,7 +554,7 @@ class ReservaService:
                                                                                                      "ambas"]:
                     mensaje += info_sala
 
-                notificacionService.crear_notificacion(
+                notificacionOutboxService.encolar_notificacion(
                     db=db,
                     usuario_id=reserva.estudiante_id,
                     titulo=f"Reserva {estado_texto}",
@@ -640,84 +602,115 @@ class ReservaService:
             db.rollback()
             logging.error(f"Error deleting reserva: {e}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
-    def get_all_reservas_detalladas(
+    def _reservas_detalladas(
         self,
         db: Session,
-        fecha_desde: date = None,
-        fecha_hasta: date = None
+        filtros: list,
+        orden: tuple = (models.Reserva.id,),
+        con_estudiante: bool = True,
+        con_pago_y_calificacion: bool = False
     ):
         """
-        Obtiene todas las reservas del sistema con información detallada (para admin)
-        Incluye información del servicio, materia, tutor y estudiante
+        Reservas que cumplen `filtros` con su servicio, materia y tutor (y opcionalmente estudiante,
+        último pago y calificación), con el mismo formato que `to_dict_*`.
+
+        Se arma con consultas por columnas sobre el mismo filtro (reservas con servicio y materia,
+        usuarios, pagos, calificaciones), sin instanciar objetos ORM ni consultar por reserva
         """
-        try:
-            query = db.query(models.Reserva)
-            if fecha_desde:
-                query = query.filter(models.Reserva.fecha >= fecha_desde)
-            if fecha_hasta:
-                query = query.filter(models.Reserva.fecha <= fecha_hasta)
-            reservas = query.all()
-
-            sorted_reservas = sorted(reservas, key=lambda r: (
-                0 if r.estado == "pendiente" else
-                1 if r.estado == "confirmada" else
-                2 if r.estado == "completada" else 3,
-                r.fecha
-            ))
-
-            reserva_responses = []
-
-            for reserva in sorted_reservas:
-                # Datos básicos de la reserva
-                reserva_dict = reserva.to_dict_reserva()
-
-                # Obtener servicio asociado con materia y tutor
-                servicio = db.query(models.ServicioTutoria).filter(
-                    models.ServicioTutoria.id == reserva.servicio_id
-                ).options(
-                    joinedload(models.ServicioTutoria.materia),
-                    joinedload(models.ServicioTutoria.tutor)
-                ).first()
-
-                # Añadir información del servicio
-                if servicio:
-                    reserva_dict["servicio"] = servicio.to_dict_servicio_tutoria()
-
-                    # Añadir información del tutor
-                    if hasattr(servicio, 'tutor') and servicio.tutor:
-                        reserva_dict["tutor"] = servicio.tutor.to_dict_usuario()
-
-                    # Añadir información de la materia
-                    if hasattr(servicio, 'materia') and servicio.materia:
-                        reserva_dict["materia"] = servicio.materia.to_dict_materia()
-
-                # Obtener información del estudiante
-                estudiante = db.query(models.Usuario).filter(
-                    models.Usuario.id == reserva.estudiante_id
-                ).first()
+        filas = db.execute(
+            select(*serializacionService.RESERVA.columnas, *serializacionService.SERVICIO.columnas,
+                   *serializacionService.MATERIA.columnas)
+            .join(models.ServicioTutoria, models.Reserva.servicio_id == models.ServicioTutoria.id)
+            .join(models.Materia, models.ServicioTutoria.materia_id == models.Materia.id)
+            .where(*filtros)
+            .order_by(*orden)
+        ).all()
+        if not filas:
+            return []
 
+        ids_usuarios = select(models.Reserva.tutor_id).where(*filtros)
+        if con_estudiante:
+            ids_usuarios = union(ids_usuarios, select(models.Reserva.estudiante_id).where(*filtros))
+        usuarios = serializacionService.usuarios_por_id(db, ids_usuarios)
+
+        # Último pago y primera calificación de cada reserva
+        pagos = {}
+        calificaciones = {}
+        if con_pago_y_calificacion:
+            for fila in db.execute(
+                select(*serializacionService.PAGO.columnas)
+                .join(models.Reserva, models.Pago.reserva_id == models.Reserva.id)
+                .where(*filtros)
+                .order_by(models.Pago.reserva_id, models.Pago.fecha_creacion.desc())
+            ):
+                pagos.setdefault(fila.reserva_id, fila)
+            for fila in db.execute(
+                select(*serializacionService.CALIFICACION.columnas)
+                .join(models.Reserva, models.Calificacion.reserva_id == models.Reserva.id)
+                .where(*filtros)
+                .order_by(models.Calificacion.id)
+            ):
+                calificaciones.setdefault(fila.reserva_id, fila)
+
+        inicio_servicio = len(serializacionService.RESERVA)
+        inicio_materia = inicio_servicio + len(serializacionService.SERVICIO)
+        reserva_responses = []
+        for fila in filas:
+            reserva_dict = serializacionService.RESERVA.a_dict(fila)
+            materia = serializacionService.MATERIA.a_dict(fila, inicio_materia)
+            tutor = usuarios.get(reserva_dict["tutor_id"])
+
+            servicio = serializacionService.SERVICIO.a_dict(fila, inicio_servicio)
+            servicio["materia"] = materia
+            servicio["tutor"] = tutor
+            reserva_dict["servicio"] = servicio
+            if tutor:
+                reserva_dict["tutor"] = tutor
+            reserva_dict["materia"] = materia
+
+            if con_estudiante:
+                estudiante = usuarios.get(reserva_dict["estudiante_id"])
                 if estudiante:
-                    reserva_dict["estudiante"] = estudiante.to_dict_usuario()
-
-                # Obtener información de pago (si existe)
-                pago = db.query(models.Pago).filter(
-                    models.Pago.reserva_id == reserva.id
-                ).order_by(models.Pago.fecha_creacion.desc()).first()
+                    reserva_dict["estudiante"] = estudiante
 
-                if pago:
-                    reserva_dict["pago"] = pago.to_dict_pago()
+            pago = pagos.get(reserva_dict["id"])
+            if pago:
+                reserva_dict["pago"] = serializacionService.PAGO.a_dict(pago)
 
-                # Obtener calificación (si existe)
-                calificacion = db.query(models.Calificacion).filter(
-                    models.Calificacion.reserva_id == reserva.id
-                ).first()
+            calificacion = calificaciones.get(reserva_dict["id"])
+            if calificacion:
+                reserva_dict["calificacion"] = serializacionService.CALIFICACION.a_dict(calificacion)
 
-                if calificacion:
-                    reserva_dict["calificacion"] = calificacion.to_dict_calificacion()
+            reserva_responses.append(reserva_dict)
 
-                reserva_responses.append(reserva_dict)
+        return reserva_responses
 
-            return reserva_responses
+    def get_all_reservas_detalladas(
+        self,
+        db: Session,
+        fecha_desde: date = None,
+        fecha_hasta: date = None
+    ):
+        """
+        Obtiene todas las reservas del sistema con información detallada (para admin)
+        Incluye información del servicio, materia, tutor, estudiante, pago y calificación
+        """
+        try:
+            filtros = []
+            if fecha_desde:
+                filtros.append(models.Reserva.fecha >= fecha_desde)
+            if fecha_hasta:
+                filtros.append(models.Reserva.fecha <= fecha_hasta)
+
+            return self._reservas_detalladas(
+                db, filtros,
+                orden=(
+                    case({"pendiente": 0, "confirmada": 1, "completada": 2}, value=models.Reserva.estado, else_=3),
+                    models.Reserva.fecha,
+                    models.Reserva.id
+                ),
+                con_pago_y_calificacion=True
+            )
 
         except Exception as e:
             logging.error(f"Error obteniendo todas las reservas detalladas: {e}")
@@ -0,0 +1,407 @@
+"""
+Resúmenes diarios para los dashboards de administración.
+
+Cada resumen guarda, por día, los conteos de una tabla de hechos agrupados por sus
+dimensiones (resumen_diario_*), así un dashboard de meses o años lee unas cientos de filas
+agregadas en lugar de recorrer millones de reservas, pagos o notificaciones:
+- reservas: por fecha de la reserva y estado
+- reservas por materia: además por materia y carrera (para los rankings)
+- pagos: por día del pago (o de su creación si no se pagó), método y estado, con el monto
+- notificaciones: por día de creación, tipo y leída
+- calificaciones: por día e histograma de puntuaciones
+
+La tarea periódica avanza con una marca de agua por resumen (resumen_estado.procesado_hasta):
+en cada ejecución recalcula desde la marca menos RESUMENES_REAPERTURA_DIAS hasta el último día
+con datos (las reservas futuras incluidas), en tramos de RESUMENES_TRAMO_DIAS días. Cada tramo
+es una transacción que borra los días del tramo, los vuelve a insertar con un INSERT ... SELECT
+agrupado y mueve la marca; si se interrumpe, la próxima ejecución sigue desde el último tramo.
+
+La reapertura cubre los cambios posteriores al día del hecho: el barrido de reservas vencidas,
+los pagos y las lecturas de notificaciones. Un cambio más viejo que la ventana (p. ej. un
+reembolso meses después) no se refleja hasta recalcular el rango con
+`python -m tutowebback.tools.resumenes --desde AAAA-MM-DD`. La ventana debe ser menor que la
+retención de notificaciones leídas: los días ya cerrados conservan los conteos de las
+notificaciones que la retención borra o archiva.
+"""
+import os
+import sys
+import time
+import logging
+from datetime import date, datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import select, insert, delete, func, cast, extract, Date
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.config import database
+from tutowebback.models import models
+from tutowebback.services import tareasService
+
+RESUMENES_INTERVALO = float(os.getenv("RESUMENES_INTERVALO", "600"))
+RESUMENES_REAPERTURA_DIAS = max(1, int(os.getenv("RESUMENES_REAPERTURA_DIAS", "7")))
+RESUMENES_TRAMO_DIAS = int(os.getenv("RESUMENES_TRAMO_DIAS", "31"))
+# Rango máximo del dashboard agrupado por día
+DASHBOARD_DIAS_MAXIMO = 366
+# Materias con más reservas que se listan
+DASHBOARD_MATERIAS = 20
+AGRUPACIONES = ["dia", "mes"]
+
+
+def _dia(db: Session, columna):
+    """
+    Día de una columna de fecha u hora
+    """
+    if isinstance(columna.type, Date):
+        return columna
+    # En SQLite CAST(... AS DATE) devuelve solo el año (afinidad numérica): se usa date()
+    if db.get_bind().dialect.name == "sqlite":
+        return func.date(columna)
+    return cast(columna, Date)
+
+
+class Resumen:
+    def __init__(self, nombre: str, modelo, fecha, columnas: list, consulta):
+        """
+        Args:
+            nombre: Clave del resumen en resumen_estado
+            modelo: Tabla del resumen
+            fecha: Función que devuelve la columna de fecha de los hechos
+            columnas: Columnas del resumen que llena la consulta, en orden
+            consulta: Función (dia, desde, hasta) -> SELECT agrupado de los hechos del rango
+        """
+        self.nombre = nombre
+        self.modelo = modelo
+        self.fecha = fecha
+        self.columnas = columnas
+        self.consulta = consulta
+
+
+def _consulta_reservas(dia, desde, hasta):
+    return (
+        select(dia, models.Reserva.estado, func.count())
+        .where(models.Reserva.fecha >= desde, models.Reserva.fecha < hasta)
+        .group_by(dia, models.Reserva.estado)
+    )
+
+
+def _consulta_reservas_materia(dia, desde, hasta):
+    return (
+        select(dia, models.ServicioTutoria.materia_id, models.Materia.carrera_id, models.Reserva.estado, func.count())
+        .join(models.ServicioTutoria, models.Reserva.servicio_id == models.ServicioTutoria.id)
+        .join(models.Materia, models.ServicioTutoria.materia_id == models.Materia.id)
+        .where(models.Reserva.fecha >= desde, models.Reserva.fecha < hasta)
+        .group_by(dia, models.ServicioTutoria.materia_id, models.Materia.carrera_id, models.Reserva.estado)
+    )
+
+
+def _fecha_pago():
+    return func.coalesce(models.Pago.fecha_pago, models.Pago.fecha_creacion)
+
+
+def _consulta_pagos(dia, desde, hasta):
+    return (
+        select(dia, models.Pago.metodo_pago, models.Pago.estado, func.count(), func.coalesce(func.sum(models.Pago.monto), 0))
+        .where(_fecha_pago() >= datetime.combine(desde, datetime.min.time()),
+               _fecha_pago() < datetime.combine(hasta, datetime.min.time()))
+        .group_by(dia, models.Pago.metodo_pago, models.Pago.estado)
+    )
+
+
+def _consulta_notificaciones(dia, desde, hasta):
+    return (
+        select(dia, models.Notificacion.tipo, models.Notificacion.leida, func.count())
+        .where(models.Notificacion.fecha_creacion >= datetime.combine(desde, datetime.min.time()),
+               models.Notificacion.fecha_creacion < datetime.combine(hasta, datetime.min.time()))
+        .group_by(dia, models.Notificacion.tipo, models.Notificacion.leida)
+    )
+
+
+def _consulta_calificaciones(dia, desde, hasta):
+    return (
+        select(dia, models.Calificacion.puntuacion, func.count())
+        .where(models.Calificacion.fecha >= datetime.combine(desde, datetime.min.time()),
+               models.Calificacion.fecha < datetime.combine(hasta, datetime.min.time()),
+               models.Calificacion.puntuacion.is_not(None))
+        .group_by(dia, models.Calificacion.puntuacion)
+    )
+
+
+RESUMENES = [
+    Resumen("reservas", models.ResumenDiarioReservas, lambda: models.Reserva.fecha,
+            ["dia", "estado", "cantidad"], _consulta_reservas),
+    Resumen("reservas_materia", models.ResumenDiarioReservasMateria, lambda: models.Reserva.fecha,
+            ["dia", "materia_id", "carrera_id", "estado", "cantidad"], _consulta_reservas_materia),
+    Resumen("pagos", models.ResumenDiarioPagos, _fecha_pago,
+            ["dia", "metodo_pago", "estado", "cantidad", "monto"], _consulta_pagos),
+    Resumen("notificaciones", models.ResumenDiarioNotificaciones, lambda: models.Notificacion.fecha_creacion,
+            ["dia", "tipo", "leida", "cantidad"], _consulta_notificaciones),
+    Resumen("calificaciones", models.ResumenDiarioCalificaciones, lambda: models.Calificacion.fecha,
+            ["dia", "puntuacion", "cantidad"], _consulta_calificaciones),
+]
+
+
+def _a_fecha(valor):
+    # date() de SQLite devuelve texto
+    if isinstance(valor, str):
+        return date.fromisoformat(valor)
+    return valor.date() if isinstance(valor, datetime) else valor
+
+
+def _bloquear_estado(db: Session, nombre: str):
+    """
+    Estado del resumen bloqueado hasta el commit, o None si otro proceso lo está actualizando.
+    Con varios workers cada uno corre la tarea: el bloqueo evita que dos recalculen los mismos días.
+    """
+    estado = db.query(models.ResumenEstado).filter(
+        models.ResumenEstado.nombre == nombre
+    ).with_for_update(skip_locked=True).first()
+    if estado is not None:
+        return estado
+    if db.get(models.ResumenEstado, nombre) is not None:
+        return None
+    try:
+        db.add(models.ResumenEstado(nombre=nombre))
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+    return db.query(models.ResumenEstado).filter(
+        models.ResumenEstado.nombre == nombre
+    ).with_for_update(skip_locked=True).first()
+
+
+def actualizar_resumen(db: Session, resumen: Resumen, desde: date = None, tramo_dias: int = None) -> dict:
+    """
+    Recalcula un resumen desde la marca de agua (menos la reapertura) o desde `desde`, hasta
+    el último día con datos
+
+    Returns:
+        Diccionario con el rango recalculado, las filas escritas y la nueva marca de agua
+    """
+    tramo_dias = tramo_dias or RESUMENES_TRAMO_DIAS
+    hoy = date.today()
+    estado = _bloquear_estado(db, resumen.nombre)
+    if estado is None:
+        return {"resumen": resumen.nombre, "omitido": "en curso en otro proceso"}
+
+    fecha = resumen.fecha()
+    dia = _dia(db, fecha)
+    # Dos consultas: así cada una puede resolverse con el índice de la fecha
+    primero, ultimo = _a_fecha(db.scalar(select(func.min(fecha)))), _a_fecha(db.scalar(select(func.max(fecha))))
+    if desde is None and estado.procesado_hasta is not None:
+        desde = estado.procesado_hasta - timedelta(days=RESUMENES_REAPERTURA_DIAS)
+    desde = desde or primero
+    if desde is None:
+        db.commit()
+        return {"resumen": resumen.nombre, "dias": 0, "filas": 0, "procesado_hasta": None}
+    hasta = max(ultimo or hoy, hoy) + timedelta(days=1)
+
+    filas, inicio = 0, desde
+    while inicio < hasta:
+        fin = min(inicio + timedelta(days=tramo_dias), hasta)
+        db.execute(delete(resumen.modelo).where(resumen.modelo.dia >= inicio, resumen.modelo.dia < fin))
+        filas += db.execute(insert(resumen.modelo).from_select(
+            resumen.columnas, resumen.consulta(dia, inicio, fin)
+        )).rowcount
+        # Los días desde hoy siguen abiertos: la marca no los pasa y se recalculan en cada ejecución
+        estado.procesado_hasta = min(fin, hoy + timedelta(days=1))
+        estado.fecha_actualizacion = datetime.utcnow()
+        db.commit()
+        inicio = fin
+        if inicio < hasta:
+            estado = _bloquear_estado(db, resumen.nombre)
+            if estado is None:
+                break
+    return {
+        "resumen": resumen.nombre,
+        "desde": desde.isoformat(),
+        "hasta": hasta.isoformat(),
+        "dias": (min(inicio, hasta) - desde).days,
+        "filas": filas,
+        "procesado_hasta": estado.procesado_hasta.isoformat() if estado is not None else None,
+    }
+
+
+def actualizar_resumenes(desde: date = None, db: Session = None) -> dict:
+    """
+    Actualiza todos los resúmenes (tarea periódica y POST /reportes/resumenes/actualizar)
+
+    Args:
+        desde: Recalcular desde este día en lugar de la marca de agua
+        db: Sesión a usar (por defecto una nueva sobre la base de la aplicación)
+
+    Returns:
+        Diccionario con el resultado de cada resumen y la duración
+    """
+    inicio = time.perf_counter()
+    propia = db is None
+    db = db or database.SessionLocal()
+    resultado = {}
+    try:
+        for resumen in RESUMENES:
+            try:
+                resultado[resumen.nombre] = actualizar_resumen(db, resumen, desde)
+            except Exception as e:
+                db.rollback()
+                logging.error(f"Error actualizando el resumen {resumen.nombre}: {e}")
+                resultado[resumen.nombre] = {"resumen": resumen.nombre, "error": str(e)}
+    finally:
+        if propia:
+            db.close()
+    resultado = {"resumenes": resultado, "segundos": round(time.perf_counter() - inicio, 3)}
+    logging.info(f"Resúmenes diarios: {resultado}")
+    return resultado
+
+
+def _fecha(texto: str, nombre: str) -> date:
+    try:
+        return datetime.strptime(texto, '%Y-%m-%d').date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Formato de {nombre} incorrecto. Use YYYY-MM-DD")
+
+
+def _periodo(modelo, agrupar: str) -> tuple:
+    if agrupar == "dia":
+        return (modelo.dia,)
+    return extract("year", modelo.dia), extract("month", modelo.dia)
+
+
+def _clave(valores: tuple) -> str:
+    if len(valores) == 1:
+        return _a_fecha(valores[0]).isoformat()
+    return f"{int(valores[0])}-{int(valores[1]):02d}"
+
+
+def _periodo_vacio() -> dict:
+    return {"reservas": {}, "pagos": {}, "ingresos": {}, "notificaciones": {"total": 0, "leidas": 0, "por_tipo": {}},
+            "calificaciones": {}}
+
+
+def _sumar(destino: dict, clave, valor):
+    destino[clave] = destino.get(clave, 0) + valor
+
+
+def obtener_dashboard(db: Session, fecha_desde: str = None, fecha_hasta: str = None, agrupar: str = "mes") -> dict:
+    """
+    Series del dashboard de administración leídas de los resúmenes diarios
+
+    Args:
+        db: Sesión de base de datos
+        fecha_desde: Fecha desde en formato YYYY-MM-DD (por defecto, un año antes de hasta)
+        fecha_hasta: Fecha hasta en formato YYYY-MM-DD, inclusive (por defecto, hoy)
+        agrupar: "dia" o "mes"
+
+    Returns:
+        Diccionario con los períodos, los totales, las materias y carreras con más reservas y
+        la marca de agua de cada resumen
+    """
+    if agrupar not in AGRUPACIONES:
+        raise HTTPException(status_code=400, detail=f"Agrupación inválida. Debe ser una de: {', '.join(AGRUPACIONES)}")
+    hasta = _fecha(fecha_hasta, "fecha_hasta") if fecha_hasta else date.today()
+    desde = _fecha(fecha_desde, "fecha_desde") if fecha_desde else hasta - timedelta(days=365)
+    if desde > hasta:
+        raise HTTPException(status_code=400, detail="fecha_desde debe ser anterior a fecha_hasta")
+    if agrupar == "dia" and (hasta - desde).days >= DASHBOARD_DIAS_MAXIMO:
+        raise HTTPException(status_code=400, detail=f"Agrupado por día el rango no puede superar {DASHBOARD_DIAS_MAXIMO} días")
+
+    def _agregado(modelo, dimensiones: tuple, sumas: tuple, por_periodo: bool = True):
+        """
+        Filas (periodo..., dimensiones..., sumas...) del resumen en el rango
+        """
+        periodo = _periodo(modelo, agrupar) if por_periodo else ()
+        return db.execute(
+            select(*periodo, *dimensiones, *[func.sum(columna) for columna in sumas])
+            .where(modelo.dia >= desde, modelo.dia <= hasta)
+            .group_by(*periodo, *dimensiones)
+        ).all()
+
+    periodos = {}
+    reservas, pagos = models.ResumenDiarioReservas, models.ResumenDiarioPagos
+    notificaciones, calificaciones = models.ResumenDiarioNotificaciones, models.ResumenDiarioCalificaciones
+
+    for *periodo, estado, cantidad in _agregado(reservas, (reservas.estado,), (reservas.cantidad,)):
+        periodos.setdefault(_clave(periodo), _periodo_vacio())["reservas"][estado] = int(cantidad)
+    for *periodo, metodo, estado, cantidad, monto in _agregado(
+            pagos, (pagos.metodo_pago, pagos.estado), (pagos.cantidad, pagos.monto)):
+        datos = periodos.setdefault(_clave(periodo), _periodo_vacio())
+        _sumar(datos["pagos"], estado, int(cantidad))
+        if estado == "completado":
+            datos["ingresos"][metodo] = round(float(monto or 0), 2)
+    for *periodo, tipo, leida, cantidad in _agregado(
+            notificaciones, (notificaciones.tipo, notificaciones.leida), (notificaciones.cantidad,)):
+        datos = periodos.setdefault(_clave(periodo), _periodo_vacio())["notificaciones"]
+        datos["total"] += int(cantidad)
+        datos["leidas"] += int(cantidad) if leida else 0
+        _sumar(datos["por_tipo"], tipo, int(cantidad))
+    for *periodo, puntuacion, cantidad in _agregado(
+            calificaciones, (calificaciones.puntuacion,), (calificaciones.cantidad,)):
+        periodos.setdefault(_clave(periodo), _periodo_vacio())["calificaciones"][puntuacion] = int(cantidad)
+
+    totales = _periodo_vacio()
+    for datos in periodos.values():
+        for seccion in ("reservas", "pagos", "ingresos", "calificaciones"):
+            for clave, valor in datos[seccion].items():
+                _sumar(totales[seccion], clave, valor)
+        totales["notificaciones"]["total"] += datos["notificaciones"]["total"]
+        totales["notificaciones"]["leidas"] += datos["notificaciones"]["leidas"]
+        for tipo, cantidad in datos["notificaciones"]["por_tipo"].items():
+            _sumar(totales["notificaciones"]["por_tipo"], tipo, cantidad)
+    totales["ingresos"] = {metodo: round(monto, 2) for metodo, monto in totales["ingresos"].items()}
+
+    por_materia = models.ResumenDiarioReservasMateria
+    filas = _agregado(por_materia, (por_materia.materia_id, por_materia.carrera_id, por_materia.estado),
+                      (por_materia.cantidad,), por_periodo=False)
+    por_carrera = {}
+    for _, carrera_id, estado, cantidad in filas:
+        _sumar(por_carrera, (carrera_id, estado), cantidad)
+    return {
+        "desde": desde.isoformat(),
+        "hasta": hasta.isoformat(),
+        "agrupar": agrupar,
+        "periodos": [{"periodo": clave, **_con_calificaciones(datos)} for clave, datos in sorted(periodos.items())],
+        "totales": _con_calificaciones(totales),
+        "materias": _ranking(db, models.Materia, "materia_id",
+                             [(materia_id, estado, cantidad) for materia_id, _, estado, cantidad in filas])[:DASHBOARD_MATERIAS],
+        "carreras": _ranking(db, models.Carrera, "carrera_id",
+                             [(carrera_id, estado, cantidad) for (carrera_id, estado), cantidad in por_carrera.items()]),
+        "actualizado": [estado.to_dict_resumen_estado() for estado in db.query(models.ResumenEstado).all()],
+    }
+
+
+def _con_calificaciones(datos: dict) -> dict:
+    """
+    Reemplaza el histograma de calificaciones por histograma, cantidad y promedio
+    """
+    histograma = {str(puntuacion): cantidad for puntuacion, cantidad in sorted(datos["calificaciones"].items())}
+    cantidad = sum(histograma.values())
+    suma = sum(int(puntuacion) * veces for puntuacion, veces in histograma.items())
+    return {
+        **datos,
+        "calificaciones": {
+            "histograma": histograma,
+            "cantidad": cantidad,
+            "promedio": round(suma / cantidad, 2) if cantidad else None,
+        },
+    }
+
+
+def _ranking(db: Session, modelo, campo: str, filas: list) -> list:
+    """
+    Reservas por estado de cada materia o carrera, de la que más tiene a la que menos
+    """
+    nombres = dict(db.execute(
+        select(modelo.id, modelo.nombre).where(modelo.id.in_({fila[0] for fila in filas}))
+    ).all()) if filas else {}
+    por_id = {}
+    for identificador, estado, cantidad in filas:
+        item = por_id.setdefault(identificador, {campo: identificador, "nombre": nombres.get(identificador),
+                                                 "reservas": 0, "por_estado": {}})
+        item["reservas"] += int(cantidad)
+        item["por_estado"][estado] = item["por_estado"].get(estado, 0) + int(cantidad)
+    return sorted(por_id.values(), key=lambda item: (-item["reservas"], item[campo]))
+
+
+tarea_resumenes = tareasService.registrar_tarea(
+    "resumenes_diarios", RESUMENES_INTERVALO, actualizar_resumenes, ejecutar_al_detener=False, exclusiva=True
+)
@@ -0,0 +1,180 @@
+import os
+import sys
+import gzip
+import json
+import time
+import zlib
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.config import database
+from tutowebback.models import models
+from tutowebback.services import tareasService
+
+# Políticas de retención en días (0 deshabilita la política). Borran y mueven datos, así que
+# están deshabilitadas salvo que se configuren; sin ninguna, la tarea periódica no se registra
+RETENCION_LEIDAS_DIAS = int(os.getenv("NOTIFICACIONES_RETENCION_LEIDAS_DIAS", "0"))
+RETENCION_ARCHIVO_DIAS = int(os.getenv("NOTIFICACIONES_RETENCION_ARCHIVO_DIAS", "0"))
+# Destino del archivo: "tabla" (notificaciones_archivo) o "archivo" (JSONL comprimido con gzip)
+RETENCION_DESTINO = os.getenv("NOTIFICACIONES_RETENCION_DESTINO", "tabla")
+RETENCION_DIRECTORIO = os.getenv(
+    "NOTIFICACIONES_RETENCION_DIRECTORIO",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "archivo", "notificaciones")
+)
+RETENCION_LOTE = int(os.getenv("NOTIFICACIONES_RETENCION_LOTE", "1000"))
+# Pausa entre lotes para liberar locks y dejar pasar al tráfico normal
+RETENCION_PAUSA = float(os.getenv("NOTIFICACIONES_RETENCION_PAUSA", "0.05"))
+RETENCION_INTERVALO = float(os.getenv("NOTIFICACIONES_RETENCION_INTERVALO", "3600"))
+
+DESTINOS_VALIDOS = ["tabla", "archivo"]
+
+
+def _ids_lote(db: Session, filtros, limite: int):
+    # SKIP LOCKED: con varios workers ejecutando la tarea, cada uno toma filas distintas
+    return [
+        fila.id for fila in db.query(models.Notificacion.id).filter(*filtros)
+        .order_by(models.Notificacion.id.asc()).limit(limite).with_for_update(skip_locked=True).all()
+    ]
+
+
+def _eliminar_leidas(db: Session, fecha_limite: datetime, lote: int):
+    """
+    Elimina en lotes las notificaciones leídas anteriores a la fecha límite.
+    Cada lote es un DELETE por clave primaria con su propio commit, así la transacción
+    y los locks se mantienen cortos.
+
+    Returns:
+        Cantidad de notificaciones eliminadas
+    """
+    filtros = (models.Notificacion.leida == True, models.Notificacion.fecha_creacion < fecha_limite)
+    total = 0
+    while True:
+        ids = _ids_lote(db, filtros, lote)
+        if not ids:
+            return total
+        db.query(models.Notificacion).filter(models.Notificacion.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        total += len(ids)
+        if len(ids) < lote:
+            return total
+        time.sleep(RETENCION_PAUSA)
+
+
+def _escribir_archivo(filas: list):
+    os.makedirs(RETENCION_DIRECTORIO, exist_ok=True)
+    # Un archivo por proceso: dos workers que agregan al mismo gzip pueden intercalar sus bytes
+    ruta = os.path.join(RETENCION_DIRECTORIO, f"notificaciones_{datetime.utcnow():%Y%m%d}_{os.getpid()}.jsonl.gz")
+    with gzip.open(ruta, "at", encoding="utf-8") as archivo:
+        for fila in filas:
+            archivo.write(json.dumps(fila, ensure_ascii=False) + "\n")
+
+
+def _archivar(db: Session, fecha_limite: datetime, lote: int, destino: str):
+    """
+    Mueve en lotes las notificaciones anteriores a la fecha límite al almacenamiento frío
+    y las elimina de la tabla principal.
+    Con destino "archivo" la escritura no es transaccional: si el commit falla, el lote
+    se vuelve a escribir en la próxima ejecución (al menos una vez).
+    Cada lote se bloquea con FOR UPDATE SKIP LOCKED hasta su commit, así varios workers que
+    ejecutan la tarea a la vez nunca archivan las mismas filas.
+
+    Returns:
+        Cantidad de notificaciones archivadas
+    """
+    filtros = (models.Notificacion.fecha_creacion < fecha_limite,)
+    total = 0
+    while True:
+        notificaciones = db.query(models.Notificacion).filter(*filtros).order_by(
+            models.Notificacion.id.asc()
+        ).limit(lote).with_for_update(skip_locked=True).all()
+        if not notificaciones:
+            return total
+
+        filas = [notificacion.to_dict_notificacion() for notificacion in notificaciones]
+        ids = [notificacion.id for notificacion in notificaciones]
+
+        if destino == "archivo":
+            _escribir_archivo(filas)
+        else:
+            ahora = datetime.utcnow()
+            db.execute(insert(models.NotificacionArchivada), [
+                {
+                    "id": notificacion.id,
+                    "usuario_id": notificacion.usuario_id,
+                    "fecha_creacion": notificacion.fecha_creacion,
+                    "fecha_archivado": ahora,
+                    "contenido": zlib.compress(json.dumps(fila, ensure_ascii=False).encode("utf-8"))
+                }
+                for notificacion, fila in zip(notificaciones, filas)
+            ])
+
+        db.query(models.Notificacion).filter(models.Notificacion.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        db.expunge_all()
+        total += len(ids)
+        if len(ids) < lote:
+            return total
+        time.sleep(RETENCION_PAUSA)
+
+
+def ejecutar_retencion(leidas_dias: int = None, archivo_dias: int = None,
+                       destino: str = None, lote: int = None):
+    """
+    Aplica las políticas de retención sobre la tabla de notificaciones
+
+    Args:
+        leidas_dias: Antigüedad en días a partir de la cual se eliminan las notificaciones leídas
+        archivo_dias: Antigüedad en días a partir de la cual se archiva el resto
+        destino: "tabla" o "archivo"
+        lote: Cantidad de filas por lote
+
+    Returns:
+        Diccionario con filas eliminadas, archivadas, duración y filas por segundo
+    """
+    leidas_dias = RETENCION_LEIDAS_DIAS if leidas_dias is None else leidas_dias
+    archivo_dias = RETENCION_ARCHIVO_DIAS if archivo_dias is None else archivo_dias
+    destino = destino or RETENCION_DESTINO
+    lote = lote or RETENCION_LOTE
+
+    if destino not in DESTINOS_VALIDOS:
+        raise ValueError(f"Destino de archivo inválido. Debe ser uno de: {', '.join(DESTINOS_VALIDOS)}")
+
+    ahora = datetime.utcnow()
+    inicio = time.perf_counter()
+    eliminadas = 0
+    archivadas = 0
+    db = database.SessionLocal()
+    try:
+        if leidas_dias > 0:
+            eliminadas = _eliminar_leidas(db, ahora - timedelta(days=leidas_dias), lote)
+        if archivo_dias > 0:
+            archivadas = _archivar(db, ahora - timedelta(days=archivo_dias), lote, destino)
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Error aplicando retención de notificaciones: {e}")
+    finally:
+        db.close()
+
+    segundos = time.perf_counter() - inicio
+    movidas = eliminadas + archivadas
+    resultado = {
+        "eliminadas": eliminadas,
+        "archivadas": archivadas,
+        "destino": destino,
+        "segundos": round(segundos, 3),
+        "filas_por_segundo": round(movidas / segundos, 1) if segundos > 0 else 0
+    }
+    if movidas:
+        logging.info(f"Retención de notificaciones: {resultado}")
+    return resultado
+
+
+tarea_retencion = None
+if RETENCION_LEIDAS_DIAS > 0 or RETENCION_ARCHIVO_DIAS > 0:
+    tarea_retencion = tareasService.registrar_tarea(
+        "notificaciones_retencion", RETENCION_INTERVALO, ejecutar_retencion, ejecutar_al_detener=False, exclusiva=True
+    )
@@ -8,6 +8,7 @@ import logging
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.models import models
 from tutowebback.schemas import schemas
+from tutowebback.services import catalogoCacheService
 
 class RoleService:
     def create_rol(self, db: Session, rol: schemas.RolCreate):
@@ -15,6 +16,7 @@ class RoleService:
             db_rol = models.Rol(nombre=rol.nombre)
             db.add(db_rol)
             db.commit()
+            catalogoCacheService.invalidar("roles")
             db.refresh(db_rol)
             return db_rol
         except IntegrityError:
@@ -43,6 +45,7 @@ class RoleService:
                 db_rol.nombre = rol.nombre
 
             db.commit()
+            catalogoCacheService.invalidar("roles")
             db.refresh(db_rol)
             return db_rol
         except IntegrityError:
@@ -58,6 +61,7 @@ class RoleService:
         try:
             db_rol.estado = False
             db.commit()
+            catalogoCacheService.invalidar("roles")
             return True
         except Exception as e:
             db.rollback()
@@ -0,0 +1,106 @@
+import os
+import sys
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.models import models
+
+
+class Proyeccion:
+    """
+    Columnas de una entidad que se leen como tuplas, sin instanciar objetos ORM, y cómo
+    convertir cada fila en el mismo dict que arma su `to_dict_*`. Las fechas y horas quedan
+    como date/time/datetime: las serializa RespuestaJSON (o jsonable_encoder) en formato ISO.
+    """
+
+    def __init__(self, *columnas, numericas: tuple = ()):
+        self.columnas = columnas
+        self.claves = tuple(columna.key for columna in columnas)
+        # Numeric llega como Decimal; los to_dict_* lo devuelven como float (0 si es nulo)
+        self.numericas = numericas
+
+    def __len__(self):
+        return len(self.columnas)
+
+    def a_dict(self, fila, desde: int = 0) -> dict:
+        datos = dict(zip(self.claves, fila[desde:desde + len(self.columnas)]))
+        for clave in self.numericas:
+            datos[clave] = float(datos[clave]) if datos[clave] else 0
+        return datos
+
+
+RESERVA = Proyeccion(
+    models.Reserva.id, models.Reserva.estudiante_id, models.Reserva.servicio_id, models.Reserva.tutor_id,
+    models.Reserva.fecha, models.Reserva.hora_inicio, models.Reserva.hora_fin, models.Reserva.estado,
+    models.Reserva.notas, models.Reserva.sala_virtual, models.Reserva.fecha_creacion,
+)
+SERVICIO = Proyeccion(
+    models.ServicioTutoria.id, models.ServicioTutoria.tutor_id, models.ServicioTutoria.materia_id,
+    models.ServicioTutoria.precio, models.ServicioTutoria.descripcion, models.ServicioTutoria.modalidad,
+    models.ServicioTutoria.activo,
+    numericas=("precio",),
+)
+MATERIA = Proyeccion(
+    models.Materia.id, models.Materia.nombre, models.Materia.carrera_id, models.Materia.descripcion,
+    models.Materia.año_plan,
+)
+PAGO = Proyeccion(
+    models.Pago.id, models.Pago.reserva_id, models.Pago.monto, models.Pago.metodo_pago, models.Pago.estado,
+    models.Pago.referencia_externa, models.Pago.fecha_pago, models.Pago.fecha_creacion,
+    numericas=("monto",),
+)
+CALIFICACION = Proyeccion(
+    models.Calificacion.id, models.Calificacion.reserva_id, models.Calificacion.calificador_id,
+    models.Calificacion.calificado_id, models.Calificacion.puntuacion, models.Calificacion.comentario,
+    models.Calificacion.fecha,
+)
+NOTIFICACION = Proyeccion(
+    models.Notificacion.id, models.Notificacion.usuario_id, models.Notificacion.titulo,
+    models.Notificacion.mensaje, models.Notificacion.tipo, models.Notificacion.leida,
+    models.Notificacion.fecha_creacion, models.Notificacion.fecha_programada, models.Notificacion.reserva_id,
+)
+USUARIO = Proyeccion(
+    models.Usuario.id, models.Usuario.nombre, models.Usuario.apellido, models.Usuario.email,
+    models.Usuario.fecha_registro, models.Usuario.puntuacion_promedio, models.Usuario.cantidad_reseñas,
+    models.Usuario.foto_perfil,
+    numericas=("puntuacion_promedio",),
+)
+
+
+def usuarios_por_id(db: Session, ids) -> dict:
+    """
+    Usuarios con el formato de `Usuario.to_dict_usuario`, indexados por id, en dos consultas
+    (usuarios con su rol y carreras de todos ellos) en lugar de dos cargas diferidas por usuario.
+
+    Args:
+        db: Sesión de base de datos
+        ids: Subconsulta (select) con los ids de los usuarios a incluir
+
+    Returns:
+        dict {id: usuario serializado}
+    """
+    usuarios = {}
+    filas = db.execute(
+        select(*USUARIO.columnas, models.Rol.id, models.Rol.nombre)
+        .outerjoin(models.Rol, models.Usuario.id_rol == models.Rol.id)
+        .where(models.Usuario.id.in_(ids))
+    ).all()
+    for fila in filas:
+        usuario = USUARIO.a_dict(fila)
+        usuario["foto_perfil_thumb"] = models.miniatura_foto_perfil(usuario["foto_perfil"])
+        usuario["rol"] = {"id": fila[len(USUARIO)], "nombre": fila[len(USUARIO) + 1]}
+        usuario["carreras"] = []
+        usuarios[usuario["id"]] = usuario
+
+    carreras = db.execute(
+        select(models.CarreraUsuario.usuario_id, models.Carrera.id, models.Carrera.nombre)
+        .join(models.Carrera, models.CarreraUsuario.carrera_id == models.Carrera.id)
+        .where(models.CarreraUsuario.usuario_id.in_(ids))
+        .order_by(models.CarreraUsuario.id)
+    ).all()
+    for usuario_id, carrera_id, nombre in carreras:
+        if usuario_id in usuarios:
+            usuarios[usuario_id]["carreras"].append({"id": carrera_id, "nombre": nombre})
+    return usuarios
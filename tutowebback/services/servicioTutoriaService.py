@@ -2,7 +2,7 @@
 
 import os
 import sys
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 import logging
@@ -76,7 +76,7 @@ class ServicioTutoriaService:
 
     def get_servicio(self, db: Session, id: int):
         db_servicio = db.query(models.ServicioTutoria).options(
-            joinedload(models.ServicioTutoria.tutor),
+            *models.Usuario.opciones_resumen(joinedload(models.ServicioTutoria.tutor)),
             joinedload(models.ServicioTutoria.materia)
         ).filter(models.ServicioTutoria.id == id).first()
 
@@ -86,7 +86,8 @@ class ServicioTutoriaService:
 
     def get_servicios_by_tutor(self, db: Session, email: str):
         return db.query(models.ServicioTutoria).join(models.Usuario).options(
-            joinedload(models.ServicioTutoria.materia)
+            joinedload(models.ServicioTutoria.materia),
+            *models.Usuario.opciones_resumen(selectinload(models.ServicioTutoria.tutor))
         ).filter(
             models.Usuario.email == email,
             models.ServicioTutoria.activo == True
@@ -94,7 +95,8 @@ class ServicioTutoriaService:
 
     def get_servicios_by_materia(self, db: Session, materia_id: int):
         return db.query(models.ServicioTutoria).options(
-            joinedload(models.ServicioTutoria.tutor)
+            *models.Usuario.opciones_resumen(joinedload(models.ServicioTutoria.tutor)),
+            joinedload(models.ServicioTutoria.materia)
         ).filter(
             models.ServicioTutoria.materia_id == materia_id,
             models.ServicioTutoria.activo == True
@@ -165,7 +167,7 @@ class ServicioTutoriaService:
             # Verificar si hay reservas asociadas a este servicio
             reservas = db.query(models.Reserva).filter(
                 models.Reserva.servicio_id == id,
-                models.Reserva.estado.in_(["pendiente", "confirmada"])
+                models.Reserva.activa()
             ).first()
 
             if reservas:
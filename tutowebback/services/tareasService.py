@@ -0,0 +1,144 @@
+import os
+import asyncio
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+# Archivo de bloqueo que elige el proceso que corre las tareas exclusivas cuando hay varios
+# workers (gunicorn.conf.py lo define por maestro). Sin él, cada proceso las corre todas
+TAREAS_BLOQUEO = os.getenv("TAREAS_BLOQUEO")
+
+# Descriptor del archivo de bloqueo mientras este proceso es el líder
+_bloqueo = None
+
+
+def es_proceso_lider() -> bool:
+    """
+    Indica si este proceso corre las tareas exclusivas. Lo es el primero que toma el bloqueo
+    (lockf) de TAREAS_BLOQUEO y lo sigue siendo hasta que termina: el sistema libera el bloqueo
+    cuando el proceso muere, así que si el líder se recicla otro worker lo toma en su próxima
+    ejecución.
+    """
+    global _bloqueo
+    if not TAREAS_BLOQUEO or fcntl is None:
+        return True
+    if _bloqueo is not None:
+        return True
+    descriptor = os.open(TAREAS_BLOQUEO, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        # Bloqueo POSIX por proceso (no flock): los hijos creados con fork, como el pool de
+        # procesamiento de imágenes, no lo heredan ni lo retienen si el líder termina
+        fcntl.lockf(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(descriptor)
+        return False
+    _bloqueo = descriptor
+    logging.info(f"Proceso {os.getpid()}: corre las tareas exclusivas")
+    return True
+
+
+class TareaPeriodica:
+    """
+    Ejecuta una función cada cierto intervalo. Las funciones sincrónicas corren en un
+    hilo del threadpool para que el trabajo de base de datos no bloquee el event loop;
+    las corrutinas se esperan directamente. Una tarea `exclusiva` solo corre en el proceso líder
+    (ver es_proceso_lider)
+    """
+
+    def __init__(self, nombre: str, intervalo: float, funcion, ejecutar_al_detener: bool = True,
+                 exclusiva: bool = False):
+        self.nombre = nombre
+        self.intervalo = intervalo
+        self.funcion = funcion
+        self.ejecutar_al_detener = ejecutar_al_detener
+        self.exclusiva = exclusiva
+        self._task = None
+        self._despertar = None
+
+    def iniciar(self):
+        """
+        Lanza el loop de la tarea en el event loop actual
+        """
+        if self._task is None:
+            self._despertar = asyncio.Event()
+            self._task = asyncio.create_task(self._loop(), name=self.nombre)
+
+    async def detener(self):
+        """
+        Cancela el loop y, si corresponde, ejecuta una última vez la tarea para no dejar trabajo pendiente
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self.ejecutar_al_detener:
+            await self.ejecutar()
+
+    def despertar(self):
+        """
+        Adelanta la próxima ejecución sin esperar el intervalo completo
+        """
+        if self._despertar is not None:
+            self._despertar.set()
+
+    async def ejecutar(self):
+        try:
+            if self.exclusiva and not es_proceso_lider():
+                return None
+            if asyncio.iscoroutinefunction(self.funcion):
+                return await self.funcion()
+            return await run_in_threadpool(self.funcion)
+        except Exception as e:
+            logging.error(f"Error ejecutando tarea {self.nombre}: {e}")
+            return None
+
+    async def _loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._despertar.wait(), timeout=self.intervalo)
+            except asyncio.TimeoutError:
+                pass
+            self._despertar.clear()
+            await self.ejecutar()
+
+
+_tareas = []
+
+
+def registrar_tarea(nombre: str, intervalo: float, funcion, ejecutar_al_detener: bool = True,
+                    exclusiva: bool = False):
+    """
+    Registra una tarea periódica que se inicia junto con la aplicación
+
+    Args:
+        nombre: Nombre de la tarea (para logs)
+        intervalo: Segundos entre ejecuciones
+        funcion: Función sin argumentos (sincrónica o corrutina)
+        ejecutar_al_detener: Si es True, se ejecuta una última vez al apagar la aplicación
+        exclusiva: Si es True, con varios workers corre solo en uno (el que tiene TAREAS_BLOQUEO)
+
+    Returns:
+        La tarea registrada
+    """
+    tarea = TareaPeriodica(nombre, intervalo, funcion, ejecutar_al_detener, exclusiva)
+    _tareas.append(tarea)
+    return tarea
+
+
+def iniciar_tareas():
+    for tarea in _tareas:
+        tarea.iniciar()
+
+
+async def detener_tareas():
+    for tarea in _tareas:
+        await tarea.detener()
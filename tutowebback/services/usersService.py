@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.models import models
 from tutowebback.schemas import schemas
 from tutowebback.auth import auth
+from tutowebback.services import catalogoCacheService
 
 
 
@@ -65,27 +66,31 @@ class UsuarioService:
             raise HTTPException(status_code=500, detail="Internal Server Error")
 
     def get_usuario(self, db: Session, usuario_id: int):
-        db_usuario = db.query(models.Usuario).filter(models.Usuario.id == usuario_id).first()
+        db_usuario = db.query(models.Usuario).options(*models.Usuario.opciones_resumen()).filter(
+            models.Usuario.id == usuario_id).first()
         if db_usuario is None:
             raise HTTPException(status_code=404, detail="Usuario not found")
         return db_usuario
 
     def get_all_usuarios(self, db: Session):
-        db_usuarios = db.query(models.Usuario).filter(models.Usuario.activo == True).all()
+        db_usuarios = db.query(models.Usuario).options(*models.Usuario.opciones_resumen()).filter(
+            models.Usuario.activo == True).all()
         if db_usuarios is None:
             raise HTTPException(status_code=404, detail="Usuarios not found")
         return db_usuarios
 
     @classmethod
     def getRoleByName(cls,db, param):
-        db_roles = db.query(models.Rol).filter(models.Rol.nombre == param).first()
+        # Se consulta en cada listado de tutores: sale de la caché de catálogos (dict serializado)
+        db_roles = catalogoCacheService.roles_por_nombre(db).get(param)
         if db_roles is None:
             raise HTTPException(status_code=404, detail="Rol not found")
         return db_roles
     def get_tutores(self, db: Session):
 
         db_roles = UsuarioService.getRoleByName(db, "alumno&tutor")
-        db_tutores = db.query(models.Usuario).filter(models.Usuario.activo == True, models.Usuario.id_rol == db_roles.id).all()
+        db_tutores = db.query(models.Usuario).options(*models.Usuario.opciones_resumen()).filter(
+            models.Usuario.activo == True, models.Usuario.id_rol == db_roles["id"]).all()
         if db_tutores is None:
             raise HTTPException(status_code=404, detail="Tutores not found")
         return db_tutores
@@ -165,7 +170,8 @@ class UsuarioService:
             raise HTTPException(status_code=500, detail="Internal Server Error")
 
     def get_usuario_by_email(self, db, email):
-        db_usuario = db.query(models.Usuario).filter(models.Usuario.email == email).first()
+        db_usuario = db.query(models.Usuario).options(*models.Usuario.opciones_resumen()).filter(
+            models.Usuario.email == email).first()
         if db_usuario is None:
             raise HTTPException(status_code=404, detail="Usuario not found")
         return db_usuario
@@ -176,12 +182,13 @@ class UsuarioService:
         return db_usuario
 
     def get_tutores_by_carrera(self, db, id):
-        # Obtener todos los tutores
+        # Tutores activos inscriptos en la carrera (filtrado en la consulta, no recorriendo sus carreras)
         db_roles = UsuarioService.getRoleByName(db, "alumno&tutor")
-        db_tutores = db.query(models.Usuario).filter(models.Usuario.activo == True, models.Usuario.id_rol == db_roles.id).all()
-        if db_tutores is None:
-            raise HTTPException(status_code=404, detail="Tutores not found")
-        db_tutores = [tutor for tutor in db_tutores if any(carrera.carrera_id == id for carrera in tutor.carreras)]
+        db_tutores = db.query(models.Usuario).options(*models.Usuario.opciones_resumen()).filter(
+            models.Usuario.activo == True,
+            models.Usuario.id_rol == db_roles["id"],
+            models.Usuario.carreras.any(models.CarreraUsuario.carrera_id == id)
+        ).all()
         if not db_tutores:
             raise HTTPException(status_code=404, detail="No tutores found for this carrera")
         return db_tutores
@@ -190,21 +197,26 @@ class UsuarioService:
         # Obtener tutores básicos
         db_tutores = self.get_tutores_by_carrera(db, carrera_id)
 
+        # Materias activas de la carrera para todos los tutores en una sola consulta
+        materias_por_tutor = {tutor.id: [] for tutor in db_tutores}
+        if materias_por_tutor:
+            # Solo las inscripciones de estos tutores, no las de los alumnos de la carrera
+            materias_rel = db.query(models.MateriasXCarreraXUsuario.usuario_id, models.Materia.nombre).join(
+                models.Materia, models.MateriasXCarreraXUsuario.materia_id == models.Materia.id
+            ).filter(
+                models.MateriasXCarreraXUsuario.carrera_id == carrera_id,
+                models.MateriasXCarreraXUsuario.estado == True,
+                models.MateriasXCarreraXUsuario.usuario_id.in_(materias_por_tutor)
+            ).order_by(models.MateriasXCarreraXUsuario.id).all()
+            for usuario_id, nombre_materia in materias_rel:
+                materias_por_tutor[usuario_id].append(nombre_materia)
+
         # Preparar la respuesta con tutores y sus materias
         tutores_con_materias = []
 
         for tutor in db_tutores:
-            # Obtener materias de este tutor para la carrera específica
-            materias_rel = db.query(models.MateriasXCarreraXUsuario).options(
-                joinedload(models.MateriasXCarreraXUsuario.materia)
-            ).filter(
-                models.MateriasXCarreraXUsuario.usuario_id == tutor.id,
-                models.MateriasXCarreraXUsuario.carrera_id == carrera_id,
-                models.MateriasXCarreraXUsuario.estado == True
-            ).all()
-
             # Extraer nombres de materias
-            nombres_materias = [rel.materia.nombre for rel in materias_rel if rel.materia]
+            nombres_materias = materias_por_tutor[tutor.id]
 
             # Crear diccionario del tutor con materias incluidas
             tutor_dict = tutor.to_dict_usuario()
@@ -0,0 +1,168 @@
+"""
+Verificación del almacenamiento S3 de imágenes (services/almacenamientoService.py) contra un
+cliente S3 en memoria, sin boto3 ni red.
+
+ClienteS3Memoria implementa la parte de la interfaz de boto3 que usa AlmacenamientoS3
+(head_object, upload_file, list_objects_v2, delete_object y exceptions.ClientError, con la
+misma forma de `response`). Sobre él se ejecutan las operaciones del backend y el flujo
+completo de ImageService: subida con variantes, Cache-Control inmutable, deduplicación y
+borrado. Cualquier caso que falla termina con código de salida 1.
+
+Uso (desde la raíz del repositorio):
+    python -m tutowebback.tools.almacenamiento_s3
+"""
+import io
+import os
+import sys
+import asyncio
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from starlette.datastructures import UploadFile
+
+from tutowebback.services.almacenamientoService import AlmacenamientoS3, CACHE_CONTROL_INMUTABLE
+from tutowebback.services.imageService import ImageService, Image
+
+BUCKET = "tutoweb-imagenes"
+URL_PUBLICA = "https://cdn.ejemplo.com/imagenes"
+
+
+class ClientErrorMemoria(Exception):
+    """
+    Igual que botocore.exceptions.ClientError: el código del error está en response["Error"]["Code"]
+    """
+
+    def __init__(self, codigo: str, operacion: str):
+        super().__init__(f"An error occurred ({codigo}) when calling the {operacion} operation")
+        self.response = {"Error": {"Code": codigo}}
+        self.operation_name = operacion
+
+
+class _Excepciones:
+    ClientError = ClientErrorMemoria
+
+
+class ClienteS3Memoria:
+    """
+    Cliente S3 en memoria. `denegar` hace que toda operación responda AccessDenied (para
+    verificar que los errores que no son "no existe" se propagan).
+    """
+    exceptions = _Excepciones
+
+    def __init__(self, buckets=(BUCKET,)):
+        self.buckets = set(buckets)
+        self.objetos = {}
+        self.subidas = 0
+        self.denegar = False
+
+    def _verificar(self, bucket: str, operacion: str):
+        if self.denegar:
+            raise ClientErrorMemoria("AccessDenied", operacion)
+        if bucket not in self.buckets:
+            raise ClientErrorMemoria("NoSuchBucket", operacion)
+
+    def head_object(self, Bucket, Key):
+        self._verificar(Bucket, "HeadObject")
+        objeto = self.objetos.get((Bucket, Key))
+        if objeto is None:
+            # head_object no tiene cuerpo: boto3 informa el status HTTP como código
+            raise ClientErrorMemoria("404", "HeadObject")
+        return {"ContentLength": len(objeto["cuerpo"]), **objeto["atributos"]}
+
+    def upload_file(self, Filename, Bucket, Key, ExtraArgs=None):
+        self._verificar(Bucket, "PutObject")
+        with open(Filename, "rb") as archivo:
+            self.objetos[(Bucket, Key)] = {"cuerpo": archivo.read(), "atributos": dict(ExtraArgs or {})}
+        self.subidas += 1
+
+    def list_objects_v2(self, Bucket, Prefix=""):
+        self._verificar(Bucket, "ListObjectsV2")
+        claves = sorted(clave for bucket, clave in self.objetos if bucket == Bucket and clave.startswith(Prefix))
+        respuesta = {"KeyCount": len(claves)}
+        if claves:
+            respuesta["Contents"] = [{"Key": clave, "Size": len(self.objetos[(Bucket, clave)]["cuerpo"])} for clave in claves]
+        return respuesta
+
+    def delete_object(self, Bucket, Key):
+        self._verificar(Bucket, "DeleteObject")
+        self.objetos.pop((Bucket, Key), None)
+        return {}
+
+
+def _imagen_png() -> bytes:
+    if Image is None:
+        # PNG 1x1 mínimo: sin Pillow solo se guarda el original
+        return bytes.fromhex(
+            "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+            "1f15c4890000000d49444154789c6360f80f0000010101005a4d6b8b0000000049454e44ae426082"
+        )
+    salida = io.BytesIO()
+    Image.new("RGB", (640, 480), (30, 120, 200)).save(salida, "PNG")
+    return salida.getvalue()
+
+
+def _backend(cliente: ClienteS3Memoria) -> list:
+    almacenamiento = AlmacenamientoS3(cliente, BUCKET, URL_PUBLICA)
+    casos = []
+    with tempfile.NamedTemporaryFile(delete=False) as archivo:
+        archivo.write(b"contenido")
+    clave = "profile_images/ab/abc.webp"
+    casos.append(("existe antes de guardar", almacenamiento.existe(clave) is False))
+    almacenamiento.guardar(clave, archivo.name, "image/webp")
+    casos.append(("guardar elimina el archivo local", not os.path.exists(archivo.name)))
+    casos.append(("existe después de guardar", almacenamiento.existe(clave)))
+    atributos = cliente.objetos[(BUCKET, clave)]["atributos"]
+    casos.append(("Content-Type y Cache-Control", atributos == {"ContentType": "image/webp", "CacheControl": CACHE_CONTROL_INMUTABLE}))
+    casos.append(("listar por prefijo", almacenamiento.listar("profile_images/ab/ab") == [clave]))
+    casos.append(("url y clave_desde_url", almacenamiento.clave_desde_url(almacenamiento.url(clave)) == clave))
+    casos.append(("clave_desde_url de otra URL", almacenamiento.clave_desde_url("/uploads/x.webp") is None))
+
+    cliente.denegar = True
+    try:
+        almacenamiento.existe(clave)
+        casos.append(("existe propaga AccessDenied", False))
+    except ClientErrorMemoria:
+        casos.append(("existe propaga AccessDenied", True))
+    cliente.denegar = False
+    try:
+        AlmacenamientoS3(cliente, "otro-bucket", URL_PUBLICA).existe(clave)
+        casos.append(("existe propaga NoSuchBucket", False))
+    except ClientErrorMemoria:
+        casos.append(("existe propaga NoSuchBucket", True))
+
+    almacenamiento.eliminar(clave)
+    casos.append(("eliminar", not almacenamiento.existe(clave)))
+    return casos
+
+
+async def _imagenes(cliente: ClienteS3Memoria) -> list:
+    servicio = ImageService(AlmacenamientoS3(cliente, BUCKET, URL_PUBLICA))
+    contenido = _imagen_png()
+    casos = []
+
+    url = await servicio.save_profile_image("a@x.com", UploadFile(io.BytesIO(contenido), filename="foto.png"))
+    claves = sorted(clave for _, clave in cliente.objetos)
+    esperadas = 3 if Image is not None else 1
+    casos.append(("subida con variantes", len(claves) == esperadas and url.startswith(URL_PUBLICA + "/profile_images/")))
+    casos.append(("todas con Cache-Control inmutable", all(
+        objeto["atributos"].get("CacheControl") == CACHE_CONTROL_INMUTABLE for objeto in cliente.objetos.values()
+    )))
+
+    subidas = cliente.subidas
+    repetida = await servicio.save_profile_image("b@x.com", UploadFile(io.BytesIO(contenido), filename="otra.png"))
+    casos.append(("deduplicación", repetida == url and cliente.subidas == subidas))
+
+    casos.append(("borrado de la imagen y sus variantes", servicio.delete_profile_image(url) and not cliente.objetos))
+    return casos
+
+
+def main():
+    cliente = ClienteS3Memoria()
+    casos = _backend(cliente) + asyncio.run(_imagenes(cliente))
+    for nombre, correcto in casos:
+        print(f"{'OK' if correcto else 'FALLA'} {nombre}")
+    sys.exit(0 if all(correcto for _, correcto in casos) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Auditoría de índices.
+
+1. Revisa los modelos: toda clave foránea debe ser la primera columna de algún índice
+   (SQL Server, PostgreSQL y SQLite no indexan las claves foráneas automáticamente).
+2. Recorre los servicios de lectura sobre una base SQLite migrada y con datos, captura el SQL
+   emitido y corre EXPLAIN QUERY PLAN: toda tabla recorrida completa (SCAN) que se filtra o
+   se une por una columna sin índice se reporta.
+3. Con --tiempos copia la base, revierte la copia hasta la revisión --antes y repite sobre
+   ambas las mismas consultas capturadas. Las que usan columnas que la revisión anterior no
+   tiene se informan como n/d.
+
+Uso (desde la raíz del repositorio):
+    python -m tutowebback.tools.auditoria_indices
+    python -m tutowebback.tools.auditoria_indices --tiempos --antes 0003 --reservas 20000
+
+Sale con código 1 si encuentra columnas sin índice.
+"""
+import os
+import re
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from sqlalchemy import Boolean, create_engine, event
+from sqlalchemy.orm import Session
+
+from tutowebback.models import models
+from tutowebback.schemas import schemas
+from tutowebback.services import notificacionService
+from tutowebback.services.reservaService import ReservaService
+from tutowebback.services.disponibilidadService import DisponibilidadService
+from tutowebback.services.calificacionService import CalificacionService
+from tutowebback.services.pagoService import PagoService
+from tutowebback.services.materiaService import MateriaService
+from tutowebback.services.servicioTutoriaService import ServicioTutoriaService
+from tutowebback.services.usersService import UsuarioService
+from tutowebback.services.materiasXCarreraXUsuarioService import MateriasXCarreraXUsuarioService
+from tutowebback.tools.datos_prueba import migrar, revertir, cargar_datos
+
+# (nombre, llamada al servicio) para los caminos de lectura más usados
+RECORRIDO = [
+    ("reservas estudiante detalladas",
+     lambda db, d: ReservaService().get_reservas_by_estudiante_detalladas(db, d["estudiante"])),
+    ("reservas tutor detalladas",
+     lambda db, d: ReservaService().get_reservas_by_tutor_detalladas(db, d["tutor"])),
+    ("acciones de reservas",
+     lambda db, d: ReservaService().get_reservas_actions(
+         db, schemas.ReservasIdsRequest(reserva_ids=[d["reserva_completada"]]))),
+    ("disponibilidades disponibles",
+     lambda db, d: DisponibilidadService().get_disponibilidades_disponibles(db, d["tutor"], d["fecha"])),
+    ("disponibilidades del tutor",
+     lambda db, d: DisponibilidadService().get_disponibilidades_by_tutor(db, d["tutor"])),
+    ("calificación de una reserva",
+     lambda db, d: CalificacionService().get_calificacion_by_reserva(db, d["reserva_completada"])),
+    ("calificaciones del tutor",
+     lambda db, d: CalificacionService().get_calificaciones_by_tutor(db, d["tutor"])),
+    ("calificaciones del estudiante",
+     lambda db, d: CalificacionService().get_calificaciones_by_estudiante(db, d["estudiante"])),
+    ("pago de una reserva",
+     lambda db, d: PagoService().get_pago_by_reserva(db, d["reserva_completada"])),
+    ("pagos del estudiante",
+     lambda db, d: PagoService().get_pagos_by_estudiante(db, d["estudiante"])),
+    ("pagos del tutor",
+     lambda db, d: PagoService().get_pagos_by_tutor(db, d["tutor"])),
+    ("notificaciones del usuario",
+     lambda db, d: notificacionService.obtener_notificaciones_usuario(db, d["estudiante"])),
+    ("notificaciones por tipo",
+     lambda db, d: notificacionService.obtener_notificaciones_por_tipo(db, d["estudiante"], "reserva")),
+    ("materias de una carrera",
+     lambda db, d: MateriaService().get_materias_by_carrera(db, d["carrera"])),
+    ("servicios de una materia",
+     lambda db, d: ServicioTutoriaService().get_servicios_by_materia(db, d["materia"])),
+    ("servicios del tutor",
+     lambda db, d: ServicioTutoriaService().get_servicios_by_tutor(db, d["email_tutor"])),
+    ("tutores por carrera",
+     lambda db, d: UsuarioService().get_tutores_by_carrera(db, d["carrera"])),
+    ("tutores por carrera con materias",
+     lambda db, d: UsuarioService().get_tutores_by_carrera_with_materias(db, d["carrera"])),
+    ("materias de usuario y carrera",
+     lambda db, d: MateriasXCarreraXUsuarioService().get_materias_by_usuario_and_carrera(
+         db, d["tutor"], d["carrera"])),
+    ("usuarios de materia y carrera",
+     lambda db, d: MateriasXCarreraXUsuarioService().get_usuarios_by_materia_and_carrera(
+         db, d["materia"], d["carrera"])),
+]
+
+# Tablas de pocas filas donde el recorrido completo es lo más barato
+TABLAS_CHICAS = {"roles"}
+
+_OPERADORES = r"\s*(?:=|!=|<>|<=|>=|<|>|\bIN\b|\bNOT IN\b|\bBETWEEN\b|\bIS\b|\bLIKE\b)"
+
+
+def columnas_indexadas(tabla) -> set:
+    """
+    Columnas que encabezan algún índice, restricción única o clave primaria de la tabla
+    """
+    primeras = set()
+    for indice in tabla.indexes:
+        primeras.add(indice.columns[0].name)
+    for restriccion in tabla.constraints:
+        columnas = list(getattr(restriccion, "columns", []))
+        if columnas and not hasattr(restriccion, "referred_table"):
+            primeras.add(columnas[0].name)
+    return primeras
+
+
+def claves_foraneas_sin_indice(metadata) -> list:
+    """
+    Returns:
+        Lista de (tabla, columna) con clave foránea que no encabeza ningún índice
+    """
+    faltantes = []
+    for tabla in metadata.sorted_tables:
+        indexadas = columnas_indexadas(tabla)
+        for clave in tabla.foreign_keys:
+            if clave.parent.name not in indexadas:
+                faltantes.append((tabla.name, clave.parent.name))
+    return sorted(set(faltantes))
+
+
+@contextmanager
+def capturar_consultas(engine):
+    """
+    Registra las sentencias SELECT/UPDATE/DELETE que pasan por `engine` como (sentencia, parámetros)
+    """
+    capturadas = []
+
+    def _capturar(conn, cursor, sentencia, parametros, contexto, executemany):
+        if sentencia.lstrip().split(" ", 1)[0].upper() in ("SELECT", "UPDATE", "DELETE"):
+            capturadas.append((sentencia, parametros))
+
+    event.listen(engine, "before_cursor_execute", _capturar)
+    try:
+        yield capturadas
+    finally:
+        event.remove(engine, "before_cursor_execute", _capturar)
+
+
+def ejecutar_recorrido(engine, datos: dict) -> dict:
+    """
+    Ejecuta RECORRIDO y devuelve {nombre: [(sentencia, parámetros), ...]}
+    """
+    consultas = {}
+    with Session(engine) as db:
+        for nombre, llamada in RECORRIDO:
+            with capturar_consultas(engine) as capturadas:
+                try:
+                    llamada(db, datos)
+                except Exception:
+                    # Las HTTPException de los servicios no importan: se audita el SQL emitido
+                    db.rollback()
+            consultas[nombre] = list(capturadas)
+    return consultas
+
+
+def _tablas_por_alias(sentencia: str) -> dict:
+    alias = {}
+    for tabla, nombre in re.findall(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+AS\s+(\w+))?", sentencia, re.IGNORECASE):
+        alias[nombre or tabla] = tabla
+    return alias
+
+
+def recorridos_completos(conexion, sentencia: str, parametros, metadata) -> list:
+    """
+    Corre EXPLAIN QUERY PLAN y devuelve (tabla, columna) filtradas o unidas en tablas recorridas
+    completas cuya columna no encabeza ningún índice. Se omiten las columnas booleanas (un índice
+    sobre ellas no es selectivo) y las TABLAS_CHICAS.
+    """
+    plan = conexion.exec_driver_sql(f"EXPLAIN QUERY PLAN {sentencia}", parametros).fetchall()
+    alias = _tablas_por_alias(sentencia)
+    hallazgos = []
+    for fila in plan:
+        detalle = str(fila[-1])
+        coincidencia = re.match(r"SCAN (\w+)(?! USING)", detalle)
+        if not coincidencia or " USING " in detalle:
+            continue
+        nombre = coincidencia.group(1)
+        tabla = alias.get(nombre, nombre)
+        if tabla not in metadata.tables or tabla in TABLAS_CHICAS:
+            continue
+        columnas = metadata.tables[tabla].columns
+        indexadas = columnas_indexadas(metadata.tables[tabla])
+        filtradas = re.findall(rf"\b{re.escape(nombre)}\.(\w+){_OPERADORES}", sentencia, re.IGNORECASE)
+        # Columnas de la tabla recorrida comparadas desde el otro lado de la igualdad (a.x = tabla.col)
+        filtradas += re.findall(rf"=\s*{re.escape(nombre)}\.(\w+)", sentencia)
+        for columna in filtradas:
+            if columna in columnas and columna not in indexadas and not isinstance(columnas[columna].type, Boolean):
+                hallazgos.append((tabla, columna))
+    return hallazgos
+
+
+def auditar_consultas(engine, consultas: dict) -> dict:
+    """
+    Returns:
+        {(tabla, columna): set de nombres de recorrido donde aparece sin índice}
+    """
+    resultado = {}
+    with engine.connect() as conexion:
+        for nombre, sentencias in consultas.items():
+            for sentencia, parametros in sentencias:
+                for hallazgo in recorridos_completos(conexion, sentencia, parametros, models.Base.metadata):
+                    resultado.setdefault(hallazgo, set()).add(nombre)
+    return resultado
+
+
+def medir(engine, consultas: dict, repeticiones: int) -> dict:
+    """
+    Mediana en milisegundos de repetir las sentencias SELECT capturadas de cada recorrido
+    (None si alguna no se puede ejecutar sobre el esquema de `engine`)
+    """
+    tiempos = {}
+    with engine.connect() as conexion:
+        for nombre, sentencias in consultas.items():
+            lecturas = [(s, p) for s, p in sentencias if s.lstrip().upper().startswith("SELECT")]
+            muestras = []
+            try:
+                for _ in range(repeticiones):
+                    inicio = time.perf_counter()
+                    for sentencia, parametros in lecturas:
+                        conexion.exec_driver_sql(sentencia, parametros).fetchall()
+                    muestras.append((time.perf_counter() - inicio) * 1000)
+            except Exception:
+                conexion.rollback()
+                tiempos[nombre] = None
+                continue
+            tiempos[nombre] = statistics.median(muestras)
+    return tiempos
+
+
+def _ms(valor):
+    return f"{valor:.2f}" if valor is not None else "n/d"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reporta claves foráneas y columnas de filtro sin índice")
+    parser.add_argument("--tiempos", action="store_true", help="Comparar los recorridos contra una revisión anterior")
+    parser.add_argument("--antes", default="0003", help="Revisión de Alembic para la medición 'antes'")
+    parser.add_argument("--reservas", type=int, default=4000, help="Cantidad de reservas a generar")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    escala = {"reservas": args.reservas, "tutores": max(10, args.reservas // 400),
+              "estudiantes": max(40, args.reservas // 100)}
+
+    faltantes = claves_foraneas_sin_indice(models.Base.metadata)
+    print("Claves foráneas sin índice (modelos):")
+    for tabla, columna in faltantes:
+        print(f"  {tabla}.{columna}")
+    if not faltantes:
+        print("  ninguna")
+
+    with tempfile.TemporaryDirectory(prefix="tutoweb_indices_") as directorio:
+        ruta = os.path.join(directorio, "despues.db")
+        engine = create_engine(f"sqlite:///{ruta}")
+        migrar(engine)
+        with Session(engine) as db:
+            datos = cargar_datos(db, **escala)
+        consultas = ejecutar_recorrido(engine, datos)
+        hallazgos = auditar_consultas(engine, consultas)
+
+        print("\nColumnas filtradas o unidas sin índice (consultas):")
+        for (tabla, columna), recorridos in sorted(hallazgos.items()):
+            print(f"  {tabla}.{columna}: {', '.join(sorted(recorridos))}")
+        if not hallazgos:
+            print("  ninguna")
+
+        if args.tiempos:
+            tiempos_despues = medir(engine, consultas, args.repeticiones)
+            engine.dispose()
+            ruta_antes = os.path.join(directorio, "antes.db")
+            shutil.copyfile(ruta, ruta_antes)
+            engine_antes = create_engine(f"sqlite:///{ruta_antes}")
+            revertir(engine_antes, args.antes)
+            tiempos_antes = medir(engine_antes, consultas, args.repeticiones)
+            engine_antes.dispose()
+
+            print(f"\nTiempos (mediana de {args.repeticiones}, {args.reservas} reservas) {args.antes} -> head:")
+            print(f"  {'recorrido':<36}{'antes ms':>10}{'después ms':>12}{'x':>8}")
+            for nombre, _ in RECORRIDO:
+                antes, despues = tiempos_antes[nombre], tiempos_despues[nombre]
+                mejora = f"{antes / despues:.1f}" if antes is not None and despues else ""
+                print(f"  {nombre:<36}{_ms(antes):>10}{_ms(despues):>12}{mejora:>8}")
+        else:
+            engine.dispose()
+
+    sys.exit(1 if faltantes or hallazgos else 0)
+
+
+if __name__ == "__main__":
+    main()
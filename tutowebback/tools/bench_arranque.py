@@ -0,0 +1,120 @@
+"""
+Benchmark del arranque en frío de la API.
+
+Cada repetición corre en un intérprete nuevo (como un worker recién creado por el autoscaler)
+y mide por separado:
+
+- importar: `import main` (módulos, routers, controladores y la app que arma `crear_app()`)
+- arranque: el lifespan de la aplicación hasta quedar lista para atender
+- primer_request: el primer GET /carreras/all (primera conexión a la base incluida)
+
+La base es un SQLite temporal migrado con Alembic. Con `--importtime` además lista los módulos
+que más tardan en importarse (python -X importtime) en una corrida adicional.
+
+Uso (desde la raíz del repositorio):
+    python -m tutowebback.tools.bench_arranque
+    python -m tutowebback.tools.bench_arranque --repeticiones 10 --importtime
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from sqlalchemy import create_engine
+
+from tutowebback.tools.datos_prueba import migrar
+
+DIRECTORIO_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRECTORIO_RAIZ = os.path.dirname(DIRECTORIO_APP)
+FASES = ("importar", "arranque", "primer_request")
+
+# Se ejecuta en el proceso hijo; imprime los tiempos (ms) como JSON en la última línea
+_MEDICION = f"""
+import sys, time, json
+sys.path.insert(0, {DIRECTORIO_APP!r})
+inicio = time.perf_counter()
+import main
+importado = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as cliente:
+    listo = time.perf_counter()
+    respuesta = cliente.get("/carreras/all")
+    atendido = time.perf_counter()
+assert respuesta.status_code == 200, respuesta.text
+print(json.dumps({{
+    "importar": (importado - inicio) * 1000,
+    "arranque": (listo - importado) * 1000,
+    "primer_request": (atendido - listo) * 1000,
+}}))
+"""
+
+
+def _entorno(url_base: str) -> dict:
+    entorno = dict(os.environ, SQLALCHEMY_DATABASE_URL_LOCAL=url_base)
+    # La base ya está migrada: create_all solo agregaría consultas al arranque
+    entorno.pop("DB_CREATE_ALL", None)
+    return entorno
+
+
+def medir(url_base: str) -> dict:
+    """
+    Una corrida en frío; devuelve {fase: ms}
+    """
+    salida = subprocess.run(
+        [sys.executable, "-c", _MEDICION], cwd=DIRECTORIO_RAIZ, env=_entorno(url_base),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def modulos_mas_lentos(url_base: str, cantidad: int = 15) -> list:
+    """
+    Módulos con mayor tiempo de importación acumulado, según python -X importtime
+    """
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {DIRECTORIO_APP!r}); import main"],
+        cwd=DIRECTORIO_RAIZ, env=_entorno(url_base), capture_output=True, text=True, check=True,
+    )
+    modulos = []
+    for linea in salida.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        propio, acumulado, nombre = (parte.strip() for parte in linea.split(":", 1)[1].split("|"))
+        modulos.append((int(acumulado), int(propio), nombre))
+    return sorted(modulos, reverse=True)[:cantidad]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el arranque en frío de la API")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Corridas en frío (se informa mediana y mínimo)")
+    parser.add_argument("--importtime", action="store_true", help="Lista los módulos más lentos de importar")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="tutoweb_arranque_") as directorio:
+        url_base = f"sqlite:///{os.path.join(directorio, 'arranque.db')}"
+        engine = create_engine(url_base)
+        migrar(engine)
+        engine.dispose()
+
+        corridas = [medir(url_base) for _ in range(args.repeticiones)]
+        lentos = modulos_mas_lentos(url_base) if args.importtime else []
+
+    print(f"\n{'fase':<16}{'mediana':>10}{'mínimo':>10}")
+    for fase in FASES + ("total",):
+        valores = [sum(corrida.values()) if fase == "total" else corrida[fase] for corrida in corridas]
+        print(f"{fase:<16}{statistics.median(valores):>10.1f}{min(valores):>10.1f}")
+    print(f"\nTiempos en ms sobre {args.repeticiones} corridas en frío.")
+
+    if lentos:
+        print(f"\n{'módulo':<60}{'acumulado':>12}{'propio':>10}")
+        for acumulado, propio, nombre in lentos:
+            print(f"{nombre:<60}{acumulado / 1000:>12.1f}{propio / 1000:>10.1f}")
+        print("\nTiempos de importación en ms (python -X importtime).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark de las exportaciones de administración (services/exportacionService.py).
+
+Genera un conjunto sintético con `--reservas` reservas (un millón por defecto, con sus pagos y
+calificaciones) en una base SQLite temporal, o usa una base existente con `--base`, y exporta
+cada conjunto en cada formato descartando los bytes. Por exportación informa filas, tamaño,
+duración, filas por segundo y el pico de memoria de Python (tracemalloc, en una segunda pasada
+para no cargar la medición de tiempo): con la lectura en lotes el pico depende de
+EXPORTACION_LOTE y no de la cantidad de filas.
+
+Uso (desde la raíz del repositorio):
+    python -m tutowebback.tools.bench_exportacion
+    python -m tutowebback.tools.bench_exportacion --reservas 100000 --formatos csv
+    python -m tutowebback.tools.bench_exportacion --base sqlite:////tmp/datos.db --conjuntos reservas
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.orm import Session
+
+from tutowebback.models import models
+from tutowebback.services import exportacionService
+from tutowebback.tools.datos_prueba import migrar
+from tutowebback.tools.generador_datos import generar
+
+
+def _exportar(db: Session, conjunto, formato: str, lote: int) -> int:
+    """
+    Recorre la exportación completa y devuelve su tamaño en bytes
+    """
+    escribir = exportacionService.escribir_parquet if formato == "parquet" else exportacionService.escribir_csv
+    return sum(len(bloque) for bloque in escribir(conjunto, lote=lote, sesion=db))
+
+
+def _medir(db: Session, conjunto, formato: str, lote: int) -> dict:
+    filas = db.scalar(select(func.count()).select_from(conjunto.consulta().subquery()))
+    inicio = time.perf_counter()
+    tamano = _exportar(db, conjunto, formato, lote)
+    segundos = time.perf_counter() - inicio
+    db.rollback()
+
+    tracemalloc.start()
+    _exportar(db, conjunto, formato, lote)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.rollback()
+    return {
+        "filas": filas,
+        "mib": round(tamano / 2 ** 20, 1),
+        "segundos": round(segundos, 2),
+        "filas_por_segundo": round(filas / segundos) if segundos else 0,
+        "pico_memoria_mib": round(pico / 2 ** 20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de las exportaciones CSV y Parquet")
+    parser.add_argument("--base", help="URL de una base con datos (por defecto se genera un SQLite temporal)")
+    parser.add_argument("--reservas", type=int, default=1_000_000, help="Reservas del conjunto generado")
+    parser.add_argument("--usuarios", type=int, default=12000, help="Usuarios del conjunto generado")
+    parser.add_argument("--conjuntos", default=",".join(exportacionService.CONJUNTOS),
+                        help="Conjuntos separados por coma")
+    parser.add_argument("--formatos", default="csv,parquet", help="Formatos separados por coma")
+    parser.add_argument("--lote", type=int, default=exportacionService.EXPORTACION_LOTE, help="Filas por lote")
+    args = parser.parse_args()
+
+    formatos = args.formatos.split(",")
+    if "parquet" in formatos and exportacionService.pyarrow is None:
+        print("pyarrow no está instalado: se omite parquet")
+        formatos.remove("parquet")
+
+    with tempfile.TemporaryDirectory(prefix="tutoweb_exportacion_") as directorio:
+        engine = create_engine(args.base or f"sqlite:///{os.path.join(directorio, 'exportacion.db')}")
+        with Session(engine) as db:
+            if not args.base:
+                migrar(engine)
+                inicio = time.perf_counter()
+                print("Generando datos:", generar(db, usuarios=args.usuarios, reservas=args.reservas),
+                      f"en {time.perf_counter() - inicio:.1f} s")
+            print(f"Reservas en la base: {db.scalar(select(func.count(models.Reserva.id)))}; lote {args.lote}\n")
+            print(f"{'conjunto':<16}{'formato':<9}{'filas':>10}{'MiB':>8}{'s':>8}{'filas/s':>10}{'pico MiB':>10}")
+            for nombre in args.conjuntos.split(","):
+                for formato in formatos:
+                    r = _medir(db, exportacionService.CONJUNTOS[nombre], formato, args.lote)
+                    print(f"{nombre:<16}{formato:<9}{r['filas']:>10}{r['mib']:>8}{r['segundos']:>8}"
+                          f"{r['filas_por_segundo']:>10}{r['pico_memoria_mib']:>10}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
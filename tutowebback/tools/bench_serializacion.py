@@ -0,0 +1,139 @@
+"""
+Benchmark de serialización de los listados grandes de administración.
+
+Sobre una base SQLite temporal con `--filas` reservas (y otras tantas notificaciones) compara,
+para cada listado, las dos etapas que separa RespuestaJSON:
+
+- armado: objetos ORM + `to_dict_*` (con carga anticipada, sin N+1) frente a la proyección por
+  columnas de serializacionService (solo reservas, el listado con más relaciones)
+- codificación: `jsonable_encoder` + `json.dumps` (lo que hace FastAPI con JSONResponse) frente
+  a `a_json` (orjson) sobre el mismo contenido
+
+Uso (desde la raíz del repositorio):
+    python -m tutowebback.tools.bench_serializacion
+    python -m tutowebback.tools.bench_serializacion --filas 20000 --repeticiones 7
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, selectinload
+
+from tutowebback.models import models
+from tutowebback.config.respuestas import a_json
+from tutowebback.services.reservaService import ReservaService
+from tutowebback.services.calificacionService import CalificacionService
+from tutowebback.services import notificacionService
+from tutowebback.tools.datos_prueba import migrar, cargar_datos
+
+
+def _medir(funcion, repeticiones: int):
+    """
+    Mediana en milisegundos de `repeticiones` ejecuciones, y el resultado de la última
+    """
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos), resultado
+
+
+def _codificar_stdlib(contenido) -> bytes:
+    # Equivalente a JSONResponse.render después del jsonable_encoder de FastAPI
+    return json.dumps(
+        jsonable_encoder(contenido), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _reservas_orm(db: Session):
+    """
+    Listado de reservas de administración armado con objetos ORM y `to_dict_*`
+    """
+    reservas = db.query(models.Reserva).options(
+        selectinload(models.Reserva.servicio).selectinload(models.ServicioTutoria.materia),
+        *models.Usuario.opciones_resumen(
+            selectinload(models.Reserva.servicio).selectinload(models.ServicioTutoria.tutor)),
+        *models.Usuario.opciones_resumen(selectinload(models.Reserva.estudiante)),
+        selectinload(models.Reserva.pagos),
+        selectinload(models.Reserva.calificaciones),
+    ).all()
+
+    resultado = []
+    for reserva in reservas:
+        reserva_dict = reserva.to_dict_reserva()
+        reserva_dict["servicio"] = reserva.servicio.to_dict_servicio_tutoria()
+        reserva_dict["tutor"] = reserva.servicio.tutor.to_dict_usuario()
+        reserva_dict["materia"] = reserva.servicio.materia.to_dict_materia()
+        reserva_dict["estudiante"] = reserva.estudiante.to_dict_usuario()
+        if reserva.pagos:
+            reserva_dict["pago"] = max(reserva.pagos, key=lambda pago: pago.fecha_creacion).to_dict_pago()
+        if reserva.calificaciones:
+            reserva_dict["calificacion"] = reserva.calificaciones[0].to_dict_calificacion()
+        resultado.append(reserva_dict)
+    return resultado
+
+
+def ejecutar(engine, repeticiones: int) -> list:
+    """
+    Corre las mediciones sobre `engine` (ya migrado y con datos) y devuelve las filas del reporte
+    """
+    listados = [
+        ("reservas/admin/all", lambda db: ReservaService().get_all_reservas_detalladas(db), _reservas_orm),
+        ("notificaciones/all", lambda db: notificacionService.obtener_todas_las_notificaciones(db), None),
+        ("calificaciones/date-range",
+         lambda db: CalificacionService().get_calificaciones_by_date_range_formatted(db, "2000-01-01")[0], None),
+    ]
+    reporte = []
+    for nombre, proyeccion, orm in listados:
+        def _en_sesion(funcion):
+            # Sesión nueva en cada corrida: sin objetos ya cargados en el identity map
+            def _correr():
+                with Session(engine) as db:
+                    return funcion(db)
+            return _correr
+
+        ms_proyeccion, contenido = _medir(_en_sesion(proyeccion), repeticiones)
+        ms_orm = _medir(_en_sesion(orm), repeticiones)[0] if orm else None
+        contenido = {"success": True, "data": contenido, "message": ""}
+        ms_stdlib, cuerpo_stdlib = _medir(lambda: _codificar_stdlib(contenido), repeticiones)
+        ms_orjson, cuerpo_orjson = _medir(lambda: a_json(contenido), repeticiones)
+        if json.loads(cuerpo_stdlib) != json.loads(cuerpo_orjson):
+            raise AssertionError(f"{nombre}: orjson y json generan contenidos distintos")
+        reporte.append((nombre, len(contenido["data"]), len(cuerpo_orjson), ms_orm, ms_proyeccion, ms_stdlib, ms_orjson))
+    return reporte
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara la serialización de los listados grandes")
+    parser.add_argument("--filas", type=int, default=10000, help="Reservas (y notificaciones) a generar")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Corridas por medición (se informa la mediana)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="tutoweb_bench_") as directorio:
+        engine = create_engine(f"sqlite:///{os.path.join(directorio, 'bench.db')}")
+        migrar(engine)
+        with Session(engine) as db:
+            cargar_datos(db, reservas=args.filas)
+        reporte = ejecutar(engine, args.repeticiones)
+        engine.dispose()
+
+    print(f"\n{'listado':<28}{'filas':>7}{'KB':>8}{'ORM+to_dict':>13}{'proyección':>12}"
+          f"{'json':>10}{'orjson':>10}{'mejora':>9}")
+    for nombre, filas, tamano, ms_orm, ms_proyeccion, ms_stdlib, ms_orjson in reporte:
+        orm = f"{ms_orm:.1f}" if ms_orm is not None else "-"
+        print(f"{nombre:<28}{filas:>7}{tamano / 1024:>8.0f}{orm:>13}{ms_proyeccion:>12.1f}"
+              f"{ms_stdlib:>10.1f}{ms_orjson:>10.1f}{ms_stdlib / ms_orjson:>8.1f}x")
+    print("\nTiempos en ms (mediana). 'mejora' compara solo la codificación (json vs orjson).")
+
+
+if __name__ == "__main__":
+    main()
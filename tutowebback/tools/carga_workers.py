@@ -0,0 +1,177 @@
+"""
+Prueba de carga del perfil de producción (gunicorn.conf.py) con distinta cantidad de workers.
+
+Para cada valor de `--workers` levanta gunicorn con WEB_CONCURRENCY=n sobre la misma base,
+envía requests durante `--duracion` segundos desde `--concurrencia` clientes asíncronos y
+reporta throughput y latencias, para ver cómo escala el servicio con los workers.
+
+La mezcla de requests son lecturas frecuentes: catálogo de carreras, tutores de una carrera y
+reservas detalladas del tutor (autenticado). Por defecto usa un SQLite temporal con el conjunto
+de datos_prueba; con `--url-base` se usa una base existente (debe tener el usuario `--email`).
+
+Uso (desde la raíz del repositorio, con gunicorn instalado):
+    python -m tutowebback.tools.carga_workers
+    python -m tutowebback.tools.carga_workers --workers 1,2,4,8 --concurrencia 64 --duracion 20
+"""
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from tutowebback.models import models
+from tutowebback.auth import auth
+from tutowebback.tools.datos_prueba import migrar, cargar_datos
+
+DIRECTORIO_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIGURACION = os.path.join(DIRECTORIO_APP, "gunicorn.conf.py")
+PASSWORD = "carga"
+
+
+def percentil(valores: list, p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+async def generar_carga(cliente: httpx.AsyncClient, solicitudes: list, concurrencia: int, duracion: float) -> dict:
+    """
+    Envía las `solicitudes` (lista de (método, url, headers)) en ronda desde `concurrencia`
+    clientes durante `duracion` segundos. Devuelve las latencias (s) y la cantidad de errores.
+    """
+    latencias, errores = [], 0
+    fin = time.perf_counter() + duracion
+
+    async def _cliente(desplazamiento: int):
+        nonlocal errores
+        indice = desplazamiento
+        while time.perf_counter() < fin:
+            metodo, url, headers = solicitudes[indice % len(solicitudes)]
+            indice += 1
+            inicio = time.perf_counter()
+            try:
+                respuesta = await cliente.request(metodo, url, headers=headers)
+                if respuesta.status_code >= 400:
+                    errores += 1
+                    continue
+            except httpx.HTTPError:
+                errores += 1
+                continue
+            latencias.append(time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*[_cliente(i) for i in range(concurrencia)])
+    return {"latencias": latencias, "errores": errores, "segundos": time.perf_counter() - inicio}
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as conexion:
+        conexion.bind(("127.0.0.1", 0))
+        return conexion.getsockname()[1]
+
+
+def _esperar_servidor(url: str, proceso: subprocess.Popen, espera: float = 60):
+    limite = time.monotonic() + espera
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError(f"gunicorn terminó al iniciar (código {proceso.returncode})")
+        try:
+            if httpx.get(f"{url}/carreras/all", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("gunicorn no respondió a tiempo")
+
+
+async def _medir(url: str, email: str, carrera: int, concurrencia: int, duracion: float) -> dict:
+    limites = httpx.Limits(max_connections=concurrencia, max_keepalive_connections=concurrencia)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=30) as cliente:
+        respuesta = await cliente.post("/login", params={"email": email, "password": PASSWORD})
+        respuesta.raise_for_status()
+        autorizacion = {"Authorization": f"Bearer {respuesta.json()['access_token']}"}
+        solicitudes = [
+            ("GET", "/carreras/all", None),
+            ("GET", f"/tutores/by/carrera/{carrera}", autorizacion),
+            ("GET", "/reservas/tutor/detalladas", autorizacion),
+        ]
+        # Calentamiento: conexiones del pool, caché de catálogos y código de cada worker
+        await generar_carga(cliente, solicitudes, concurrencia, min(2.0, duracion / 5))
+        return await generar_carga(cliente, solicitudes, concurrencia, duracion)
+
+
+def probar_workers(workers: int, url_base: str, email: str, carrera: int, concurrencia: int, duracion: float) -> dict:
+    puerto = _puerto_libre()
+    entorno = dict(
+        os.environ, WEB_CONCURRENCY=str(workers), GUNICORN_BIND=f"127.0.0.1:{puerto}",
+        GUNICORN_ACCESSLOG="", GUNICORN_LOGLEVEL="warning", SQLALCHEMY_DATABASE_URL_LOCAL=url_base,
+    )
+    proceso = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", CONFIGURACION], env=entorno)
+    try:
+        url = f"http://127.0.0.1:{puerto}"
+        _esperar_servidor(url, proceso)
+        return asyncio.run(_medir(url, email, carrera, concurrencia, duracion))
+    finally:
+        proceso.terminate()
+        proceso.wait(timeout=60)
+
+
+def _preparar_base(url_base: str) -> dict:
+    engine = create_engine(url_base)
+    migrar(engine)
+    with Session(engine) as db:
+        datos = cargar_datos(db)
+        tutor = db.get(models.Usuario, datos["tutor"])
+        tutor.password_hash = auth.get_password_hash(PASSWORD)
+        db.commit()
+    engine.dispose()
+    return datos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput del servicio según la cantidad de workers")
+    parser.add_argument("--workers", default="1,2,4", help="Cantidades de workers separadas por coma")
+    parser.add_argument("--concurrencia", type=int, default=32, help="Clientes simultáneos")
+    parser.add_argument("--duracion", type=float, default=10, help="Segundos de medición por cantidad de workers")
+    parser.add_argument("--url-base", help="Base a usar en lugar de un SQLite temporal con datos de prueba")
+    parser.add_argument("--email", help="Usuario (con password 'carga') para los endpoints autenticados")
+    parser.add_argument("--carrera", type=int, default=1, help="Carrera para /tutores/by/carrera/{id}")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="tutoweb_carga_") as directorio:
+        url_base, email, carrera = args.url_base, args.email, args.carrera
+        if not url_base:
+            url_base = f"sqlite:///{os.path.join(directorio, 'carga.db')}"
+            datos = _preparar_base(url_base)
+            email, carrera = datos["email_tutor"], datos["carrera"]
+
+        resultados = []
+        for workers in [int(valor) for valor in args.workers.split(",")]:
+            medicion = probar_workers(workers, url_base, email, carrera, args.concurrencia, args.duracion)
+            resultados.append((workers, medicion))
+
+    print(f"\n{'workers':>8}{'req/s':>10}{'escala':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errores':>9}")
+    base = None
+    for workers, medicion in resultados:
+        latencias = medicion["latencias"]
+        throughput = len(latencias) / medicion["segundos"]
+        base = base or throughput
+        print(f"{workers:>8}{throughput:>10.1f}{throughput / base:>8.2f}x"
+              f"{statistics.median(latencias) * 1000 if latencias else 0:>10.1f}"
+              f"{percentil(latencias, 95) * 1000:>10.1f}{percentil(latencias, 99) * 1000:>10.1f}{medicion['errores']:>9}")
+    print(f"\n{args.concurrencia} clientes, {args.duracion:.0f} s por medición. "
+          f"Para resultados representativos de producción usar --url-base.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Verificación de la cantidad de consultas SQL por listado.
+
+Aplica las migraciones sobre una base SQLite vacía, carga el conjunto de datos de prueba y
+ejecuta cada listado (servicio o controlador, incluyendo la serialización) contando las
+sentencias emitidas. Cada listado tiene un máximo fijo que no depende de la cantidad de filas:
+una carga diferida por fila (p. ej. un `to_dict_usuario` sin `Usuario.opciones_resumen()`)
+lo supera y la verificación falla (código de salida 1).
+
+Los mismos máximos se declaran en las rutas con `instrumentacion.presupuesto_consultas(n)`, que
+los controla por request HTTP (con DB_PRESUPUESTO_ESTRICTO=true el request responde 500).
+
+Uso (desde la raíz del repositorio):
+    python -m tutowebback.tools.consultas_listados
+"""
+import os
+import sys
+import asyncio
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from tutowebback.services import catalogoCacheService, notificacionService
+from tutowebback.services.reservaService import ReservaService
+from tutowebback.services.calificacionService import CalificacionService
+from tutowebback.controllers import userController, servicioTutoriaController, calificacionController, \
+    materiasXCarreraXUsuarioController
+from tutowebback.tools.datos_prueba import migrar, cargar_datos
+
+# (nombre, llamada, máximo de consultas). Se ejecutan con la sesión y la caché de catálogos vacías.
+CASOS = [
+    ("get_reserva_detallada", lambda db, d: ReservaService().get_reserva_detallada(db, d["reserva_completada"]), 3),
+    ("get_reservas_by_estudiante_detalladas",
+     lambda db, d: ReservaService().get_reservas_by_estudiante_detalladas(db, d["estudiante"]), 3),
+    ("get_reservas_by_tutor_detalladas",
+     lambda db, d: ReservaService().get_reservas_by_tutor_detalladas(db, d["tutor"]), 3),
+    ("get_all_reservas_detalladas", lambda db, d: ReservaService().get_all_reservas_detalladas(db), 5),
+    ("obtener_todas_las_notificaciones", lambda db, d: notificacionService.obtener_todas_las_notificaciones(db), 3),
+    ("get_calificaciones_by_date_range_formatted",
+     lambda db, d: CalificacionService().get_calificaciones_by_date_range_formatted(db, "2000-01-01"), 1),
+    ("get_calificaciones_by_date_range_formatted (página)",
+     lambda db, d: CalificacionService().get_calificaciones_by_date_range_formatted(db, "2000-01-01", None, None, 2, 50), 2),
+    ("userController.get_all_usuarios", lambda db, d: userController.get_all_usuarios(db), 4),
+    ("userController.get_usuario_by_email",
+     lambda db, d: userController.get_usuario_by_email(d["email_tutor"], db, None), 4),
+    ("userController.get_tutores", lambda db, d: userController.get_tutores(db), 5),
+    ("userController.get_tutores_by_carrera",
+     lambda db, d: userController.get_tutores_by_carrera(db, None, d["carrera"]), 5),
+    ("userController.get_tutores_by_carrera_with_materias",
+     lambda db, d: userController.get_tutores_by_carrera_with_materias(db, None, d["carrera"]), 6),
+    ("servicioTutoriaController.get_servicio",
+     lambda db, d: servicioTutoriaController.get_servicio(d["servicio"], db, None), 4),
+    ("servicioTutoriaController.get_servicios_by_tutor",
+     lambda db, d: servicioTutoriaController.get_servicios_by_tutor(d["email_tutor"], db, None), 5),
+    ("servicioTutoriaController.get_servicios_by_materia",
+     lambda db, d: servicioTutoriaController.get_servicios_by_materia(d["materia"], db, None), 4),
+    ("calificacionController.get_calificaciones_by_tutor",
+     lambda db, d: calificacionController.get_calificaciones_by_tutor(d["tutor"], db, None), 4),
+    ("calificacionController.get_calificaciones_by_estudiante",
+     lambda db, d: calificacionController.get_calificaciones_by_estudiante(db, {"id": d["estudiante"]}), 4),
+    ("materiasXCarreraXUsuarioController.get_usuarios_by_materia_and_carrera",
+     lambda db, d: materiasXCarreraXUsuarioController.get_usuarios_by_materia_and_carrera(
+         d["materia"], d["carrera"], db, None), 6),
+]
+
+
+def verificar(engine) -> list:
+    """
+    Ejecuta los casos contra `engine` (ya migrado) y devuelve la lista de errores encontrados
+    """
+    sentencias = []
+
+    def _contar(conn, cursor, sentencia, parametros, contexto, executemany):
+        sentencias.append(sentencia)
+
+    errores = []
+    with Session(engine) as db:
+        datos = cargar_datos(db)
+        event.listen(engine, "before_cursor_execute", _contar)
+        try:
+            for nombre, llamada, maximo in CASOS:
+                # Sin objetos ya cargados: cada caso paga todas sus consultas
+                db.expunge_all()
+                catalogoCacheService.catalogo_cache.limpiar()
+                sentencias.clear()
+
+                resultado = llamada(db, datos)
+                if asyncio.iscoroutine(resultado):
+                    asyncio.run(resultado)
+
+                estado = "OK" if len(sentencias) <= maximo else "FALLA"
+                print(f"{estado} {nombre}: {len(sentencias)} consultas (máximo {maximo})")
+                if len(sentencias) > maximo:
+                    errores.append(f"{nombre}: {len(sentencias)} consultas, máximo {maximo}\n" + "\n".join(sentencias))
+        finally:
+            event.remove(engine, "before_cursor_execute", _contar)
+    return errores
+
+
+def main():
+    with tempfile.TemporaryDirectory(prefix="tutoweb_consultas_") as directorio:
+        engine = create_engine(f"sqlite:///{os.path.join(directorio, 'consultas.db')}")
+        migrar(engine)
+        errores = verificar(engine)
+        engine.dispose()
+
+    for error in errores:
+        print(f"\n{error}")
+    sys.exit(1 if errores else 0)
+
+
+if __name__ == "__main__":
+    main()
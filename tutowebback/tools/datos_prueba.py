@@ -0,0 +1,138 @@
+"""
+Datos de prueba para las herramientas de análisis de consultas (planes_consulta, auditoria_indices).
+
+Genera un conjunto determinístico repartido entre varios tutores, estudiantes, servicios, fechas
+y estados, de modo que los filtros de las consultas sean selectivos como en una base en uso.
+"""
+import os
+import sys
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from tutowebback.models import models
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+ESTADOS_RESERVA = ["pendiente", "confirmada", "completada", "cancelada"]
+
+
+def migrar(engine, revision: str = "head"):
+    """
+    Aplica las migraciones de Alembic sobre `engine` hasta `revision`
+    """
+    config = Config(ALEMBIC_INI)
+    with engine.begin() as conexion:
+        config.attributes["connection"] = conexion
+        command.upgrade(config, revision)
+
+
+def revertir(engine, revision: str):
+    """
+    Revierte las migraciones de `engine` hasta `revision` (conservando los datos que sobrevivan)
+    """
+    config = Config(ALEMBIC_INI)
+    with engine.begin() as conexion:
+        config.attributes["connection"] = conexion
+        command.downgrade(config, revision)
+
+
+def cargar_datos(db: Session, tutores: int = 10, estudiantes: int = 40, reservas: int = 4000) -> dict:
+    """
+    Carga catálogo, usuarios, servicios, disponibilidad, reservas, pagos, calificaciones y notificaciones.
+
+    Args:
+        db: Sesión sobre una base vacía y migrada
+        tutores: Cantidad de tutores (uno o dos servicios cada uno)
+        estudiantes: Cantidad de estudiantes con historial de reservas
+        reservas: Cantidad de reservas a repartir
+
+    Returns:
+        dict con ids de referencia (tutor, estudiante, estudiante_nuevo, servicio, materia, carrera,
+        reserva_completada), el email del tutor y la fecha base
+    """
+    roles = [models.Rol(nombre=nombre) for nombre in ("superAdmin", "admin", "alumno", "alumno&tutor")]
+    carreras = [models.Carrera(nombre=f"Carrera {i}") for i in range(3)]
+    db.add_all([*roles, *carreras])
+    db.flush()
+
+    materias = [
+        models.Materia(nombre=f"Materia {i}", carrera_id=carreras[i % len(carreras)].id, año_plan=1 + i % 5)
+        for i in range(12)
+    ]
+    usuarios_tutores = [
+        models.Usuario(nombre="Tutor", apellido=str(i), email=f"tutor{i}@datos.local", password_hash="-",
+                       id_rol=roles[3].id)
+        for i in range(tutores)
+    ]
+    usuarios_estudiantes = [
+        models.Usuario(nombre="Estudiante", apellido=str(i), email=f"estudiante{i}@datos.local", password_hash="-",
+                       id_rol=roles[2].id)
+        for i in range(estudiantes)
+    ]
+    # Sin historial: no lo bloquea la validación de reservas completadas sin pagar
+    estudiante_nuevo = models.Usuario(nombre="Estudiante", apellido="Nuevo", email="nuevo@datos.local",
+                                      password_hash="-", id_rol=roles[2].id)
+    db.add_all([*materias, *usuarios_tutores, *usuarios_estudiantes, estudiante_nuevo])
+    db.flush()
+
+    db.add_all([
+        models.CarreraUsuario(usuario_id=usuario.id, carrera_id=carreras[i % len(carreras)].id)
+        for i, usuario in enumerate([*usuarios_tutores, *usuarios_estudiantes, estudiante_nuevo])
+    ])
+    servicios = []
+    for i, tutor in enumerate(usuarios_tutores):
+        for materia in (materias[i % len(materias)], materias[(i + 5) % len(materias)]):
+            db.add(models.MateriasXCarreraXUsuario(estado=True, usuario_id=tutor.id, materia_id=materia.id,
+                                                   carrera_id=materia.carrera_id))
+            servicios.append(models.ServicioTutoria(tutor_id=tutor.id, materia_id=materia.id, precio=Decimal("100"),
+                                                    modalidad="presencial", activo=True))
+    db.add_all(servicios)
+    db.add_all([
+        models.Disponibilidad(tutor_id=tutor.id, dia_semana=dia, hora_inicio=time(8, 0), hora_fin=time(20, 0))
+        for tutor in usuarios_tutores for dia in range(1, 8)
+    ])
+    db.flush()
+
+    fecha = date.today() + timedelta(days=7)
+    lista_reservas = [
+        models.Reserva(estudiante_id=usuarios_estudiantes[i % estudiantes].id,
+                       servicio_id=servicios[(i // 8) % len(servicios)].id,
+                       tutor_id=servicios[(i // 8) % len(servicios)].tutor_id,
+                       fecha=fecha + timedelta(days=i // (8 * len(servicios)) - 30), hora_inicio=time(8 + i % 8, 0),
+                       hora_fin=time(9 + i % 8, 0), estado=ESTADOS_RESERVA[(i // 3) % len(ESTADOS_RESERVA)])
+        for i in range(reservas)
+    ]
+    db.add_all(lista_reservas)
+    db.flush()
+
+    ahora = datetime.now()
+    for i, reserva in enumerate(lista_reservas):
+        servicio = servicios[(i // 8) % len(servicios)]
+        db.add(models.ReservaActions(reserva_id=reserva.id))
+        db.add(models.Notificacion(usuario_id=reserva.estudiante_id, titulo="Reserva", mensaje="Reserva creada",
+                                   tipo="reserva", leida=i % 2 == 0, reserva_id=reserva.id,
+                                   fecha_creacion=ahora - timedelta(hours=i)))
+        if reserva.estado == "completada":
+            db.add(models.Pago(reserva_id=reserva.id, monto=servicio.precio, metodo_pago="efectivo",
+                               estado="completado", fecha_pago=ahora - timedelta(hours=i)))
+            db.add(models.Calificacion(reserva_id=reserva.id, calificador_id=reserva.estudiante_id,
+                                       calificado_id=servicio.tutor_id, puntuacion=1 + i % 5,
+                                       fecha=ahora - timedelta(hours=i)))
+    db.commit()
+
+    # Estadísticas como las de una base en uso; sin ellas el planificador elige a ciegas
+    db.execute(text("ANALYZE"))
+    db.commit()
+    reserva_completada = next(r for r in lista_reservas if r.estado == "completada")
+    return {
+        "tutor": usuarios_tutores[0].id, "estudiante": usuarios_estudiantes[0].id,
+        "estudiante_nuevo": estudiante_nuevo.id, "servicio": servicios[0].id,
+        "materia": materias[0].id, "carrera": carreras[0].id, "fecha": fecha,
+        "email_tutor": usuarios_tutores[0].email, "reserva_completada": reserva_completada.id,
+    }
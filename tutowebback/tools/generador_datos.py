@@ -0,0 +1,341 @@
+"""
+Generador de conjuntos de datos sintéticos con la forma de los datos reales, a escala.
+
+A diferencia de datos_prueba (un conjunto chico y fijo para las herramientas de consultas),
+el tamaño y la forma se controlan con parámetros (ver PARAMETROS):
+
+- popularidad de tutores con ley de potencias: el peso de cada tutor sale de una distribución
+  de Pareto (alfa 1.16 es la regla 80/20)
+- disponibilidad semanal recurrente: cada tutor atiende algunos días de la semana en una franja
+  fija, y sus reservas caen siempre dentro de esas franjas, sin solaparse. Cuando los horarios
+  de un tutor popular se llenan, la reserva pasa a otro tutor (y tras varios intentos queda
+  cancelada), así que la concentración real es menor que la de los pesos
+- estacionalidad: la fecha de cada reserva se elige con un peso por mes (picos en los turnos
+  de exámenes, baja en el receso de verano)
+- mezcla de métodos de pago, reservas canceladas, completadas sin pagar y calificadas
+
+Las filas se insertan con INSERT masivos por lotes (executemany, sin objetos ORM) y las reservas
+con sus pagos, calificaciones y notificaciones se generan por tandas de `tanda_reservas`, así las
+filas en memoria no crecen con la cantidad de reservas. Lo que sí se conserva durante toda la
+generación son los horarios ocupados (una máscara de horas por tutor y día con reservas, acotada
+por tutores × días del rango) y la suma de calificaciones de cada tutor. La generación es
+determinística para una misma semilla y parámetros.
+
+Uso (desde la raíz del repositorio, sobre una base vacía):
+    python -m tutowebback.tools.generador_datos --base sqlite:////tmp/datos.db --usuarios 10000 --reservas 1000000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import bisect
+import itertools
+from datetime import date, datetime, timedelta
+from datetime import time as hora
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from sqlalchemy import create_engine, func, insert, select, update, text
+from sqlalchemy.orm import Session
+
+from tutowebback.models import models
+from tutowebback.auth import auth
+from tutowebback.tools.datos_prueba import migrar
+
+ROLES = ["superAdmin", "admin", "alumno", "alumno&tutor"]
+
+PARAMETROS = {
+    "carreras": 20,
+    "materias_por_carrera": 20,
+    "usuarios": 2000,
+    "proporcion_tutores": 0.15,
+    "materias_por_tutor": (1, 3),
+    "reservas": 50000,
+    # Días de historia y de reservas futuras respecto de `hoy`
+    "dias_historia": 365,
+    "dias_futuro": 60,
+    # Popularidad: alfa de Pareto de tutores y de la actividad de los estudiantes
+    "alfa_tutores": 1.16,
+    "alfa_estudiantes": 2.5,
+    # Disponibilidad semanal: días por tutor y horas por franja
+    "dias_por_tutor": (2, 5),
+    "horas_por_franja": (2, 4),
+    # Peso de cada mes (enero a diciembre) en la fecha de las reservas
+    "estacionalidad": (0.3, 1.2, 1.0, 1.0, 1.1, 1.4, 1.5, 0.8, 1.0, 1.1, 1.4, 1.2),
+    "metodos_pago": {"mercado_pago": 0.65, "efectivo": 0.35},
+    "proporcion_canceladas": 0.12,
+    "proporcion_confirmadas": 0.6,
+    "proporcion_impagas": 0.03,
+    "proporcion_calificadas": 0.7,
+    "password": "datos",
+    "dominio": "datos.local",
+    "hoy": None,
+    "lote": 5000,
+    "tanda_reservas": 20000,
+}
+
+# Inicio de las franjas de disponibilidad y peso de cada día de la semana (lunes a domingo)
+_INICIOS_FRANJA = (8, 9, 10, 14, 15, 16, 17, 18)
+_PESOS_DIA = (1.0, 1.0, 1.0, 1.0, 0.9, 0.4, 0.1)
+# Reintentos para ubicar una reserva en un horario libre antes de darla por cancelada
+_REINTENTOS = 5
+
+
+def _insertar(db: Session, modelo, filas: list, lote: int) -> list:
+    """
+    Inserta `filas` en lotes y devuelve los ids generados, en el mismo orden
+    """
+    if not filas:
+        return []
+    desde = db.scalar(select(func.max(modelo.id))) or 0
+    for inicio in range(0, len(filas), lote):
+        db.execute(insert(modelo), filas[inicio:inicio + lote])
+    return list(db.scalars(select(modelo.id).where(modelo.id > desde).order_by(modelo.id)))
+
+
+def _pesos_pareto(azar: random.Random, cantidad: int, alfa: float) -> list:
+    """
+    Pesos acumulados de `cantidad` elementos con popularidad de Pareto, para random.choices
+    """
+    return list(itertools.accumulate(azar.paretovariate(alfa) for _ in range(cantidad)))
+
+
+def _franjas(azar: random.Random, parametros: dict) -> list:
+    """
+    Franjas semanales de un tutor: [(dia_semana, hora_inicio, hora_fin)] con días distintos
+    """
+    dias = set()
+    cantidad = azar.randint(*parametros["dias_por_tutor"])
+    while len(dias) < cantidad:
+        dias.add(azar.choices(range(1, 8), weights=_PESOS_DIA)[0])
+    franjas = []
+    for dia in sorted(dias):
+        inicio = azar.choice(_INICIOS_FRANJA)
+        franjas.append((dia, inicio, min(22, inicio + azar.randint(*parametros["horas_por_franja"]))))
+    return franjas
+
+
+def generar(db: Session, semilla: int = 42, **parametros) -> dict:
+    """
+    Genera el conjunto de datos en una base vacía y migrada.
+
+    Args:
+        db: Sesión sobre la base
+        semilla: Semilla del generador aleatorio
+        **parametros: Valores que reemplazan a los de PARAMETROS
+
+    Returns:
+        dict con la cantidad de filas insertadas por tabla
+    """
+    desconocidos = set(parametros) - set(PARAMETROS)
+    if desconocidos:
+        raise ValueError(f"Parámetros desconocidos: {', '.join(sorted(desconocidos))}")
+    parametros = {**PARAMETROS, **parametros}
+    azar = random.Random(semilla)
+    lote = parametros["lote"]
+    hoy = parametros["hoy"] or date.today()
+    ahora = datetime.combine(hoy, hora(0, 0))
+    # El hash es lo más caro de crear un usuario: todos comparten el mismo
+    password_hash = auth.get_password_hash(parametros["password"])
+
+    roles = dict(zip(ROLES, _insertar(db, models.Rol, [{"nombre": nombre} for nombre in ROLES], lote)))
+    carreras = _insertar(db, models.Carrera, [
+        {"nombre": f"Carrera {i}", "descripcion": None} for i in range(parametros["carreras"])
+    ], lote)
+    filas_materias = [
+        {"nombre": f"Materia {carrera}-{i}", "carrera_id": carrera, "descripcion": None, "año_plan": 1 + i % 5}
+        for carrera in carreras for i in range(parametros["materias_por_carrera"])
+    ]
+    materias_de_carrera = {carrera: [] for carrera in carreras}
+    for materia, fila in zip(_insertar(db, models.Materia, filas_materias, lote), filas_materias):
+        materias_de_carrera[fila["carrera_id"]].append(materia)
+
+    # Usuarios: tutores primero, después estudiantes
+    cantidad_tutores = max(1, int(parametros["usuarios"] * parametros["proporcion_tutores"]))
+    cantidad_estudiantes = max(1, parametros["usuarios"] - cantidad_tutores)
+
+    def _usuario(tipo: str, i: int, rol: int) -> dict:
+        email = f"{tipo}{i}@{parametros['dominio']}"
+        return {"nombre": tipo.capitalize(), "apellido": str(i), "email": email, "password_hash": password_hash,
+                "id_rol": rol, "fecha_registro": ahora - timedelta(days=azar.randint(1, 3 * parametros["dias_historia"]))}
+
+    tutores = _insertar(db, models.Usuario, [
+        _usuario("tutor", i, roles["alumno&tutor"]) for i in range(cantidad_tutores)
+    ], lote)
+    estudiantes = _insertar(db, models.Usuario, [
+        _usuario("estudiante", i, roles["alumno"]) for i in range(cantidad_estudiantes)
+    ], lote)
+    carrera_de_usuario = {usuario: azar.choice(carreras) for usuario in tutores + estudiantes}
+    _insertar(db, models.CarreraUsuario, [
+        {"usuario_id": usuario, "carrera_id": carrera} for usuario, carrera in carrera_de_usuario.items()
+    ], lote)
+
+    # Materias, servicios y franjas de cada tutor
+    filas_mxc, filas_servicios, filas_disponibilidad = [], [], []
+    franjas_de_tutor = {}
+    for tutor in tutores:
+        carrera = carrera_de_usuario[tutor]
+        minimo, maximo = parametros["materias_por_tutor"]
+        cantidad = min(len(materias_de_carrera[carrera]), azar.randint(minimo, maximo))
+        for materia in azar.sample(materias_de_carrera[carrera], cantidad):
+            filas_mxc.append({"estado": True, "usuario_id": tutor, "materia_id": materia, "carrera_id": carrera})
+            filas_servicios.append({"tutor_id": tutor, "materia_id": materia, "descripcion": None,
+                                    "precio": Decimal(azar.choice((80, 100, 120, 150, 200))),
+                                    "modalidad": azar.choice(("virtual", "presencial")), "activo": True})
+        franjas_de_tutor[tutor] = _franjas(azar, parametros)
+        filas_disponibilidad.extend(
+            {"tutor_id": tutor, "dia_semana": dia, "hora_inicio": hora(inicio, 0), "hora_fin": hora(fin, 0)}
+            for dia, inicio, fin in franjas_de_tutor[tutor]
+        )
+    _insertar(db, models.MateriasXCarreraXUsuario, filas_mxc, lote)
+    ids_servicios = _insertar(db, models.ServicioTutoria, filas_servicios, lote)
+    _insertar(db, models.Disponibilidad, filas_disponibilidad, lote)
+    servicios_de_tutor = {}
+    for servicio, fila in zip(ids_servicios, filas_servicios):
+        servicios_de_tutor.setdefault(fila["tutor_id"], []).append((servicio, fila["precio"]))
+    tutores = [tutor for tutor in tutores if tutor in servicios_de_tutor]
+
+    # Fechas posibles de las reservas con su peso estacional
+    fechas = [hoy + timedelta(days=dias) for dias in range(-parametros["dias_historia"], parametros["dias_futuro"] + 1)]
+    pesos_fechas = list(itertools.accumulate(parametros["estacionalidad"][fecha.month - 1] for fecha in fechas))
+    pesos_tutores = _pesos_pareto(azar, len(tutores), parametros["alfa_tutores"])
+    pesos_estudiantes = _pesos_pareto(azar, len(estudiantes), parametros["alfa_estudiantes"])
+    metodos, pesos_metodos = zip(*parametros["metodos_pago"].items())
+    primera, ultima = fechas[0], fechas[-1]
+    # Horas ocupadas de cada (tutor, fecha) como máscara de bits: una entrada por día con
+    # reservas en lugar de una por reserva
+    ocupados = {}
+    totales = {"reservas": 0, "pagos": 0, "calificaciones": 0, "notificaciones": 0}
+    resenas = {}
+
+    def _ubicar():
+        """
+        (tutor, fecha, hora) de una reserva dentro de las franjas del tutor, o la última opción
+        probada si todas estaban ocupadas (la reserva queda cancelada)
+        """
+        for _ in range(_REINTENTOS):
+            tutor = tutores[bisect.bisect(pesos_tutores, azar.random() * pesos_tutores[-1])]
+            dia, inicio, fin = azar.choice(franjas_de_tutor[tutor])
+            fecha = fechas[bisect.bisect(pesos_fechas, azar.random() * pesos_fechas[-1])]
+            # Mover la fecha al día de la franja dentro de la misma semana
+            fecha += timedelta(days=dia - fecha.isoweekday())
+            if fecha < primera:
+                fecha += timedelta(days=7)
+            elif fecha > ultima:
+                fecha -= timedelta(days=7)
+            clave = (tutor, fecha, azar.randrange(inicio, fin))
+            mascara, bit = ocupados.get((tutor, fecha), 0), 1 << clave[2]
+            if not mascara & bit:
+                ocupados[(tutor, fecha)] = mascara | bit
+                return clave, True
+        return clave, False
+
+    pendientes = parametros["reservas"]
+    while pendientes > 0:
+        tanda = min(pendientes, parametros["tanda_reservas"])
+        pendientes -= tanda
+        filas_reservas = []
+        for _ in range(tanda):
+            (tutor, fecha, inicio), libre = _ubicar()
+            servicio, precio = azar.choice(servicios_de_tutor[tutor])
+            if not libre or azar.random() < parametros["proporcion_canceladas"]:
+                estado = "cancelada"
+            elif fecha < hoy:
+                estado = "completada"
+            else:
+                estado = "confirmada" if azar.random() < parametros["proporcion_confirmadas"] else "pendiente"
+            inicio_reserva = datetime.combine(fecha, hora(inicio, 0))
+            filas_reservas.append({
+                "estudiante_id": estudiantes[bisect.bisect(pesos_estudiantes, azar.random() * pesos_estudiantes[-1])],
+                "servicio_id": servicio, "tutor_id": tutor, "fecha": fecha,
+                "hora_inicio": hora(inicio, 0), "hora_fin": hora(inicio + 1, 0), "estado": estado,
+                "notas": None, "sala_virtual": None,
+                "fecha_creacion": min(ahora, inicio_reserva - timedelta(hours=azar.randint(2, 24 * 21))),
+                "_precio": precio,
+            })
+        precios = [fila.pop("_precio") for fila in filas_reservas]
+        ids_reservas = _insertar(db, models.Reserva, filas_reservas, lote)
+
+        filas_acciones, filas_pagos, filas_calificaciones, filas_notificaciones = [], [], [], []
+        for reserva, fila, precio in zip(ids_reservas, filas_reservas, precios):
+            creada = fila["fecha_creacion"]
+            filas_acciones.append({"reserva_id": reserva, "tutor_opened": fila["fecha"] < hoy,
+                                   "estudiante_opened": fila["fecha"] < hoy})
+            for usuario, mensaje in ((fila["tutor_id"], "Nueva reserva"), (fila["estudiante_id"], "Reserva registrada")):
+                filas_notificaciones.append({
+                    "usuario_id": usuario, "titulo": "Reserva", "mensaje": mensaje, "tipo": "reserva",
+                    "leida": fila["fecha"] < hoy, "fecha_creacion": creada, "fecha_programada": None,
+                    "reserva_id": reserva,
+                })
+            if fila["estado"] != "completada":
+                continue
+            if azar.random() >= parametros["proporcion_impagas"]:
+                fin_reserva = datetime.combine(fila["fecha"], fila["hora_fin"])
+                metodo = azar.choices(metodos, weights=pesos_metodos)[0]
+                filas_pagos.append({
+                    "reserva_id": reserva, "monto": precio, "metodo_pago": metodo, "estado": "completado",
+                    "referencia_externa": f"mp-{reserva}" if metodo == "mercado_pago" else None,
+                    "fecha_pago": fin_reserva + timedelta(hours=azar.randint(0, 48)), "fecha_creacion": fin_reserva,
+                })
+            if azar.random() < parametros["proporcion_calificadas"]:
+                puntuacion = azar.choices((1, 2, 3, 4, 5), weights=(2, 3, 10, 35, 50))[0]
+                filas_calificaciones.append({
+                    "reserva_id": reserva, "calificador_id": fila["estudiante_id"], "calificado_id": fila["tutor_id"],
+                    "puntuacion": puntuacion, "comentario": None,
+                    "fecha": datetime.combine(fila["fecha"], fila["hora_fin"]) + timedelta(hours=azar.randint(1, 72)),
+                })
+                suma, cantidad = resenas.get(fila["tutor_id"], (0, 0))
+                resenas[fila["tutor_id"]] = (suma + puntuacion, cantidad + 1)
+        _insertar(db, models.ReservaActions, filas_acciones, lote)
+        _insertar(db, models.Pago, filas_pagos, lote)
+        _insertar(db, models.Calificacion, filas_calificaciones, lote)
+        _insertar(db, models.Notificacion, filas_notificaciones, lote)
+        db.commit()
+        totales["reservas"] += len(ids_reservas)
+        totales["pagos"] += len(filas_pagos)
+        totales["calificaciones"] += len(filas_calificaciones)
+        totales["notificaciones"] += len(filas_notificaciones)
+
+    # Promedio y cantidad de reseñas de cada tutor, como los mantiene calificacionService
+    filas_resenas = [
+        {"id": tutor, "puntuacion_promedio": Decimal(suma / cantidad).quantize(Decimal("0.01")), "cantidad_reseñas": cantidad}
+        for tutor, (suma, cantidad) in resenas.items()
+    ]
+    for inicio in range(0, len(filas_resenas), lote):
+        db.execute(update(models.Usuario), filas_resenas[inicio:inicio + lote])
+    db.commit()
+
+    if db.bind.dialect.name in ("sqlite", "postgresql"):
+        # Estadísticas para el planificador, como en una base en uso
+        db.execute(text("ANALYZE"))
+        db.commit()
+
+    return {
+        "usuarios": cantidad_tutores + cantidad_estudiantes, "tutores": cantidad_tutores,
+        "servicios": len(ids_servicios), "disponibilidades": len(filas_disponibilidad), **totales,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un conjunto de datos sintético en una base vacía")
+    parser.add_argument("--base", required=True, help="URL de la base (se migra antes de generar)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--usuarios", type=int, default=PARAMETROS["usuarios"])
+    parser.add_argument("--reservas", type=int, default=PARAMETROS["reservas"])
+    parser.add_argument("--proporcion-tutores", type=float, default=PARAMETROS["proporcion_tutores"])
+    parser.add_argument("--alfa-tutores", type=float, default=PARAMETROS["alfa_tutores"])
+    args = parser.parse_args()
+
+
+    engine = create_engine(args.base)
+    migrar(engine)
+    inicio = time.perf_counter()
+    with Session(engine) as db:
+        filas = generar(db, args.semilla, usuarios=args.usuarios, reservas=args.reservas,
+                        proporcion_tutores=args.proporcion_tutores, alfa_tutores=args.alfa_tutores)
+    print(f"{filas} en {time.perf_counter() - inicio:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
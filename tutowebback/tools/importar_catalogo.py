@@ -0,0 +1,46 @@
+"""
+Importación masiva del catálogo de carreras y materias (services/importacionCatalogoService.py)
+desde un archivo CSV o JSON. Imprime el reporte de diferencias y termina con error si el
+archivo tiene errores (en ese caso no se escribe nada).
+
+Uso (desde la raíz del repositorio, con la base en SQLALCHEMY_DATABASE_URL_LOCAL):
+    python -m tutowebback.tools.importar_catalogo plan_2023.csv --dry-run
+    python -m tutowebback.tools.importar_catalogo plan_2023.csv
+    python -m tutowebback.tools.importar_catalogo catalogo.json --lote 500
+"""
+import os
+import sys
+import json
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from fastapi import HTTPException
+
+from tutowebback.config import database
+from tutowebback.services import importacionCatalogoService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa carreras y materias desde un CSV o JSON")
+    parser.add_argument("archivo", help="Archivo .csv o .json")
+    parser.add_argument("--dry-run", action="store_true", help="Solo mostrar las diferencias, sin escribir")
+    parser.add_argument("--lote", type=int, default=importacionCatalogoService.IMPORTACION_LOTE,
+                        help="Filas por transacción")
+    args = parser.parse_args()
+
+    with open(args.archivo, "rb") as archivo:
+        contenido = archivo.read()
+    db = database.SessionLocal()
+    try:
+        reporte = importacionCatalogoService.importar(db, contenido, args.archivo, args.dry_run, args.lote)
+    except HTTPException as e:
+        sys.exit(e.detail)
+    finally:
+        db.close()
+    print(json.dumps(reporte, indent=2, ensure_ascii=False, default=str))
+    if not reporte["exitoso"]:
+        sys.exit(f"El archivo tiene {reporte['total_errores']} errores: no se importó nada")
+
+
+if __name__ == "__main__":
+    main()
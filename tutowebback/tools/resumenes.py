@@ -0,0 +1,35 @@
+"""
+Actualización de los resúmenes diarios de los dashboards (services/resumenService.py).
+
+Sin argumentos hace lo mismo que la tarea periódica: recalcula desde la marca de agua de cada
+resumen. Con `--desde` recalcula desde ese día, p. ej. para llenar los resúmenes de una base
+existente o para reflejar cambios anteriores a la ventana de reapertura.
+
+Uso (desde la raíz del repositorio, con la base en SQLALCHEMY_DATABASE_URL_LOCAL):
+    python -m tutowebback.tools.resumenes
+    python -m tutowebback.tools.resumenes --desde 2025-01-01
+"""
+import os
+import sys
+import json
+import argparse
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from tutowebback.services import resumenService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Actualiza los resúmenes diarios de los dashboards")
+    parser.add_argument("--desde", type=date.fromisoformat, help="Recalcular desde este día (AAAA-MM-DD)")
+    args = parser.parse_args()
+
+    resultado = resumenService.actualizar_resumenes(args.desde)
+    print(json.dumps(resultado, indent=2))
+    errores = [nombre for nombre, detalle in resultado["resumenes"].items() if "error" in detalle]
+    if errores:
+        sys.exit(f"Resúmenes con error: {', '.join(errores)}")
+
+
+if __name__ == "__main__":
+    main()
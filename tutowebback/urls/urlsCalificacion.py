@@ -7,6 +7,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.config import database
 from tutowebback.schemas import schemas
 from tutowebback.auth import auth
+from tutowebback.controllers import calificacionController
+from tutowebback.services import calificacionService
+from tutowebback.config import instrumentacion
 
 router = APIRouter(tags=["Calificaciones"])
 
@@ -16,7 +19,6 @@ async def create_calificacion(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.get_current_user),
 ):
-    from tutowebback.controllers import calificacionController
     return await calificacionController.create_calificacion(calificacion, db, current_user)
 
 @router.get("/calificacion/reserva/{reserva_id}", response_model=None)
@@ -25,40 +27,42 @@ async def get_calificacion_by_reserva(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.get_current_user),
 ):
-    from tutowebback.controllers import calificacionController
     return await calificacionController.get_calificacion_by_reserva(reserva_id, db, current_user)
-@router.get("/calificaciones/date-range", response_model=None)
+@router.get("/calificaciones/date-range", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(2))])
 async def get_calificaciones_by_date_range(
     fecha_desde: str = Query(None, description="Fecha desde en formato YYYY-MM-DD"),
     fecha_hasta: str = Query(None, description="Fecha hasta en formato YYYY-MM-DD"),
     usuario_id: int = Query(None, description="ID del usuario (calificador o calificado)"),
+    pagina: int = Query(1, ge=1, description="Número de página, desde 1"),
+    por_pagina: int = Query(calificacionService.CALIFICACIONES_POR_PAGINA, ge=1,
+                            le=calificacionService.CALIFICACIONES_POR_PAGINA_MAXIMO,
+                            description="Calificaciones por página"),
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
 ):
-    from tutowebback.controllers import calificacionController
     return await calificacionController.get_calificaciones_by_date_range(
-        fecha_desde, fecha_hasta, usuario_id, db, current_user
+        fecha_desde, fecha_hasta, usuario_id, db, current_user, pagina, por_pagina
     )
-@router.get("/calificaciones/tutor/{tutor_id}", response_model=None)
+@router.get("/calificaciones/tutor/{tutor_id}", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(4))])
 async def get_calificaciones_by_tutor(
     tutor_id: int,
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.get_current_user),
 ):
-    from tutowebback.controllers import calificacionController
     return await calificacionController.get_calificaciones_by_tutor(tutor_id, db, current_user)
 
-@router.get("/calificaciones/estudiante", response_model=None)
+@router.get("/calificaciones/estudiante", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(4))])
 async def get_calificaciones_by_estudiante(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.get_current_user),
 ):
-    from tutowebback.controllers import calificacionController
     return await calificacionController.get_calificaciones_by_estudiante(db, current_user)
 @router.get("/calificaciones/estudiante/reserva", response_model=None)
 async def get_calificaciones_by_estudiante(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.get_current_user),
 ):
-    from tutowebback.controllers import calificacionController
     return await calificacionController.get_calificaciones_for_estudiante_reservas(db, current_user)
\ No newline at end of file
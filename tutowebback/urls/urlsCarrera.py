@@ -1,12 +1,14 @@
 import os
 import sys
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Header
 from sqlalchemy.orm import Session
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.config import database
 from tutowebback.schemas import schemas
 from tutowebback.auth import auth
+from tutowebback.controllers import carreraController
 
 router = APIRouter(tags=["Carreras"])
 
@@ -16,15 +18,14 @@ async def create_carrera(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
 ):
-    from tutowebback.controllers import carreraController
     return await carreraController.create_carrera(carrera, db, current_user)
 
 @router.get("/carreras/all", response_model=None)
 async def get_all_carreras(
     db: Session = Depends(database.get_db),
+    if_none_match: Optional[str] = Header(None),
 ):
-    from tutowebback.controllers import carreraController
-    return await carreraController.get_all_carreras(db)
+    return await carreraController.get_all_carreras(db, if_none_match)
 
 @router.get("/carrera/{id}", response_model=None)
 async def get_carrera(
@@ -32,7 +33,6 @@ async def get_carrera(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "tutor", "estudiante"])),
 ):
-    from tutowebback.controllers import carreraController
     return await carreraController.get_carrera(id, db, current_user)
 
 @router.put("/carrera/{id}", response_model=None)
@@ -42,7 +42,6 @@ async def edit_carrera(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
 ):
-    from tutowebback.controllers import carreraController
     return await carreraController.edit_carrera(id, carrera, db, current_user)
 
 @router.delete("/carrera/{id}", response_model=None)
@@ -51,5 +50,4 @@ async def delete_carrera(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"]))
 ):
-    from tutowebback.controllers import carreraController
     return await carreraController.delete_carrera(id, db, current_user)
\ No newline at end of file
@@ -7,6 +7,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.config import database
 from tutowebback.schemas import schemas
 from tutowebback.auth import auth
+from tutowebback.controllers import disponibilidadController
 
 router = APIRouter(tags=["Disponibilidad"])
 
@@ -16,7 +17,6 @@ async def create_disponibilidad(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["alumno&tutor", "tutor"])),
 ):
-    from tutowebback.controllers import disponibilidadController
     return await disponibilidadController.create_disponibilidad(disponibilidad, db, current_user)
 @router.get("/disponibilidades/disponibles/{tutor_id}/{fecha}", response_model=None)
 async def get_disponibilidades_disponibles(
@@ -25,7 +25,6 @@ async def get_disponibilidades_disponibles(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin","alumno", "alumno&tutor", "tutor", "estudiante"])),
 ):
-    from tutowebback.controllers import disponibilidadController
     return await disponibilidadController.get_disponibilidades_disponibles(tutor_id, fecha, db, current_user)
 @router.get("/disponibilidades/tutor/{tutor_id}", response_model=None)
 async def get_disponibilidades_by_tutor(
@@ -33,7 +32,6 @@ async def get_disponibilidades_by_tutor(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin","alumno", "alumno&tutor", "tutor", "estudiante"])),
 ):
-    from tutowebback.controllers import disponibilidadController
     return await disponibilidadController.get_disponibilidades_by_tutor(tutor_id, db, current_user)
 
 @router.get("/disponibilidad/{id}", response_model=None)
@@ -42,7 +40,6 @@ async def get_disponibilidad(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "alumno&tutor", "tutor"])),
 ):
-    from tutowebback.controllers import disponibilidadController
     return await disponibilidadController.get_disponibilidad(id, db, current_user)
 
 @router.put("/disponibilidad/{id}", response_model=None)
@@ -52,7 +49,6 @@ async def edit_disponibilidad(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["alumno&tutor", "tutor"])),
 ):
-    from tutowebback.controllers import disponibilidadController
     return await disponibilidadController.edit_disponibilidad(id, disponibilidad, db, current_user)
 
 @router.delete("/disponibilidad/{id}", response_model=None)
@@ -61,5 +57,4 @@ async def delete_disponibilidad(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["alumno&tutor", "tutor"]))
 ):
-    from tutowebback.controllers import disponibilidadController
     return await disponibilidadController.delete_disponibilidad(id, db, current_user)
\ No newline at end of file
@@ -0,0 +1,38 @@
+import os
+import sys
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.config import database
+from tutowebback.schemas import schemas
+from tutowebback.auth import auth
+from tutowebback.controllers import dispositivoController
+
+router = APIRouter(tags=["Dispositivos"])
+
+
+@router.post("/dispositivos/register", response_model=None)
+async def registrar_dispositivo(
+    dispositivo: schemas.DispositivoUsuarioRegistro,
+    db: Session = Depends(database.get_db),
+    current_user: schemas.Usuario = Depends(auth.get_current_user),
+):
+    return await dispositivoController.registrar_dispositivo(dispositivo, db, current_user)
+
+
+@router.get("/dispositivos", response_model=None)
+async def get_dispositivos(
+    db: Session = Depends(database.get_db),
+    current_user: schemas.Usuario = Depends(auth.get_current_user),
+):
+    return await dispositivoController.get_dispositivos(db, current_user)
+
+
+@router.delete("/dispositivos", response_model=None)
+async def delete_dispositivo(
+    token_dispositivo: str = Query(..., description="Token del dispositivo a desvincular"),
+    db: Session = Depends(database.get_db),
+    current_user: schemas.Usuario = Depends(auth.get_current_user),
+):
+    return await dispositivoController.delete_dispositivo(token_dispositivo, db, current_user)
@@ -0,0 +1,21 @@
+import os
+import sys
+from fastapi import APIRouter, Depends, Query
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.schemas import schemas
+from tutowebback.auth import auth
+from tutowebback.controllers import exportacionController
+
+router = APIRouter(tags=["Exportaciones"])
+
+
+@router.get("/exportaciones/{conjunto}", response_model=None)
+async def exportar(
+    conjunto: str,
+    formato: str = Query("csv", description="Formato del archivo: csv o parquet"),
+    fecha_desde: str = Query(None, description="Fecha desde en formato YYYY-MM-DD"),
+    fecha_hasta: str = Query(None, description="Fecha hasta en formato YYYY-MM-DD"),
+    current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
+):
+    return await exportacionController.exportar(conjunto, formato, fecha_desde, fecha_hasta, current_user)
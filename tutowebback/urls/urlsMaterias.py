@@ -1,12 +1,14 @@
 import os
 import sys
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, UploadFile, File, Query
 from sqlalchemy.orm import Session
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.config import database
 from tutowebback.schemas import schemas
 from tutowebback.auth import auth
+from tutowebback.controllers import materiaController
 
 router = APIRouter(tags=["Materias"])
 
@@ -16,25 +18,33 @@ async def create_materia(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
 ):
-    from tutowebback.controllers import materiaController
     return await materiaController.create_materia(materia, db, current_user)
 
+@router.post("/materias/importar", response_model=None)
+async def importar_catalogo(
+    archivo: UploadFile = File(...),
+    dry_run: bool = Query(False),
+    db: Session = Depends(database.get_db),
+    current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
+):
+    return await materiaController.importar_catalogo(archivo, dry_run, db, current_user)
+
 @router.get("/materias/all", response_model=None)
 async def get_all_materias(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "alumno","alumno&tutor","tutor", "estudiante"])),
+    if_none_match: Optional[str] = Header(None),
 ):
-    from tutowebback.controllers import materiaController
-    return await materiaController.get_all_materias(db, current_user)
+    return await materiaController.get_all_materias(db, current_user, if_none_match)
 
 @router.get("/materias/carrera/{carrera_id}", response_model=None)
 async def get_materias_by_carrera(
     carrera_id: int,
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin","alumno&tutor", "admin", "tutor", "estudiante","alumno"])),
+    if_none_match: Optional[str] = Header(None),
 ):
-    from tutowebback.controllers import materiaController
-    return await materiaController.get_materias_by_carrera(carrera_id, db, current_user)
+    return await materiaController.get_materias_by_carrera(carrera_id, db, current_user, if_none_match)
 
 @router.get("/materia/{id}", response_model=None)
 async def get_materia(
@@ -42,7 +52,6 @@ async def get_materia(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "tutor", "estudiante"])),
 ):
-    from tutowebback.controllers import materiaController
     return await materiaController.get_materia(id, db, current_user)
 
 @router.put("/materia/{id}", response_model=None)
@@ -52,7 +61,6 @@ async def edit_materia(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
 ):
-    from tutowebback.controllers import materiaController
     return await materiaController.edit_materia(id, materia, db, current_user)
 
 @router.delete("/materia/{id}", response_model=None)
@@ -61,5 +69,4 @@ async def delete_materia(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"]))
 ):
-    from tutowebback.controllers import materiaController
     return await materiaController.delete_materia(id, db, current_user)
\ No newline at end of file
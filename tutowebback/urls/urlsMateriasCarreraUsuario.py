@@ -7,6 +7,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.config import database
 from tutowebback.schemas import schemas
 from tutowebback.auth import auth
+from tutowebback.controllers import materiasXCarreraXUsuarioController
+from tutowebback.config import instrumentacion
 
 router = APIRouter(tags=["MateriasXCarreraXUsuario"])
 
@@ -16,7 +18,6 @@ async def create_materia_carrera_usuario(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "alumno&tutor"])),
 ):
-    from tutowebback.controllers import materiasXCarreraXUsuarioController
     return await materiasXCarreraXUsuarioController.create_materia_carrera_usuario(materia_carrera_usuario, db, current_user)
 
 @router.get("/materias-carrera-usuario/all", response_model=None)
@@ -24,7 +25,6 @@ async def get_all_materias_carrera_usuario(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
 ):
-    from tutowebback.controllers import materiasXCarreraXUsuarioController
     return await materiasXCarreraXUsuarioController.get_all_materias_carrera_usuario(db, current_user)
 
 @router.get("/materias-carrera-usuario/{id}", response_model=None)
@@ -33,7 +33,6 @@ async def get_materia_carrera_usuario(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "alumno&tutor", "estudiante"])),
 ):
-    from tutowebback.controllers import materiasXCarreraXUsuarioController
     return await materiasXCarreraXUsuarioController.get_materia_carrera_usuario(id, db, current_user)
 
 @router.get("/materias-carrera-usuario/usuario/{usuario_id}/carrera/{carrera_id}", response_model=None)
@@ -43,17 +42,16 @@ async def get_materias_by_usuario_and_carrera(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "tutor", "alumno&tutor"])),
 ):
-    from tutowebback.controllers import materiasXCarreraXUsuarioController
     return await materiasXCarreraXUsuarioController.get_materias_by_usuario_and_carrera(usuario_id, carrera_id, db, current_user)
 
-@router.get("/materias-carrera-usuario/materia/{materia_id}/carrera/{carrera_id}", response_model=None)
+@router.get("/materias-carrera-usuario/materia/{materia_id}/carrera/{carrera_id}", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(6))])
 async def get_usuarios_by_materia_and_carrera(
     materia_id: int,
     carrera_id: int,
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "tutor"])),
 ):
-    from tutowebback.controllers import materiasXCarreraXUsuarioController
     return await materiasXCarreraXUsuarioController.get_usuarios_by_materia_and_carrera(materia_id, carrera_id, db, current_user)
 
 @router.put("/materias-carrera-usuario/{id}", response_model=None)
@@ -63,7 +61,6 @@ async def edit_materia_carrera_usuario(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "tutor"])),
 ):
-    from tutowebback.controllers import materiasXCarreraXUsuarioController
     return await materiasXCarreraXUsuarioController.edit_materia_carrera_usuario(id, materia_carrera_usuario, db, current_user)
 
 @router.delete("/materias-carrera-usuario/{id}", response_model=None)
@@ -72,5 +69,4 @@ async def delete_materia_carrera_usuario(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin","alumno&tutor"]))
 ):
-    from tutowebback.controllers import materiasXCarreraXUsuarioController
     return await materiasXCarreraXUsuarioController.delete_materia_carrera_usuario(id, db, current_user)
\ No newline at end of file
@@ -0,0 +1,21 @@
+import os
+import sys
+
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.config import telemetria
+
+router = APIRouter(tags=["Métricas"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metricas(authorization: Optional[str] = Header(None)):
+    # Formato de texto de Prometheus; lo lee el scraper, no el frontend
+    if not telemetria.autorizado(authorization):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    telemetria.actualizar_threadpool()
+    texto = await run_in_threadpool(telemetria.exponer)
+    return PlainTextResponse(texto, media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -9,6 +9,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.config import database
 from tutowebback.schemas import schemas
 from tutowebback.auth import auth
+from tutowebback.controllers import notificacionController
+from tutowebback.services import notificacionService
+from tutowebback.config import instrumentacion
 
 router = APIRouter(tags=["Notificaciones"])
 
@@ -19,7 +22,6 @@ async def create_notificacion(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
 ):
-    from tutowebback.controllers import notificacionController
     return await notificacionController.create_notificacion(notificacion, db, current_user)
 
 
@@ -29,18 +31,17 @@ async def get_notificaciones(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.get_current_user),
 ):
-    from tutowebback.controllers import notificacionController
     return await notificacionController.get_notificaciones_by_user(db, current_user, solo_no_leidas)
 
 
-@router.get("/notificaciones/all", response_model=None)
+@router.get("/notificaciones/all", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(3))])
 async def get_all_notificaciones(
     fecha_desde: str = Query(None, description="Fecha desde en formato YYYY-MM-DD"),
     fecha_hasta: str = Query(None, description="Fecha hasta en formato YYYY-MM-DD"),
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
 ):
-    from tutowebback.controllers import notificacionController
     return await notificacionController.get_all_notificaciones(db, current_user, fecha_desde, fecha_hasta)
 
 
@@ -50,7 +51,6 @@ async def get_notificaciones_by_tipo(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.get_current_user),
 ):
-    from tutowebback.services import notificacionService
     notificaciones = notificacionService.obtener_notificaciones_por_tipo(
         db, current_user["id"], tipo
     )
@@ -71,7 +71,6 @@ async def get_estadisticas_notificaciones(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
 ):
-    from tutowebback.services import notificacionService
     estadisticas = notificacionService.obtener_estadisticas_notificaciones(
         db, fecha_desde, fecha_hasta
     )
@@ -83,13 +82,22 @@ async def get_estadisticas_notificaciones(
     }
 
 
+@router.post("/notificaciones/retencion", response_model=None)
+async def ejecutar_retencion_notificaciones(
+    leidas_dias: int = Query(None, ge=0, description="Eliminar leídas con más de N días (por defecto según configuración)"),
+    archivo_dias: int = Query(None, ge=0, description="Archivar notificaciones con más de N días (por defecto según configuración)"),
+    destino: str = Query(None, description="Destino del archivo: tabla o archivo"),
+    current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
+):
+    return await notificacionController.ejecutar_retencion(current_user, leidas_dias, archivo_dias, destino)
+
+
 @router.put("/notificaciones/{notificacion_id}/leer", response_model=None)
 async def marcar_notificacion_como_leida(
     notificacion_id: int,
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.get_current_user),
 ):
-    from tutowebback.controllers import notificacionController
     return await notificacionController.mark_notificacion_as_read(notificacion_id, db, current_user)
 
 
@@ -98,7 +106,6 @@ async def marcar_todas_como_leidas(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.get_current_user),
 ):
-    from tutowebback.controllers import notificacionController
     return await notificacionController.mark_all_as_read(db, current_user)
 
 
@@ -108,5 +115,4 @@ async def delete_notificacion(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.get_current_user),
 ):
-    from tutowebback.controllers import notificacionController
     return await notificacionController.delete_notificacion(notificacion_id, db, current_user)
\ No newline at end of file
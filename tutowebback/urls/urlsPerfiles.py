@@ -0,0 +1,35 @@
+import os
+import sys
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.schemas import schemas
+from tutowebback.auth import auth
+from tutowebback.config import perfilado
+
+router = APIRouter(tags=["Perfilado"])
+
+
+@router.get("/admin/perfiles", response_model=None)
+async def get_perfiles(
+    current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
+):
+    # Perfiles guardados por config/perfilado.py, del más nuevo al más viejo
+    return {
+        "success": True,
+        "data": perfilado.listar(),
+        "message": "Get perfiles successfully"
+    }
+
+
+@router.get("/admin/perfiles/{archivo}", response_model=None)
+async def download_perfil(
+    archivo: str,
+    current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
+):
+    ruta = perfilado.ruta_archivo(archivo)
+    if not ruta:
+        raise HTTPException(status_code=404, detail="Perfil not found")
+    media_type = "text/plain; charset=utf-8" if archivo.endswith(".txt") else None
+    return FileResponse(ruta, filename=archivo, media_type=media_type)
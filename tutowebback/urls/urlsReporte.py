@@ -0,0 +1,66 @@
+import os
+import sys
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tutowebback.config import database
+from tutowebback.schemas import schemas
+from tutowebback.auth import auth
+from tutowebback.controllers import reporteController
+from tutowebback.config import instrumentacion
+
+router = APIRouter(tags=["Reportes"])
+
+# Tres consultas agregadas como máximo: los meses en caché no consultan la base
+PRESUPUESTO_REPORTE = 3
+
+
+@router.get("/reportes/tutor", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(PRESUPUESTO_REPORTE))])
+async def get_reporte_propio(
+    desde: str = Query(None, description="Mes desde en formato YYYY-MM"),
+    hasta: str = Query(None, description="Mes hasta en formato YYYY-MM"),
+    db: Session = Depends(database.get_db),
+    current_user: schemas.Usuario = Depends(auth.role_required(["tutor", "alumno&tutor"])),
+):
+    return await reporteController.get_reporte_tutor(current_user["id"], desde, hasta, db, current_user)
+
+@router.get("/reportes/tutor/{tutor_id}", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(PRESUPUESTO_REPORTE))])
+async def get_reporte_tutor(
+    tutor_id: int,
+    desde: str = Query(None, description="Mes desde en formato YYYY-MM"),
+    hasta: str = Query(None, description="Mes hasta en formato YYYY-MM"),
+    db: Session = Depends(database.get_db),
+    current_user: schemas.Usuario = Depends(auth.get_current_user),
+):
+    return await reporteController.get_reporte_tutor(tutor_id, desde, hasta, db, current_user)
+
+@router.get("/reportes/global", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(PRESUPUESTO_REPORTE))])
+async def get_reporte_global(
+    desde: str = Query(None, description="Mes desde en formato YYYY-MM"),
+    hasta: str = Query(None, description="Mes hasta en formato YYYY-MM"),
+    db: Session = Depends(database.get_db),
+    current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
+):
+    return await reporteController.get_reporte_global(desde, hasta, db, current_user)
+
+@router.get("/reportes/dashboard", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(8))])
+async def get_dashboard(
+    fecha_desde: str = Query(None, description="Fecha desde en formato YYYY-MM-DD"),
+    fecha_hasta: str = Query(None, description="Fecha hasta en formato YYYY-MM-DD"),
+    agrupar: str = Query("mes", description="Agrupación de la serie: dia o mes"),
+    db: Session = Depends(database.get_db),
+    current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
+):
+    return await reporteController.get_dashboard(fecha_desde, fecha_hasta, agrupar, db, current_user)
+
+@router.post("/reportes/resumenes/actualizar", response_model=None)
+async def actualizar_resumenes(
+    desde: str = Query(None, description="Recalcular desde esta fecha (YYYY-MM-DD); por defecto desde la marca de agua"),
+    current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
+):
+    return await reporteController.actualizar_resumenes(desde, current_user)
@@ -1,12 +1,14 @@
 import os
 import sys
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Header
 from sqlalchemy.orm import Session
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.schemas import schemas
 from tutowebback.config import database
 from tutowebback.auth import auth
+from tutowebback.controllers import roleController
 
 router = APIRouter(tags=["Roles"])
 
@@ -16,28 +18,26 @@ async def create(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "eDefuncionAdmin", "eNacimientoAdmin"])),
 ):
-    from tutowebback.controllers import roleController
     return await roleController.create_rol(role, db, current_user)
 @router.get("/roles/all", response_model=None)
 async def get_all_roles(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "alumno&tutor"])),
+    if_none_match: Optional[str] = Header(None),
 ):
-    from tutowebback.controllers import roleController
-    return await roleController.get_all_roles(db, current_user)
+    return await roleController.get_all_roles(db, current_user, if_none_match)
 @router.get("/roles/all/register", response_model=None)
 async def get_all_roles_by_register(
     db: Session = Depends(database.get_db),
+    if_none_match: Optional[str] = Header(None),
 ):
-    from tutowebback.controllers import roleController
-    return await roleController.get_all_roles_by_register(db)
+    return await roleController.get_all_roles_by_register(db, if_none_match)
 @router.get("/roles/{id}", response_model=None)
 async def get_role(
     id: int,
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "eDefuncionAdmin", "eNacimientoAdmin"])),
 ):
-    from tutowebback.controllers import roleController
     return await roleController.get_role(id,db, current_user)
 @router.put("/role/{id}", response_model=None)
 async def edit_role(
@@ -46,7 +46,6 @@ async def edit_role(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "eDefuncionAdmin", "eNacimientoAdmin"])),
 ):
-    from tutowebback.controllers import roleController
     return await roleController.edit_role(id, role, db, current_user)
 @router.delete("/roleDelete/{id}", response_model=None)
 async def delete_role(
@@ -54,5 +53,4 @@ async def delete_role(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "eDefuncionAdmin", "eNacimientoAdmin"])),
 ):
-    from tutowebback.controllers import roleController
     return await roleController.delete_role(id, db, current_user)
\ No newline at end of file
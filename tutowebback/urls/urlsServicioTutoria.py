@@ -9,6 +9,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tutowebback.config import database
 from tutowebback.schemas import schemas
 from tutowebback.auth import auth
+from tutowebback.controllers import servicioTutoriaController
+from tutowebback.config import instrumentacion
 
 router = APIRouter(tags=["ServiciosTutoria"])
 
@@ -18,34 +20,33 @@ async def create_servicio(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "alumno&tutor", "tutor"])),
 ):
-    from tutowebback.controllers import servicioTutoriaController
     return await servicioTutoriaController.create_servicio(servicio, db, current_user)
 
-@router.get("/servicio/{id}", response_model=None)
+@router.get("/servicio/{id}", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(4))])
 async def get_servicio(
     id: int,
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "alumno&tutor", "tutor", "estudiante"])),
 ):
-    from tutowebback.controllers import servicioTutoriaController
     return await servicioTutoriaController.get_servicio(id, db, current_user)
 
-@router.get("/servicios/tutor/{email}", response_model=None)
+@router.get("/servicios/tutor/{email}", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(5))])
 async def get_servicios_by_tutor(
     email: str,
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "alumno", "alumno&tutor", "tutor", "estudiante"])),
 ):
-    from tutowebback.controllers import servicioTutoriaController
     return await servicioTutoriaController.get_servicios_by_tutor(email, db, current_user)
 
-@router.get("/servicios/materia/{materia_id}", response_model=None)
+@router.get("/servicios/materia/{materia_id}", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(4))])
 async def get_servicios_by_materia(
     materia_id: int,
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "alumno&tutor", "tutor", "estudiante"])),
 ):
-    from tutowebback.controllers import servicioTutoriaController
     return await servicioTutoriaController.get_servicios_by_materia(materia_id, db, current_user)
 
 @router.put("/servicio/{id}", response_model=None)
@@ -55,7 +56,6 @@ async def edit_servicio(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "alumno&tutor", "tutor"])),
 ):
-    from tutowebback.controllers import servicioTutoriaController
     return await servicioTutoriaController.edit_servicio(id, servicio, db, current_user)
 
 @router.delete("/servicio/{id}", response_model=None)
@@ -64,5 +64,4 @@ async def delete_servicio(
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "alumno&tutor", "tutor"])),
 ):
-    from tutowebback.controllers import servicioTutoriaController
     return await servicioTutoriaController.delete_servicio(id, db, current_user)
\ No newline at end of file
@@ -7,9 +7,11 @@ from typing import List, Optional
 from fastapi.responses import FileResponse
 from fastapi import Request
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import database
+from tutowebback.config import database
 from tutowebback.schemas import schemas
 from tutowebback.auth import auth
+from tutowebback.controllers import userController
+from tutowebback.config import instrumentacion
 
 router = APIRouter(tags=["Usuarios"])
 
@@ -19,7 +21,6 @@ async def create(
         db: Session = Depends(database.get_db),
         current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
 ):
-    from tutowebback.controllers import userController
     return await userController.create_usuario(usuario, db, current_user)
 
 
@@ -47,7 +48,6 @@ async def register_form(
     )
 
     # Llamar al controlador con la imagen
-    from tutowebback.controllers import userController
     return await userController.create_usuario(usuario, db, profile_image)
 
 
@@ -59,16 +59,15 @@ async def edit_usuario(
         db: Session = Depends(database.get_db),
         current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"])),
 ):
-    from tutowebback.controllers import userController
     return await userController.edit_usuario(id, usuario, db, current_user)
 
-@router.get("/tutores/by/carrera/{carrera_id}/with-materias", response_model=None)
+@router.get("/tutores/by/carrera/{carrera_id}/with-materias", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(6))])
 async def get_tutores_by_carrera_with_materias(
     carrera_id: int,
     db: Session = Depends(database.get_db),
     current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "tutor","alumno","alumno&tutor"])),
 ):
-    from tutowebback.controllers import userController
     return await userController.get_tutores_by_carrera_with_materias(db, current_user, carrera_id)
 @router.put("/usuario/{emailParam}/form", response_model=None)
 async def edit_usuario_form(
@@ -94,7 +93,6 @@ async def edit_usuario_form(
         id_carrera=id_carrera
     )
 
-    from tutowebback.controllers import userController
     return await userController.edit_usuario(emailParam,id, usuario, db, current_user, profile_image)
 
 
@@ -124,27 +122,27 @@ async def get_upload(path: str):
 
 
 # Resto de endpoints sin cambios
-@router.get("/usuarios/all", response_model=None)
+@router.get("/usuarios/all", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(4))])
 async def get_all_usuarios(
         db: Session = Depends(database.get_db),
         current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "tutor","alumno"])),
 ):
-    from tutowebback.controllers import userController
     return await userController.get_all_usuarios(db, current_user)
-@router.get("/tutores/by/carrera/{id}", response_model=None)
+@router.get("/tutores/by/carrera/{id}", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(5))])
 async def get_tutores_by_carrera(
         id: int,
         db: Session = Depends(database.get_db),
         current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "tutor","alumno","alumno&tutor"])),
 ):
-    from tutowebback.controllers import userController
     return await userController.get_tutores_by_carrera(db, current_user,id)
-@router.get("/usuarios/tutores", response_model=None)
+@router.get("/usuarios/tutores", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(5))])
 async def get_tutores(
         db: Session = Depends(database.get_db)
       ,
 ):
-    from tutowebback.controllers import userController
     return await userController.get_tutores(db)
 
 
@@ -154,15 +152,14 @@ async def get_usuario(
         db: Session = Depends(database.get_db),
         current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin", "tutor", "estudiante"])),
 ):
-    from tutowebback.controllers import userController
     return await userController.get_usuario(id, db, current_user)
-@router.get("/usuario/by-email/{email}", response_model=None)
+@router.get("/usuario/by-email/{email}", response_model=None,
+            dependencies=[Depends(instrumentacion.presupuesto_consultas(4))])
 async def get_usuario(
         email: str,
         db: Session = Depends(database.get_db),
         current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "alumno","alumno&tutor"])),
 ):
-    from tutowebback.controllers import userController
     return await userController.get_usuario_by_email(email, db, current_user)
 
 
@@ -172,7 +169,6 @@ async def delete_usuario(
         db: Session = Depends(database.get_db),
         current_user: schemas.Usuario = Depends(auth.role_required(["superAdmin", "admin"]))
 ):
-    from tutowebback.controllers import userController
     return await userController.delete_usuario(id, db, current_user)
 
 
@@ -182,5 +178,4 @@ async def login(
         password: str,
         db: Session = Depends(database.get_db),
 ):
-    from tutowebback.auth import auth
     return auth.login_for_access_token(db, email, password)
\ No newline at end of file